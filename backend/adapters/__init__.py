@@ -5,6 +5,7 @@ This module contains adapters that allow integration with external services
 that don't have native LangChain support.
 """
 
+from .claude_cli_pool import ClaudeCLIPool, get_claude_cli_pool
 from .claude_cli_simple import ClaudeCLISimple
 
-__all__ = ["ClaudeCLISimple"]
+__all__ = ["ClaudeCLISimple", "ClaudeCLIPool", "get_claude_cli_pool"]
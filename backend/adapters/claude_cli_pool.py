@@ -0,0 +1,512 @@
+"""
+Warm Claude CLI Process Pool
+
+Every one-shot `claude --print` call boots a Node runtime and loads its
+configuration before the first token. This pool keeps pre-spawned CLI
+workers in streaming input mode (`--input-format stream-json`) per
+(command, workspace) key, so that startup happens off the critical path.
+
+Workers receive the prompt as a JSONL user message on stdin and answer
+with the usual stream-json events, ending with a "result" event.
+
+Context isolation:
+    A CLI worker keeps its conversation history between requests. With
+    the default max_requests_per_worker=1 every worker serves exactly one
+    request (fresh context) and a warm replacement is spawned in the
+    background. Raise it (KI_CLAUDE_CLI_POOL_MAX_REQUESTS) to also reuse
+    workers when shared context between calls is acceptable.
+
+Idle workers:
+    Every acquire leaves a warm spare for its (workspace, agent) key, so
+    finished workflows would keep one idle CLI per agent alive. A reaper
+    task closes workers idle longer than max_idle_seconds
+    (KI_CLAUDE_CLI_POOL_IDLE_SECONDS, default 600), and at most
+    max_idle_workers (KI_CLAUDE_CLI_POOL_MAX_IDLE, default 8) idle workers
+    are kept across all keys - the least recently used go first.
+
+Usage:
+    from adapters.claude_cli_pool import get_claude_cli_pool
+
+    pool = get_claude_cli_pool()
+    worker = await pool.acquire(cmd, cwd=workspace_path)
+    ...
+    await pool.release(worker, healthy=True)
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import signal
+import time
+from collections import deque
+from typing import Any
+
+from adapters.cli_process_supervisor import ClaudeCLITimeoutError, get_process_supervisor
+
+logger = logging.getLogger(__name__)
+
+# Maximum length of a single stream-json line (asyncio default is only 64 KB)
+STREAM_LINE_LIMIT = 32 * 1024 * 1024
+
+PoolKey = tuple[str | None, tuple[str, ...]]
+
+
+class ClaudeCLIWorkerError(RuntimeError):
+    """Raised when a pooled CLI worker dies or cannot accept a request."""
+
+
+def to_streaming_command(cmd: list[str]) -> list[str]:
+    """
+    Convert a one-shot command (`... -p <prompt>`) to streaming input mode.
+
+    The prompt is dropped (it is sent on stdin) and
+    `--input-format stream-json` is added before `-p`.
+    """
+    if len(cmd) < 2 or cmd[-2] != "-p":
+        raise ValueError("Expected command ending with '-p <prompt>'")
+    return cmd[:-2] + ["--input-format", "stream-json", "-p"]
+
+
+class ClaudeCLIWorker:
+    """A long-lived CLI process in streaming input mode."""
+
+    def __init__(self, key: PoolKey, process: asyncio.subprocess.Process):
+        self.key = key
+        self.process = process
+        self.spawned_at = time.time()
+        self.last_used = self.spawned_at
+        self.requests_served = 0
+        self._stderr_tail: deque[str] = deque(maxlen=50)
+        # Drain stderr continuously - a full stderr pipe would block the CLI
+        self._stderr_task = asyncio.create_task(self._drain_stderr())
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    @property
+    def stderr_tail(self) -> str:
+        return "".join(self._stderr_tail)
+
+    async def _drain_stderr(self) -> None:
+        if self.process.stderr is None:
+            return
+        async for line in self.process.stderr:
+            self._stderr_tail.append(line.decode(errors="replace"))
+
+    async def send(self, prompt: str) -> None:
+        """Send one user message (JSONL) to the worker."""
+        if not self.alive or self.process.stdin is None:
+            raise ClaudeCLIWorkerError(f"Worker {self.pid} is not running: {self.stderr_tail}")
+
+        message = {
+            "type": "user",
+            "message": {
+                "role": "user",
+                "content": [{"type": "text", "text": prompt}]
+            }
+        }
+        try:
+            self.process.stdin.write((json.dumps(message) + "\n").encode())
+            await self.process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise ClaudeCLIWorkerError(f"Worker {self.pid} closed stdin: {e}") from e
+
+        self.last_used = time.time()
+
+    async def readline(self, timeout: float | None = None) -> bytes:
+        """
+        Read one stdout line.
+
+        Raises:
+            ClaudeCLIWorkerError: On EOF (worker died)
+            ClaudeCLITimeoutError: If no line arrives within timeout
+        """
+        try:
+            line = await asyncio.wait_for(self.process.stdout.readline(), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise ClaudeCLITimeoutError(f"Worker {self.pid} timed out") from None
+        if not line:
+            await self.process.wait()
+            raise ClaudeCLIWorkerError(
+                f"Worker {self.pid} exited (code {self.process.returncode}): {self.stderr_tail}"
+            )
+        return line
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Close stdin (CLI exits after the last turn), then SIGTERM → SIGKILL."""
+        if self.alive:
+            try:
+                if self.process.stdin is not None:
+                    self.process.stdin.close()
+                await asyncio.wait_for(self.process.wait(), timeout=timeout)
+            except (asyncio.TimeoutError, ProcessLookupError, BrokenPipeError):
+                pass
+
+        # Terminates the process group if still running, unregisters it
+        await get_process_supervisor().terminate(self.process)
+
+        if not self._stderr_task.done():
+            self._stderr_task.cancel()
+
+
+class ClaudeCLIPool:
+    """
+    Pool of warm Claude CLI workers keyed by (workspace, command).
+
+    - acquire(): hands out a healthy idle worker (warm hit) or spawns one
+      (cold), then replenishes the warm spare in the background
+    - release(): recycles workers after max_requests_per_worker requests,
+      on failure or when they died
+    - Health checks: process alive and idle for less than max_idle_seconds
+    - Reaper: closes expired idle workers in the background; idle workers
+      across all keys are capped at max_idle_workers (LRU)
+    - Keys whose workers die before answering are marked unsupported, so
+      callers fall back to one-shot mode
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        warm_workers_per_key: int = 1,
+        max_requests_per_worker: int = 1,
+        max_idle_seconds: float = 600.0,
+        max_idle_workers: int = 8
+    ):
+        self.enabled = enabled
+        self.warm_workers_per_key = warm_workers_per_key
+        self.max_requests_per_worker = max(1, max_requests_per_worker)
+        self.max_idle_seconds = max_idle_seconds
+        self.max_idle_workers = max(0, max_idle_workers)
+
+        self._idle: dict[PoolKey, list[ClaudeCLIWorker]] = {}
+        self._busy: set[ClaudeCLIWorker] = set()
+        self._unsupported: set[PoolKey] = set()
+        self._background: set[asyncio.Task] = set()
+        self._reaper: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+        # Startup latency tracking (exponential moving average, ms)
+        self._cold_start_ema_ms: float | None = None
+        self._warm_start_ema_ms: float | None = None
+
+        self.stats: dict[str, Any] = {
+            "workers_spawned": 0,
+            "workers_recycled": 0,
+            "workers_unhealthy": 0,
+            "workers_reaped": 0,
+            "warm_hits": 0,
+            "cold_spawns": 0,
+            "fallbacks": 0,
+            "spawn_failures": 0,
+            "saved_startup_ms": 0.0
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def _check_loop(self) -> None:
+        """Workers are bound to the event loop that spawned them."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+
+        if self._loop is not None:
+            # Previous loop is gone - its workers cannot be awaited anymore
+            for workers in self._idle.values():
+                for worker in workers:
+                    _kill_quietly(worker.pid)
+                    get_process_supervisor().unregister(worker.pid)
+            for worker in self._busy:
+                _kill_quietly(worker.pid)
+                get_process_supervisor().unregister(worker.pid)
+            self._idle.clear()
+            self._busy.clear()
+            self._background.clear()
+            self._reaper = None
+
+        self._loop = loop
+        if self._reaper is None:
+            self._reaper = asyncio.create_task(self._reap_loop())
+
+    async def _spawn(self, key: PoolKey, cmd: list[str]) -> ClaudeCLIWorker | None:
+        cwd, _ = key
+        try:
+            process = await get_process_supervisor().spawn(
+                cmd,
+                agent=_agent_from_cmd(cmd),
+                mode="pool",
+                cwd=cwd,
+                stdin=asyncio.subprocess.PIPE,
+                limit=STREAM_LINE_LIMIT
+            )
+            get_process_supervisor().update(process.pid, state="idle")
+        except (OSError, ValueError) as e:
+            self.stats["spawn_failures"] += 1
+            logger.warning(f"⚠️ Claude CLI pool: spawn failed ({e}) - using one-shot mode")
+            self._unsupported.add(key)
+            return None
+
+        self.stats["workers_spawned"] += 1
+        logger.debug(f"🔥 Claude CLI pool: spawned worker {process.pid}")
+        return ClaudeCLIWorker(key, process)
+
+    def _is_healthy(self, worker: ClaudeCLIWorker) -> bool:
+        if not worker.alive:
+            return False
+        return (time.time() - worker.last_used) < self.max_idle_seconds
+
+    async def _replenish(self, key: PoolKey, cmd: list[str]) -> None:
+        while (
+            len(self._idle.get(key, [])) < self.warm_workers_per_key
+            and key not in self._unsupported
+        ):
+            worker = await self._spawn(key, cmd)
+            if worker is None:
+                return
+            self._idle.setdefault(key, []).append(worker)
+            await self._enforce_idle_cap()
+
+    def _schedule_replenish(self, key: PoolKey, cmd: list[str]) -> None:
+        if self.warm_workers_per_key <= 0:
+            return
+        task = asyncio.create_task(self._replenish(key, cmd))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _close_idle(self, workers: list[ClaudeCLIWorker]) -> None:
+        if workers:
+            self.stats["workers_reaped"] += len(workers)
+            await asyncio.gather(*(w.close(timeout=1.0) for w in workers), return_exceptions=True)
+
+    async def _enforce_idle_cap(self) -> None:
+        """Close the least recently used idle workers above max_idle_workers."""
+        idle = sorted(
+            (w for workers in self._idle.values() for w in workers),
+            key=lambda w: w.last_used
+        )
+        excess = idle[:max(0, len(idle) - self.max_idle_workers)]
+        for worker in excess:
+            self._idle[worker.key].remove(worker)
+            if not self._idle[worker.key]:
+                del self._idle[worker.key]
+        await self._close_idle(excess)
+
+    async def reap_idle(self) -> int:
+        """Close idle workers that died or were idle for max_idle_seconds."""
+        expired = []
+        for key in list(self._idle):
+            workers = self._idle[key]
+            expired += [w for w in workers if not self._is_healthy(w)]
+            workers[:] = [w for w in workers if self._is_healthy(w)]
+            if not workers:
+                del self._idle[key]
+
+        if expired:
+            logger.info(f"🧹 Claude CLI pool: closed {len(expired)} idle workers")
+        await self._close_idle(expired)
+        return len(expired)
+
+    async def _reap_loop(self) -> None:
+        interval = max(1.0, min(60.0, self.max_idle_seconds / 2))
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reap_idle()
+            except Exception as e:
+                logger.warning(f"⚠️ Claude CLI pool: reaping idle workers failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def make_key(self, cmd: list[str], cwd: str | None) -> PoolKey:
+        return (cwd, tuple(cmd))
+
+    def is_supported(self, cmd: list[str], cwd: str | None) -> bool:
+        return self.enabled and self.make_key(cmd, cwd) not in self._unsupported
+
+    async def acquire(self, cmd: list[str], cwd: str | None = None) -> ClaudeCLIWorker | None:
+        """
+        Get a worker for a streaming-mode command.
+
+        Args:
+            cmd: Streaming command (see to_streaming_command)
+            cwd: Workspace directory for the CLI
+
+        Returns:
+            Worker or None if pooling is disabled/unsupported for this key
+        """
+        if not self.enabled:
+            return None
+
+        self._check_loop()
+        key = self.make_key(cmd, cwd)
+        if key in self._unsupported:
+            return None
+
+        worker = None
+        idle = self._idle.setdefault(key, [])
+        while idle:
+            candidate = idle.pop(0)
+            if self._is_healthy(candidate):
+                worker = candidate
+                self.stats["warm_hits"] += 1
+                break
+            self.stats["workers_unhealthy"] += 1
+            await candidate.close(timeout=1.0)
+
+        if worker is None:
+            worker = await self._spawn(key, cmd)
+            if worker is None:
+                return None
+            self.stats["cold_spawns"] += 1
+
+        self._busy.add(worker)
+        get_process_supervisor().update(worker.pid, state="busy")
+        self._schedule_replenish(key, cmd)
+        return worker
+
+    async def release(self, worker: ClaudeCLIWorker, healthy: bool) -> None:
+        """Return a worker after a request; recycles it when needed."""
+        self._busy.discard(worker)
+        worker.requests_served += 1
+        worker.last_used = time.time()
+
+        if (
+            healthy
+            and worker.alive
+            and worker.requests_served < self.max_requests_per_worker
+            and self._loop is asyncio.get_running_loop()
+        ):
+            self._idle.setdefault(worker.key, []).append(worker)
+            get_process_supervisor().update(worker.pid, state="idle")
+            await self._enforce_idle_cap()
+            return
+
+        self.stats["workers_recycled"] += 1
+        # Failed/incomplete turn: no point waiting for a graceful stdin close
+        await worker.close(timeout=5.0 if healthy else 0.0)
+
+    async def mark_unsupported(self, worker: ClaudeCLIWorker) -> None:
+        """Worker died before answering - stop pooling this key."""
+        logger.warning(
+            f"⚠️ Claude CLI pool: worker {worker.pid} died before answering "
+            f"- falling back to one-shot mode for this agent"
+        )
+        self._unsupported.add(worker.key)
+        self.stats["fallbacks"] += 1
+        self._busy.discard(worker)
+        await worker.close(timeout=1.0)
+        for idle in self._idle.pop(worker.key, []):
+            await idle.close(timeout=1.0)
+
+    def record_cold_start(self, ms: float) -> None:
+        """Time to first event of a one-shot call (= CLI startup latency)."""
+        self._cold_start_ema_ms = _ema(self._cold_start_ema_ms, ms)
+
+    def record_warm_start(self, ms: float) -> None:
+        """Time to first event of a pooled call."""
+        self._warm_start_ema_ms = _ema(self._warm_start_ema_ms, ms)
+        if self._cold_start_ema_ms is not None:
+            self.stats["saved_startup_ms"] += max(0.0, self._cold_start_ema_ms - ms)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Pool statistics (for /api/v6/stats)."""
+        return {
+            **self.stats,
+            "saved_startup_ms": round(self.stats["saved_startup_ms"], 1),
+            "enabled": self.enabled,
+            "idle_workers": sum(len(w) for w in self._idle.values()),
+            "busy_workers": len(self._busy),
+            "keys": len(self._idle),
+            "unsupported_keys": len(self._unsupported),
+            "max_requests_per_worker": self.max_requests_per_worker,
+            "max_idle_workers": self.max_idle_workers,
+            "cold_start_ms": _round(self._cold_start_ema_ms),
+            "warm_start_ms": _round(self._warm_start_ema_ms)
+        }
+
+    async def shutdown(self) -> None:
+        """Stop background spawns and close all workers."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            if self._reaper.get_loop() is asyncio.get_running_loop():
+                await asyncio.gather(self._reaper, return_exceptions=True)
+            self._reaper = None
+
+        for task in list(self._background):
+            task.cancel()
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+        self._background.clear()
+
+        workers = [w for idle in self._idle.values() for w in idle] + list(self._busy)
+        self._idle.clear()
+        self._busy.clear()
+        if workers:
+            await asyncio.gather(*(w.close(timeout=2.0) for w in workers), return_exceptions=True)
+            logger.info(f"🛑 Claude CLI pool: closed {len(workers)} workers")
+
+
+def _ema(current: float | None, value: float, alpha: float = 0.3) -> float:
+    return value if current is None else alpha * value + (1 - alpha) * current
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 1) if value is not None else None
+
+
+def _kill_quietly(pid: int) -> None:
+    """Kill a worker's process group (workers run in their own session)."""
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _agent_from_cmd(cmd: list[str]) -> str:
+    """Agent name from the --agents definition (for the process registry)."""
+    try:
+        return next(iter(json.loads(cmd[cmd.index("--agents") + 1])))
+    except (ValueError, IndexError, StopIteration, json.JSONDecodeError):
+        return "unknown"
+
+
+# Global pool instance
+_pool: ClaudeCLIPool | None = None
+
+
+def get_claude_cli_pool() -> ClaudeCLIPool:
+    """Get global Claude CLI pool instance (configured via environment)."""
+    global _pool
+    if _pool is None:
+        _pool = ClaudeCLIPool(
+            enabled=os.environ.get("KI_CLAUDE_CLI_POOL", "1").lower() not in ("0", "false", "no"),
+            warm_workers_per_key=int(os.environ.get("KI_CLAUDE_CLI_POOL_WARM", "1")),
+            max_requests_per_worker=int(os.environ.get("KI_CLAUDE_CLI_POOL_MAX_REQUESTS", "1")),
+            max_idle_seconds=float(os.environ.get("KI_CLAUDE_CLI_POOL_IDLE_SECONDS", "600")),
+            max_idle_workers=int(os.environ.get("KI_CLAUDE_CLI_POOL_MAX_IDLE", "8"))
+        )
+    return _pool
+
+
+__all__ = [
+    "STREAM_LINE_LIMIT",
+    "ClaudeCLIPool",
+    "ClaudeCLIWorker",
+    "ClaudeCLIWorkerError",
+    "get_claude_cli_pool",
+    "to_streaming_command",
+]
@@ -10,6 +10,10 @@ Usage:
     llm = ClaudeCLISimple(model="claude-sonnet-4-20250514")
     response = await llm.ainvoke([HumanMessage(content="Hello")])
 
+    # Stream events while the CLI is still running
+    async for event in llm.astream([HumanMessage(content="Hello")]):
+        print(event.get("type"))
+
 Author: KI AutoAgent Team
 Python: 3.13+
 """
@@ -17,10 +21,13 @@ Python: 3.13+
 from __future__ import annotations
 
 import asyncio
+import inspect
 import json
 import logging
+import os
 import subprocess
-from typing import Any, List
+import time
+from typing import Any, AsyncIterator, List
 
 from langchain_core.messages import (
     AIMessage,
@@ -29,11 +36,51 @@ from langchain_core.messages import (
     SystemMessage,
 )
 
+from adapters.claude_cli_pool import (
+    STREAM_LINE_LIMIT,
+    ClaudeCLIPool,
+    ClaudeCLIWorker,
+    ClaudeCLIWorkerError,
+    get_claude_cli_pool,
+    to_streaming_command,
+)
+from adapters.cli_process_supervisor import (
+    ClaudeCLITimeoutError,
+    get_agent_timeout,
+    get_max_retries,
+    get_process_supervisor,
+    get_retry_budget,
+    is_transient_error,
+    retry_delay,
+)
+from adapters.llm_response_cache import (
+    LLMResponseCache,
+    get_llm_response_cache,
+    has_side_effects,
+    hash_workspace_files,
+    is_cache_enabled,
+)
+
 logger = logging.getLogger(__name__)
 
 # DEBUG_OUTPUT: Set to True to enable detailed output during development
 DEBUG_OUTPUT = True  # Set to False in production
 
+# CAPTURE_RAW_OUTPUT: Keep the raw JSONL output of every call (temp file +
+# last_raw_output + command file). Opt-in: a single architect call can produce
+# several MB. Enable per instance (capture_raw_output=True) or globally via env.
+CAPTURE_RAW_OUTPUT = os.environ.get("KI_CLAUDE_CLI_CAPTURE_RAW", "").lower() in ("1", "true", "yes")
+
+
+def _is_result_line(line: str) -> bool:
+    """True if a stream-json line is the final "result" event of a turn."""
+    if '"result"' not in line:
+        return False
+    try:
+        return json.loads(line).get("type") == "result"
+    except (json.JSONDecodeError, AttributeError):
+        return False
+
 
 class ClaudeCLISimple:
     """
@@ -55,14 +102,21 @@ class ClaudeCLISimple:
         permission_mode: str = "acceptEdits",
         allowed_tools: list[str] | None = None,
         hitl_callback: Any = None,
-        workspace_path: str | None = None
+        workspace_path: str | None = None,
+        capture_raw_output: bool | None = None,
+        use_pool: bool = True,
+        response_cache: bool | None = None,
+        event_listener: Any = None,
+        timeout: float | None = None,
+        max_retries: int | None = None,
+        retry_budget: float | None = None
     ):
         """
         Initialize Claude CLI wrapper.
 
         Args:
             model: Claude model name (default: claude-sonnet-4-20250514 = Sonnet 4.5)
-            temperature: Sampling temperature (0-1)
+            temperature: Sampling temperature (0-1) - informational, the CLI has no such option
             max_tokens: Maximum tokens to generate
             cli_path: Path to claude CLI binary
             agent_name: Name of the agent (used in --agents parameter)
@@ -76,6 +130,20 @@ class ClaudeCLISimple:
             workspace_path: Working directory for Claude CLI subprocess
                           CRITICAL: Must be set to target workspace to avoid confusion!
                           Bug found 2025-10-11: Without this, CLI runs from dev repo
+            capture_raw_output: Keep raw JSONL output (temp file + last_raw_output).
+                          Default: CAPTURE_RAW_OUTPUT (env KI_CLAUDE_CLI_CAPTURE_RAW)
+            use_pool: Use warm pooled CLI workers (see adapters/claude_cli_pool.py).
+                          Falls back to one-shot mode automatically.
+            response_cache: Use the content-addressed response cache
+                          (see adapters/llm_response_cache.py). Default: KI_LLM_CACHE
+            event_listener: Called with every streamed event (sync or async)
+                          Signature: def(event: dict) -> None
+                          Used by Codesmith for early file materialization
+            timeout: Wall-clock timeout per CLI call in seconds
+                          Default: per-agent (see adapters/cli_process_supervisor.py)
+            max_retries: Retries for transient failures (default: KI_CLAUDE_CLI_MAX_RETRIES)
+            retry_budget: No retry once a call ran this many seconds
+                          (default: KI_CLAUDE_CLI_RETRY_BUDGET)
         """
         self.model = model
         self.temperature = temperature
@@ -89,6 +157,15 @@ class ClaudeCLISimple:
         self.allowed_tools = allowed_tools or ["Read", "Edit", "Bash"]
         self.hitl_callback = hitl_callback
         self.workspace_path = workspace_path  # 🎯 FIX: Set CWD for subprocess
+        self.capture_raw_output = (
+            CAPTURE_RAW_OUTPUT if capture_raw_output is None else capture_raw_output
+        )
+        self.use_pool = use_pool
+        self.response_cache = is_cache_enabled() if response_cache is None else response_cache
+        self.event_listener = event_listener
+        self.timeout = timeout if timeout is not None else get_agent_timeout(agent_name)
+        self.max_retries = max_retries if max_retries is not None else get_max_retries()
+        self.retry_budget = retry_budget if retry_budget is not None else get_retry_budget()
 
         # HITL Debug Info (captured during execution)
         self.last_command: list[str] | None = None
@@ -261,9 +338,12 @@ class ClaudeCLISimple:
         logger.info(f"✅ Extracted {len(files)} files from {len(events)} Claude CLI events")
         return files
 
-    async def _call_cli(self, messages: List[BaseMessage]) -> dict[str, Any]:
+    def _build_cli_command(
+        self,
+        messages: List[BaseMessage]
+    ) -> tuple[list[str], str, str, str]:
         """
-        Call Claude CLI with stream-json format to avoid truncation.
+        Build the Claude CLI command for a list of messages.
 
         Note: NOT using --agents parameter (causes timeouts in CLI 2.0.13)
         Instead: Format as "System: ...\n\nHuman: ..." and use --print
@@ -272,14 +352,8 @@ class ClaudeCLISimple:
             messages: List of LangChain messages
 
         Returns:
-            Parsed JSON response from CLI (last event from JSONL)
-
-        Raises:
-            RuntimeError: If CLI call fails
+            Tuple of (cmd, system_prompt, user_prompt, combined_prompt)
         """
-        import time
-        start_time = time.time()
-
         # Extract system prompt (agent instructions) and user prompt (task)
         system_prompt, user_prompt = self._extract_system_and_user_prompts(messages)
 
@@ -300,11 +374,6 @@ NO explanations!"""
             agent_prompt = "You are a helpful assistant."
             combined_prompt = f"{system_prompt}\n\n{user_prompt}"
 
-        # HITL: Capture prompts
-        self.last_system_prompt = system_prompt
-        self.last_user_prompt = user_prompt
-        self.last_combined_prompt = combined_prompt
-
         # Build agent definition
         agent_definition = {
             self.agent_name: {
@@ -327,10 +396,11 @@ NO explanations!"""
             "-p", combined_prompt             # System + User COMBINED!
         ]
 
-        # HITL: Capture command
-        self.last_command = cmd.copy()
+        return cmd, system_prompt, user_prompt, combined_prompt
 
-        # LOG COMPLETE COMMAND FOR USER
+    def _save_command_file(self, cmd: list[str]) -> None:
+        """Write the complete CLI command to /tmp for manual re-runs (raw capture only)."""
+        agents_json = cmd[cmd.index("--agents") + 1]
         with open("/tmp/claude_cli_command.txt", "w") as f:
             f.write(f"# Complete Claude CLI command\n\n")
             f.write(f"# Command as list:\n{cmd}\n\n")
@@ -339,12 +409,105 @@ NO explanations!"""
             f.write(f'  --model {self.model} \\\n')
             f.write(f'  --permission-mode {self.permission_mode} \\\n')
             f.write(f'  --allowedTools "{" ".join(self.allowed_tools)}" \\\n')
-            f.write(f"  --agents '{json.dumps(agent_definition)}' \\\n")
+            f.write(f"  --agents '{agents_json}' \\\n")
             f.write(f'  --output-format stream-json \\\n')
             f.write(f'  --verbose \\\n')
             f.write(f'  -p "$(cat /tmp/claude_user_prompt.txt)"\n')
         logger.info(f"📝 Complete command saved to /tmp/claude_cli_command.txt")
 
+    def _parse_event_line(self, line_number: int, line: str) -> dict | None:
+        """
+        Parse a single JSONL line from the CLI.
+
+        Args:
+            line_number: 1-based line number (for logging)
+            line: Raw line without trailing newline
+
+        Returns:
+            Parsed event or None if the line is empty or not valid JSON
+        """
+        if not line.strip():
+            return None
+
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError as e:
+            if DEBUG_OUTPUT:
+                print(f"  [{line_number}] ❌ JSON PARSE ERROR")
+                print(f"        Length: {len(line)} chars")
+                print(f"        Preview: {line[:200]}...")
+            logger.error(f"❌ JSON parse error on line {line_number}: {e}")
+            logger.error(f"   Line length: {len(line)} chars")
+            logger.error(f"   First 200: {line[:200]}")
+            logger.error(f"   Last 200: {line[-200:]}")
+            # Skip - might be incomplete but the remaining events are still usable
+            return None
+
+        # Show event details
+        if DEBUG_OUTPUT:
+            event_type = event.get('type', 'unknown')
+            event_subtype = event.get('subtype', '')
+
+            if event_type == "system":
+                print(f"  [{line_number}] 🔧 SYSTEM: {event_subtype}")
+            elif event_type == "assistant":
+                message = event.get('message', {})
+                content_preview = str(message)[:100]
+                print(f"  [{line_number}] 🤖 ASSISTANT: {content_preview}...")
+            elif event_type == "user":
+                print(f"  [{line_number}] 👤 USER")
+            elif event_type == "result":
+                result_preview = str(event.get('result', ''))[:100]
+                print(f"  [{line_number}] ✅ RESULT: {result_preview}...")
+            else:
+                print(f"  [{line_number}] ❓ {event_type}: {str(event)[:100]}...")
+
+        logger.debug(f"✅ Parsed line {line_number}: type={event.get('type')}")
+        return event
+
+    async def _send_hitl(self, payload: dict[str, Any], stage: str) -> None:
+        """Send debug info to the HITL callback (never fails the call)."""
+        if not self.hitl_callback:
+            return
+
+        try:
+            await self.hitl_callback(payload)
+        except Exception as e:
+            logger.warning(f"HITL callback failed ({stage}): {e}")
+
+    async def astream(self, messages: List[BaseMessage]) -> AsyncIterator[dict[str, Any]]:
+        """
+        Call Claude CLI and yield stream-json events as they arrive.
+
+        stdout is read line by line, so every event is parsed, forwarded to
+        the HITL callback (type "claude_cli_event") and yielded while the CLI
+        is still running. The raw output is only kept (last_raw_output and a
+        temp file) when capture_raw_output is enabled.
+
+        Args:
+            messages: List of LangChain messages
+
+        Yields:
+            Parsed JSONL events in CLI order (the last one is the final result)
+
+        Raises:
+            RuntimeError: If CLI call fails or returns no valid events
+        """
+        start_time = time.time()
+
+        cmd, system_prompt, user_prompt, combined_prompt = self._build_cli_command(messages)
+
+        # HITL: Capture prompts and command
+        self.last_system_prompt = system_prompt
+        self.last_user_prompt = user_prompt
+        self.last_combined_prompt = combined_prompt
+        self.last_command = cmd.copy()
+        self.last_raw_output = None
+        self.last_events = None
+
+        if self.capture_raw_output:
+            self._save_command_file(cmd)
+
         # DEBUG: Show exact command
         if DEBUG_OUTPUT:
             print("\n" + "="*80)
@@ -362,130 +525,72 @@ NO explanations!"""
         logger.debug(f"Calling Claude CLI: --agents {self.agent_name} + stream-json + verbose")
 
         # HITL: Send debug info BEFORE execution
-        if self.hitl_callback:
-            try:
-                await self.hitl_callback({
-                    "type": "claude_cli_start",
-                    "agent": self.agent_name,
-                    "model": self.model,
-                    "command": cmd,
-                    "system_prompt": system_prompt,
-                    "system_prompt_length": len(system_prompt),
-                    "user_prompt": user_prompt,
-                    "user_prompt_length": len(user_prompt),
-                    "combined_prompt_length": len(combined_prompt),
-                    "tools": self.agent_tools,
-                    "permission_mode": self.permission_mode,
-                    "timestamp": start_time
-                })
-            except Exception as e:
-                logger.warning(f"HITL callback failed (start): {e}")
+        await self._send_hitl({
+            "type": "claude_cli_start",
+            "agent": self.agent_name,
+            "model": self.model,
+            "command": cmd,
+            "system_prompt": system_prompt,
+            "system_prompt_length": len(system_prompt),
+            "user_prompt": user_prompt,
+            "user_prompt_length": len(user_prompt),
+            "combined_prompt_length": len(combined_prompt),
+            "tools": self.agent_tools,
+            "permission_mode": self.permission_mode,
+            "timestamp": start_time
+        }, "start")
+
+        raw_lines: list[str] | None = [] if self.capture_raw_output else None
+        events: list[dict] = []
+        output_length = 0
 
         try:
-            # Run CLI command
-            if DEBUG_OUTPUT:
-                print("⏳ Starting subprocess...")
-                if self.workspace_path:
-                    print(f"   CWD: {self.workspace_path}")
+            # Parse JSONL (JSON Lines) incrementally - each line is a separate event
+            line_number = 0
+            deadline = time.monotonic() + self.timeout
+            async for line in self._iter_output_lines(cmd, combined_prompt, deadline):
+                line_number += 1
+                output_length += len(line)
 
-            # 🎯 FIX (2025-10-11): Set correct working directory!
-            # Bug: Without cwd, subprocess runs from wherever Python started
-            # → Claude finds old test artifacts in dev repo
-            # → Gets confused, crashes after 5 minutes
-            # Solution: Explicit CWD to target workspace
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                stdin=asyncio.subprocess.DEVNULL,  # Prevent CLI from waiting on stdin
-                cwd=self.workspace_path  # 🎯 USE WORKSPACE AS WORKING DIRECTORY!
-            )
-            if DEBUG_OUTPUT:
-                print(f"✅ Process started, PID: {process.pid}")
+                if raw_lines is not None:
+                    raw_lines.append(line)
 
-            if DEBUG_OUTPUT:
-                print("⏳ Waiting for response...")
-            stdout, stderr = await process.communicate()
-            if DEBUG_OUTPUT:
-                print(f"✅ Process completed, returncode: {process.returncode}")
+                event = self._parse_event_line(line_number, line)
+                if event is None:
+                    continue
 
-            if process.returncode != 0:
-                error_msg = stderr.decode() if stderr else "Unknown error"
-                if DEBUG_OUTPUT:
-                    print(f"❌ ERROR: {error_msg[:500]}")
-                raise RuntimeError(f"Claude CLI failed: {error_msg}")
+                events.append(event)
 
-            # Decode output (stream-json format = JSONL)
-            output_str = stdout.decode().strip()
+                # HITL/WebSocket: Forward event while the CLI is still working
+                await self._send_hitl({
+                    "type": "claude_cli_event",
+                    "agent": self.agent_name,
+                    "model": self.model,
+                    "index": len(events) - 1,
+                    "event_type": event.get("type"),
+                    "event_subtype": event.get("subtype"),
+                    "event": event,
+                    "elapsed_ms": (time.time() - start_time) * 1000
+                }, "event")
+
+                if self.event_listener:
+                    try:
+                        listener_result = self.event_listener(event)
+                        if inspect.isawaitable(listener_result):
+                            await listener_result
+                    except Exception as e:
+                        logger.warning(f"Event listener failed: {e}")
 
-            if DEBUG_OUTPUT:
-                print(f"\n📦 Received {len(output_str)} chars of output")
-            logger.debug(f"CLI returned {len(output_str)} chars")
+                yield event
 
-            # DEBUG: Save raw output to file for inspection
-            import tempfile
-            debug_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='_claude_raw.jsonl')
-            debug_file.write(output_str)
-            debug_file.close()
             if DEBUG_OUTPUT:
-                print(f"💾 Raw output saved to: {debug_file.name}")
-            logger.info(f"🔍 DEBUG: Raw CLI output saved to: {debug_file.name}")
+                print(f"✅ Parsed {len(events)} events total ({output_length} chars)\n")
 
-            # Parse JSONL (JSON Lines) - each line is a separate event
-            if not output_str:
+            if output_length == 0:
                 if DEBUG_OUTPUT:
                     print("❌ ERROR: Empty response!")
                 raise RuntimeError("Empty response from Claude CLI")
 
-            lines = output_str.split('\n')
-            events = []
-
-            if DEBUG_OUTPUT:
-                print(f"\n📊 Parsing {len(lines)} lines...")
-                print("="*80)
-
-            for i, line in enumerate(lines, 1):
-                if line.strip():
-                    try:
-                        event = json.loads(line)
-                        events.append(event)
-
-                        # Show event details
-                        if DEBUG_OUTPUT:
-                            event_type = event.get('type', 'unknown')
-                            event_subtype = event.get('subtype', '')
-
-                            if event_type == "system":
-                                print(f"  [{i}] 🔧 SYSTEM: {event_subtype}")
-                            elif event_type == "assistant":
-                                message = event.get('message', {})
-                                content_preview = str(message)[:100]
-                                print(f"  [{i}] 🤖 ASSISTANT: {content_preview}...")
-                            elif event_type == "user":
-                                print(f"  [{i}] 👤 USER")
-                            elif event_type == "result":
-                                result_preview = str(event.get('result', ''))[:100]
-                                print(f"  [{i}] ✅ RESULT: {result_preview}...")
-                            else:
-                                print(f"  [{i}] ❓ {event_type}: {str(event)[:100]}...")
-
-                        logger.debug(f"✅ Parsed line {i}: type={event.get('type')}")
-                    except json.JSONDecodeError as e:
-                        if DEBUG_OUTPUT:
-                            print(f"  [{i}] ❌ JSON PARSE ERROR")
-                            print(f"        Length: {len(line)} chars")
-                            print(f"        Preview: {line[:200]}...")
-                        logger.error(f"❌ JSON parse error on line {i}: {e}")
-                        logger.error(f"   Line length: {len(line)} chars")
-                        logger.error(f"   First 200: {line[:200]}")
-                        logger.error(f"   Last 200: {line[-200:]}")
-                        # Try to parse anyway - might be incomplete but salvageable
-                        continue
-
-            if DEBUG_OUTPUT:
-                print("="*80)
-                print(f"✅ Parsed {len(events)} events total\n")
-
             if not events:
                 if DEBUG_OUTPUT:
                     print("❌ ERROR: No valid events!")
@@ -496,37 +601,44 @@ NO explanations!"""
 
             logger.debug(f"Parsed {len(events)} events, final type: {final_event.get('type')}")
 
+            # DEBUG: Save raw output to file for inspection (opt-in)
+            raw_output = None
+            if raw_lines is not None:
+                import tempfile
+                raw_output = "\n".join(raw_lines)
+                debug_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='_claude_raw.jsonl')
+                debug_file.write(raw_output)
+                debug_file.close()
+                if DEBUG_OUTPUT:
+                    print(f"💾 Raw output saved to: {debug_file.name}")
+                logger.info(f"🔍 DEBUG: Raw CLI output saved to: {debug_file.name}")
+
             # Calculate duration
             end_time = time.time()
             duration_ms = (end_time - start_time) * 1000
 
             # HITL: Capture execution info
-            self.last_raw_output = output_str
+            self.last_raw_output = raw_output
             self.last_events = events
             self.last_duration_ms = duration_ms
             self.last_error = None
 
             # HITL: Send debug info AFTER successful execution
-            if self.hitl_callback:
-                try:
-                    await self.hitl_callback({
-                        "type": "claude_cli_complete",
-                        "agent": self.agent_name,
-                        "model": self.model,
-                        "duration_ms": duration_ms,
-                        "output_length": len(output_str),
-                        "raw_output": output_str,
-                        "events_count": len(events),
-                        "events": events,
-                        "final_event_type": final_event.get('type'),
-                        "result_preview": str(final_event.get('result', ''))[:500],
-                        "success": True,
-                        "timestamp": end_time
-                    })
-                except Exception as e:
-                    logger.warning(f"HITL callback failed (complete): {e}")
-
-            return final_event
+            # Events were already streamed as claude_cli_event - only resend with raw capture
+            await self._send_hitl({
+                "type": "claude_cli_complete",
+                "agent": self.agent_name,
+                "model": self.model,
+                "duration_ms": duration_ms,
+                "output_length": output_length,
+                "raw_output": raw_output,
+                "events_count": len(events),
+                "events": events if raw_output is not None else None,
+                "final_event_type": final_event.get('type'),
+                "result_preview": str(final_event.get('result', ''))[:500],
+                "success": True,
+                "timestamp": end_time
+            }, "complete")
 
         except Exception as e:
             # Calculate duration even on error
@@ -538,24 +650,237 @@ NO explanations!"""
             self.last_duration_ms = duration_ms
 
             # HITL: Send debug info AFTER error
-            if self.hitl_callback:
-                try:
-                    await self.hitl_callback({
-                        "type": "claude_cli_error",
-                        "agent": self.agent_name,
-                        "model": self.model,
-                        "duration_ms": duration_ms,
-                        "error": str(e),
-                        "error_type": type(e).__name__,
-                        "success": False,
-                        "timestamp": end_time
-                    })
-                except Exception as callback_error:
-                    logger.warning(f"HITL callback failed (error): {callback_error}")
+            await self._send_hitl({
+                "type": "claude_cli_error",
+                "agent": self.agent_name,
+                "model": self.model,
+                "duration_ms": duration_ms,
+                "error": str(e),
+                "error_type": type(e).__name__,
+                "success": False,
+                "timestamp": end_time
+            }, "error")
 
             logger.error(f"Claude CLI error: {e}", exc_info=True)
             raise
 
+    async def _iter_output_lines(
+        self,
+        cmd: list[str],
+        combined_prompt: str,
+        deadline: float
+    ) -> AsyncIterator[str]:
+        """
+        Yield stdout lines of one CLI call: from a warm pooled worker if
+        possible, otherwise from a one-shot subprocess.
+
+        Falls back to one-shot mode transparently if the pooled worker dies
+        before producing any output (e.g. CLI without streaming input).
+
+        Raises:
+            ClaudeCLITimeoutError: If the call is not done by deadline (time.monotonic())
+        """
+        pool = get_claude_cli_pool() if self.use_pool else None
+        streaming_cmd = to_streaming_command(cmd)
+
+        if pool is not None and pool.is_supported(streaming_cmd, self.workspace_path):
+            worker = await pool.acquire(streaming_cmd, cwd=self.workspace_path)
+            if worker is not None:
+                lines_yielded = 0
+                try:
+                    async for line in self._iter_worker_lines(pool, worker, combined_prompt, deadline):
+                        lines_yielded += 1
+                        yield line
+                    return
+                except ClaudeCLIWorkerError:
+                    if lines_yielded:
+                        raise
+                    await pool.mark_unsupported(worker)
+
+        async for line in self._iter_oneshot_lines(cmd, pool, deadline):
+            yield line
+
+    def _remaining(self, deadline: float) -> float:
+        """Seconds left until deadline; raises ClaudeCLITimeoutError when exceeded."""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise self._timeout_error()
+        return remaining
+
+    def _timeout_error(self) -> ClaudeCLITimeoutError:
+        get_process_supervisor().record_timeout()
+        logger.error(f"⏱️ Claude CLI ({self.agent_name}) timed out after {self.timeout:.0f}s")
+        return ClaudeCLITimeoutError(
+            f"Claude CLI ({self.agent_name}) timed out after {self.timeout:.0f}s"
+        )
+
+    async def _iter_worker_lines(
+        self,
+        pool: ClaudeCLIPool,
+        worker: ClaudeCLIWorker,
+        combined_prompt: str,
+        deadline: float
+    ) -> AsyncIterator[str]:
+        """Send the prompt to a pooled worker and yield lines until the "result" event."""
+        if DEBUG_OUTPUT:
+            print(f"♻️  Using warm CLI worker, PID: {worker.pid}")
+            print("⏳ Streaming events...")
+            print("="*80)
+
+        turn_complete = False
+        try:
+            sent_at = time.time()
+            await worker.send(combined_prompt)
+
+            first_line = True
+            while not turn_complete:
+                try:
+                    raw_line = await worker.readline(timeout=self._remaining(deadline))
+                except ClaudeCLITimeoutError:
+                    raise self._timeout_error() from None
+                line = raw_line.decode().rstrip("\n")
+                if first_line:
+                    pool.record_warm_start((time.time() - sent_at) * 1000)
+                    first_line = False
+                # Worker stays alive after a turn - the result event ends it
+                turn_complete = _is_result_line(line)
+                yield line
+        finally:
+            # Incomplete turn (timeout, error, consumer stopped) → worker is terminated
+            await pool.release(worker, healthy=turn_complete)
+
+    async def _iter_oneshot_lines(
+        self,
+        cmd: list[str],
+        pool: ClaudeCLIPool | None,
+        deadline: float
+    ) -> AsyncIterator[str]:
+        """Run a fresh CLI subprocess (registered with the supervisor) and yield its stdout lines."""
+        supervisor = get_process_supervisor()
+
+        process = None
+        stderr_task = None
+        try:
+            if DEBUG_OUTPUT:
+                print("⏳ Starting subprocess...")
+                if self.workspace_path:
+                    print(f"   CWD: {self.workspace_path}")
+
+            # 🎯 FIX (2025-10-11): Set correct working directory!
+            # Bug: Without cwd, subprocess runs from wherever Python started
+            # → Claude finds old test artifacts in dev repo
+            # → Gets confused, crashes after 5 minutes
+            # Solution: Explicit CWD to target workspace
+            spawned_at = time.time()
+            process = await supervisor.spawn(
+                cmd,
+                agent=self.agent_name,
+                mode="oneshot",
+                stdin=asyncio.subprocess.DEVNULL,  # Prevent CLI from waiting on stdin
+                cwd=self.workspace_path,  # 🎯 USE WORKSPACE AS WORKING DIRECTORY!
+                limit=STREAM_LINE_LIMIT,  # The final "result" event is one (long) line
+                timeout=self.timeout
+            )
+            if DEBUG_OUTPUT:
+                print(f"✅ Process started, PID: {process.pid}")
+                print("⏳ Streaming events...")
+                print("="*80)
+
+            # Drain stderr concurrently - a full stderr pipe would block the CLI
+            stderr_task = asyncio.create_task(process.stderr.read())
+
+            first_line = True
+            while True:
+                try:
+                    raw_line = await asyncio.wait_for(
+                        process.stdout.readline(), timeout=self._remaining(deadline)
+                    )
+                except asyncio.TimeoutError:
+                    raise self._timeout_error() from None
+                if not raw_line:
+                    break
+                if first_line and pool is not None:
+                    pool.record_cold_start((time.time() - spawned_at) * 1000)
+                first_line = False
+                yield raw_line.decode().rstrip("\n")
+
+            try:
+                returncode = await asyncio.wait_for(process.wait(), timeout=self._remaining(deadline))
+                stderr = await stderr_task
+            except asyncio.TimeoutError:
+                raise self._timeout_error() from None
+
+            if DEBUG_OUTPUT:
+                print("="*80)
+                print(f"✅ Process completed, returncode: {returncode}")
+
+            if returncode != 0:
+                error_msg = stderr.decode() if stderr else "Unknown error"
+                if DEBUG_OUTPUT:
+                    print(f"❌ ERROR: {error_msg[:500]}")
+                raise RuntimeError(f"Claude CLI failed: {error_msg}")
+
+        finally:
+            # Consumer stopped early, timeout or error - SIGTERM → SIGKILL the
+            # process group (also reaps leftover children) and unregister it
+            if process is not None:
+                await supervisor.terminate(process)
+            if stderr_task is not None and not stderr_task.done():
+                stderr_task.cancel()
+
+    async def _call_cli(self, messages: List[BaseMessage]) -> dict[str, Any]:
+        """
+        Call Claude CLI with stream-json format to avoid truncation.
+
+        Consumes astream() and returns the final event. Transient failures
+        (timeouts, dead workers, overload/network errors) are retried with
+        jittered exponential backoff, up to max_retries times - unless the
+        failed attempt already ran a file-modifying tool (a retry would
+        repeat its edits) or the call exceeded retry_budget seconds.
+
+        Args:
+            messages: List of LangChain messages
+
+        Returns:
+            Parsed JSON response from CLI (last event from JSONL)
+
+        Raises:
+            RuntimeError: If CLI call fails
+        """
+        attempt = 0
+        started = time.monotonic()
+        while True:
+            events: list[dict[str, Any]] = []
+            try:
+                final_event: dict[str, Any] = {}
+                async for event in self.astream(messages):
+                    events.append(event)
+                    final_event = event
+                return final_event
+            except Exception as e:
+                if attempt >= self.max_retries or not is_transient_error(e):
+                    raise
+                if has_side_effects(events):
+                    logger.warning(
+                        f"⚠️ Claude CLI ({self.agent_name}) failed after modifying files - not retried: {e}"
+                    )
+                    raise
+
+                delay = retry_delay(attempt)
+                if time.monotonic() - started + delay > self.retry_budget:
+                    logger.warning(
+                        f"⚠️ Claude CLI ({self.agent_name}) retry budget of {self.retry_budget:.0f}s "
+                        f"exhausted - not retried: {e}"
+                    )
+                    raise
+                attempt += 1
+                get_process_supervisor().record_retry()
+                logger.warning(
+                    f"🔁 Claude CLI ({self.agent_name}) transient failure: {e} "
+                    f"- retry {attempt}/{self.max_retries} in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
     async def ainvoke(
         self,
         messages: List[BaseMessage],
@@ -571,6 +896,21 @@ NO explanations!"""
         Returns:
             AIMessage with response
         """
+        # Response cache (opt-in). The CLI has no temperature option, so
+        # enabling it means replaying the first answer to an identical call.
+        cache = None
+        cache_key = None
+        if self.response_cache:
+            cache = get_llm_response_cache(self.workspace_path)
+            cache_key = await self._response_cache_key(cache, messages)
+            cached = await asyncio.to_thread(cache.get, cache_key, self.agent_name)
+            if cached is not None:
+                self.last_events = cached.get("events", [])
+                self.last_raw_output = None
+                self.last_duration_ms = 0.0
+                self.last_error = None
+                return AIMessage(content=cached["content"])
+
         # Call CLI with messages (will extract system/user prompts internally)
         response = await self._call_cli(messages)
 
@@ -581,9 +921,43 @@ NO explanations!"""
 
         content = response.get("result", "")
 
+        if cache_key is not None:
+            if has_side_effects(self.last_events):
+                # Replaying this response would skip the file edits it made
+                cache.record_skip(self.agent_name, "file-modifying tool use")
+            else:
+                await asyncio.to_thread(
+                    cache.put, cache_key, {"content": content, "events": self.last_events}, self.agent_name
+                )
+
         # Return AI message
         return AIMessage(content=content)
 
+    async def _response_cache_key(self, cache: LLMResponseCache, messages: List[BaseMessage]) -> str:
+        """
+        Cache key for a CLI call.
+
+        Built from the command the call runs (model, permission mode,
+        allowed tools, agent definition - no temperature, the CLI has no
+        such option). The CLI agent can read any workspace file with its
+        tools, so the content hashes of all workspace files are part of
+        the key.
+        """
+        cmd, system_prompt, user_prompt, _ = self._build_cli_command(messages)
+        file_hashes = None
+        if self.workspace_path and os.path.isdir(self.workspace_path):
+            file_hashes = await asyncio.to_thread(hash_workspace_files, self.workspace_path)
+
+        return cache.make_key(
+            self.model,
+            None,
+            system_prompt,
+            user_prompt,
+            file_hashes,
+            agent=self.agent_name,
+            command=cmd[1:-1]  # Without the CLI path and the prompt (both above)
+        )
+
     def _call_cli_sync(self, messages: List[BaseMessage]) -> dict[str, Any]:
         """
         Call Claude CLI synchronously with stream-json format.
@@ -633,19 +1007,21 @@ NO explanations!"""
                 capture_output=True,
                 text=True,
                 check=True,
-                cwd=self.workspace_path  # 🎯 USE WORKSPACE AS WORKING DIRECTORY!
+                cwd=self.workspace_path,  # 🎯 USE WORKSPACE AS WORKING DIRECTORY!
+                timeout=self.timeout  # Child is killed on timeout
             )
 
             # Parse JSONL (stream-json format)
             output_str = result.stdout.strip()
             logger.debug(f"CLI returned {len(output_str)} chars")
 
-            # DEBUG: Save raw output to file for inspection
-            import tempfile
-            debug_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='_claude_raw_sync.jsonl')
-            debug_file.write(output_str)
-            debug_file.close()
-            logger.info(f"🔍 DEBUG: Raw CLI output saved to: {debug_file.name}")
+            # DEBUG: Save raw output to file for inspection (opt-in)
+            if self.capture_raw_output:
+                import tempfile
+                debug_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='_claude_raw_sync.jsonl')
+                debug_file.write(output_str)
+                debug_file.close()
+                logger.info(f"🔍 DEBUG: Raw CLI output saved to: {debug_file.name}")
 
             if not output_str:
                 raise RuntimeError("Empty response from Claude CLI")
@@ -679,6 +1055,11 @@ NO explanations!"""
         except subprocess.CalledProcessError as e:
             error_msg = e.stderr if e.stderr else "Unknown error"
             raise RuntimeError(f"Claude CLI failed: {error_msg}")
+        except subprocess.TimeoutExpired:
+            get_process_supervisor().record_timeout()
+            raise ClaudeCLITimeoutError(
+                f"Claude CLI ({self.agent_name}) timed out after {self.timeout:.0f}s"
+            ) from None
         except Exception as e:
             logger.error(f"Claude CLI error: {e}", exc_info=True)
             raise
@@ -0,0 +1,278 @@
+"""
+Claude CLI Process Supervisor
+
+Lifecycle management for every Claude CLI subprocess (one-shot and pooled):
+
+- Per-agent wall-clock timeouts (a hung CLI must not hold a workflow slot
+  forever - see the 5-minute crash reports from 2025-10-11)
+- Graceful termination: SIGTERM to the whole process group, SIGKILL after
+  a grace period (the CLI spawns Node/MCP/Bash children)
+- Retry with jittered exponential backoff for transient transport
+  failures (overload, rate limit, connection errors, timeouts) - never
+  after the call already ran a file-modifying tool, and only while the
+  call's total time stays within the retry budget
+- Live registry of running CLI processes (for /api/v6/stats)
+- shutdown(): terminates everything still registered (server lifespan)
+
+Configuration (environment):
+    KI_CLAUDE_CLI_TIMEOUT=<seconds>             default for all agents
+    KI_CLAUDE_CLI_TIMEOUT_<AGENT>=<seconds>     e.g. KI_CLAUDE_CLI_TIMEOUT_CODESMITH=900
+    KI_CLAUDE_CLI_MAX_RETRIES=<n>               default 2
+    KI_CLAUDE_CLI_RETRY_BUDGET=<seconds>        no retry after this much time, default 300
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import re
+import signal
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Wall-clock timeouts per agent (seconds)
+DEFAULT_TIMEOUT = 600.0
+AGENT_TIMEOUTS: dict[str, float] = {
+    "research": 300.0,
+    "architect": 600.0,
+    "codesmith": 900.0,
+    "fixer": 600.0,
+}
+
+# SIGTERM → SIGKILL grace period (seconds)
+TERMINATE_GRACE = 5.0
+
+# Retry with full jitter: sleep uniform(0, min(cap, base * 2**attempt))
+DEFAULT_MAX_RETRIES = 2
+RETRY_BASE_DELAY = 2.0
+RETRY_MAX_DELAY = 30.0
+
+# A call that already ran this long is not retried (a timed-out codesmith
+# call must not cost 3 x 900s)
+DEFAULT_RETRY_BUDGET = 300.0
+
+# stderr/error fragments of transport failures (HTTP status codes only in
+# an API error/status context, never bare numbers)
+TRANSIENT_ERROR_PATTERN = re.compile(
+    r"overloaded|rate.?limit|econnreset|etimedout|econnrefused|enotfound|socket hang up"
+    r"|network error|(?:api error|status(?: code)?|http)[:\s]+(?:429|500|502|503|504|529)\b",
+    re.IGNORECASE
+)
+
+
+class ClaudeCLITimeoutError(RuntimeError):
+    """Raised when a CLI call exceeds its wall-clock timeout."""
+
+
+def get_agent_timeout(agent_name: str) -> float:
+    """Timeout for an agent: env override > per-agent default > global default."""
+    env_value = os.environ.get(f"KI_CLAUDE_CLI_TIMEOUT_{agent_name.upper()}") or os.environ.get("KI_CLAUDE_CLI_TIMEOUT")
+    if env_value:
+        return float(env_value)
+    return AGENT_TIMEOUTS.get(agent_name, DEFAULT_TIMEOUT)
+
+
+def get_max_retries() -> int:
+    return int(os.environ.get("KI_CLAUDE_CLI_MAX_RETRIES", DEFAULT_MAX_RETRIES))
+
+
+def get_retry_budget() -> float:
+    return float(os.environ.get("KI_CLAUDE_CLI_RETRY_BUDGET", DEFAULT_RETRY_BUDGET))
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Timeouts, dead pooled workers and known transport/overload errors."""
+    # Local import: claude_cli_pool imports this module
+    from adapters.claude_cli_pool import ClaudeCLIWorkerError
+
+    if isinstance(error, (ClaudeCLITimeoutError, ClaudeCLIWorkerError)):
+        return True
+    return bool(TRANSIENT_ERROR_PATTERN.search(str(error)))
+
+
+def retry_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for retry number `attempt` (0-based)."""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+class ProcessSupervisor:
+    """Registry and lifecycle control for Claude CLI subprocesses."""
+
+    def __init__(self, terminate_grace: float = TERMINATE_GRACE):
+        self.terminate_grace = terminate_grace
+        self._running: dict[int, dict[str, Any]] = {}
+        self._processes: dict[int, asyncio.subprocess.Process] = {}
+        self.stats: dict[str, int] = {
+            "spawned": 0,
+            "timeouts": 0,
+            "retries": 0,
+            "terminated": 0,
+            "killed": 0
+        }
+
+    async def spawn(
+        self,
+        cmd: list[str],
+        *,
+        agent: str,
+        mode: str,
+        cwd: str | None = None,
+        stdin: int | None = asyncio.subprocess.DEVNULL,
+        limit: int | None = None,
+        timeout: float | None = None
+    ) -> asyncio.subprocess.Process:
+        """
+        Start a CLI process in its own process group and register it.
+
+        Args:
+            cmd: Command to run
+            agent: Agent name (for the registry)
+            mode: "oneshot" or "pool"
+            cwd: Working directory
+            stdin: stdin mode (DEVNULL for one-shot, PIPE for pooled workers)
+            limit: StreamReader line limit
+            timeout: Wall-clock timeout (registry info only; callers enforce it)
+        """
+        kwargs: dict[str, Any] = {}
+        if limit is not None:
+            kwargs["limit"] = limit
+
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=stdin,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,
+            start_new_session=True,  # Own process group → children are terminated too
+            **kwargs
+        )
+
+        self.stats["spawned"] += 1
+        self._processes[process.pid] = process
+        self._running[process.pid] = {
+            "pid": process.pid,
+            "agent": agent,
+            "mode": mode,
+            "cwd": cwd,
+            "started_at": time.time(),
+            "timeout_s": timeout
+        }
+        return process
+
+    def update(self, pid: int, **info: Any) -> None:
+        """Update registry info (e.g. agent/state of a pooled worker)."""
+        if pid in self._running:
+            self._running[pid].update(info)
+
+    def unregister(self, pid: int) -> None:
+        self._running.pop(pid, None)
+        self._processes.pop(pid, None)
+
+    def record_timeout(self) -> None:
+        self.stats["timeouts"] += 1
+
+    def record_retry(self) -> None:
+        self.stats["retries"] += 1
+
+    async def terminate(self, process: asyncio.subprocess.Process, grace: float | None = None) -> None:
+        """SIGTERM the process group, SIGKILL after the grace period."""
+        grace = self.terminate_grace if grace is None else grace
+
+        if process.returncode is None:
+            if _signal_group(process, signal.SIGTERM):
+                self.stats["terminated"] += 1
+                try:
+                    await asyncio.wait_for(process.wait(), timeout=grace)
+                except asyncio.TimeoutError:
+                    logger.warning(f"⚠️ CLI process {process.pid} ignored SIGTERM - sending SIGKILL")
+                    _signal_group(process, signal.SIGKILL)
+                    self.stats["killed"] += 1
+                    await process.wait()
+        else:
+            # Leader exited - make sure no children of its group survive
+            _signal_group(process, signal.SIGKILL)
+
+        self.unregister(process.pid)
+
+    def list_running(self) -> list[dict[str, Any]]:
+        now = time.time()
+        running = []
+        for pid, info in list(self._running.items()):
+            process = self._processes.get(pid)
+            if process is not None and process.returncode is not None:
+                self.unregister(pid)
+                continue
+            running.append({**info, "age_s": round(now - info["started_at"], 1)})
+        return running
+
+    def get_stats(self) -> dict[str, Any]:
+        """Live registry + counters (for /api/v6/stats)."""
+        return {
+            **self.stats,
+            "running": self.list_running()
+        }
+
+    async def shutdown(self) -> None:
+        """Terminate all registered CLI processes (orphan cleanup)."""
+        processes = list(self._processes.values())
+        if not processes:
+            return
+
+        logger.info(f"🛑 Terminating {len(processes)} Claude CLI processes...")
+        try:
+            await asyncio.gather(
+                *(self.terminate(process) for process in processes),
+                return_exceptions=True
+            )
+        except RuntimeError:
+            # Processes from a different (closed) event loop
+            for process in processes:
+                _signal_group(process, signal.SIGKILL)
+        self._running.clear()
+        self._processes.clear()
+
+
+def _signal_group(process: asyncio.subprocess.Process, sig: int) -> bool:
+    """Send a signal to the process group; False if it is already gone."""
+    try:
+        os.killpg(process.pid, sig)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        try:
+            process.send_signal(sig)
+            return True
+        except ProcessLookupError:
+            return False
+
+
+# Global supervisor instance
+_supervisor: ProcessSupervisor | None = None
+
+
+def get_process_supervisor() -> ProcessSupervisor:
+    """Get global process supervisor instance."""
+    global _supervisor
+    if _supervisor is None:
+        _supervisor = ProcessSupervisor()
+    return _supervisor
+
+
+__all__ = [
+    "ClaudeCLITimeoutError",
+    "ProcessSupervisor",
+    "get_agent_timeout",
+    "get_max_retries",
+    "get_process_supervisor",
+    "is_transient_error",
+    "get_retry_budget",
+    "retry_delay",
+]
@@ -0,0 +1,403 @@
+"""
+Content-Addressed LLM Response Cache
+
+Identical prompts are common: ReviewFix reviews the same unchanged file set
+again, fixer retries repeat the same prompt. This cache stores responses on
+disk, keyed by a SHA-256 over:
+
+- the call parameters, read from the client object (model, temperature,
+  max_tokens, ... - see client_params) or, for the CLI, the command line
+  the call actually runs (model, tools, permissions, agent definition)
+- agent, system prompt and user prompt
+- content hashes of the workspace files (for agents with file tools)
+
+Rules:
+- Opt-in: KI_LLM_CACHE=1 (or response_cache=True on ClaudeCLISimple)
+- Chat models: only consulted for deterministic calls - the client's
+  temperature <= max_temperature (default 0.3; KI_LLM_CACHE_MAX_TEMPERATURE)
+- CLI calls: the CLI has no temperature option, so enabling the cache for
+  a CLI client means accepting a replay of the first answer to an
+  identical command + workspace
+- Responses of CLI calls that used file-modifying tools (Edit/Write/Bash)
+  are NOT stored - replaying them would skip their side effects
+- Size-based LRU eviction (KI_LLM_CACHE_MAX_MB, default 256 MB)
+- Per-agent hit rates via get_llm_cache_stats()
+
+Location: $WORKSPACE/.ki_autoagent_ws/cache/llm_responses/
+          (~/.ki_autoagent/cache/llm_responses/ without workspace)
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_TEMPERATURE = 0.3
+
+# Directories never hashed for the workspace fingerprint
+IGNORED_DIRS = {
+    ".git", ".ki_autoagent_ws", "node_modules", "__pycache__",
+    ".venv", "venv", ".mypy_cache", ".pytest_cache", "dist", "build"
+}
+
+# Files above this size are fingerprinted by size + mtime instead of content
+MAX_HASHED_FILE_BYTES = 5 * 1024 * 1024
+
+# CLI tools whose use means the call had side effects in the workspace
+SIDE_EFFECT_TOOLS = {"Edit", "Write", "MultiEdit", "NotebookEdit", "Bash"}
+
+
+def is_cache_enabled() -> bool:
+    """Global opt-in switch (KI_LLM_CACHE)."""
+    return os.environ.get("KI_LLM_CACHE", "").lower() in ("1", "true", "yes")
+
+
+# ============================================================================
+# WORKSPACE FILE HASHES
+# ============================================================================
+
+# (path) → (size, mtime_ns, sha256) - avoids re-reading unchanged files
+_file_hash_memo: dict[str, tuple[int, int, str]] = {}
+
+
+def hash_workspace_files(workspace_path: str) -> dict[str, str]:
+    """
+    Content hashes of all workspace files (relative path → sha256).
+
+    Unchanged files (same size + mtime) are not re-read.
+    """
+    hashes: dict[str, str] = {}
+
+    for root, dirs, files in os.walk(workspace_path):
+        dirs[:] = sorted(d for d in dirs if d not in IGNORED_DIRS)
+        for name in sorted(files):
+            full_path = os.path.join(root, name)
+            try:
+                stat = os.stat(full_path)
+            except OSError:
+                continue
+
+            rel_path = os.path.relpath(full_path, workspace_path)
+
+            if stat.st_size > MAX_HASHED_FILE_BYTES:
+                hashes[rel_path] = f"size:{stat.st_size}:mtime:{stat.st_mtime_ns}"
+                continue
+
+            memo = _file_hash_memo.get(full_path)
+            if memo and memo[0] == stat.st_size and memo[1] == stat.st_mtime_ns:
+                hashes[rel_path] = memo[2]
+                continue
+
+            try:
+                with open(full_path, "rb") as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                continue
+
+            _file_hash_memo[full_path] = (stat.st_size, stat.st_mtime_ns, digest)
+            hashes[rel_path] = digest
+
+    return hashes
+
+
+def has_side_effects(events: list[dict] | None) -> bool:
+    """True if CLI events contain a file-modifying tool_use."""
+    for event in events or []:
+        if event.get("type") != "assistant":
+            continue
+        content = event.get("message", {}).get("content", [])
+        if not isinstance(content, list):
+            continue
+        for block in content:
+            if isinstance(block, dict) and block.get("type") == "tool_use" and block.get("name") in SIDE_EFFECT_TOOLS:
+                return True
+    return False
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+# Per-agent statistics shared by all cache instances
+_agent_stats: dict[str, dict[str, int]] = {}
+
+
+def _agent(agent_name: str) -> dict[str, int]:
+    return _agent_stats.setdefault(agent_name, {"hits": 0, "misses": 0, "stores": 0, "skipped": 0})
+
+
+class LLMResponseCache:
+    """Disk-backed response cache with size-based LRU eviction."""
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_temperature: float = DEFAULT_MAX_TEMPERATURE
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_temperature = max_temperature
+        self._total_bytes: int | None = None  # Computed lazily on first put
+        self.evictions = 0
+
+    def is_cacheable(self, temperature: float | None) -> bool:
+        """Only deterministic calls are cached."""
+        return temperature is not None and temperature <= self.max_temperature
+
+    def make_key(
+        self,
+        model: str,
+        temperature: float | None,
+        system_prompt: str,
+        user_prompt: str,
+        file_hashes: dict[str, str] | None = None,
+        **extra: Any
+    ) -> str:
+        """SHA-256 over everything that determines the response."""
+        payload = {
+            "model": model,
+            "temperature": temperature,
+            "system": system_prompt,
+            "user": user_prompt,
+            "files": file_hashes or {},
+            "extra": extra
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str, agent_name: str) -> dict[str, Any] | None:
+        """Get a cached response (and mark it as recently used)."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            _agent(agent_name)["misses"] += 1
+            return None
+
+        # LRU: mtime = last access
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        _agent(agent_name)["hits"] += 1
+        logger.info(f"💾 LLM cache HIT ({agent_name}): {key[:12]}")
+        return entry["value"]
+
+    def put(self, key: str, value: dict[str, Any], agent_name: str) -> None:
+        """Store a response (atomic write), then evict if over the size limit."""
+        data = json.dumps({"created": time.time(), "agent": agent_name, "value": value})
+        path = self._path(key)
+
+        try:
+            previous_size = path.stat().st_size if path.exists() else 0
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"⚠️ LLM cache write failed: {e}")
+            return
+
+        _agent(agent_name)["stores"] += 1
+
+        if self._total_bytes is None:
+            self._total_bytes = self._scan_total_bytes()
+        else:
+            self._total_bytes += len(data.encode()) - previous_size
+
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def record_skip(self, agent_name: str, reason: str) -> None:
+        """Count a response that was deliberately not cached."""
+        _agent(agent_name)["skipped"] += 1
+        logger.debug(f"LLM cache skip ({agent_name}): {reason}")
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan_total_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until 90% of max_bytes."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                total -= size
+                self.evictions += 1
+            except OSError:
+                continue
+
+        self._total_bytes = total
+        logger.info(f"🧹 LLM cache evicted down to {total} bytes")
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "cache_dir": str(self.cache_dir),
+            "size_bytes": self._total_bytes if self._total_bytes is not None else self._scan_total_bytes(),
+            "max_bytes": self.max_bytes,
+            "max_temperature": self.max_temperature,
+            "evictions": self.evictions
+        }
+
+
+# Cache instances per directory
+_caches: dict[str, LLMResponseCache] = {}
+
+
+def get_llm_response_cache(workspace_path: str | None = None) -> LLMResponseCache:
+    """Get the cache for a workspace (or the global user cache)."""
+    if workspace_path:
+        cache_dir = Path(workspace_path) / ".ki_autoagent_ws" / "cache" / "llm_responses"
+    else:
+        cache_dir = Path.home() / ".ki_autoagent" / "cache" / "llm_responses"
+
+    key = str(cache_dir)
+    if key not in _caches:
+        _caches[key] = LLMResponseCache(
+            cache_dir,
+            max_bytes=int(float(os.environ.get("KI_LLM_CACHE_MAX_MB", DEFAULT_MAX_BYTES / (1024 * 1024))) * 1024 * 1024),
+            max_temperature=float(os.environ.get("KI_LLM_CACHE_MAX_TEMPERATURE", DEFAULT_MAX_TEMPERATURE))
+        )
+    return _caches[key]
+
+
+def get_llm_cache_stats() -> dict[str, Any]:
+    """Per-agent hit rates plus per-cache sizes (for /api/v6/stats)."""
+    agents = {}
+    for agent_name, stats in _agent_stats.items():
+        lookups = stats["hits"] + stats["misses"]
+        agents[agent_name] = {
+            **stats,
+            "hit_rate": round(stats["hits"] / lookups, 3) if lookups else 0.0
+        }
+
+    return {
+        "enabled": is_cache_enabled(),
+        "agents": agents,
+        "caches": [cache.get_stats() for cache in _caches.values()]
+    }
+
+
+# Client attributes that change the response (LangChain chat model field names)
+_CLIENT_PARAMS = ("temperature", "max_tokens", "top_p", "seed", "stop")
+
+
+def client_params(llm: Any) -> dict[str, Any]:
+    """
+    Call parameters of a chat model client, read from the instance.
+
+    Returns:
+        {"model": str, "temperature": float | None, ...} - only attributes
+        the client actually has
+    """
+    params: dict[str, Any] = {
+        "model": getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__
+    }
+    for name in _CLIENT_PARAMS:
+        value = getattr(llm, name, None)
+        if value is not None:
+            params[name] = value
+    params.setdefault("temperature", None)
+    return params
+
+
+def split_messages(messages: list[BaseMessage]) -> tuple[str, str]:
+    """Split messages into (system prompt, conversation) for the cache key."""
+    system_parts = []
+    other_parts = []
+    for msg in messages:
+        if isinstance(msg, SystemMessage):
+            system_parts.append(str(msg.content))
+        else:
+            other_parts.append(f"{msg.type}: {msg.content}")
+    return "\n\n".join(system_parts), "\n\n".join(other_parts)
+
+
+async def cached_ainvoke(
+    llm: Any,
+    messages: list[BaseMessage],
+    *,
+    agent_name: str,
+    workspace_path: str | None = None,
+    enabled: bool | None = None
+) -> Any:
+    """
+    llm.ainvoke() through the response cache (for tool-less chat models).
+
+    Model, temperature and the other call parameters are read from the
+    client (client_params), so the key always matches the actual call.
+    The prompt must contain everything the model sees - no workspace
+    hashes are added. Falls through to llm.ainvoke() when the cache is
+    disabled or the call is not deterministic.
+    """
+    if not (is_cache_enabled() if enabled is None else enabled):
+        return await llm.ainvoke(messages)
+
+    params = client_params(llm)
+    model = params.pop("model")
+    temperature = params.pop("temperature")
+
+    cache = get_llm_response_cache(workspace_path)
+    if not cache.is_cacheable(temperature):
+        cache.record_skip(agent_name, f"temperature {temperature} > {cache.max_temperature}")
+        return await llm.ainvoke(messages)
+
+    system_prompt, user_prompt = split_messages(messages)
+    key = cache.make_key(model, temperature, system_prompt, user_prompt, agent=agent_name, params=params)
+
+    cached = await asyncio.to_thread(cache.get, key, agent_name)
+    if cached is not None:
+        return AIMessage(content=cached["content"])
+
+    response = await llm.ainvoke(messages)
+    content = response.content if hasattr(response, "content") else str(response)
+    await asyncio.to_thread(cache.put, key, {"content": content}, agent_name)
+    return response
+
+
+__all__ = [
+    "LLMResponseCache",
+    "cached_ainvoke",
+    "client_params",
+    "get_llm_cache_stats",
+    "get_llm_response_cache",
+    "has_side_effects",
+    "hash_workspace_files",
+    "is_cache_enabled",
+]
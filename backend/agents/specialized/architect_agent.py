@@ -71,6 +71,7 @@ except ImportError as e:
 # Architect works without these using AI-only mode
 ANALYSIS_AVAILABLE = False
 try:
+    from core.analysis.analysis_pipeline import AnalyzerTask, run_analyzers
     from core.analysis.call_graph_analyzer import CallGraphAnalyzer
     from core.analysis.layer_analyzer import LayerAnalyzer
     from core.analysis.radon_metrics import RadonMetrics
@@ -1531,7 +1532,7 @@ CRITICAL RULES:
         Invalidate cache - either specific type or all
 
         Args:
-            cache_type: Specific cache to invalidate ('code_index', 'security_analysis', etc.)
+            cache_type: Specific cache to invalidate ('security_analysis', 'metrics', etc.)
                        If None, invalidates all caches
         """
         if not self.project_cache:
@@ -1583,6 +1584,10 @@ CRITICAL RULES:
             client_id, "🔄 Updating system knowledge after changes...", manager
         )
 
+        # Files were written: search indexes refresh on the next lookup
+        if self.code_search:
+            self.code_search.invalidate_indexes()
+
         if not components:
             # Full refresh if no specific components specified
             return await self.refresh_analysis(client_id, manager)
@@ -1595,18 +1600,15 @@ CRITICAL RULES:
             await self._send_progress(
                 client_id, "📂 Re-indexing code changes...", manager
             )
-            if self.project_cache:
-                self.project_cache.invalidate("code_index")
 
-            # Re-index code
+            # Re-index code (only changed files are re-parsed)
             async def progress_callback(msg: str):
                 await self._send_progress(client_id, msg, manager)
 
             code_index = await self.code_indexer.build_full_index(
                 workspace_path, progress_callback, "incremental"
             )
-            if self.project_cache:
-                self.project_cache.set("code_index", code_index)
+            self._invalidate_index_dependents(code_index)
 
         if "security" in components:
             logger.info("🔒 Refreshing security analysis...")
@@ -1925,95 +1927,63 @@ networks:
         async def progress_callback(msg: str):
             await self._send_progress(client_id, msg, manager)
 
-        # Check if we have cached code index
-        code_index = None
-        if self.project_cache:
-            code_index = self.project_cache.get("code_index")
-
-        if not code_index:
-            code_index = await self.code_indexer.build_full_index(
-                root_path, progress_callback, request_type
-            )
-            # Store in permanent cache
-            if self.project_cache:
-                self.project_cache.set("code_index", code_index)
+        # Always rebuilt: the per-file index store only re-parses changed
+        # files (an unchanged project costs one stat() per file)
+        code_index = await self.code_indexer.build_full_index(
+            root_path, progress_callback, request_type
+        )
+        self._invalidate_index_dependents(code_index)
 
-        # Phase 2: Security and quality analysis
+        # Phase 2: Security and quality analysis - all analyzers concurrently
+        # (each only depends on the code index; cached ones are skipped)
         logger.info("Phase 2: Running security and quality analysis")
         await self._send_progress(
             client_id, "🔒 Phase 2: Running security and quality analysis...", manager
         )
 
-        # Check cache for each analysis
-        security_analysis = None
-        dead_code = None
-        metrics = None
-
-        if self.project_cache:
-            security_analysis = self.project_cache.get("security_analysis")
-            dead_code = self.project_cache.get("dead_code")
-            metrics = self.project_cache.get("metrics")
-
-        if not security_analysis:
-            await self._send_progress(
-                client_id,
-                "🔒 Phase 2a: Scanning for security vulnerabilities...",
-                manager,
-            )
-            security_analysis = await self.semgrep.run_analysis(
-                root_path, progress_callback=progress_callback
-            )
-            if self.project_cache:
-                self.project_cache.set("security_analysis", security_analysis)
-
-        if not dead_code:
-            await self._send_progress(
-                client_id, "🧹 Phase 2b: Finding dead code...", manager
-            )
-            dead_code = await self.vulture.find_dead_code(
-                root_path, progress_callback=progress_callback
-            )
-            if self.project_cache:
-                self.project_cache.set("dead_code", dead_code)
-
-        if not metrics:
-            await self._send_progress(
-                client_id, "📊 Phase 2c: Calculating code metrics...", manager
-            )
-            metrics = await self.metrics.calculate_all_metrics(
-                root_path, progress_callback=progress_callback
-            )
-            if self.project_cache:
-                self.project_cache.set("metrics", metrics)
-
-        # Phase 2d: Build Function Call Graph (NEW - v5.0)
-        call_graph = None
-        if self.project_cache:
-            call_graph = self.project_cache.get("function_call_graph")
-
-        if not call_graph and self.call_graph_analyzer:
-            await self._send_progress(
-                client_id, "📞 Phase 2d: Building function call graph...", manager
-            )
-            call_graph = await self.call_graph_analyzer.build_call_graph(code_index)
-            if self.project_cache:
-                self.project_cache.set("function_call_graph", call_graph)
+        tasks = [
+            AnalyzerTask(
+                "security", "security_analysis", "🔒 Security scan (Semgrep)",
+                lambda executor: self.semgrep.run_analysis(root_path, progress_callback=progress_callback),
+                cpu_bound=False,
+            ),
+            AnalyzerTask(
+                "dead_code", "dead_code", "🧹 Dead code (Vulture)",
+                lambda executor: self.vulture.find_dead_code(
+                    root_path, progress_callback=progress_callback, executor=executor
+                ),
+            ),
+            AnalyzerTask(
+                "metrics", "metrics", "📊 Code metrics (Radon)",
+                lambda executor: self.metrics.calculate_all_metrics(
+                    root_path, progress_callback=progress_callback, executor=executor
+                ),
+            ),
+        ]
+        if self.call_graph_analyzer:
+            tasks.append(AnalyzerTask(
+                "call_graph", "function_call_graph", "📞 Function call graph",
+                lambda executor: self.call_graph_analyzer.build_call_graph(code_index, executor=executor),
+            ))
+        if self.layer_analyzer:
+            tasks.append(AnalyzerTask(
+                "system_layers", "system_layers", "🏗️ System layers",
+                lambda executor: self.layer_analyzer.detect_system_layers(code_index, executor=executor),
+            ))
+
+        analysis, _ = await run_analyzers(tasks, self.project_cache, progress_callback)
+
+        security_analysis = analysis["security"]
+        dead_code = analysis["dead_code"]
+        metrics = analysis["metrics"]
+        call_graph = analysis.get("call_graph")  # NEW - v5.0
+        system_layers = analysis.get("system_layers")  # NEW - v5.0
+
+        if call_graph and "metrics" in call_graph:
             logger.info(
                 f"✅ Call graph built: {call_graph['metrics']['total_functions']} functions, {call_graph['metrics']['total_calls']} calls"
             )
-
-        # Phase 2e: Analyze System Layers (NEW - v5.0)
-        system_layers = None
-        if self.project_cache:
-            system_layers = self.project_cache.get("system_layers")
-
-        if not system_layers and self.layer_analyzer:
-            await self._send_progress(
-                client_id, "🏗️ Phase 2e: Analyzing system layers...", manager
-            )
-            system_layers = await self.layer_analyzer.detect_system_layers(code_index)
-            if self.project_cache:
-                self.project_cache.set("system_layers", system_layers)
+        if system_layers and "quality_score" in system_layers:
             logger.info(
                 f"✅ System layers analyzed: Quality score = {system_layers['quality_score']:.2f}, Violations = {len(system_layers['violations'])}"
             )
@@ -2075,46 +2045,11 @@ networks:
                 "✅ System knowledge shared via shared_context for agent collaboration"
             )
 
-        # Index functions for search
-        if self.code_search and code_index:
-            await self._index_functions_for_search(code_index)
-
         logger.info(
             f"System understanding complete: {len(code_index.get('ast', {}).get('files', {}))} files analyzed"
         )
         return self.system_knowledge
 
-    async def _index_functions_for_search(self, code_index: dict):
-        """
-        Index functions in SQLite search database for fast retrieval
-        """
-        if not self.code_search:
-            return
-
-        try:
-            # Extract functions from AST
-            ast_data = code_index.get("ast", {})
-            files_data = ast_data.get("files", {})
-
-            for file_path, file_info in files_data.items():
-                functions = file_info.get("functions", [])
-                for func in functions:
-                    func_data = {
-                        "file_path": file_path,
-                        "name": func.get("name"),
-                        "signature": func.get("signature", ""),
-                        "docstring": func.get("docstring", ""),
-                        "body": func.get("body", "")[:1000],  # Limit body size
-                        "return_type": func.get("return_type", ""),
-                        "parameters": func.get("parameters", []),
-                        "line_number": func.get("line_number", 0),
-                    }
-                    await self.code_search.index_function(func_data)
-
-            logger.info("✅ Indexed functions in SQLite search database")
-        except Exception as e:
-            logger.error(f"Failed to index functions for search: {e}")
-
     async def analyze_infrastructure_improvements(self) -> str:
         """
         Analyze codebase and suggest infrastructure improvements
@@ -2435,6 +2370,13 @@ if message_type == "stop":
 
         return f"## System Architecture Flowchart\n\n{flowchart}"
 
+    def _invalidate_index_dependents(self, code_index: dict[str, Any]) -> None:
+        """Drop cached analyzers derived from the code index once files changed."""
+        index_update = code_index.get("index_update", {})
+        if self.project_cache and (index_update.get("changed") or index_update.get("deleted")):
+            self.project_cache.invalidate("function_call_graph")
+            self.project_cache.invalidate("system_layers")
+
     def _detect_request_type(self, prompt: str) -> str:
         """Detect the type of request from the prompt using match/case"""
         prompt_lower = prompt.lower()
@@ -79,6 +79,16 @@ from starlette.websockets import WebSocketState
 
 # Import v6 integrated workflow
 from workflow_v6_integrated import WorkflowV6Integrated
+from adapters.claude_cli_pool import get_claude_cli_pool
+from adapters.cli_process_supervisor import get_process_supervisor
+from adapters.llm_response_cache import get_llm_cache_stats
+from utils.http_clients import get_http_client_registry, shutdown_http_clients
+from utils.perplexity_cache import get_perplexity_cache_stats
+from tools.tree_sitter_tools import get_parse_cache_stats
+from subgraphs.validation_pipeline import shutdown_validation_pools
+from subgraphs.build_validation import shutdown_build_validators
+from core.analysis.analysis_pipeline import shutdown_analysis_pool
+from core.indexing.code_indexer import shutdown_index_pool
 
 # Configure logging
 logging.basicConfig(
@@ -161,6 +171,15 @@ async def lifespan(app: FastAPI):
 
     logger.info("🛑 Shutting down v6 Integrated Server...")
 
+    # Close warm Claude CLI workers, then terminate any orphaned CLI processes
+    await get_claude_cli_pool().shutdown()
+    await get_process_supervisor().shutdown()
+    shutdown_validation_pools()
+    shutdown_analysis_pool()
+    shutdown_index_pool()
+    await shutdown_build_validators()
+    await shutdown_http_clients()
+
 # ============================================================================
 # FASTAPI APP
 # ============================================================================
@@ -203,7 +222,13 @@ async def get_v6_stats():
     stats = {
         "active_workflows": len(workflows),
         "active_connections": len(manager.active_connections),
-        "systems": {}
+        "systems": {},
+        "claude_cli_pool": get_claude_cli_pool().get_stats(),
+        "cli_processes": get_process_supervisor().get_stats(),
+        "llm_cache": get_llm_cache_stats(),
+        "perplexity_cache": get_perplexity_cache_stats(),
+        "parse_cache": get_parse_cache_stats(),
+        "http_clients": get_http_client_registry().get_stats()
     }
 
     # Get stats from first active workflow (if any)
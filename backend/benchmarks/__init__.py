@@ -0,0 +1,10 @@
+"""
+Benchmarks for KI AutoAgent v6.1
+
+Measures OUR overhead (graph, state, checkpoint, memory I/O) with all
+LLM and web calls replaced by instant stubs, so regressions are visible
+independently of model latency.
+
+Usage:
+    python benchmarks/workflow_overhead.py --sessions 8 --output overhead.json
+"""
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Code Search Scan Benchmark
+
+Compares the ways LightweightCodeSearch.search can find matches on a large
+tree:
+
+- line_scan      the previous implementation: every file read into
+                 Python strings and matched line by line, one at a time
+- scan_engine    parallel mmap scan engine (services.scan_engine), all files
+- trigram_index  scan engine on the trigram index candidates (warm index)
+
+The tree is generated (synthetic Python modules) unless --root is given.
+Every engine must return the same matches as line_scan; the report says
+so per pattern.
+
+Usage:
+    cd backend
+    python benchmarks/code_search_scan.py --files 2000 --lines 400 --output scan.json
+    python benchmarks/code_search_scan.py --root /path/to/workspace --file-pattern "**/*.py"
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.code_search import LightweightCodeSearch, SearchResult
+from services.scan_engine import get_scan_workers
+
+DEFAULT_PATTERNS = [
+    r"rare_marker_\d+",          # Few hits in few files
+    r"def\s+handle_request",     # Definition-style regex
+    r"return",                   # Hits everywhere (early termination)
+    r"\w+Error\(",               # No trigrams → full scan for every engine
+]
+
+_WORDS = ["user", "order", "payment", "session", "cache", "config", "report", "invoice"]
+
+
+def generate_tree(root: Path, files: int, lines: int, seed: int = 42) -> None:
+    """Synthetic package tree: modules of functions, classes and comments."""
+    rng = random.Random(seed)
+    for i in range(files):
+        package = root / f"pkg_{i % 20}"
+        package.mkdir(parents=True, exist_ok=True)
+
+        body = [f'"""Module {i}."""', "", "import os", ""]
+        while len(body) < lines:
+            word = rng.choice(_WORDS)
+            body += [
+                f"def handle_{word}_{len(body)}(value):",
+                f"    # process the {word} value",
+                f"    result = {{'{word}': value, 'size': len(str(value))}}",
+                "    if not value:",
+                f"        raise ValueError('missing {word}')",
+                "    return result",
+                "",
+            ]
+            if rng.random() < 0.01:
+                body.append(f"RARE = 'rare_marker_{rng.randint(0, 999)}'")
+            if rng.random() < 0.005:
+                body += ["def handle_request(request):", "    return request", ""]
+        (package / f"module_{i}.py").write_text("\n".join(body[:lines]) + "\n")
+
+
+def line_scan(search: LightweightCodeSearch, pattern: str, file_pattern: str, max_results: int) -> list[SearchResult]:
+    """The previous search loop (serial, line by line)."""
+    regex = re.compile(pattern, re.IGNORECASE)
+    results: list[SearchResult] = []
+    for file_path in search._find_files(file_pattern):
+        if len(results) >= max_results:
+            break
+        results.extend(search._search_file(file_path, regex, 2, max_results - len(results)))
+    return results
+
+
+def _keys(results: list[SearchResult]) -> list[tuple[str, int]]:
+    return sorted((r.file_path, r.line_number) for r in results)
+
+
+def _time(func, repeats: int) -> tuple[list[SearchResult], dict[str, float]]:
+    samples = []
+    results: list[SearchResult] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        results = func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return results, {
+        "median_ms": round(statistics.median(samples), 3),
+        "min_ms": round(min(samples), 3),
+    }
+
+
+def run_benchmark(
+    root: str | None = None,
+    files: int = 2000,
+    lines: int = 400,
+    patterns: list[str] | None = None,
+    file_pattern: str = "**/*.py",
+    max_results: int = 100,
+    repeats: int = 3,
+) -> dict[str, Any]:
+    """
+    Run all engines for all patterns.
+
+    Returns:
+        JSON-serializable result dict
+    """
+    patterns = patterns or DEFAULT_PATTERNS
+
+    with tempfile.TemporaryDirectory(prefix="ki_scan_") as tmp:
+        if root is None:
+            tree = Path(tmp) / "tree"
+            generate_tree(tree, files, lines)
+        else:
+            tree = Path(root)
+        cache_dir = str(Path(tmp) / "cache")
+
+        plain = LightweightCodeSearch(str(tree), cache_dir=cache_dir, use_index=False)
+        indexed = LightweightCodeSearch(str(tree), cache_dir=cache_dir, use_index=True)
+
+        start = time.perf_counter()
+        indexed.search(patterns[0], file_pattern, max_results=1)
+        index_build_ms = (time.perf_counter() - start) * 1000
+
+        tree_files = plain._find_files(file_pattern)
+        tree_bytes = sum(path.stat().st_size for path in tree_files)
+
+        engines = {
+            "line_scan": lambda p, n: line_scan(plain, p, file_pattern, n),
+            "scan_engine": lambda p, n: plain.search(p, file_pattern, max_results=n),
+            "trigram_index": lambda p, n: indexed.search(p, file_pattern, max_results=n),
+        }
+
+        results: dict[str, Any] = {}
+        for pattern in patterns:
+            per_engine: dict[str, Any] = {}
+            expected = None
+            for name, engine in engines.items():
+                matches, timing = _time(lambda: engine(pattern, max_results), repeats)
+                # Truncated results may legitimately differ (file order) - compare all matches
+                complete = engine(pattern, 10**9)
+                if expected is None:
+                    expected = _keys(complete)
+                per_engine[name] = {
+                    **timing,
+                    "results": len(matches),
+                    "same_matches": _keys(complete) == expected,
+                }
+            baseline = per_engine["line_scan"]["median_ms"]
+            for name in ("scan_engine", "trigram_index"):
+                engine_ms = per_engine[name]["median_ms"]
+                per_engine[name]["speedup"] = round(baseline / engine_ms, 2) if engine_ms else None
+            results[pattern] = per_engine
+
+    return {
+        "benchmark": "code_search_scan",
+        "timestamp": datetime.now().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "scan_workers": get_scan_workers(),
+        },
+        "config": {
+            "root": root or "generated",
+            "files": len(tree_files),
+            "bytes": tree_bytes,
+            "file_pattern": file_pattern,
+            "max_results": max_results,
+            "repeats": repeats,
+        },
+        "index_build_ms": round(index_build_ms, 3),
+        "patterns": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare code search scan engines")
+    parser.add_argument("--root", help="Existing tree to search (default: generate one)")
+    parser.add_argument("--files", type=int, default=2000, help="Generated files")
+    parser.add_argument("--lines", type=int, default=400, help="Lines per generated file")
+    parser.add_argument("--pattern", action="append", dest="patterns", help="Regex (repeatable)")
+    parser.add_argument("--file-pattern", default="**/*.py", help="Glob of files to search")
+    parser.add_argument("--max-results", type=int, default=100, help="max_results per search")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per engine and pattern")
+    parser.add_argument("--output", help="Write JSON here (default: stdout)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    results = run_benchmark(
+        root=args.root,
+        files=args.files,
+        lines=args.lines,
+        patterns=args.patterns,
+        file_pattern=args.file_pattern,
+        max_results=args.max_results,
+        repeats=args.repeats,
+    )
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+        print(f"✅ Benchmark results written to {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
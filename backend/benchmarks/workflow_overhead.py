@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""
+Workflow Orchestration Overhead Benchmark
+
+Runs WorkflowV6Integrated end-to-end with instant stub LLMs, a stubbed
+Perplexity tool and a local (hash-based) embedder. Everything that is
+left is OUR overhead:
+
+- Graph build/compile time
+- Pre-execution analysis (classifier, curiosity, predictive, reasoner)
+- Per-node time (state conversions, adapter checks, file validation, memory I/O)
+- Checkpoint bytes written per superstep
+- State conversion cost (state_v6 transformations)
+- Memory store/search latency (FAISS + SQLite, no network)
+- Throughput in concurrent sessions per second
+
+Results are written as machine-readable JSON so regressions can be tracked.
+
+Usage:
+    cd backend
+    python benchmarks/workflow_overhead.py --sessions 8 --iterations 3 --output overhead.json
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any
+from unittest import mock
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_core.messages import AIMessage
+
+from memory.memory_system_v6 import MemorySystem
+from state_v6 import (
+    architect_to_supervisor,
+    codesmith_to_supervisor,
+    research_to_supervisor,
+    reviewfix_to_supervisor,
+    supervisor_to_architect,
+    supervisor_to_codesmith,
+    supervisor_to_research,
+    supervisor_to_reviewfix,
+)
+from workflow_v6_integrated import WorkflowV6Integrated
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUERY = "Create a small Python CLI tool that greets the user"
+
+
+# ============================================================================
+# STUBS (instant LLMs, no network)
+# ============================================================================
+
+STUB_RESPONSES: dict[str, str] = {
+    "research": (
+        "Key Findings: Use argparse for CLI parsing.\n"
+        "Technologies: Python 3.13, argparse\n"
+        "Best Practices: Type hints, small functions\n"
+        "Sources: docs.python.org"
+    ),
+    "architect": (
+        "Tech Stack: Python 3.13, argparse\n"
+        "Patterns: Command pattern\n"
+        "Components: src/app.py (entry point)\n"
+        "Data Flow: argv -> parser -> greeting\n"
+        "Rationale: Minimal dependencies"
+    ),
+    "codesmith": (
+        "FILE: src/app.py\n"
+        "```python\n"
+        "def greet(name: str) -> str:\n"
+        "    return f\"Hello, {name}!\"\n"
+        "\n"
+        "\n"
+        "if __name__ == \"__main__\":\n"
+        "    print(greet(\"World\"))\n"
+        "```\n"
+        "\n"
+        "FILE: README.md\n"
+        "```markdown\n"
+        "# Greeter\n"
+        "```\n"
+    ),
+    "fixer": "",
+    "reviewer": (
+        "QUALITY_SCORE: 0.9\n"
+        "\n"
+        "FEEDBACK:\n"
+        "- Suggestion 1: none\n"
+        "\n"
+        "SUMMARY: Clean implementation"
+    ),
+}
+
+
+class StubChatModel:
+    """
+    Instant drop-in for ClaudeCLISimple and ChatOpenAI.
+
+    Accepts the constructor arguments of both and answers with a canned,
+    agent-specific response so every downstream parser gets valid input.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        self.agent_name = kwargs.get("agent_name", "reviewer")
+        self.model = kwargs.get("model", "stub")
+        self.workspace_path = kwargs.get("workspace_path")
+        self.last_events: list[dict] = []
+
+    async def ainvoke(self, messages: list[Any], **kwargs: Any) -> AIMessage:
+        return AIMessage(content=STUB_RESPONSES.get(self.agent_name, ""))
+
+    def extract_file_paths_from_events(self, events: list[dict]) -> list[dict[str, Any]]:
+        return []
+
+
+class StubPerplexityTool:
+    """Instant replacement for tools.perplexity_tool.perplexity_search."""
+
+    async def ainvoke(self, tool_input: dict[str, Any], **kwargs: Any) -> dict[str, Any]:
+        content = f"Stub search results for: {tool_input.get('query', '')}"
+        return {
+            "content": content,
+            "answer": content,
+            "citations": [],
+            "sources": [],
+            "success": True,
+            "model": "stub",
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+class LocalEmbeddingMemory(MemorySystem):
+    """
+    MemorySystem with a deterministic local embedder.
+
+    FAISS and SQLite are real; only the OpenAI embedding call is replaced
+    by a hash-seeded random vector, so memory I/O stays in the measurement.
+    """
+
+    async def initialize(self) -> None:
+        await super().initialize()
+        # Any truthy client stops store()/search() from creating AsyncOpenAI()
+        self.openai_client = object()
+
+    async def _get_embedding(self, text: str) -> np.ndarray:
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+        rng = np.random.default_rng(seed)
+        return rng.standard_normal(self.EMBEDDING_DIMENSION).astype(np.float32)
+
+
+class BenchmarkWorkflow(WorkflowV6Integrated):
+    """WorkflowV6Integrated with local memory and checkpoint accounting."""
+
+    def __init__(self, workspace_path: str):
+        super().__init__(workspace_path=workspace_path, websocket_callback=None)
+        self.checkpoint_bytes: list[int] = []
+        self.write_bytes: list[int] = []
+
+    async def _setup_memory(self) -> MemorySystem:
+        memory = LocalEmbeddingMemory(workspace_path=self.workspace_path)
+        await memory.initialize()
+        return memory
+
+    async def _setup_checkpointer(self) -> Any:
+        checkpointer = await super()._setup_checkpointer()
+        serde = checkpointer.serde
+        original_aput = checkpointer.aput
+        original_aput_writes = checkpointer.aput_writes
+
+        async def aput(config, checkpoint, metadata, new_versions):
+            _, payload = serde.dumps_typed(checkpoint)
+            meta_size = len(json.dumps(metadata, default=str).encode())
+            self.checkpoint_bytes.append(len(payload) + meta_size)
+            return await original_aput(config, checkpoint, metadata, new_versions)
+
+        async def aput_writes(config, writes, task_id, task_path=""):
+            self.write_bytes.append(sum(len(serde.dumps_typed(value)[1]) for _, value in writes))
+            return await original_aput_writes(config, writes, task_id, task_path)
+
+        # Instance attributes shadow the bound methods used by the compiled graph
+        checkpointer.aput = aput
+        checkpointer.aput_writes = aput_writes
+        return checkpointer
+
+
+@contextlib.contextmanager
+def stubbed_llms():
+    """Patch every LLM and web entry point used by the v6.1 subgraphs."""
+    targets = [
+        ("subgraphs.research_subgraph_v6_1", "ChatAnthropic", StubChatModel),
+        ("subgraphs.research_subgraph_v6_1", "perplexity_search", StubPerplexityTool()),
+        ("subgraphs.architect_subgraph_v6_1", "ChatAnthropic", StubChatModel),
+        ("subgraphs.codesmith_subgraph_v6_1", "ChatAnthropic", StubChatModel),
+        ("subgraphs.reviewfix_subgraph_v6_1", "ChatAnthropic", StubChatModel),
+        ("subgraphs.reviewfix_subgraph_v6_1", "ChatOpenAI", StubChatModel),
+    ]
+
+    with contextlib.ExitStack() as stack:
+        for module_name, attribute, replacement in targets:
+            module = __import__(module_name, fromlist=[attribute])
+            stack.enter_context(mock.patch.object(module, attribute, replacement))
+        yield
+
+
+# ============================================================================
+# MEASUREMENTS
+# ============================================================================
+
+def _summarize(samples: list[float]) -> dict[str, Any]:
+    """Summarize a list of millisecond samples."""
+    if not samples:
+        return {"count": 0}
+
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p50_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[p95_index], 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+async def _new_workflow(workspace_path: str) -> tuple[BenchmarkWorkflow, float]:
+    """Create and initialize a benchmark workflow, returning init time in ms."""
+    workflow = BenchmarkWorkflow(workspace_path)
+    start = time.perf_counter()
+    await workflow.initialize()
+    return workflow, (time.perf_counter() - start) * 1000
+
+
+async def _close_workflow(workflow: BenchmarkWorkflow) -> None:
+    """Release SQLite connections held by a benchmark workflow."""
+    if workflow.memory:
+        await workflow.memory.close()
+    if workflow.checkpointer:
+        await workflow.checkpointer.conn.close()
+
+
+async def measure_compile(workflow: BenchmarkWorkflow, repeats: int) -> dict[str, Any]:
+    """Time subgraph construction + supervisor graph compilation."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        await workflow._build_workflow()
+        samples.append((time.perf_counter() - start) * 1000)
+    return _summarize(samples)
+
+
+async def measure_pre_execution(
+    workflow: BenchmarkWorkflow,
+    query: str,
+    repeats: int
+) -> dict[str, Any]:
+    """Time classifier + curiosity + predictive + reasoner checks."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        await workflow._pre_execution_analysis(query)
+        samples.append((time.perf_counter() - start) * 1000)
+    return _summarize(samples)
+
+
+async def measure_nodes(
+    workflow: BenchmarkWorkflow,
+    query: str,
+    iterations: int
+) -> dict[str, Any]:
+    """
+    Time every supervisor-level node via the LangGraph debug stream.
+
+    With instant LLMs the node time IS the orchestration overhead.
+    Checkpoint writes include the nested subgraph supersteps, because the
+    subgraphs inherit the supervisor's checkpointer at runtime.
+    """
+    durations: dict[str, list[float]] = defaultdict(list)
+    supersteps_per_run = []
+    workflow.checkpoint_bytes.clear()
+    workflow.write_bytes.clear()
+
+    for i in range(iterations):
+        started: dict[str, float] = {}
+        steps = 0
+        async for event in workflow.workflow.astream(
+            workflow._build_initial_state(query),
+            config={"configurable": {"thread_id": f"bench-nodes-{i}"}},
+            stream_mode="debug"
+        ):
+            kind = event.get("type")
+            payload = event.get("payload", {})
+            if kind == "task":
+                started[payload["id"]] = time.perf_counter()
+            elif kind == "task_result":
+                t0 = started.pop(payload["id"], None)
+                if t0 is not None:
+                    durations[payload["name"]].append((time.perf_counter() - t0) * 1000)
+            elif kind == "checkpoint":
+                steps += 1
+        supersteps_per_run.append(steps)
+
+    checkpoint_bytes = list(workflow.checkpoint_bytes)
+    return {
+        "nodes": {name: _summarize(samples) for name, samples in durations.items()},
+        "checkpoints": {
+            "supersteps_per_run": supersteps_per_run,
+            "writes": len(checkpoint_bytes),
+            "total_bytes": sum(checkpoint_bytes),
+            "mean_bytes_per_superstep": round(statistics.fmean(checkpoint_bytes), 1) if checkpoint_bytes else 0,
+            "max_bytes_per_superstep": max(checkpoint_bytes, default=0),
+            "pending_write_bytes": sum(workflow.write_bytes),
+        },
+    }
+
+
+def measure_state_conversions(file_count: int, repeats: int) -> dict[str, Any]:
+    """Microbenchmark the state_v6 Supervisor <-> Subgraph transformations."""
+    supervisor_state = {
+        "user_query": DEFAULT_QUERY,
+        "workspace_path": "/tmp/workspace",
+        "research_results": {"findings": {"analysis": "x" * 2000}},
+        "architecture_design": {"design": {"description": "y" * 4000}},
+        "generated_files": [
+            {"path": f"src/module_{i}.py", "size": 1024, "validated": True}
+            for i in range(file_count)
+        ],
+        "review_feedback": None,
+        "final_result": None,
+        "errors": [],
+    }
+
+    research = {**supervisor_to_research(supervisor_state), "findings": {"analysis": "x"}}
+    architect = supervisor_to_architect(supervisor_state)
+    codesmith = {**supervisor_to_codesmith(supervisor_state), "generated_files": supervisor_state["generated_files"]}
+    reviewfix = supervisor_to_reviewfix(supervisor_state)
+
+    conversions = {
+        "supervisor_to_research": (supervisor_to_research, supervisor_state),
+        "research_to_supervisor": (research_to_supervisor, research),
+        "supervisor_to_architect": (supervisor_to_architect, supervisor_state),
+        "architect_to_supervisor": (architect_to_supervisor, architect),
+        "supervisor_to_codesmith": (supervisor_to_codesmith, supervisor_state),
+        "codesmith_to_supervisor": (codesmith_to_supervisor, codesmith),
+        "supervisor_to_reviewfix": (supervisor_to_reviewfix, supervisor_state),
+        "reviewfix_to_supervisor": (reviewfix_to_supervisor, reviewfix),
+    }
+
+    results = {}
+    for name, (func, arg) in conversions.items():
+        start = time.perf_counter()
+        for _ in range(repeats):
+            func(arg)
+        results[name] = round((time.perf_counter() - start) / repeats * 1_000_000, 3)
+
+    return {"generated_files": file_count, "microseconds_per_call": results}
+
+
+async def measure_memory_io(workflow: BenchmarkWorkflow, items: int) -> dict[str, Any]:
+    """Time MemorySystem store/search with the local embedder."""
+    store_samples = []
+    search_samples = []
+
+    for i in range(items):
+        start = time.perf_counter()
+        await workflow.memory.store(
+            content=f"Benchmark memory item {i}: " + "lorem ipsum " * 50,
+            metadata={"agent": "benchmark", "type": "item", "index": i}
+        )
+        store_samples.append((time.perf_counter() - start) * 1000)
+
+    for i in range(items):
+        start = time.perf_counter()
+        await workflow.memory.search(
+            query=f"Benchmark memory item {i}",
+            filters={"agent": "benchmark"},
+            k=3
+        )
+        search_samples.append((time.perf_counter() - start) * 1000)
+
+    return {"store": _summarize(store_samples), "search": _summarize(search_samples)}
+
+
+async def measure_throughput(base_dir: str, sessions: int, query: str) -> dict[str, Any]:
+    """Run N complete sessions concurrently, each with its own workspace."""
+    workflows = []
+    init_samples = []
+    for i in range(sessions):
+        workspace = os.path.join(base_dir, f"session_{i}")
+        os.makedirs(workspace, exist_ok=True)
+        workflow, init_ms = await _new_workflow(workspace)
+        workflows.append(workflow)
+        init_samples.append(init_ms)
+
+    try:
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            workflow.run(user_query=query, session_id=f"bench-session-{i}")
+            for i, workflow in enumerate(workflows)
+        ))
+        wall_s = time.perf_counter() - start
+    finally:
+        for workflow in workflows:
+            await _close_workflow(workflow)
+
+    return {
+        "sessions": sessions,
+        "successful_sessions": sum(1 for r in results if r.get("success")),
+        "wall_seconds": round(wall_s, 4),
+        "sessions_per_second": round(sessions / wall_s, 3) if wall_s > 0 else None,
+        "initialize": _summarize(init_samples),
+    }
+
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+async def run_benchmark(
+    sessions: int = 4,
+    iterations: int = 3,
+    query: str = DEFAULT_QUERY,
+    memory_items: int = 20,
+    conversion_repeats: int = 2000,
+) -> dict[str, Any]:
+    """
+    Run the complete overhead benchmark suite.
+
+    Returns:
+        JSON-serializable result dict
+    """
+    with tempfile.TemporaryDirectory(prefix="ki_overhead_") as base_dir, stubbed_llms():
+        workspace = os.path.join(base_dir, "profile")
+        os.makedirs(workspace)
+        workflow, init_ms = await _new_workflow(workspace)
+
+        try:
+            compile_stats = await measure_compile(workflow, repeats=iterations)
+            pre_execution = await measure_pre_execution(workflow, query, repeats=iterations)
+            node_stats = await measure_nodes(workflow, query, iterations)
+            memory_io = await measure_memory_io(workflow, memory_items)
+        finally:
+            await _close_workflow(workflow)
+
+        throughput = await measure_throughput(base_dir, sessions, query)
+
+    return {
+        "benchmark": "workflow_overhead",
+        "timestamp": datetime.now().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "config": {
+            "sessions": sessions,
+            "iterations": iterations,
+            "memory_items": memory_items,
+            "query": query,
+        },
+        "initialize_ms": round(init_ms, 3),
+        "compile": compile_stats,
+        "pre_execution": pre_execution,
+        **node_stats,
+        "state_conversions": measure_state_conversions(file_count=50, repeats=conversion_repeats),
+        "memory_io": memory_io,
+        "throughput": throughput,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure v6 workflow orchestration overhead")
+    parser.add_argument("--sessions", type=int, default=4, help="Concurrent sessions for throughput")
+    parser.add_argument("--iterations", type=int, default=3, help="Profiling runs per measurement")
+    parser.add_argument("--memory-items", type=int, default=20, help="Items for memory I/O timing")
+    parser.add_argument("--query", default=DEFAULT_QUERY, help="User query to run")
+    parser.add_argument("--output", help="Write JSON here (default: stdout)")
+    parser.add_argument("--verbose", action="store_true", help="Keep workflow prints and INFO logs")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+
+    # The workflow prints a lot of debug output - keep it out of the measurement
+    sink = contextlib.nullcontext() if args.verbose else open(os.devnull, "w")
+    with sink as devnull:
+        redirect = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(devnull)
+        with redirect:
+            results = asyncio.run(run_benchmark(
+                sessions=args.sessions,
+                iterations=args.iterations,
+                query=args.query,
+                memory_items=args.memory_items,
+            ))
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+        print(f"✅ Benchmark results written to {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
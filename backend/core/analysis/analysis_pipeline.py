@@ -0,0 +1,173 @@
+"""
+Concurrent Analyzer Pipeline
+
+ArchitectAgent.understand_system ran Semgrep, Vulture, Radon, the call
+graph and the layer analysis one after another, although they are
+independent once the code index exists. This pipeline runs them as one
+concurrent stage:
+
+- Subprocess-based tools (Semgrep) run as async subprocesses
+- CPU-bound Python analyzers (Vulture, Radon, call graph, layers) run on
+  a shared process pool (spawn, created on first use)
+- Every analyzer keeps its own cache entry; only cache misses run
+- Progress is reported per analyzer (start + duration)
+- A failing analyzer doesn't stop the others (its result gets an
+  "error" key and is not cached)
+
+On a cold cache the stage takes as long as the slowest analyzer instead
+of the sum of all of them.
+
+Configuration:
+- KI_ANALYSIS_WORKERS        process pool size (default min(4, CPUs))
+- KI_ANALYSIS_PROCESS_POOL   0 = run CPU-bound analyzers on threads
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AnalyzerTask:
+    """One analyzer of the stage."""
+
+    name: str  # Result key
+    cache_key: str  # Key in the project cache
+    label: str  # Progress label, e.g. "🔒 Security scan (Semgrep)"
+    run: Callable[[Executor | None], Awaitable[dict[str, Any]]]
+    cpu_bound: bool = True  # Gets the process pool as executor
+
+
+# ============================================================================
+# PROCESS POOL
+# ============================================================================
+
+_process_pool: ProcessPoolExecutor | None = None
+
+
+def _pool_size() -> int:
+    return int(os.environ.get("KI_ANALYSIS_WORKERS", min(4, os.cpu_count() or 1)))
+
+
+def get_analysis_executor() -> Executor | None:
+    """Shared process pool for CPU-bound analyzers (None = default thread pool)."""
+    global _process_pool
+    if os.environ.get("KI_ANALYSIS_PROCESS_POOL", "1").lower() in ("0", "false", "no", "off"):
+        return None
+    if _process_pool is None:
+        # spawn: the server process has threads (fork would copy their locks)
+        _process_pool = ProcessPoolExecutor(
+            max_workers=_pool_size(),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _process_pool
+
+
+def shutdown_analysis_pool() -> None:
+    """Shut down the process pool (server lifespan)."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+# ============================================================================
+# STAGE
+# ============================================================================
+
+async def run_analyzers(
+    tasks: list[AnalyzerTask],
+    cache: Any | None = None,
+    progress_callback: Callable[[str], Awaitable[None]] | None = None
+) -> tuple[dict[str, Any], dict[str, float]]:
+    """
+    Run all analyzers concurrently (cached results are reused).
+
+    Args:
+        tasks: Analyzers of the stage
+        cache: Project cache with get(key)/set(key, value) (optional)
+        progress_callback: Async callback for progress messages
+
+    Returns:
+        (results by task name, durations in seconds by task name - 0.0 = cached)
+    """
+    async def report(message: str) -> None:
+        if progress_callback:
+            await progress_callback(message)
+
+    results: dict[str, Any] = {}
+    timings: dict[str, float] = {}
+    pending = []
+
+    for task in tasks:
+        cached = cache.get(task.cache_key) if cache else None
+        if cached:
+            results[task.name] = cached
+            timings[task.name] = 0.0
+        else:
+            pending.append(task)
+
+    if len(pending) < len(tasks):
+        await report(f"📦 Cached: {', '.join(t.label for t in tasks if t not in pending)}")
+
+    async def run_one(task: AnalyzerTask) -> None:
+        global _process_pool
+        await report(f"▶️ {task.label}...")
+        start = time.monotonic()
+
+        try:
+            try:
+                result = await task.run(get_analysis_executor() if task.cpu_bound else None)
+            except BrokenProcessPool:
+                logger.warning(f"⚠️ Analysis process pool broken - retrying {task.name} on threads")
+                _process_pool = None
+                result = await task.run(None)
+        except Exception as e:
+            logger.error(f"❌ Analyzer {task.name} failed: {e}", exc_info=True)
+            result = {"error": str(e)}
+
+        duration = time.monotonic() - start
+        results[task.name] = result
+        timings[task.name] = duration
+
+        if cache and result and "error" not in result:
+            cache.set(task.cache_key, result)
+
+        status = "⚠️" if "error" in result else "✅"
+        await report(f"{status} {task.label} done in {duration:.1f}s")
+        logger.info(f"{status} Analyzer {task.name}: {duration:.2f}s")
+
+    stage_start = time.monotonic()
+    await asyncio.gather(*(run_one(task) for task in pending))
+
+    if pending:
+        total = time.monotonic() - stage_start
+        slowest = max(pending, key=lambda t: timings[t.name])
+        logger.info(
+            f"✅ Analysis stage: {total:.2f}s for {len(pending)} analyzers "
+            f"(sum {sum(timings.values()):.2f}s, slowest {slowest.name})"
+        )
+
+    return results, timings
+
+
+__all__ = [
+    "AnalyzerTask",
+    "get_analysis_executor",
+    "run_analyzers",
+    "shutdown_analysis_pool",
+]
@@ -6,8 +6,10 @@ Builds comprehensive call graph showing which functions call which other functio
 Critical for impact analysis, dead code detection, and refactoring safety
 """
 
+import asyncio
 import logging
 from collections import defaultdict, deque
+from concurrent.futures import Executor
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -33,7 +35,23 @@ class CallGraphAnalyzer:
         self.hot_functions = []
         self.unused_functions = []
 
-    async def build_call_graph(self, code_index: dict[str, Any]) -> dict[str, Any]:
+    async def build_call_graph(
+        self, code_index: dict[str, Any], executor: Executor | None = None
+    ) -> dict[str, Any]:
+        """
+        Build the function call graph (see analyze()).
+
+        With an executor (e.g. the analysis pipeline's process pool) the
+        CPU-bound analysis runs there; instance attributes are then not
+        updated.
+        """
+        if executor is None:
+            return self.analyze(code_index)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, analyze_call_graph, code_index)
+
+    def analyze(self, code_index: dict[str, Any]) -> dict[str, Any]:
         """
         Build complete function call graph from code index
 
@@ -553,3 +571,8 @@ class CallGraphAnalyzer:
                 "avg_calls_per_function": 0,
             },
         }
+
+
+def analyze_call_graph(code_index: dict[str, Any]) -> dict[str, Any]:
+    """Build the function call graph in a worker process (analysis pipeline)."""
+    return CallGraphAnalyzer().analyze(code_index)
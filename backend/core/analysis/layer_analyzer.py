@@ -6,9 +6,11 @@ Detects architectural layers and validates layer separation
 Critical for architecture validation and refactoring guidance
 """
 
+import asyncio
 import logging
 import os
 from collections import defaultdict
+from concurrent.futures import Executor
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -99,7 +101,23 @@ class LayerAnalyzer:
         self.violations = []
         self.quality_score = 0.0
 
-    async def detect_system_layers(self, code_index: dict[str, Any]) -> dict[str, Any]:
+    async def detect_system_layers(
+        self, code_index: dict[str, Any], executor: Executor | None = None
+    ) -> dict[str, Any]:
+        """
+        Detect system layers (see analyze()).
+
+        With an executor (e.g. the analysis pipeline's process pool) the
+        CPU-bound analysis runs there; instance attributes are then not
+        updated.
+        """
+        if executor is None:
+            return self.analyze(code_index)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, analyze_system_layers, code_index)
+
+    def analyze(self, code_index: dict[str, Any]) -> dict[str, Any]:
         """
         Detect system layers from code index
 
@@ -459,3 +477,8 @@ class LayerAnalyzer:
                 "warning_violations": 0,
             },
         }
+
+
+def analyze_system_layers(code_index: dict[str, Any]) -> dict[str, Any]:
+    """Detect system layers in a worker process (analysis pipeline)."""
+    return LayerAnalyzer().analyze(code_index)
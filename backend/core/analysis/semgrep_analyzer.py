@@ -5,10 +5,10 @@ Semgrep Analyzer - Security vulnerability detection
 Real implementation using semgrep CLI
 """
 
+import asyncio
 import json
 import logging
 import shutil
-import subprocess
 from collections.abc import Callable
 from typing import Any
 
@@ -86,21 +86,34 @@ class SemgrepAnalyzer:
 
             logger.info(f"🔍 Running: {' '.join(cmd)}")
 
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, timeout=300  # 5 minute timeout
+            # Async subprocess: doesn't block the event loop, so other
+            # analyzers can run at the same time
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
             )
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(), timeout=300  # 5 minute timeout
+                )
+            except TimeoutError:
+                process.kill()
+                await process.wait()
+                raise
 
-            if result.returncode != 0 and result.returncode != 1:
+            if process.returncode != 0 and process.returncode != 1:
                 # returncode 1 means findings were found (not an error)
-                logger.error(f"Semgrep error: {result.stderr}")
+                error = stderr.decode("utf-8", errors="replace")
+                logger.error(f"Semgrep error: {error}")
                 return {
                     "findings": [],
                     "summary": {"critical": 0, "high": 0, "medium": 0, "low": 0},
-                    "error": result.stderr,
+                    "error": error,
                 }
 
             # Parse JSON output
-            output = json.loads(result.stdout)
+            output = json.loads(stdout)
             findings = []
             severity_counts = {"critical": 0, "high": 0, "medium": 0, "low": 0}
 
@@ -148,7 +161,7 @@ class SemgrepAnalyzer:
                 "total_findings": len(findings),
             }
 
-        except subprocess.TimeoutExpired:
+        except TimeoutError:
             logger.error("Semgrep analysis timed out after 5 minutes")
             return {
                 "findings": [],
@@ -5,8 +5,10 @@ Vulture Analyzer - Dead code detection
 Real implementation using vulture library
 """
 
+import asyncio
 import logging
 from collections.abc import Callable
+from concurrent.futures import Executor
 from pathlib import Path
 from typing import Any
 
@@ -41,6 +43,7 @@ class VultureAnalyzer:
         root_path: str,
         progress_callback: Callable | None = None,
         min_confidence: int = 60,
+        executor: Executor | None = None,
     ) -> dict[str, Any]:
         """
         Find dead code in codebase using Vulture
@@ -49,6 +52,7 @@ class VultureAnalyzer:
             root_path: Root directory to analyze
             progress_callback: Optional callback for progress updates
             min_confidence: Minimum confidence level (0-100) for reporting dead code
+            executor: Executor for the scan (default: thread pool)
 
         Returns:
             {
@@ -94,111 +98,119 @@ class VultureAnalyzer:
                 "note": "Vulture library not installed - install with: pip install vulture",
             }
 
-        try:
-            # v5.8.1: Vulture 2.11+ doesn't accept min_confidence in __init__
-            vulture = Vulture(verbose=False)
-            vulture.min_confidence = min_confidence
-
-            # Find all Python files
-            root = Path(root_path)
-            python_files = list(root.rglob("*.py"))
-
-            # Exclude common directories
-            excluded_dirs = {
-                ".git",
-                "__pycache__",
-                "venv",
-                "env",
-                ".venv",
-                "node_modules",
-                ".tox",
-            }
-            python_files = [
-                f
-                for f in python_files
-                if not any(excluded in f.parts for excluded in excluded_dirs)
-            ]
-
-            logger.info(
-                f"🔍 Analyzing {len(python_files)} Python files for dead code..."
-            )
-
-            # Scan files
-            vulture.scavenge([str(f) for f in python_files])
-
-            # Group findings by file
-            files_data = {}
-            type_counts = {
-                "function": 0,
-                "class": 0,
-                "variable": 0,
-                "import": 0,
-                "attribute": 0,
-                "property": 0,
-            }
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(executor, scan_dead_code, root_path, min_confidence)
 
-            for item in vulture.get_unused_code():
-                file_path = str(item.filename)
+        if progress_callback and "error" not in result:
+            await progress_callback(
+                f"🧹 Dead code detection complete: {result['total_items']} issues found"
+            )
 
-                if file_path not in files_data:
-                    files_data[file_path] = {"file": file_path, "items": []}
+        return result
 
-                item_type = (
-                    item.typ
-                )  # 'function', 'class', 'variable', 'import', 'attribute', 'property'
-                type_counts[item_type] = type_counts.get(item_type, 0) + 1
 
-                files_data[file_path]["items"].append(
-                    {
-                        "name": item.name,
-                        "type": item_type,
-                        "line": item.first_lineno,
-                        "confidence": item.confidence,
-                        "message": str(item),
-                    }
-                )
-
-            # Convert to list
-            files_list = list(files_data.values())
-
-            # Create summary
-            total_dead_code = sum(type_counts.values())
-            summary = {
-                "total_dead_code": total_dead_code,
-                "unused_functions": type_counts.get("function", 0),
-                "unused_classes": type_counts.get("class", 0),
-                "unused_variables": type_counts.get("variable", 0),
-                "unused_imports": type_counts.get("import", 0),
-                "unused_attributes": type_counts.get("attribute", 0)
-                + type_counts.get("property", 0),
-            }
-
-            if progress_callback:
-                await progress_callback(
-                    f"🧹 Dead code detection complete: {total_dead_code} issues found"
-                )
+def scan_dead_code(root_path: str, min_confidence: int = 60) -> dict[str, Any]:
+    """
+    Run Vulture on all Python files below root_path (synchronous).
 
-            logger.info(
-                f"✅ Vulture analysis complete: {total_dead_code} dead code items found"
+    Module-level so it can run in a worker process (analysis pipeline).
+    """
+    try:
+        # v5.8.1: Vulture 2.11+ doesn't accept min_confidence in __init__
+        vulture = Vulture(verbose=False)
+        vulture.min_confidence = min_confidence
+
+        # Find all Python files
+        root = Path(root_path)
+        python_files = list(root.rglob("*.py"))
+
+        # Exclude common directories
+        excluded_dirs = {
+            ".git",
+            "__pycache__",
+            "venv",
+            "env",
+            ".venv",
+            "node_modules",
+            ".tox",
+        }
+        python_files = [
+            f
+            for f in python_files
+            if not any(excluded in f.parts for excluded in excluded_dirs)
+        ]
+
+        logger.info(f"🔍 Analyzing {len(python_files)} Python files for dead code...")
+
+        # Scan files
+        vulture.scavenge([str(f) for f in python_files])
+
+        # Group findings by file
+        files_data = {}
+        type_counts = {
+            "function": 0,
+            "class": 0,
+            "variable": 0,
+            "import": 0,
+            "attribute": 0,
+            "property": 0,
+        }
+
+        for item in vulture.get_unused_code():
+            file_path = str(item.filename)
+
+            if file_path not in files_data:
+                files_data[file_path] = {"file": file_path, "items": []}
+
+            item_type = (
+                item.typ
+            )  # 'function', 'class', 'variable', 'import', 'attribute', 'property'
+            type_counts[item_type] = type_counts.get(item_type, 0) + 1
+
+            files_data[file_path]["items"].append(
+                {
+                    "name": item.name,
+                    "type": item_type,
+                    "line": item.first_lineno,
+                    "confidence": item.confidence,
+                    "message": str(item),
+                }
             )
 
-            return {
-                "files": files_list,
-                "summary": summary,
-                "total_items": total_dead_code,
-            }
-
-        except Exception as e:
-            logger.error(f"Vulture analysis failed: {e}")
-            return {
-                "files": [],
-                "summary": {
-                    "total_dead_code": 0,
-                    "unused_functions": 0,
-                    "unused_classes": 0,
-                    "unused_variables": 0,
-                    "unused_imports": 0,
-                    "unused_attributes": 0,
-                },
-                "error": str(e),
-            }
+        # Convert to list
+        files_list = list(files_data.values())
+
+        # Create summary
+        total_dead_code = sum(type_counts.values())
+        summary = {
+            "total_dead_code": total_dead_code,
+            "unused_functions": type_counts.get("function", 0),
+            "unused_classes": type_counts.get("class", 0),
+            "unused_variables": type_counts.get("variable", 0),
+            "unused_imports": type_counts.get("import", 0),
+            "unused_attributes": type_counts.get("attribute", 0)
+            + type_counts.get("property", 0),
+        }
+
+        logger.info(f"✅ Vulture analysis complete: {total_dead_code} dead code items found")
+
+        return {
+            "files": files_list,
+            "summary": summary,
+            "total_items": total_dead_code,
+        }
+
+    except Exception as e:
+        logger.error(f"Vulture analysis failed: {e}")
+        return {
+            "files": [],
+            "summary": {
+                "total_dead_code": 0,
+                "unused_functions": 0,
+                "unused_classes": 0,
+                "unused_variables": 0,
+                "unused_imports": 0,
+                "unused_attributes": 0,
+            },
+            "error": str(e),
+        }
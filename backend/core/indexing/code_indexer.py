@@ -2,17 +2,86 @@ from __future__ import annotations
 
 """
 Code Indexer - Orchestrates file indexing and builds comprehensive code index
+
+Files that need parsing are sharded across a process pool (spawn, created
+on first use) when there are enough of them; shard results are streamed
+back and merged into the IndexStore as they complete. Small updates and a
+broken pool use the serial path.
+
+Configuration:
+- KI_INDEX_WORKERS              process pool size (default: CPUs, 1 = serial)
+- KI_INDEX_PARALLEL_MIN_FILES   min files to parse before using the pool (default 32)
 """
 
+import asyncio
 import logging
+import math
+import multiprocessing
 import os
+import sqlite3
 from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 
-from .tree_sitter_indexer import TreeSitterIndexer
+from .index_store import IndexStore
+from .symbol_index import SymbolIndex
+from .tree_sitter_indexer import TreeSitterIndexer, index_files
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PARALLEL_MIN_FILES = 32
+
+# Upper bound of files per worker task (keeps progress updates flowing)
+MAX_SHARD_SIZE = 64
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        logger.warning(f"⚠️ Invalid {name}, using {default}")
+        return default
+
+
+# Parse result keys only the symbol index reads (kept out of the code index)
+_SYMBOL_ONLY_KEYS = frozenset({"names"})
+
+
+def _public_file_data(file_data: dict[str, Any]) -> dict[str, Any]:
+    """Parse result without the per-identifier name references."""
+    return {key: value for key, value in file_data.items() if key not in _SYMBOL_ONLY_KEYS}
+
+
+def get_index_workers() -> int:
+    return _env_int("KI_INDEX_WORKERS", os.cpu_count() or 1)
+
+
+# ============================================================================
+# PROCESS POOL
+# ============================================================================
+
+_index_pool: ProcessPoolExecutor | None = None
+
+
+def get_index_pool() -> ProcessPoolExecutor:
+    """Shared process pool for parsing files."""
+    global _index_pool
+    if _index_pool is None:
+        # spawn: the server process has threads (fork would copy their locks)
+        _index_pool = ProcessPoolExecutor(
+            max_workers=get_index_workers(),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _index_pool
+
+
+def shutdown_index_pool() -> None:
+    """Shut down the process pool (server lifespan)."""
+    global _index_pool
+    if _index_pool is not None:
+        _index_pool.shutdown(wait=False, cancel_futures=True)
+        _index_pool = None
+
 
 class CodeIndexer:
     """
@@ -32,31 +101,40 @@ class CodeIndexer:
             ".vscode",
             ".idea",
             "coverage",
+            ".ki_autoagent_ws",
         }
         self.excluded_extensions = {".pyc", ".pyo", ".so", ".dylib"}
+        self._stores: dict[str, IndexStore] = {}
+        self._symbols: dict[str, SymbolIndex] = {}
 
     async def build_full_index(
         self,
         root_path: str,
         progress_callback: Callable | None = None,
         request_type: str = "general",
+        parallel: bool | None = None,
     ) -> dict[str, Any]:
         """
         Build comprehensive index of entire codebase
 
+        Incremental: parse results are stored per file (IndexStore), so only
+        added or modified files are re-parsed.
+
         Args:
             root_path: Root directory to index
             progress_callback: Optional callback for progress updates
             request_type: Type of analysis (general, infrastructure, etc.)
+            parallel: Parse on the process pool (None = decide by file count)
 
         Returns:
             {
                 'ast': {'files': {file_path: {functions, classes, imports, calls}}},
                 'import_graph': {file: [dependencies]},
-                'statistics': {total_files, total_functions, total_classes, ...}
+                'statistics': {total_files, total_functions, total_classes, ...},
+                'index_update': {reparsed, reused, deleted, changed}
             }
         """
-        logger.info(f"Starting full code indexing for: {root_path}")
+        logger.info(f"Starting code indexing for: {root_path}")
         if progress_callback:
             await progress_callback("📂 Scanning project files...")
 
@@ -66,52 +144,159 @@ class CodeIndexer:
 
         logger.info(f"Found {total_files} Python files to index")
 
-        # Index all files
-        ast_data = {}
-        import_graph = {}
-        # v5.8.4: Count instead of storing full lists to reduce memory usage
-        total_functions_count = 0
-        total_classes_count = 0
+        # Only added/modified files are parsed, deleted ones are dropped
+        store = self._get_store(root_path)
+        changes = store.diff(python_files)
+        changed = changes["changed"]
 
-        for i, file_path in enumerate(python_files):
+        for path in changes["deleted"]:
+            store.remove(path)
+
+        # Same content seen before (renamed/copied/reverted file)
+        to_parse = []
+        for relative_path, file_path, digest, lines, stat in changed:
+            file_data = store.lookup(digest)
+            if file_data is None:
+                to_parse.append((relative_path, file_path, digest, lines, stat))
+            else:
+                store.put(relative_path, digest, lines, stat, file_data)
+
+        if parallel is None:
+            min_files = _env_int("KI_INDEX_PARALLEL_MIN_FILES", DEFAULT_PARALLEL_MIN_FILES)
+            parallel = get_index_workers() > 1 and len(to_parse) >= min_files
+
+        remaining = to_parse
+        if parallel and to_parse:
+            remaining = await self._index_parallel(to_parse, store, progress_callback)
+
+        for i, (relative_path, file_path, digest, lines, stat) in enumerate(remaining):
             if progress_callback and i % 10 == 0:
                 await progress_callback(
-                    f"📂 Indexing file {i + 1}/{total_files}: {os.path.basename(file_path)}"
+                    f"📂 Indexing file {i + 1}/{len(remaining)}: {os.path.basename(file_path)}"
                 )
-
             file_data = await self.tree_sitter.index_file(file_path)
-            relative_path = os.path.relpath(file_path, root_path)
-
-            ast_data[relative_path] = file_data
-
-            # Build import graph
-            imports = [imp.get("module", "") for imp in file_data.get("imports", [])]
-            import_graph[relative_path] = imports
-
-            # v5.8.4: Count functions and classes instead of duplicating them
-            # Functions and classes are already stored in ast_data[relative_path]
-            total_functions_count += len(file_data.get("functions", []))
-            total_classes_count += len(file_data.get("classes", []))
-
-        # Calculate statistics
-        statistics = {
-            "total_files": total_files,
-            "total_functions": total_functions_count,
-            "total_classes": total_classes_count,
-            "total_imports": sum(len(imports) for imports in import_graph.values()),
-            "lines_of_code": self._count_total_lines(python_files),
-        }
+            store.put(relative_path, digest, lines, stat, file_data)
 
-        logger.info(f"Indexing complete: {statistics}")
+        reparsed = len(to_parse)
+        store.save()
+        self._sync_symbols(root_path, store)
+
+        # v5.8.4: Functions and classes are only stored in ast_data (no
+        # all_functions/all_classes duplicates)
+        ast_data = {path: _public_file_data(store.get(path)) for path in sorted(store.manifest)}
+        statistics = store.statistics()
+
+        index_update = {
+            "reparsed": reparsed,
+            "reused": len(changes["unchanged"]) + len(changed) - reparsed,
+            "deleted": len(changes["deleted"]),
+            "changed": len(changed),
+        }
+        logger.info(f"Indexing complete: {statistics} ({index_update})")
 
-        # v5.8.4: Removed all_functions and all_classes to eliminate duplication
-        # All function/class data is already in ast.files, saving ~300KB per analysis
         return {
             "ast": {"files": ast_data},
-            "import_graph": import_graph,
+            "import_graph": store.import_graph(),
             "statistics": statistics,
+            "index_update": index_update,
         }
 
+    async def _index_parallel(
+        self,
+        entries: list[tuple],
+        store: IndexStore,
+        progress_callback: Callable | None = None,
+    ) -> list[tuple]:
+        """
+        Parse files on the process pool and merge results as shards complete.
+
+        Returns:
+            Entries that were not indexed (pool failed) - for the serial path
+        """
+        workers = get_index_workers()
+        shard_size = max(1, min(MAX_SHARD_SIZE, math.ceil(len(entries) / (workers * 4))))
+        shards = [entries[i:i + shard_size] for i in range(0, len(entries), shard_size)]
+
+        loop = asyncio.get_running_loop()
+        pool = get_index_pool()
+        logger.info(f"📂 Parsing {len(entries)} files on {workers} workers ({len(shards)} shards)")
+
+        async def run_shard(index: int) -> tuple[int, list[dict[str, Any]]]:
+            file_paths = [entry[1] for entry in shards[index]]
+            return index, await loop.run_in_executor(pool, index_files, file_paths)
+
+        tasks = [asyncio.ensure_future(run_shard(i)) for i in range(len(shards))]
+        pending = set(range(len(shards)))
+        indexed = 0
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, results = await next_done
+                for (relative_path, _, digest, lines, stat), file_data in zip(shards[index], results):
+                    store.put(relative_path, digest, lines, stat, file_data)
+                pending.discard(index)
+                indexed += len(results)
+                if progress_callback:
+                    await progress_callback(f"📂 Indexed {indexed}/{len(entries)} files")
+        except Exception as e:
+            # BrokenProcessPool, unpicklable results, ... - finish serially
+            logger.warning(f"⚠️ Parallel indexing failed ({e}) - indexing remaining files serially")
+            for task in tasks:
+                task.cancel()
+            if _index_pool is pool:
+                shutdown_index_pool()
+            return [entry for index in sorted(pending) for entry in shards[index]]
+
+        return []
+
+    def refresh_symbols(self, root_path: str, cache_dir: str | None = None) -> dict[str, int]:
+        """
+        Bring the index store and the symbol index up to date (synchronous, serial).
+
+        Used by code search before symbol lookups: unchanged files cost one
+        stat() each, only added/modified files are parsed.
+
+        Returns:
+            {"updated": files (re-)indexed, "deleted": files dropped}
+        """
+        store = self._get_store(root_path, cache_dir)
+        changes = store.diff(self._find_python_files(root_path))
+        if not changes["changed"] and not changes["deleted"]:
+            return {"updated": 0, "deleted": 0}
+
+        for path in changes["deleted"]:
+            store.remove(path)
+        for relative_path, file_path, digest, lines, stat in changes["changed"]:
+            file_data = store.lookup(digest)
+            if file_data is None:
+                file_data = self.tree_sitter.index_file_sync(file_path)
+            store.put(relative_path, digest, lines, stat, file_data)
+
+        store.save()
+        self._sync_symbols(root_path, store)
+        return {"updated": len(changes["changed"]), "deleted": len(changes["deleted"])}
+
+    def _get_store(self, root_path: str, cache_dir: str | None = None) -> IndexStore:
+        """Index store per project (kept for the lifetime of the indexer)."""
+        key = os.path.abspath(root_path)
+        if cache_dir:
+            key = f"{key}\0{os.path.abspath(cache_dir)}"
+        if key not in self._stores:
+            self._stores[key] = IndexStore(
+                os.path.abspath(root_path), os.path.join(cache_dir, "code_index") if cache_dir else None
+            )
+        return self._stores[key]
+
+    def _sync_symbols(self, root_path: str, store: IndexStore) -> None:
+        """Update the persistent symbol index (definition/usage lookups)."""
+        key = str(store.cache_dir.parent / "symbols.db")
+        try:
+            if key not in self._symbols:
+                self._symbols[key] = SymbolIndex(store.cache_dir.parent / "symbols.db")
+            self._symbols[key].sync(store)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"⚠️ Symbol index update failed: {e}")
+
     def _find_python_files(self, root_path: str) -> list[str]:
         """Find all Python files in the project"""
         all_files = []  # v5.8.2: Renamed from python_files
@@ -129,14 +314,3 @@ class CodeIndexer:
                     all_files.append(file_path)
 
         return all_files
-
-    def _count_total_lines(self, files: list[str]) -> int:
-        """Count total lines of code"""
-        total = 0
-        for file_path in files:
-            try:
-                with open(file_path, encoding="utf-8") as f:
-                    total += len(f.readlines())
-            except Exception:
-                pass
-        return total
@@ -0,0 +1,276 @@
+"""
+Per-File Incremental Code Index Store
+
+The code index used to be one monolithic ProjectCache blob that had to be
+rebuilt - every file re-parsed - as soon as anything changed. The store
+keeps the index per file:
+
+- files/<content_hash>.json   parse result of one file (content-addressed:
+                              renamed/copied files are not re-parsed)
+- manifest.json               relative path → {hash, size, mtime_ns, lines,
+                              functions, classes, imports}
+
+An update only re-parses added or modified files (size/mtime first, then
+content hash) and drops deleted ones. The import graph and statistics are
+recomputed from the manifest summaries, without loading any parse result.
+
+Location: $WORKSPACE/.ki_autoagent_ws/cache/code_index/
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Bump when the parse result format changes (forces a full rebuild)
+INDEX_VERSION = 3
+
+
+def hash_content(file_path: str, content: bytes) -> str:
+    """Content hash; the extension is included because it selects the parser."""
+    extension = os.path.splitext(file_path)[1].lower()
+    return hashlib.sha256(extension.encode() + b"\0" + content).hexdigest()
+
+
+def count_lines(content: bytes) -> int:
+    """Same count as len(f.readlines()); undecodable files count as 0."""
+    try:
+        text = content.decode("utf-8")
+    except UnicodeDecodeError:
+        return 0
+    return len(text.splitlines(keepends=True))
+
+
+def summarize(file_data: dict[str, Any]) -> dict[str, Any]:
+    """Manifest summary of a parse result (enough for graph + statistics)."""
+    return {
+        "functions": len(file_data.get("functions", [])),
+        "classes": len(file_data.get("classes", [])),
+        "imports": [imp.get("module", "") for imp in file_data.get("imports", [])],
+    }
+
+
+def _atomic_write_json(path: Path, data: Any) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class IndexStore:
+    """Manifest + content-addressed per-file parse results for one project."""
+
+    def __init__(self, root_path: str, cache_dir: str | Path | None = None):
+        self.root_path = os.path.abspath(root_path)
+        self.cache_dir = Path(cache_dir) if cache_dir else (
+            Path(self.root_path) / ".ki_autoagent_ws" / "cache" / "code_index"
+        )
+        self.files_dir = self.cache_dir / "files"
+        self.persistent = True
+        try:
+            self.files_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"⚠️ Code index cache not writable ({e}) - indexing in memory only")
+            self.persistent = False
+
+        self.manifest: dict[str, dict[str, Any]] = self._load_manifest()
+        # content hash → parse result (avoids re-reading blobs in this process)
+        self._memo: dict[str, dict[str, Any]] = {}
+
+    # ------------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------------
+
+    def _load_manifest(self) -> dict[str, dict[str, Any]]:
+        if not self.persistent:
+            return {}
+        try:
+            with open(self.cache_dir / "manifest.json", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable code index manifest: {e}")
+            return {}
+
+        if data.get("version") != INDEX_VERSION:
+            logger.info("📂 Code index format changed - full rebuild")
+            # Parse results are content-addressed: old ones must not be reused
+            for blob in self.files_dir.glob("*.json"):
+                try:
+                    blob.unlink()
+                except OSError:
+                    pass
+            return {}
+        return data.get("files", {})
+
+    def save(self) -> None:
+        """Persist the manifest and delete parse results no file refers to."""
+        if not self.persistent:
+            return
+        try:
+            _atomic_write_json(
+                self.cache_dir / "manifest.json",
+                {"version": INDEX_VERSION, "root": self.root_path, "files": self.manifest}
+            )
+        except OSError as e:
+            logger.warning(f"⚠️ Failed to save code index manifest: {e}")
+            return
+
+        referenced = {entry["hash"] for entry in self.manifest.values()}
+        for blob in self.files_dir.glob("*.json"):
+            if blob.stem not in referenced:
+                try:
+                    blob.unlink()
+                except OSError:
+                    pass
+
+    # ------------------------------------------------------------------------
+    # Change detection
+    # ------------------------------------------------------------------------
+
+    def diff(self, file_paths: list[str]) -> dict[str, Any]:
+        """
+        Compare the current files with the manifest.
+
+        Unchanged size + mtime means unchanged without reading the file;
+        otherwise the content hash decides.
+
+        Returns:
+            {
+                "changed": [(relative_path, absolute_path, hash, lines, stat)],
+                "unchanged": [relative_path],
+                "deleted": [relative_path]
+            }
+        """
+        changed = []
+        unchanged = []
+        current = set()
+
+        for file_path in file_paths:
+            relative_path = os.path.relpath(file_path, self.root_path)
+            current.add(relative_path)
+            entry = self.manifest.get(relative_path)
+
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+
+            if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                unchanged.append(relative_path)
+                continue
+
+            try:
+                with open(file_path, "rb") as f:
+                    content = f.read()
+            except OSError as e:
+                logger.warning(f"Failed to read {file_path}: {e}")
+                continue
+
+            digest = hash_content(file_path, content)
+            if entry and entry["hash"] == digest and self._has_blob(digest):
+                # Touched but not modified
+                entry["size"], entry["mtime_ns"] = stat.st_size, stat.st_mtime_ns
+                unchanged.append(relative_path)
+                continue
+
+            changed.append((relative_path, file_path, digest, count_lines(content), stat))
+
+        deleted = [path for path in self.manifest if path not in current]
+        return {"changed": changed, "unchanged": unchanged, "deleted": deleted}
+
+    # ------------------------------------------------------------------------
+    # Per-file parse results
+    # ------------------------------------------------------------------------
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.files_dir / f"{digest}.json"
+
+    def _has_blob(self, digest: str) -> bool:
+        return digest in self._memo or (self.persistent and self._blob_path(digest).exists())
+
+    def lookup(self, digest: str) -> dict[str, Any] | None:
+        """Parse result for a content hash (e.g. of a renamed file)."""
+        if digest in self._memo:
+            return self._memo[digest]
+        if not self.persistent:
+            return None
+        try:
+            with open(self._blob_path(digest), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._memo[digest] = data
+        return data
+
+    def put(self, relative_path: str, digest: str, lines: int, stat: os.stat_result, file_data: dict[str, Any]) -> None:
+        """Store the parse result of one file and update its manifest entry."""
+        if self.persistent and digest not in self._memo and not self._blob_path(digest).exists():
+            try:
+                _atomic_write_json(self._blob_path(digest), file_data)
+            except OSError as e:
+                logger.warning(f"⚠️ Failed to cache index of {relative_path}: {e}")
+        self._memo[digest] = file_data
+
+        self.manifest[relative_path] = {
+            "hash": digest,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "lines": lines,
+            **summarize(file_data),
+        }
+
+    def remove(self, relative_path: str) -> None:
+        self.manifest.pop(relative_path, None)
+
+    def get(self, relative_path: str) -> dict[str, Any]:
+        """Parse result of a file in the manifest (empty result if the blob is gone)."""
+        data = self.lookup(self.manifest[relative_path]["hash"])
+        if data is None:
+            logger.warning(f"⚠️ Missing cached index for {relative_path}")
+            return {"functions": [], "classes": [], "imports": [], "calls": []}
+        return data
+
+    # ------------------------------------------------------------------------
+    # Aggregates (from the manifest only)
+    # ------------------------------------------------------------------------
+
+    def import_graph(self) -> dict[str, list[str]]:
+        return {path: list(entry["imports"]) for path, entry in self.manifest.items()}
+
+    def statistics(self) -> dict[str, int]:
+        entries = self.manifest.values()
+        return {
+            "total_files": len(self.manifest),
+            "total_functions": sum(entry["functions"] for entry in entries),
+            "total_classes": sum(entry["classes"] for entry in entries),
+            "total_imports": sum(len(entry["imports"]) for entry in entries),
+            "lines_of_code": sum(entry["lines"] for entry in entries),
+        }
+
+
+__all__ = [
+    "INDEX_VERSION",
+    "IndexStore",
+    "count_lines",
+    "hash_content",
+    "summarize",
+]
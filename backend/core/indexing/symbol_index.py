@@ -0,0 +1,233 @@
+"""
+Persistent Symbol Index
+
+LightweightCodeSearch.search_definition / search_usage ran a regex over
+every file of the project on each call. The symbol index keeps the
+symbols of the code index in SQLite, so these queries are index lookups:
+
+- definitions   functions, classes, module/class-level variables
+- refs          usages: calls, imported names, base classes, decorators
+                and every other name/attribute reference (callbacks passed
+                by name, attribute reads, assignments, annotations)
+- imports       imported modules per file
+
+Every row carries file and line. The table is derived from the per-file
+IndexStore: sync() only rewrites files whose content hash changed and
+drops deleted ones.
+
+Location: $WORKSPACE/.ki_autoagent_ws/cache/symbols.db
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Bump when the tables change (forces a rebuild from the IndexStore)
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, hash TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS definitions (name TEXT NOT NULL, kind TEXT NOT NULL, path TEXT NOT NULL, line INTEGER);
+CREATE TABLE IF NOT EXISTS refs (name TEXT NOT NULL, kind TEXT NOT NULL, path TEXT NOT NULL, line INTEGER);
+CREATE TABLE IF NOT EXISTS imports (module TEXT NOT NULL, path TEXT NOT NULL, line INTEGER);
+CREATE INDEX IF NOT EXISTS idx_definitions_name ON definitions (name);
+CREATE INDEX IF NOT EXISTS idx_definitions_path ON definitions (path);
+CREATE INDEX IF NOT EXISTS idx_refs_name ON refs (name);
+CREATE INDEX IF NOT EXISTS idx_refs_path ON refs (path);
+CREATE INDEX IF NOT EXISTS idx_imports_module ON imports (module);
+CREATE INDEX IF NOT EXISTS idx_imports_path ON imports (path);
+"""
+
+
+def extract_symbols(file_data: dict[str, Any]) -> dict[str, list[tuple]]:
+    """
+    Symbol rows of one parse result (TreeSitterIndexer format).
+
+    Returns:
+        {"definitions": [(name, kind, line)], "refs": [(name, kind, line)],
+         "imports": [(module, line)]}
+    """
+    definitions = []
+    refs = []
+    imports = []
+
+    for func in file_data.get("functions", []):
+        definitions.append((func["name"], "function", func.get("line")))
+        for decorator in func.get("decorators", []):
+            if decorator:
+                refs.append((decorator, "decorator", func.get("line")))
+
+    for cls in file_data.get("classes", []):
+        definitions.append((cls["name"], "class", cls.get("line")))
+        for base in cls.get("bases", []):
+            # "pkg.Base" is a usage of Base
+            refs.append((base.rsplit(".", 1)[-1], "base", cls.get("line")))
+
+    for var in file_data.get("variables", []):
+        definitions.append((var["name"], "variable", var.get("line")))
+
+    for call in file_data.get("calls", []):
+        refs.append((call["function"], "call", call.get("line")))
+
+    for imp in file_data.get("imports", []):
+        if imp.get("module"):
+            imports.append((imp["module"], imp.get("line")))
+        for name in imp.get("names", []):
+            refs.append((name.rsplit(".", 1)[-1], "import", imp.get("line")))
+
+    # Remaining references (a call is not recorded a second time as a name)
+    seen = {(name, line) for name, _, line in refs}
+    for item in file_data.get("names", []):
+        if (item["name"], item.get("line")) not in seen:
+            refs.append((item["name"], "name", item.get("line")))
+
+    return {"definitions": definitions, "refs": refs, "imports": imports}
+
+
+class SymbolIndex:
+    """SQLite symbol table of one project."""
+
+    def __init__(self, db_path: str | Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            with self._conn:
+                for table in ("files", "definitions", "refs", "imports"):
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------------
+
+    def sync(self, store: Any) -> dict[str, int]:
+        """
+        Bring the table in line with an IndexStore manifest.
+
+        Only files whose content hash differs are rewritten.
+
+        Returns:
+            {"updated": files rewritten, "deleted": files dropped}
+        """
+        with self._lock:
+            indexed = dict(self._conn.execute("SELECT path, hash FROM files"))
+            deleted = [path for path in indexed if path not in store.manifest]
+            changed = [
+                path for path, entry in store.manifest.items()
+                if indexed.get(path) != entry["hash"]
+            ]
+
+            if deleted or changed:
+                with self._conn:
+                    for path in deleted + changed:
+                        self._delete_file(path)
+                    for path in changed:
+                        self._insert_file(path, store.manifest[path]["hash"], store.get(path))
+
+        if deleted or changed:
+            logger.info(f"🔣 Symbol index: {len(changed)} files updated, {len(deleted)} removed")
+        return {"updated": len(changed), "deleted": len(deleted)}
+
+    def update_file(self, path: str, digest: str, file_data: dict[str, Any]) -> None:
+        """Replace the symbols of one file."""
+        with self._lock, self._conn:
+            self._delete_file(path)
+            self._insert_file(path, digest, file_data)
+
+    def remove_file(self, path: str) -> None:
+        with self._lock, self._conn:
+            self._delete_file(path)
+
+    def _delete_file(self, path: str) -> None:
+        for table in ("files", "definitions", "refs", "imports"):
+            self._conn.execute(f"DELETE FROM {table} WHERE path = ?", (path,))
+
+    def _insert_file(self, path: str, digest: str, file_data: dict[str, Any]) -> None:
+        symbols = extract_symbols(file_data)
+        self._conn.execute("INSERT INTO files (path, hash) VALUES (?, ?)", (path, digest))
+        self._conn.executemany(
+            "INSERT INTO definitions (name, kind, path, line) VALUES (?, ?, ?, ?)",
+            [(name, kind, path, line) for name, kind, line in symbols["definitions"]]
+        )
+        self._conn.executemany(
+            "INSERT INTO refs (name, kind, path, line) VALUES (?, ?, ?, ?)",
+            [(name, kind, path, line) for name, kind, line in symbols["refs"]]
+        )
+        self._conn.executemany(
+            "INSERT INTO imports (module, path, line) VALUES (?, ?, ?)",
+            [(module, path, line) for module, line in symbols["imports"]]
+        )
+
+    # ------------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------------
+
+    def _query(self, sql: str, params: tuple) -> list[dict[str, Any]]:
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM files LIMIT 1").fetchone() is None
+
+    def find_definitions(self, name: str, kind: str = "any") -> list[dict[str, Any]]:
+        """Definitions of a symbol: [{"name", "kind", "path", "line"}]."""
+        if kind == "any":
+            return self._query(
+                "SELECT name, kind, path, line FROM definitions WHERE name = ? ORDER BY path, line",
+                (name,)
+            )
+        return self._query(
+            "SELECT name, kind, path, line FROM definitions WHERE name = ? AND kind = ? ORDER BY path, line",
+            (name, kind)
+        )
+
+    def find_references(self, name: str) -> list[dict[str, Any]]:
+        """Usages of a symbol: [{"name", "kind", "path", "line"}]."""
+        return self._query(
+            "SELECT name, kind, path, line FROM refs WHERE name = ? ORDER BY path, line",
+            (name,)
+        )
+
+    def find_importers(self, module: str) -> list[dict[str, Any]]:
+        """Files importing a module: [{"module", "path", "line"}]."""
+        return self._query(
+            "SELECT module, path, line FROM imports WHERE module = ? ORDER BY path, line",
+            (module,)
+        )
+
+    def statistics(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("files", "definitions", "refs", "imports")
+            }
+
+
+__all__ = [
+    "SCHEMA_VERSION",
+    "SymbolIndex",
+    "extract_symbols",
+]
@@ -23,6 +23,10 @@ class TreeSitterIndexer:
         logger.info("TreeSitterIndexer initialized (using Python ast module)")
 
     async def index_file(self, file_path: str) -> dict[str, Any]:
+        """Index a single file (see index_file_sync)."""
+        return self.index_file_sync(file_path)
+
+    def index_file_sync(self, file_path: str) -> dict[str, Any]:
         """
         Index a single file and extract functions, classes, imports
 
@@ -31,12 +35,14 @@ class TreeSitterIndexer:
                 'functions': [{'name': 'foo', 'line': 10, 'calls': ['bar', 'baz']}],
                 'classes': [{'name': 'MyClass', 'methods': [...]}],
                 'imports': [{'module': 'os', 'names': ['path']}],
-                'calls': [{'function': 'bar', 'line': 15}]
+                'calls': [{'function': 'bar', 'line': 15}],
+                'variables': [{'name': 'CONFIG', 'line': 3}],
+                'names': [{'name': 'handler', 'line': 20}]  # names/attributes used
             }
         """
         # v5.8.2: Support HTML/CSS/JS files with basic parsing
         if file_path.endswith((".html", ".css", ".js", ".jsx", ".ts", ".tsx")):
-            return await self._index_web_file(file_path)
+            return self._index_web_file(file_path)
 
         if not file_path.endswith(".py"):
             return {"functions": [], "classes": [], "imports": [], "calls": []}
@@ -51,10 +57,11 @@ class TreeSitterIndexer:
             classes = []
             imports = []
             calls = []
+            names = set()
 
             # Extract functions and their calls
             for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
                     func_calls = self._extract_function_calls(node)
                     functions.append(
                         {
@@ -71,7 +78,8 @@ class TreeSitterIndexer:
 
                 elif isinstance(node, ast.ClassDef):
                     methods = [
-                        n.name for n in ast.walk(node) if isinstance(n, ast.FunctionDef)
+                        n.name for n in ast.walk(node)
+                        if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))
                     ]
                     classes.append(
                         {
@@ -90,18 +98,47 @@ class TreeSitterIndexer:
                     if func_name:
                         calls.append({"function": func_name, "line": node.lineno})
 
+                # Callbacks passed by name, attribute access, assignments,
+                # annotations (usages that are not calls)
+                elif isinstance(node, ast.Name):
+                    names.add((node.id, node.lineno))
+                elif isinstance(node, ast.Attribute):
+                    names.add((node.attr, node.lineno))
+
             return {
                 "functions": functions,
                 "classes": classes,
                 "imports": imports,
                 "calls": calls,
+                "variables": self._extract_variables(tree),
+                "names": [{"name": name, "line": line} for name, line in sorted(names)],
             }
 
         except Exception as e:
             logger.error(f"Failed to index {file_path}: {e}")
             return {"functions": [], "classes": [], "imports": [], "calls": []}
 
-    def _extract_function_calls(self, func_node: ast.FunctionDef) -> list[str]:
+    def _extract_variables(self, tree: ast.Module) -> list[dict[str, Any]]:
+        """Extract module- and class-level variable assignments"""
+        variables = []
+        bodies = [tree.body] + [
+            node.body for node in tree.body if isinstance(node, ast.ClassDef)
+        ]
+        for body in bodies:
+            for node in body:
+                if isinstance(node, ast.Assign):
+                    targets = node.targets
+                elif isinstance(node, ast.AnnAssign):
+                    targets = [node.target]
+                else:
+                    continue
+                for target in targets:
+                    for name in ast.walk(target):
+                        if isinstance(name, ast.Name):
+                            variables.append({"name": name.id, "line": node.lineno})
+        return variables
+
+    def _extract_function_calls(self, func_node: ast.FunctionDef | ast.AsyncFunctionDef) -> list[str]:
         """Extract all function calls within a function"""
         calls = []
         for node in ast.walk(func_node):
@@ -165,7 +202,7 @@ class TreeSitterIndexer:
             }
         return {}
 
-    async def _index_web_file(self, file_path: str) -> dict[str, Any]:
+    def _index_web_file(self, file_path: str) -> dict[str, Any]:
         """
         Basic parsing for HTML/CSS/JS files (v5.8.2)
         Uses regex-based extraction (not a full AST parser)
@@ -291,3 +328,20 @@ class TreeSitterIndexer:
     async def search_pattern(self, pattern: str) -> list[dict[str, Any]]:
         """Search for pattern in indexed code (stub for compatibility)"""
         return []
+
+
+# Indexer of a worker process (created on first use)
+_worker_indexer: TreeSitterIndexer | None = None
+
+
+def index_files(file_paths: list[str]) -> list[dict[str, Any]]:
+    """
+    Index a shard of files (synchronous, runs in a worker process).
+
+    Returns:
+        Parse results in the order of file_paths
+    """
+    global _worker_indexer
+    if _worker_indexer is None:
+        _worker_indexer = TreeSitterIndexer()
+    return [_worker_indexer.index_file_sync(file_path) for file_path in file_paths]
@@ -3,15 +3,70 @@ from __future__ import annotations
 """
 Lightweight Code Search Service
 Fast text-based code searching without heavy dependencies
+
+Definition and usage lookups on Python files (the only files whose usages
+the indexer records) use the persistent symbol index
+(core.indexing.symbol_index) once CodeIndexer has built it; other file
+patterns, and projects without the index, are scanned. The index is
+brought up to date at most every KI_CODE_SEARCH_REFRESH_SECONDS: files
+whose size/mtime changed are re-parsed, deleted files dropped, new files
+added. Changes on disk can therefore take that long to show up in
+lookups; invalidate_indexes() (e.g. after writing files) forces a refresh
+on the next lookup.
+
+Regex searches only scan the candidate files of the trigram index
+(services.trigram_index); patterns without literal trigrams scan all files.
+The trigram index has the same refresh interval and staleness window as
+the symbol index.
+Files are scanned by the parallel mmap scan engine (services.scan_engine).
+
+Configuration:
+- KI_CODE_SEARCH_INDEX             0 = no trigram index (always scan all files)
+- KI_CODE_SEARCH_REFRESH_SECONDS   min. seconds between symbol/trigram index refreshes (default 5)
+- KI_CODE_SEARCH_WORKERS           scan threads (default min(8, CPUs))
 """
 
 import logging
+import os
 import re
+import sqlite3
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from fnmatch import fnmatchcase
 from pathlib import Path
 from typing import Any
 
+from core.indexing.code_indexer import CodeIndexer
+from core.indexing.symbol_index import SymbolIndex
+
+from .scan_engine import scan_files
+from .trigram_index import TrigramIndex, regex_trigrams
+
 logger = logging.getLogger(__name__)
 
+# Max. staleness of index lookups (see invalidate_indexes())
+DEFAULT_REFRESH_SECONDS = 5.0
+
+# File types whose definitions and usages the symbol index records
+SYMBOL_INDEX_SUFFIXES = (".py",)
+
+
+def _glob_match(parts: tuple[str, ...], pattern: tuple[str, ...]) -> bool:
+    """Path.glob semantics: "*" stays within one segment, "**" spans zero or more."""
+    if not pattern:
+        return not parts
+    if pattern[0] == "**":
+        return any(_glob_match(parts[i:], pattern[1:]) for i in range(len(parts) + 1))
+    return bool(parts) and fnmatchcase(parts[0], pattern[0]) and _glob_match(parts[1:], pattern[1:])
+
+
+def get_refresh_interval() -> float:
+    try:
+        return max(0.0, float(os.environ.get("KI_CODE_SEARCH_REFRESH_SECONDS", DEFAULT_REFRESH_SECONDS)))
+    except ValueError:
+        return DEFAULT_REFRESH_SECONDS
+
 
 class SearchResult:
     """Single search result"""
@@ -46,19 +101,35 @@ class LightweightCodeSearch:
     Fast code search using regex patterns
     No external dependencies required
 
-    v5.8.0: Optional cache_dir parameter for consistency (not used, search is always live)
+    v5.8.0: Optional cache_dir parameter (location of the symbol and
+    trigram indexes, default $PROJECT/.ki_autoagent_ws/cache)
     """
 
-    def __init__(self, project_root: str, cache_dir: str | None = None):
+    def __init__(
+        self, project_root: str, cache_dir: str | None = None, use_index: bool | None = None
+    ):
         """
         Initialize code search
 
         Args:
             project_root: Root directory to search
-            cache_dir: Optional cache directory (for API consistency, not used in this implementation)
+            cache_dir: Optional cache directory (holds symbols.db, trigrams.db)
+            use_index: Narrow regex searches with the trigram index
+                (default: KI_CODE_SEARCH_INDEX, on)
         """
         self.project_root = Path(project_root)
         self.cache_dir = Path(cache_dir) if cache_dir else None
+        index_dir = self.cache_dir or self.project_root / ".ki_autoagent_ws" / "cache"
+        self.symbol_db_path = index_dir / "symbols.db"
+        self.trigram_db_path = index_dir / "trigrams.db"
+        self._symbol_index: SymbolIndex | None = None
+        self._symbol_indexer: CodeIndexer | None = None
+        self._symbols_refreshed: float | None = None
+        self._trigram_index: TrigramIndex | None = None
+        self._trigram_refreshed: float | None = None
+        if use_index is None:
+            use_index = os.environ.get("KI_CODE_SEARCH_INDEX", "1").lower() not in ("0", "false", "no", "off")
+        self.use_index = use_index
         self.default_ignore_patterns = {
             ".git",
             "__pycache__",
@@ -75,6 +146,7 @@ class LightweightCodeSearch:
             "*.so",
             "*.dylib",
             "*.dll",
+            ".ki_autoagent_ws",
         }
         logger.info(f"🔍 LightweightCodeSearch initialized for: {self.project_root}")
 
@@ -99,33 +171,47 @@ class LightweightCodeSearch:
         Returns:
             List of SearchResult objects
         """
-        results = []
+        results = list(
+            self.iter_search(pattern, file_pattern, case_sensitive, context_lines, max_results)
+        )
+        logger.info(f"🔍 Found {len(results)} matches for pattern: {pattern}")
+        return results
+
+    def iter_search(
+        self,
+        pattern: str,
+        file_pattern: str = "**/*.py",
+        case_sensitive: bool = False,
+        context_lines: int = 2,
+        max_results: int = 100,
+    ) -> Iterator[SearchResult]:
+        """
+        Stream search results as they are found (same arguments as search)
+
+        Files are scanned in parallel by the scan engine; results arrive in
+        file order and scanning stops once max_results were yielded.
+        """
         flags = 0 if case_sensitive else re.IGNORECASE
 
         try:
             regex = re.compile(pattern, flags)
         except re.error as e:
             logger.error(f"Invalid regex pattern: {pattern} - {e}")
-            return []
-
-        # Find matching files
-        matching_files = self._find_files(file_pattern)
-
-        for file_path in matching_files:
-            if len(results) >= max_results:
-                break
-
-            try:
-                results.extend(
-                    self._search_file(
-                        file_path, regex, context_lines, max_results - len(results)
-                    )
-                )
-            except Exception as e:
-                logger.warning(f"Error searching {file_path}: {e}")
-
-        logger.info(f"🔍 Found {len(results)} matches for pattern: {pattern}")
-        return results
+            return
+
+        # Find matching files (trigram index candidates if possible)
+        matching_files = self._indexed_candidates(pattern, file_pattern)
+        if matching_files is None:
+            matching_files = self._find_files(file_pattern)
+
+        for match in scan_files(matching_files, regex, context_lines, max_results):
+            yield SearchResult(
+                file_path=str(match.file_path.relative_to(self.project_root)),
+                line_number=match.line_number,
+                line_content=match.line_content,
+                context_before=match.context_before,
+                context_after=match.context_after,
+            )
 
     def search_definition(
         self, symbol_name: str, symbol_type: str = "any", file_pattern: str = "**/*.py"
@@ -148,6 +234,12 @@ class LightweightCodeSearch:
             "any": rf"(^\s*class\s+{symbol_name}\s*[:\(]|^\s*def\s+{symbol_name}\s*\(|^\s*{symbol_name}\s*[=:])",
         }
 
+        symbol_index = self._get_symbol_index(file_pattern)
+        if symbol_index:
+            kind = symbol_type if symbol_type in patterns else "any"
+            hits = symbol_index.find_definitions(symbol_name, kind)
+            return self._results_for_hits(hits, file_pattern, context_lines=5)
+
         pattern = patterns.get(symbol_type, patterns["any"])
         return self.search(pattern, file_pattern, case_sensitive=True, context_lines=5)
 
@@ -157,6 +249,10 @@ class LightweightCodeSearch:
         """
         Search for usages of a symbol
 
+        With the symbol index (Python files), usages are all references in
+        code (calls, imports, bases, decorators, names and attributes); the
+        file scan also matches the name in comments and strings.
+
         Args:
             symbol_name: Symbol name to find usages of
             file_pattern: Files to search
@@ -164,10 +260,138 @@ class LightweightCodeSearch:
         Returns:
             List of SearchResult objects
         """
+        symbol_index = self._get_symbol_index(file_pattern)
+        if symbol_index:
+            hits = symbol_index.find_references(symbol_name)
+            return self._results_for_hits(hits, file_pattern, context_lines=2)
+
         # Match word boundaries to avoid partial matches
         pattern = rf"\b{re.escape(symbol_name)}\b"
         return self.search(pattern, file_pattern, case_sensitive=True, context_lines=2)
 
+    async def build_symbol_index(self) -> dict[str, int]:
+        """Build/update the code index (and with it the symbol index) of the project."""
+        await CodeIndexer().build_full_index(str(self.project_root))
+        self.invalidate_indexes()
+        symbol_index = self._get_symbol_index()
+        return symbol_index.statistics() if symbol_index else {}
+
+    def invalidate_indexes(self) -> None:
+        """Refresh the indexes on the next lookup (e.g. after files were written)."""
+        self._symbols_refreshed = None
+        self._trigram_refreshed = None
+
+    def _get_symbol_index(self, file_pattern: str = "**/*.py") -> SymbolIndex | None:
+        """
+        Symbol index of the project, None if file_pattern selects files it
+        does not cover or until CodeIndexer has built it.
+        """
+        if not file_pattern.endswith(SYMBOL_INDEX_SUFFIXES):
+            return None
+        try:
+            if self._symbol_index is None:
+                if not self.symbol_db_path.exists():
+                    return None
+                self._symbol_index = SymbolIndex(self.symbol_db_path)
+            if self._symbol_index.is_empty():
+                return None
+
+            if (
+                self._symbols_refreshed is None
+                or time.monotonic() - self._symbols_refreshed >= get_refresh_interval()
+            ):
+                if self._symbol_indexer is None:
+                    self._symbol_indexer = CodeIndexer()
+                self._symbol_indexer.refresh_symbols(
+                    str(self.project_root), str(self.symbol_db_path.parent)
+                )
+                self._symbols_refreshed = time.monotonic()
+        except (OSError, ValueError, sqlite3.Error) as e:
+            logger.warning(f"Symbol index unavailable, scanning files: {e}")
+            return None
+        return self._symbol_index
+
+    def _results_for_hits(
+        self,
+        hits: list[dict[str, Any]],
+        file_pattern: str,
+        context_lines: int,
+        max_results: int = 100,
+    ) -> list[SearchResult]:
+        """SearchResults (one per line, with current file content) for index hits"""
+        lines_by_path: dict[str, set[int]] = defaultdict(set)
+        for hit in hits:
+            path = hit["path"]
+            if self._matches_pattern(path, file_pattern) and hit["line"]:
+                lines_by_path[path].add(hit["line"])
+
+        results = []
+        for path, line_numbers in lines_by_path.items():
+            try:
+                with open(self.project_root / path, encoding="utf-8", errors="ignore") as f:
+                    lines = f.readlines()
+            except OSError as e:
+                logger.warning(f"Error reading {path}: {e}")
+                continue
+
+            for line_number in sorted(line_numbers):
+                i = line_number - 1
+                if i >= len(lines):
+                    continue
+                start = max(0, i - context_lines)
+                end = min(len(lines), i + context_lines + 1)
+                results.append(
+                    SearchResult(
+                        file_path=path,
+                        line_number=line_number,
+                        line_content=lines[i].rstrip(),
+                        context_before=[l.rstrip() for l in lines[start:i]],
+                        context_after=[l.rstrip() for l in lines[i + 1 : end]],
+                    )
+                )
+                if len(results) >= max_results:
+                    return results
+
+        return results
+
+    @staticmethod
+    def _matches_pattern(relative_path: str, file_pattern: str) -> bool:
+        """Glob match of a relative path, same result as Path.glob(file_pattern)"""
+        parts = tuple(part for part in relative_path.replace("\\", "/").split("/") if part)
+        pattern = tuple(part for part in file_pattern.split("/") if part not in ("", "."))
+        return _glob_match(parts, pattern)
+
+    def _indexed_candidates(self, pattern: str, file_pattern: str) -> list[Path] | None:
+        """Files that may match (trigram index), None if all files must be scanned"""
+        if not self.use_index:
+            return None
+        query = regex_trigrams(pattern)
+        if query is None:
+            return None
+
+        try:
+            if self._trigram_index is None:
+                self._trigram_index = TrigramIndex(
+                    self.project_root, self.trigram_db_path, self._should_ignore
+                )
+            if (
+                self._trigram_refreshed is None
+                or time.monotonic() - self._trigram_refreshed >= get_refresh_interval()
+            ):
+                self._trigram_index.refresh()
+                self._trigram_refreshed = time.monotonic()
+            paths = self._trigram_index.candidates(query)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            logger.warning(f"Trigram index unavailable, scanning all files: {e}")
+            self.use_index = False
+            return None
+
+        return [
+            self.project_root / path for path in paths
+            if self._matches_pattern(path, file_pattern)
+            and not self._should_ignore(self.project_root / path)
+        ]
+
     def _find_files(self, file_pattern: str) -> list[Path]:
         """Find files matching pattern"""
         matching_files = []
@@ -184,24 +408,24 @@ class LightweightCodeSearch:
 
     def _should_ignore(self, file_path: Path) -> bool:
         """Check if file/directory should be ignored"""
-        parts = file_path.parts
+        patterns = self.default_ignore_patterns
 
-        for ignore_pattern in self.default_ignore_patterns:
-            if "*" in ignore_pattern:
-                # Wildcard pattern
-                if file_path.match(ignore_pattern):
-                    return True
-            else:
-                # Exact match in path
-                if ignore_pattern in parts:
-                    return True
+        # Exact match in path
+        if any(pattern in patterns for pattern in file_path.parts):
+            return True
 
-        return False
+        # Wildcard pattern (single-part patterns only need the name)
+        name = file_path.name
+        return any(
+            file_path.match(pattern) if "/" in pattern else fnmatchcase(name, pattern)
+            for pattern in patterns
+            if "*" in pattern
+        )
 
     def _search_file(
         self, file_path: Path, regex: re.Pattern, context_lines: int, max_results: int
     ) -> list[SearchResult]:
-        """Search single file for pattern"""
+        """Search single file for pattern (line by line, without the scan engine)"""
         results = []
 
         try:
@@ -9,12 +9,14 @@ import base64
 import json
 import logging
 import re
-import urllib.parse
-import urllib.request
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
+import httpx
+
+from utils.http_clients import get_http_client_registry
+
 logger = logging.getLogger(__name__)
 
 # Import OpenAI service for AI-powered diagram generation
@@ -548,12 +550,11 @@ Return ONLY the Mermaid code (no ```mermaid wrapper, no explanations):"""
 
             logger.info("🎨 Converting Mermaid to SVG via mermaid.ink...")
 
-            # Fetch SVG
-            request = urllib.request.Request(url)
-            request.add_header("User-Agent", "KI-AutoAgent/5.8.7")
-
-            with urllib.request.urlopen(request, timeout=10) as response:
-                svg_content = response.read().decode("utf-8")
+            # Fetch SVG (pooled keep-alive client)
+            client = get_http_client_registry().sync_client("mermaid.ink", timeout=10)
+            response = client.get(url, headers={"User-Agent": "KI-AutoAgent/5.8.7"})
+            response.raise_for_status()
+            svg_content = response.text
 
             if svg_content and "<svg" in svg_content:
                 logger.info("✅ Mermaid converted to SVG successfully")
@@ -562,11 +563,11 @@ Return ONLY the Mermaid code (no ```mermaid wrapper, no explanations):"""
                 logger.warning("⚠️ Mermaid.ink returned invalid SVG")
                 return None
 
-        except urllib.error.HTTPError as e:
-            logger.error(f"❌ Mermaid.ink API error: {e.code} - {e.reason}")
+        except httpx.HTTPStatusError as e:
+            logger.error(f"❌ Mermaid.ink API error: {e.response.status_code} - {e.response.reason_phrase}")
             return None
-        except urllib.error.URLError as e:
-            logger.error(f"❌ Network error converting Mermaid to SVG: {e.reason}")
+        except httpx.TransportError as e:
+            logger.error(f"❌ Network error converting Mermaid to SVG: {e}")
             return None
         except Exception as e:
             logger.error(f"❌ Failed to convert Mermaid to SVG: {e}")
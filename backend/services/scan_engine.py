@@ -0,0 +1,302 @@
+"""
+Parallel mmap Scan Engine for Code Search
+
+LightweightCodeSearch read every file into Python strings and ran the
+regex line by line, one file after the other. The scan engine:
+
+- memory-maps each file and runs the compiled regex over the raw bytes
+  (one C-level search per match instead of one Python iteration per line)
+- skips files that lack the trigrams the regex requires (substring
+  checks on lowercased chunks of the mapping) without running the regex
+- never copies a whole file into Python memory: the prefilter and the
+  ASCII/CR checks work chunk-wise (_CHUNK_BYTES), the regex runs on the
+  mapping itself
+- only decodes the lines that match (plus their context)
+- scans files on a thread pool, reading ahead of the consumer
+- streams results in file order and stops scheduling files as soon as
+  max_results is reached
+
+Line semantics are the same as the line-by-line scan: a bytes match only
+nominates its line, which is then verified with the original (str) regex.
+Non-ASCII patterns and files with non-ASCII bytes or carriage returns,
+where bytes and str regex semantics differ (\\w, IGNORECASE, $ before
+\\r\\n), are scanned line by line - as are patterns with \\A, \\Z or
+lookbehinds, which would see the whole file instead of one line.
+
+Configuration:
+- KI_CODE_SEARCH_WORKERS   scan threads (default min(8, CPUs))
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import re
+import threading
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from .trigram_index import regex_trigrams
+
+logger = logging.getLogger(__name__)
+
+# Anchors and lookbehinds whose meaning differs between one line and the
+# whole file (a lookbehind at line start would see the previous "\n")
+_WHOLE_TEXT_ANCHORS = re.compile(r"\\[AZ]|\(\?<[=!]")
+
+# Bytes copied at a time for the prefilter and line counting
+_CHUNK_BYTES = 1 << 20
+
+
+def get_scan_workers() -> int:
+    try:
+        return max(1, int(os.environ.get("KI_CODE_SEARCH_WORKERS", min(8, os.cpu_count() or 1))))
+    except ValueError:
+        return min(8, os.cpu_count() or 1)
+
+
+@dataclass
+class ScanMatch:
+    """One matching line (converted to SearchResult by the caller)."""
+
+    file_path: Path
+    line_number: int
+    line_content: str
+    context_before: list[str]
+    context_after: list[str]
+
+
+class ScanPattern:
+    """A search regex compiled for both scan paths."""
+
+    def __init__(self, regex: re.Pattern):
+        self.regex = regex
+        # Trigrams a matching file must contain (cheap per-file prefilter)
+        self.trigrams = [
+            [trigram.encode("ascii") for trigram in alternative]
+            for alternative in regex_trigrams(regex.pattern) or []
+        ]
+        self.bytes_regex: re.Pattern | None = None
+        if regex.pattern.isascii() and not _WHOLE_TEXT_ANCHORS.search(regex.pattern):
+            try:
+                self.bytes_regex = re.compile(
+                    regex.pattern.encode("ascii"),
+                    (regex.flags & re.IGNORECASE) | re.MULTILINE
+                )
+            except re.error:
+                self.bytes_regex = None
+
+
+def _count_newlines(buffer: mmap.mmap, start: int, end: int) -> int:
+    """Newlines in buffer[start:end], counted chunk-wise."""
+    return sum(
+        buffer[chunk:min(end, chunk + _CHUNK_BYTES)].count(b"\n")
+        for chunk in range(start, end, _CHUNK_BYTES)
+    )
+
+
+def _prefilter(buffer: mmap.mmap, trigrams: list[list[bytes]]) -> bool | None:
+    """
+    Chunk-wise checks before the bytes regex scan.
+
+    Returns:
+        None if the file needs the line scan (carriage returns or non-ASCII
+        bytes), False if it lacks the required trigrams, True otherwise
+    """
+    needed = {trigram for alternative in trigrams for trigram in alternative}
+    found: set[bytes] = set()
+    tail = b""
+    for start in range(0, len(buffer), _CHUNK_BYTES):
+        chunk = buffer[start:start + _CHUNK_BYTES]
+        if b"\r" in chunk or not chunk.isascii():
+            return None
+        if needed - found:
+            # The last 2 bytes of the previous chunk catch trigrams across the boundary
+            window = tail + chunk.lower()
+            found.update(trigram for trigram in needed - found if trigram in window)
+            tail = window[-2:]
+
+    return not trigrams or any(all(t in found for t in alternative) for alternative in trigrams)
+
+
+def _decode(line: bytes) -> str:
+    return line.decode("utf-8", errors="ignore").rstrip()
+
+
+def _scan_lines(
+    path: Path, pattern: ScanPattern, context_lines: int, max_results: int, stop: threading.Event
+) -> list[ScanMatch]:
+    """Line-by-line scan (str regex)."""
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        lines = f.readlines()
+
+    matches = []
+    for i, line in enumerate(lines):
+        if len(matches) >= max_results or stop.is_set():
+            break
+        if pattern.regex.search(line):
+            start = max(0, i - context_lines)
+            end = min(len(lines), i + context_lines + 1)
+            matches.append(ScanMatch(
+                file_path=path,
+                line_number=i + 1,
+                line_content=line.rstrip(),
+                context_before=[l.rstrip() for l in lines[start:i]],
+                context_after=[l.rstrip() for l in lines[i + 1:end]],
+            ))
+    return matches
+
+
+def _scan_mmap(
+    path: Path,
+    buffer: mmap.mmap,
+    pattern: ScanPattern,
+    context_lines: int,
+    max_results: int,
+    stop: threading.Event,
+) -> list[ScanMatch]:
+    """Whole-buffer bytes regex; each nominated line is verified with the str regex."""
+    matches = []
+    size = len(buffer)
+    pos = 0
+    counted_to = 0
+    line_number = 1
+
+    while pos < size and len(matches) < max_results and not stop.is_set():
+        found = pattern.bytes_regex.search(buffer, pos)
+        if found is None:
+            break
+        if found.start() == size and buffer[size - 1] == ord("\n"):
+            break  # Empty match after the final newline - not a line
+
+        line_start = buffer.rfind(b"\n", 0, found.start()) + 1
+        line_end = buffer.find(b"\n", found.start())
+        line_end = size if line_end == -1 else line_end + 1
+
+        line_number += _count_newlines(buffer, counted_to, line_start)
+        counted_to = line_start
+
+        line = buffer[line_start:line_end]
+        if pattern.regex.search(line.decode("utf-8", errors="ignore")):
+            before_start = line_start
+            for _ in range(context_lines):
+                if before_start == 0:
+                    break
+                before_start = buffer.rfind(b"\n", 0, before_start - 1) + 1
+
+            after_end = line_end
+            for _ in range(context_lines):
+                if after_end >= size:
+                    break
+                next_end = buffer.find(b"\n", after_end)
+                after_end = size if next_end == -1 else next_end + 1
+
+            matches.append(ScanMatch(
+                file_path=path,
+                line_number=line_number,
+                line_content=_decode(line),
+                context_before=[_decode(l) for l in buffer[before_start:line_start].splitlines()],
+                context_after=[_decode(l) for l in buffer[line_end:after_end].splitlines()],
+            ))
+
+        # A line is reported at most once; continue with the next one
+        pos = line_end
+
+    return matches
+
+
+def scan_file(
+    path: Path,
+    pattern: ScanPattern,
+    context_lines: int = 2,
+    max_results: int = 100,
+    stop: threading.Event | None = None,
+) -> list[ScanMatch]:
+    """Matching lines of one file (at most max_results)."""
+    stop = stop or threading.Event()
+    if pattern.bytes_regex is None:
+        return _scan_lines(path, pattern, context_lines, max_results, stop)
+
+    with open(path, "rb") as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            return []
+
+    with buffer:
+        candidate = _prefilter(buffer, pattern.trigrams)
+        if candidate is None:
+            return _scan_lines(path, pattern, context_lines, max_results, stop)
+        if not candidate:
+            return []
+        return _scan_mmap(path, buffer, pattern, context_lines, max_results, stop)
+
+
+def scan_files(
+    files: Iterable[Path],
+    regex: re.Pattern,
+    context_lines: int = 2,
+    max_results: int = 100,
+    workers: int | None = None,
+) -> Iterator[ScanMatch]:
+    """
+    Scan files on a thread pool and stream matches in file order.
+
+    Up to 2 x workers files are scanned ahead of the consumer. Once
+    max_results matches were yielded (or the consumer stops iterating),
+    pending files are cancelled.
+    """
+    if max_results <= 0:
+        return
+
+    pattern = ScanPattern(regex)
+    workers = workers or get_scan_workers()
+    stop = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="code-search")
+    files = iter(files)
+    window: deque[tuple[Path, Future]] = deque()
+
+    def submit_next() -> None:
+        path = next(files, None)
+        if path is not None:
+            future = pool.submit(scan_file, path, pattern, context_lines, max_results, stop)
+            window.append((path, future))
+
+    try:
+        for _ in range(workers * 2):
+            submit_next()
+
+        found = 0
+        while window:
+            path, future = window.popleft()
+            try:
+                file_matches = future.result()
+            except Exception as e:
+                logger.warning(f"Error searching {path}: {e}")
+                file_matches = []
+
+            for match in file_matches:
+                yield match
+                found += 1
+                if found >= max_results:
+                    return
+            submit_next()
+    finally:
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+__all__ = [
+    "ScanMatch",
+    "ScanPattern",
+    "get_scan_workers",
+    "scan_file",
+    "scan_files",
+]
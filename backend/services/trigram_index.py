@@ -0,0 +1,278 @@
+"""
+Trigram Index for Regex Code Search
+
+LightweightCodeSearch.search globbed the project and ran the regex over
+every file - each query cost time linear in the size of the repository.
+The trigram index narrows the candidate files first:
+
+- Every indexed file is reduced to the set of (lowercased, ASCII) three
+  character substrings of its lines; posting lists map trigram → files
+- The literal runs a regex requires are extracted from its parse tree
+  ("def\\s+load_config" needs "def", "loa", "oad", ...); alternations
+  become an OR of such AND queries
+- Only files containing all trigrams of one alternative are scanned with
+  the regex. Files that can't be indexed (binary, too large) are always
+  scanned.
+
+Patterns without extractable trigrams (".*", "\\w+\\(", ...) return no
+query and the caller falls back to a full scan.
+
+refresh() keeps the index current: it walks the tree (ignored directories
+pruned) and re-reads only files whose size or mtime changed.
+
+Location: $WORKSPACE/.ki_autoagent_ws/cache/trigrams.db
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re._parser as sre_parse
+import sqlite3
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Bump when the tables or the trigram extraction change
+SCHEMA_VERSION = 1
+
+# Larger files are not indexed (always scanned)
+MAX_FILE_BYTES = 1_000_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, indexed INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    trigram TEXT NOT NULL, file_id INTEGER NOT NULL, PRIMARY KEY (trigram, file_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_file ON postings (file_id);
+"""
+
+_REPEATS = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, sre_parse.POSSESSIVE_REPEAT}
+
+
+def extract_trigrams(text: str) -> set[str]:
+    """Trigrams of a text: lowercased, ASCII only, never spanning a line break."""
+    text = text.lower()
+    return {
+        text[i:i + 3] for i in range(len(text) - 2)
+        if text[i:i + 3].isascii() and "\n" not in text[i:i + 3]
+    }
+
+
+def _required_trigrams(sequence: Any) -> set[str]:
+    """Trigrams every match of a (branch-free) sequence contains."""
+    trigrams: set[str] = set()
+    run: list[str] = []
+
+    for op, av in sequence:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+
+        trigrams |= extract_trigrams("".join(run))
+        run = []
+        if op is sre_parse.SUBPATTERN:
+            trigrams |= _required_trigrams(av[-1])
+        elif op in _REPEATS and av[0] >= 1:
+            trigrams |= _required_trigrams(av[2])
+        elif op is sre_parse.ATOMIC_GROUP:
+            trigrams |= _required_trigrams(av)
+
+    return trigrams | extract_trigrams("".join(run))
+
+
+def _alternatives(sequence: Any) -> list[set[str]]:
+    # Zero-width assertions (^, \b) don't change what a match contains
+    items = [(op, av) for op, av in sequence if op is not sre_parse.AT]
+    if len(items) == 1:
+        op, av = items[0]
+        if op is sre_parse.BRANCH:
+            return [alt for branch in av[1] for alt in _alternatives(branch)]
+        if op is sre_parse.SUBPATTERN:
+            return _alternatives(av[-1])
+    return [_required_trigrams(sequence)]
+
+
+def regex_trigrams(pattern: str) -> list[set[str]] | None:
+    """
+    Trigram query of a regex: a file can only match if it contains all
+    trigrams of at least one alternative.
+
+    Returns:
+        [{trigram, ...}, ...] (OR of ANDs), or None if the pattern can't be
+        narrowed down (full scan needed)
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        return None
+
+    alternatives = _alternatives(parsed)
+    if not alternatives or any(not trigrams for trigrams in alternatives):
+        return None
+    return alternatives
+
+
+class TrigramIndex:
+    """Persistent trigram posting lists of one project."""
+
+    def __init__(self, root_path: str | Path, db_path: str | Path, should_ignore: Callable[[Path], bool]):
+        self.root_path = Path(root_path)
+        self.db_path = Path(db_path)
+        self.should_ignore = should_ignore
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            with self._conn:
+                self._conn.execute("DROP TABLE IF EXISTS postings")
+                self._conn.execute("DROP TABLE IF EXISTS files")
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _walk(self) -> dict[str, os.stat_result]:
+        """Files of the project (ignored directories are not entered)."""
+        files = {}
+        root = str(self.root_path)
+        stack = [root]
+        while stack:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                if self.should_ignore(Path(entry.path)):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        relative_path = entry.path[len(root):].lstrip(os.sep)
+                        files[relative_path.replace(os.sep, "/")] = entry.stat()
+                except OSError:
+                    continue
+        return files
+
+    def refresh(self) -> dict[str, int]:
+        """
+        Re-index added/modified files, drop deleted ones.
+
+        Returns:
+            {"updated": files (re-)indexed, "deleted": files dropped}
+        """
+        current = self._walk()
+
+        with self._lock:
+            known = {
+                path: (file_id, size, mtime_ns)
+                for file_id, path, size, mtime_ns in self._conn.execute(
+                    "SELECT id, path, size, mtime_ns FROM files"
+                )
+            }
+            changed = [
+                path for path, stat in current.items()
+                if known.get(path, (None,))[1:] != (stat.st_size, stat.st_mtime_ns)
+            ]
+            deleted = [path for path in known if path not in current]
+
+            if changed or deleted:
+                with self._conn:
+                    for path in changed + deleted:
+                        if path in known:
+                            self._delete_file(known[path][0])
+                    for path in changed:
+                        self._insert_file(path, current[path])
+
+        if changed or deleted:
+            logger.debug(f"🔍 Trigram index: {len(changed)} files updated, {len(deleted)} removed")
+        return {"updated": len(changed), "deleted": len(deleted)}
+
+    def _delete_file(self, file_id: int) -> None:
+        self._conn.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+        self._conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    def _insert_file(self, path: str, stat: os.stat_result) -> None:
+        trigrams: set[str] = set()
+        indexed = 0
+        if stat.st_size <= MAX_FILE_BYTES:
+            try:
+                with open(self.root_path / path, "rb") as f:
+                    content = f.read()
+                if b"\0" not in content[:8192]:
+                    # Same decoding as the regex scan
+                    trigrams = extract_trigrams(content.decode("utf-8", errors="ignore"))
+                    indexed = 1
+            except OSError as e:
+                logger.debug(f"Trigram index: can't read {path}: {e}")
+
+        cursor = self._conn.execute(
+            "INSERT INTO files (path, size, mtime_ns, indexed) VALUES (?, ?, ?, ?)",
+            (path, stat.st_size, stat.st_mtime_ns, indexed)
+        )
+        file_id = cursor.lastrowid
+        self._conn.executemany(
+            "INSERT INTO postings (trigram, file_id) VALUES (?, ?)",
+            [(trigram, file_id) for trigram in trigrams]
+        )
+
+    def candidates(self, query: list[set[str]]) -> list[str]:
+        """Relative paths of files that may match a regex_trigrams() query."""
+        with self._lock:
+            file_ids: set[int] = {
+                row[0] for row in self._conn.execute("SELECT id FROM files WHERE indexed = 0")
+            }
+            for trigrams in query:
+                matching: set[int] | None = None
+                for trigram in trigrams:
+                    ids = {
+                        row[0] for row in self._conn.execute(
+                            "SELECT file_id FROM postings WHERE trigram = ?", (trigram,)
+                        )
+                    }
+                    matching = ids if matching is None else matching & ids
+                    if not matching:
+                        break
+                file_ids |= matching or set()
+
+            if not file_ids:
+                return []
+            paths = []
+            for (file_id, path) in self._conn.execute("SELECT id, path FROM files"):
+                if file_id in file_ids:
+                    paths.append(path)
+        return sorted(paths)
+
+    def statistics(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "files": self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0],
+                "unindexed_files": self._conn.execute(
+                    "SELECT COUNT(*) FROM files WHERE indexed = 0"
+                ).fetchone()[0],
+                "postings": self._conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0],
+            }
+
+
+__all__ = [
+    "MAX_FILE_BYTES",
+    "TrigramIndex",
+    "extract_trigrams",
+    "regex_trigrams",
+]
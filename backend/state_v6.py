@@ -288,6 +288,11 @@ class ReviewFixState(TypedDict):
     }
     """
 
+    # Loop control (convergence policy - see subgraphs/convergence_policy.py)
+    score_history: list[float]  # quality_score per iteration
+    finding_signatures: list[str]  # findings fingerprint per iteration
+    stop_reason: str  # Why the loop stopped (or continues)
+
     # Fix results
     fixes_applied: list[dict[str, Any]]
     """
@@ -444,6 +449,9 @@ def supervisor_to_reviewfix(state: SupervisorState) -> ReviewFixState:
         "fixes_applied": [],
         "iteration": 0,
         "should_continue": True,
+        "score_history": [],
+        "finding_signatures": [],
+        "stop_reason": "",
         "errors": []
     }
 
@@ -459,7 +467,9 @@ def reviewfix_to_supervisor(reviewfix_state: ReviewFixState) -> dict[str, Any]:
             "quality_score": reviewfix_state["quality_score"],
             "feedback": reviewfix_state["review_feedback"],
             "fixes_applied": reviewfix_state["fixes_applied"],
-            "iterations": reviewfix_state["iteration"]
+            "iterations": reviewfix_state["iteration"],
+            "score_history": reviewfix_state.get("score_history", []),
+            "stop_reason": reviewfix_state.get("stop_reason", "")
         }
     }
 
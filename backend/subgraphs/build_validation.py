@@ -0,0 +1,427 @@
+"""
+Build Validation for ReviewFix
+
+Runs the real toolchain checks on generated projects:
+
+- TypeScript: tsc --noEmit --incremental (needs tsconfig.json + package.json)
+- Python: mypy through the dmypy daemon (falls back to mypy with a
+  persistent cache dir when the daemon cannot start)
+- JavaScript: eslint --format json, only on changed files
+
+All checks run concurrently as async subprocesses (no blocking
+subprocess.run on the event loop). Warm state is kept between ReviewFix
+iterations, per workspace:
+
+- tsc build info and mypy/eslint caches under .ki_autoagent_ws/cache/build/
+- the dmypy daemon stays up while the workflow runs; it is stopped when
+  the workflow ends (release_build_validator()), when its validator was
+  idle for KI_BUILD_IDLE_SECONDS, or by shutdown_build_validators()
+- a check whose input files did not change since its last run is not
+  re-run; its previous result is reused
+
+Checks run for EVERY language present (polyglot projects). Missing tools
+are skipped with a warning, not reported as errors.
+
+Configuration (environment):
+    KI_BUILD_CHECK_TIMEOUT=<seconds>   per check (default 60)
+    KI_BUILD_DMYPY=0                   disable the mypy daemon
+    KI_BUILD_IDLE_SECONDS=<seconds>    stop idle validators (default 600)
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_IDLE_SECONDS = 600.0
+
+MYPY_ARGS = ["--ignore-missing-imports", "--no-strict-optional"]
+
+# "path.py:12: error: ..." / "path.py:12:5: error: ..." (mypy error line)
+_MYPY_ERROR_PATTERN = re.compile(r"^\S[^\n]*?:\d+(?::\d+)?: error:", re.MULTILINE)
+
+
+class BuildCheckUnavailable(RuntimeError):
+    """The checker is not installed - the check is skipped."""
+
+
+def _hash_file(path: str) -> str | None:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class BuildValidator:
+    """Async, incremental build checks for one workspace."""
+
+    def __init__(self, workspace_path: str, timeout: float | None = None):
+        self.workspace_path = workspace_path
+        self.timeout = timeout or float(os.environ.get("KI_BUILD_CHECK_TIMEOUT", DEFAULT_TIMEOUT))
+        self.cache_dir = os.path.join(workspace_path, ".ki_autoagent_ws", "cache", "build")
+        self.use_dmypy = os.environ.get("KI_BUILD_DMYPY", "1").lower() not in ("0", "false", "no")
+
+        # check → {path: content hash} of its inputs at the last run
+        self._snapshots: dict[str, dict[str, str | None]] = {}
+        # check → errors of the last run
+        self._results: dict[str, list[dict[str, Any]]] = {}
+        # eslint: path → error text of the last lint ("" = clean)
+        self._eslint_files: dict[str, str] = {}
+
+        self.dmypy_started = False
+        self.last_used = time.monotonic()
+        self.stats = {"runs": 0, "reused": 0}
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    async def _exec(self, cmd: list[str], cwd: str | None = None) -> tuple[int, str]:
+        """Run a checker; returns (returncode, stdout + stderr)."""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                cwd=cwd or self.workspace_path,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+        except FileNotFoundError as e:
+            raise BuildCheckUnavailable(str(e)) from e
+
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+        return process.returncode, stdout.decode(errors="replace") + stderr.decode(errors="replace")
+
+    def _changed(self, check: str, paths: list[str]) -> list[str] | None:
+        """
+        Inputs of a check that changed since its last run.
+
+        Returns None on the first run, [] when nothing changed.
+        """
+        snapshot = {
+            path: _hash_file(os.path.join(self.workspace_path, path)) for path in paths
+        }
+        previous = self._snapshots.get(check)
+        self._snapshots[check] = snapshot
+        if previous is None:
+            return None
+        return [path for path in set(snapshot) | set(previous) if snapshot.get(path) != previous.get(path)]
+
+    def _error(self, check: str, text: str) -> list[dict[str, Any]]:
+        return [{"type": check, "errors": text}]
+
+    # ------------------------------------------------------------------
+    # TypeScript
+    # ------------------------------------------------------------------
+
+    async def _check_typescript(self, ts_files: list[str]) -> list[dict[str, Any]]:
+        check = "typescript_compilation"
+        tsconfig_path = os.path.join(self.workspace_path, 'tsconfig.json')
+        package_json_path = os.path.join(self.workspace_path, 'package.json')
+
+        if not (os.path.exists(tsconfig_path) and os.path.exists(package_json_path)):
+            logger.warning("⚠️  No tsconfig.json or package.json found - skipping TS compilation check")
+            return []
+
+        changed = self._changed(check, ts_files + ['tsconfig.json', 'package.json'])
+        if changed == [] and check in self._results:
+            self.stats["reused"] += 1
+            logger.info("♻️ TypeScript sources unchanged - reusing last tsc result")
+            return self._results[check]
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        logger.info("🔬 Running TypeScript compilation check (tsc --noEmit --incremental)...")
+
+        try:
+            returncode, output = await self._exec([
+                'npx', 'tsc', '--noEmit', '--incremental',
+                '--tsBuildInfoFile', os.path.join(self.cache_dir, 'tsconfig.tsbuildinfo')
+            ])
+        except BuildCheckUnavailable:
+            logger.warning("⚠️  npx not found - skipping TS compilation check")
+            return []
+        except asyncio.TimeoutError:
+            logger.error(f"❌ TypeScript compilation timeout ({self.timeout:.0f}s)")
+            self._snapshots.pop(check, None)
+            return self._error(check, f"Compilation timeout after {self.timeout:.0f} seconds")
+
+        self.stats["runs"] += 1
+        if returncode == 0:
+            logger.info("✅ TypeScript compilation passed!")
+            errors = []
+        else:
+            logger.error("❌ TypeScript compilation failed!")
+            logger.error(f"   Errors:\n{output}")
+            errors = self._error(check, output)
+
+        self._results[check] = errors
+        return errors
+
+    # ------------------------------------------------------------------
+    # Python
+    # ------------------------------------------------------------------
+
+    async def _run_dmypy(self, paths: list[str]) -> tuple[int, str] | None:
+        """dmypy run (starts the daemon on first use); None if the daemon is unusable."""
+        status_file = os.path.join(self.cache_dir, "dmypy.json")
+        returncode, output = await self._exec(
+            ['python3', '-m', 'mypy.dmypy', '--status-file', status_file, 'run', '--', *paths, *MYPY_ARGS]
+        )
+        self.dmypy_started = True
+        # 0 = clean, 1 = type errors, 2 = blocking errors (e.g. a syntax
+        # error in generated code) or a daemon failure
+        if returncode in (0, 1) or (returncode == 2 and _MYPY_ERROR_PATTERN.search(output)):
+            return returncode, output
+        logger.warning(f"⚠️  dmypy failed (code {returncode}) - using mypy with cache")
+        logger.debug(f"   dmypy output:\n{output}")
+        self.use_dmypy = False
+        return None
+
+    async def _check_python(self, python_files: list[str]) -> list[dict[str, Any]]:
+        check = "python_mypy"
+        changed = self._changed(check, python_files)
+        if changed == [] and check in self._results:
+            self.stats["reused"] += 1
+            logger.info("♻️ Python sources unchanged - reusing last mypy result")
+            return self._results[check]
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        paths = [os.path.join(self.workspace_path, f) for f in python_files]
+        logger.info(
+            f"🔬 Running Python mypy type check ({len(python_files)} files, "
+            f"{'all' if changed is None else len(changed)} changed)..."
+        )
+
+        try:
+            result = await self._run_dmypy(paths) if self.use_dmypy else None
+            if result is None:
+                result = await self._exec(
+                    ['python3', '-m', 'mypy', *paths, *MYPY_ARGS,
+                     '--cache-dir', os.path.join(self.cache_dir, 'mypy_cache')]
+                )
+            returncode, output = result
+        except BuildCheckUnavailable:
+            logger.warning("⚠️  python3 not found - skipping Python type check")
+            return []
+        except asyncio.TimeoutError:
+            logger.error(f"❌ Python mypy timeout ({self.timeout:.0f}s)")
+            self._snapshots.pop(check, None)
+            return self._error(check, f"Mypy type check timeout after {self.timeout:.0f} seconds")
+
+        if "No module named mypy" in output:
+            logger.warning("⚠️  mypy not installed - skipping Python type check")
+            logger.warning("   Install with: pip install mypy")
+            self._snapshots.pop(check, None)
+            return []
+
+        self.stats["runs"] += 1
+        if returncode == 0:
+            logger.info("✅ Python mypy type check passed!")
+            errors = []
+        else:
+            logger.error("❌ Python mypy type check failed!")
+            logger.error(f"   Errors:\n{output}")
+            errors = self._error(check, output)
+
+        self._results[check] = errors
+        return errors
+
+    # ------------------------------------------------------------------
+    # JavaScript
+    # ------------------------------------------------------------------
+
+    async def _check_javascript(self, javascript_files: list[str]) -> list[dict[str, Any]]:
+        check = "javascript_eslint"
+        changed = self._changed(check, javascript_files)
+        to_lint = javascript_files if changed is None else [f for f in changed if f in javascript_files]
+
+        # Deleted/removed files no longer count
+        self._eslint_files = {f: t for f, t in self._eslint_files.items() if f in javascript_files}
+
+        if to_lint:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            logger.info(f"🔬 Running JavaScript ESLint check ({len(to_lint)}/{len(javascript_files)} files)...")
+
+            try:
+                returncode, output = await self._exec([
+                    'npx', 'eslint', '--format', 'json',
+                    '--cache', '--cache-location', os.path.join(self.cache_dir, 'eslintcache'),
+                    *[os.path.join(self.workspace_path, f) for f in to_lint]
+                ])
+            except BuildCheckUnavailable:
+                logger.warning("⚠️  ESLint not found - skipping JavaScript linting")
+                logger.warning("   Install with: npm install --save-dev eslint")
+                return []
+            except asyncio.TimeoutError:
+                logger.error(f"❌ JavaScript ESLint timeout ({self.timeout:.0f}s)")
+                self._snapshots.pop(check, None)
+                return self._error(check, f"ESLint check timeout after {self.timeout:.0f} seconds")
+
+            # ESLint returns 0 for no errors, 1 for errors, 2 for fatal errors
+            if returncode not in (0, 1):
+                logger.error(f"❌ JavaScript ESLint fatal error (code {returncode})")
+                logger.error(f"   Output:\n{output}")
+                # Don't fail build on configuration issues
+                logger.warning("   Continuing without ESLint check")
+                self._snapshots.pop(check, None)
+                return []
+
+            self.stats["runs"] += 1
+            try:
+                start = output.index("[")
+                reports, _ = json.JSONDecoder().raw_decode(output[start:])
+            except ValueError:
+                reports = []
+                if returncode == 1:
+                    self._eslint_files[to_lint[0]] = output
+
+            for report in reports:
+                rel_path = os.path.relpath(report.get("filePath", ""), self.workspace_path)
+                self._eslint_files[rel_path] = "\n".join(
+                    f"{rel_path}:{m.get('line', 0)}: {m.get('message', '')} ({m.get('ruleId')})"
+                    for m in report.get("messages", [])
+                    if m.get("severity") == 2
+                )
+        else:
+            self.stats["reused"] += 1
+            logger.info("♻️ JavaScript sources unchanged - reusing last ESLint result")
+
+        failing = {f: text for f, text in self._eslint_files.items() if text}
+        if failing:
+            logger.error(f"❌ JavaScript ESLint check failed ({len(failing)} files)!")
+            return self._error(check, "\n".join(failing.values()))
+
+        logger.info("✅ JavaScript ESLint check passed!")
+        return []
+
+    # ------------------------------------------------------------------
+    # Entry point
+    # ------------------------------------------------------------------
+
+    async def run(self, generated_files: list[dict[str, Any]]) -> tuple[bool, list[dict[str, Any]]]:
+        """
+        Run all applicable checks concurrently.
+
+        Returns:
+            (build_validation_passed, build_errors) - each error is
+            {"type": "typescript_compilation" | "python_mypy" | "javascript_eslint", "errors": str}
+        """
+        self.last_used = time.monotonic()
+        paths = [f.get('path', '') for f in generated_files if f.get('path')]
+        ts_files = [p for p in paths if p.endswith(('.ts', '.tsx'))]
+        python_files = [p for p in paths if p.endswith('.py')]
+        javascript_files = [p for p in paths if p.endswith(('.js', '.jsx'))]
+
+        checks = []
+        if ts_files:
+            logger.info("📘 Project Type: TypeScript")
+            checks.append(self._check_typescript(ts_files))
+        if python_files:
+            logger.info("🐍 Project Type: Python")
+            checks.append(self._check_python(python_files))
+        if javascript_files:
+            logger.info("📙 Project Type: JavaScript")
+            checks.append(self._check_javascript(javascript_files))
+
+        results = await asyncio.gather(*checks, return_exceptions=True)
+
+        build_errors: list[dict[str, Any]] = []
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error(f"❌ Build check failed: {result}")
+                build_errors.append({"type": "build_check", "errors": str(result)})
+            else:
+                build_errors.extend(result)
+
+        return not build_errors, build_errors
+
+    async def shutdown(self) -> None:
+        """Stop the dmypy daemon (if this validator started one)."""
+        if not self.dmypy_started:
+            return
+        try:
+            await self._exec([
+                'python3', '-m', 'mypy.dmypy',
+                '--status-file', os.path.join(self.cache_dir, "dmypy.json"), 'stop'
+            ])
+        except (BuildCheckUnavailable, asyncio.TimeoutError) as e:
+            logger.warning(f"⚠️  Could not stop dmypy daemon: {e}")
+        self.dmypy_started = False
+
+
+# Validators per workspace (keep warm state between ReviewFix iterations)
+_validators: dict[str, BuildValidator] = {}
+
+
+def get_build_validator(workspace_path: str) -> BuildValidator:
+    """Get the build validator of a workspace."""
+    key = os.path.abspath(workspace_path)
+    if key not in _validators:
+        _validators[key] = BuildValidator(workspace_path)
+    return _validators[key]
+
+
+async def run_build_validation(
+    generated_files: list[dict[str, Any]],
+    workspace_path: str
+) -> tuple[bool, list[dict[str, Any]]]:
+    """Run build checks for all languages in the generated files."""
+    await stop_idle_build_validators()
+    return await get_build_validator(workspace_path).run(generated_files)
+
+
+async def release_build_validator(workspace_path: str) -> None:
+    """Stop the validator (and its mypy daemon) of a workspace - end of a workflow."""
+    validator = _validators.pop(os.path.abspath(workspace_path), None)
+    if validator is not None:
+        await validator.shutdown()
+
+
+async def stop_idle_build_validators(max_idle_seconds: float | None = None) -> int:
+    """Stop validators not used for max_idle_seconds (default KI_BUILD_IDLE_SECONDS)."""
+    if max_idle_seconds is None:
+        max_idle_seconds = float(os.environ.get("KI_BUILD_IDLE_SECONDS", DEFAULT_IDLE_SECONDS))
+    now = time.monotonic()
+    idle = [key for key, validator in _validators.items() if now - validator.last_used > max_idle_seconds]
+    validators = [_validators.pop(key) for key in idle]
+    await asyncio.gather(*(validator.shutdown() for validator in validators), return_exceptions=True)
+    if validators:
+        logger.info(f"🧹 Stopped {len(validators)} idle build validators")
+    return len(validators)
+
+
+async def shutdown_build_validators() -> None:
+    """Stop all mypy daemons (server lifespan)."""
+    await asyncio.gather(
+        *(validator.shutdown() for validator in _validators.values()),
+        return_exceptions=True
+    )
+    _validators.clear()
+
+
+__all__ = [
+    "BuildValidator",
+    "get_build_validator",
+    "release_build_validator",
+    "run_build_validation",
+    "shutdown_build_validators",
+    "stop_idle_build_validators",
+]
@@ -27,10 +27,15 @@ from langchain_core.messages import HumanMessage, SystemMessage
 from langgraph.graph import END, StateGraph
 
 from state_v6 import CodesmithState
-from tools.file_tools import write_file, read_file
-from tools.tree_sitter_tools import TreeSitterAnalyzer
-from security.asimov_rules import validate_asimov_rules, format_violations_report
 from subgraphs.file_validation import validate_generated_files, generate_completion_prompt
+from subgraphs.file_materializer import EarlyFileMaterializer
+from subgraphs.validation_pipeline import run_validation_pipeline
+from subgraphs.design_manifest import (
+    DesignManifest,
+    build_incremental_prompt,
+    is_incremental_enabled,
+    split_design_sections,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -109,9 +114,24 @@ def create_codesmith_subgraph(
                 context_from_memory = "\n".join(context_parts)
                 logger.info(f"✅ Loaded context: {len(context_from_memory)} chars")
 
+            # Step 1.5: Diff the design against the previous generation
+            # (only files mapped to changed design sections are regenerated).
+            # Memory context is excluded: its search results vary between runs.
+            design_sections = split_design_sections(design_content)
+            manifest = DesignManifest.load(workspace_path)
+            if is_incremental_enabled():
+                regeneration_plan = manifest.plan(design_sections)
+            else:
+                regeneration_plan = {"mode": "full", "reason": "incremental regeneration disabled", "keep": []}
+            logger.info(f"🧩 Regeneration mode: {regeneration_plan['mode']} ({regeneration_plan['reason']})")
+
             # Step 2: Generate code with Claude
             logger.info("🤖 Generating code with Claude...")
 
+            # Files written via Edit/Write tools are validated while the CLI
+            # is still generating (instead of after it exits)
+            materializer = EarlyFileMaterializer(workspace_path)
+
             llm = ChatAnthropic(
                 model="claude-sonnet-4-20250514",
                 temperature=0.2,
@@ -121,7 +141,8 @@ def create_codesmith_subgraph(
                 agent_tools=["Read", "Edit", "Bash"],  # NOTE: Write does NOT exist! Use Edit.
                 permission_mode="acceptEdits",
                 hitl_callback=hitl_callback,  # Pass HITL callback for debug info
-                workspace_path=workspace_path  # 🎯 FIX (2025-10-11): Set CWD for subprocess!
+                workspace_path=workspace_path,  # 🎯 FIX (2025-10-11): Set CWD for subprocess!
+                event_listener=materializer.on_event
             )
 
             system_prompt = """You are an expert code generator specializing in clean, maintainable code.
@@ -171,206 +192,62 @@ START YOUR RESPONSE WITH "FILE:" - Nothing else!"""
 
 Generate complete, production-ready code files."""
 
-            response = await llm.ainvoke([
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=user_prompt)
-            ])
+            if regeneration_plan["mode"] == "incremental":
+                user_prompt = build_incremental_prompt(regeneration_plan, design_sections)
 
-            code_output = response.content if hasattr(response, 'content') else str(response)
+            if regeneration_plan["mode"] == "unchanged":
+                logger.info("✅ Design unchanged and all files present - skipping generation")
+                code_output = ""
+            else:
+                try:
+                    response = await llm.ainvoke([
+                        SystemMessage(content=system_prompt),
+                        HumanMessage(content=user_prompt)
+                    ])
+                except Exception:
+                    materializer.cancel()
+                    raise
+
+                code_output = response.content if hasattr(response, 'content') else str(response)
             logger.info(f"✅ Code generated: {len(code_output)} chars")
             logger.debug(f"📄 First 500 chars of generated code:\n{code_output[:500]}")
             logger.debug(f"📄 Last 500 chars of generated code:\n{code_output[-500:]}")
 
-            # Step 3: Parse and write files
+            # Step 3: Parse, validate (in parallel) and write files
             logger.info("📝 Writing files to workspace...")
 
-            generated_files = []
-
-            # Simple parser for FILE: <path> format
-            lines = code_output.split('\n')
-            current_file = None
-            current_code = []
-            in_code_block = False
-
-            # Initialize Tree-sitter analyzer
-            tree_sitter = TreeSitterAnalyzer()
-
-            for line in lines:
-                if line.startswith('FILE:'):
-                    # Save previous file
-                    if current_file and current_code:
-                        file_content = '\n'.join(current_code).strip()
-
-                        # Validate syntax with Tree-sitter BEFORE writing
-                        file_path = current_file.strip()
-                        language = tree_sitter.detect_language(file_path)
-
-                        if language:
-                            logger.info(f"🔍 Validating {file_path} ({language})...")
-                            is_valid = tree_sitter.validate_syntax(file_content, language)
-
-                            if not is_valid:
-                                logger.error(f"❌ Syntax validation failed for {file_path}")
-                                logger.warning(f"⚠️ Skipping file due to syntax errors")
-                                # Don't write invalid files
-                                current_file = line.replace('FILE:', '').strip()
-                                current_code = []
-                                in_code_block = False
-                                continue
-
-                            logger.info(f"✅ Syntax valid for {file_path}")
-                        else:
-                            logger.debug(f"⚠️ No parser for {file_path}, skipping Tree-sitter validation")
-
-                        # Asimov Security Check (for code files)
-                        if language:  # Only check code files
-                            logger.info(f"🔒 Asimov security check for {file_path}...")
-                            asimov_result = validate_asimov_rules(
-                                code=file_content,
-                                file_path=file_path,
-                                strict=False  # Warnings allowed, errors block
-                            )
-
-                            if not asimov_result["valid"]:
-                                # Log violations
-                                report = format_violations_report(asimov_result, file_path)
-                                logger.warning(f"\n{report}")
-
-                                # Count errors (not warnings)
-                                error_count = asimov_result["summary"]["errors"]
-                                if error_count > 0:
-                                    logger.error(f"❌ Asimov Rule violations: {error_count} errors")
-                                    logger.warning(f"⚠️ Skipping file due to Asimov violations")
-                                    current_file = line.replace('FILE:', '').strip()
-                                    current_code = []
-                                    in_code_block = False
-                                    continue
-                                else:
-                                    # Only warnings, write anyway but log
-                                    logger.warning(f"⚠️ Asimov warnings present, but writing file")
-                            else:
-                                logger.info(f"✅ Asimov rules passed for {file_path}")
-
-                        # Write file (tool expects relative path + workspace_path)
-                        try:
-                            await write_file.ainvoke({
-                                "file_path": file_path,
-                                "content": file_content,
-                                "workspace_path": workspace_path
-                            })
-
-                            generated_files.append({
-                                "path": file_path,
-                                "size": len(file_content),
-                                "timestamp": datetime.now().isoformat(),
-                                "validated": language is not None
-                            })
-
-                            logger.debug(f"✅ Wrote {file_path}")
-                        except Exception as e:
-                            logger.error(f"❌ Failed to write {file_path}: {e}")
-
-                    # Start new file
-                    current_file = line.replace('FILE:', '').strip()
-                    current_code = []
-                    in_code_block = False
-
-                elif line.startswith('```'):
-                    if in_code_block:
-                        # End code block
-                        in_code_block = False
-                    else:
-                        # Start code block
-                        in_code_block = True
-
-                elif in_code_block and current_file:
-                    current_code.append(line)
-
-            # Save last file (with validation)
-            if current_file and current_code:
-                file_content = '\n'.join(current_code).strip()
-                file_path = current_file.strip()
-
-                # Validate syntax with Tree-sitter
-                language = tree_sitter.detect_language(file_path)
-
-                if language:
-                    logger.info(f"🔍 Validating {file_path} ({language})...")
-                    is_valid = tree_sitter.validate_syntax(file_content, language)
-
-                    if not is_valid:
-                        logger.error(f"❌ Syntax validation failed for {file_path}")
-                        logger.warning(f"⚠️ Skipping file due to syntax errors")
-                    else:
-                        logger.info(f"✅ Syntax valid for {file_path}")
-
-                        # Asimov Security Check
-                        logger.info(f"🔒 Asimov security check for {file_path}...")
-                        asimov_result = validate_asimov_rules(
-                            code=file_content,
-                            file_path=file_path,
-                            strict=False
-                        )
-
-                        asimov_passed = True
-                        if not asimov_result["valid"]:
-                            report = format_violations_report(asimov_result, file_path)
-                            logger.warning(f"\n{report}")
-
-                            error_count = asimov_result["summary"]["errors"]
-                            if error_count > 0:
-                                logger.error(f"❌ Asimov violations: {error_count} errors")
-                                logger.warning(f"⚠️ Skipping file due to Asimov violations")
-                                asimov_passed = False  # Don't write file with errors
-                            else:
-                                logger.warning(f"⚠️ Asimov warnings, but writing file")
-                        else:
-                            logger.info(f"✅ Asimov rules passed for {file_path}")
-
-                        # Write file only if valid
-                        if asimov_passed:
-                            try:
-                                await write_file.ainvoke({
-                                    "file_path": file_path,
-                                    "content": file_content,
-                                    "workspace_path": workspace_path
-                                })
-
-                                generated_files.append({
-                                    "path": file_path,
-                                    "size": len(file_content),
-                                    "timestamp": datetime.now().isoformat(),
-                                    "validated": True
-                                })
-
-                                logger.debug(f"✅ Wrote {file_path}")
-                            except Exception as e:
-                                logger.error(f"❌ Failed to write {file_path}: {e}")
-                else:
-                    logger.debug(f"⚠️ No parser for {file_path}, writing without validation")
-
-                    # Write file without validation (e.g., .txt, .md)
-                    try:
-                        await write_file.ainvoke({
-                            "file_path": file_path,
-                            "content": file_content,
-                            "workspace_path": workspace_path
-                        })
-
-                        generated_files.append({
-                            "path": file_path,
-                            "size": len(file_content),
-                            "timestamp": datetime.now().isoformat(),
-                            "validated": False
-                        })
-
-                        logger.debug(f"✅ Wrote {file_path}")
-                    except Exception as e:
-                        logger.error(f"❌ Failed to write {file_path}: {e}")
+            pipeline_result = await run_validation_pipeline(code_output, workspace_path)
+            generated_files = pipeline_result["generated_files"]
+            validation_report = pipeline_result["report"]
 
             logger.info(f"✅ Generated {len(generated_files)} files from parsing")
 
-            # Step 3.5: FALLBACK - Extract files from Claude CLI events
+            # Step 3.5: Files written by Claude CLI Edit/Write tools
+            # (materialized and validated while the CLI was still running)
+            early_files = await materializer.finish()
+            parsed_paths = {f["path"] for f in generated_files}
+            for file_info in early_files:
+                if file_info["path"] not in parsed_paths:
+                    generated_files.append(file_info)
+            if early_files:
+                logger.info(f"⚡ {len(early_files)} files materialized early from Claude CLI tool events")
+
+            # Step 3.55: Files kept from the previous generation (incremental mode)
+            parsed_paths = {f["path"] for f in generated_files}
+            kept_files = [
+                file_info for file_info in manifest.kept_file_infos(regeneration_plan)
+                if file_info["path"] not in parsed_paths
+            ]
+            generated_files.extend(kept_files)
+            if kept_files:
+                logger.info(f"♻️ Kept {len(kept_files)} unchanged files from the previous generation")
+
+            # Files that only belonged to removed design sections
+            deleted_files = manifest.delete_files(regeneration_plan)
+            if deleted_files:
+                logger.info(f"🗑️ Deleted {len(deleted_files)} files of removed design sections")
+
+            # Step 3.6: FALLBACK - Extract files from Claude CLI events
             # (Claude CLI uses Edit tool, not FILE: format in text output)
             if len(generated_files) == 0:
                 logger.info("🔍 No files from parsing - extracting from Claude CLI Edit tool events...")
@@ -387,7 +264,7 @@ Generate complete, production-ready code files."""
                 else:
                     logger.warning("⚠️  No Claude CLI events available for file extraction")
 
-            # Step 3.6: Validate generated files (NEW!)
+            # Step 3.7: Validate generated files (NEW!)
             logger.info("🔍 Validating file completeness...")
             validation_result = validate_generated_files(
                 workspace_path=workspace_path,
@@ -438,6 +315,14 @@ Generate complete, production-ready code files."""
             else:
                 logger.info(f"✅ File validation PASSED - All critical files present!")
 
+            # Step 3.8: Record design sections + file mapping for the next run
+            if generated_files:
+                try:
+                    manifest.update(design_sections, generated_files)
+                    manifest.save()
+                except OSError as e:
+                    logger.warning(f"⚠️ Could not save design manifest: {e}")
+
             # Step 4: Create implementation summary
             implementation_summary = f"""# Implementation Summary
 
@@ -446,6 +331,7 @@ Generate complete, production-ready code files."""
 **App Type:** {validation_result['app_type']}
 **Completeness:** {validation_result['completeness']*100:.1f}%
 **Validation:** {'✅ PASSED' if validation_result['valid'] else '⚠️ INCOMPLETE'}
+**Regeneration:** {regeneration_plan['mode']} ({regeneration_plan['reason']})
 
 ## Generated Files
 
@@ -464,6 +350,9 @@ Generate complete, production-ready code files."""
                 for missing in (set(validation_result['missing_files']) - set(validation_result['missing_critical'])):
                     implementation_summary += f"- ⚠️ `{missing}` (optional)\n"
 
+            if validation_report["summary"]["total"]:
+                implementation_summary += f"\n{validation_report['markdown']}\n"
+
             implementation_summary += f"""
 
 ## Code Generation Output
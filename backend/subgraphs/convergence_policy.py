@@ -0,0 +1,144 @@
+"""
+Adaptive ReviewFix Loop Termination
+
+should_continue_fixing used to stop only at quality >= 0.75 or after 3
+iterations, so we often paid for fixer/reviewer rounds that barely moved
+the score. The convergence policy looks at the score trajectory and stops
+as soon as another round is unlikely to pay off:
+
+1. quality_reached    quality >= quality_threshold
+2. max_iterations     iteration >= max_iterations
+3. stalled            last improvement < min_improvement (incl. regressions)
+4. repeated_findings  same findings as the previous iteration (fix had no effect)
+5. not_worth_cost     predicted gain of the next round < iteration_cost
+
+The predicted gain is the decayed mean of the improvements so far.
+Every decision is recorded in the state (stop_reason).
+
+Per-workspace settings (all optional) in
+$WORKSPACE/.ki_autoagent_ws/config/reviewfix.json:
+
+    {
+        "quality_threshold": 0.75,
+        "max_iterations": 3,
+        "min_improvement": 0.03,
+        "gain_decay": 0.6,
+        "iteration_cost": 0.02,
+        "stop_on_repeated_findings": true
+    }
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CONFIG_FILE = "reviewfix.json"
+
+DEFAULT_POLICY: dict[str, Any] = {
+    "quality_threshold": 0.75,
+    "max_iterations": 3,
+    "min_improvement": 0.03,
+    "gain_decay": 0.6,
+    "iteration_cost": 0.02,
+    "stop_on_repeated_findings": True,
+}
+
+
+def load_convergence_policy(workspace_path: str | None) -> dict[str, Any]:
+    """Default policy, overridden by the workspace's reviewfix.json."""
+    policy = dict(DEFAULT_POLICY)
+    if not workspace_path:
+        return policy
+
+    path = os.path.join(workspace_path, ".ki_autoagent_ws", "config", CONFIG_FILE)
+    try:
+        with open(path, encoding="utf-8") as f:
+            overrides = json.load(f)
+    except FileNotFoundError:
+        return policy
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️ Ignoring invalid {CONFIG_FILE}: {e}")
+        return policy
+
+    for key, value in overrides.items():
+        if key not in DEFAULT_POLICY:
+            logger.warning(f"⚠️ Unknown ReviewFix policy setting: {key}")
+            continue
+        policy[key] = type(DEFAULT_POLICY[key])(value)
+
+    logger.debug(f"ReviewFix convergence policy: {policy}")
+    return policy
+
+
+def findings_signature(verdicts: dict[str, dict[str, Any]], static_findings: list[dict[str, Any]]) -> str:
+    """Stable fingerprint of the current findings (per-file issues + static findings)."""
+    items = sorted(
+        [f"{path}|{issue}" for path, verdict in verdicts.items() for issue in verdict.get("issues", [])]
+        + [f"{f.get('file')}|{f.get('source')}|{f.get('line')}|{f.get('message')}" for f in static_findings]
+    )
+    return hashlib.sha256("\n".join(items).encode("utf-8")).hexdigest()[:16]
+
+
+def predict_gain(score_history: list[float], decay: float) -> float:
+    """Expected improvement of the next round: decayed mean of past improvements."""
+    deltas = [b - a for a, b in zip(score_history, score_history[1:])]
+    if not deltas:
+        return float("inf")  # No trajectory yet
+    return max(0.0, sum(deltas) / len(deltas)) * decay
+
+
+def decide(
+    score_history: list[float],
+    finding_signatures: list[str],
+    iteration: int,
+    policy: dict[str, Any]
+) -> tuple[bool, str]:
+    """
+    Decide whether another fix round is worth it.
+
+    Returns:
+        (should_continue, reason)
+    """
+    quality = score_history[-1] if score_history else 0.0
+
+    if quality >= policy["quality_threshold"]:
+        return False, f"quality_reached: {quality:.2f} >= {policy['quality_threshold']:.2f}"
+
+    if iteration >= policy["max_iterations"]:
+        return False, f"max_iterations: {iteration}"
+
+    if len(score_history) >= 2:
+        improvement = score_history[-1] - score_history[-2]
+        if improvement < policy["min_improvement"]:
+            return False, f"stalled: improvement {improvement:+.3f} < {policy['min_improvement']:.3f}"
+
+    if (
+        policy["stop_on_repeated_findings"]
+        and len(finding_signatures) >= 2
+        and finding_signatures[-1] == finding_signatures[-2]
+    ):
+        return False, "repeated_findings: fix round did not change the findings"
+
+    predicted = predict_gain(score_history, policy["gain_decay"])
+    if predicted < policy["iteration_cost"]:
+        return False, f"not_worth_cost: predicted gain {predicted:.3f} < cost {policy['iteration_cost']:.3f}"
+
+    return True, f"continue: quality {quality:.2f}, iteration {iteration}"
+
+
+__all__ = [
+    "DEFAULT_POLICY",
+    "decide",
+    "findings_signature",
+    "load_convergence_policy",
+    "predict_gain",
+]
@@ -0,0 +1,350 @@
+"""
+Design Manifest - Design-Diff Driven Incremental Regeneration for Codesmith
+
+When the architect loop or HITL changes part of a design, Codesmith used to
+regenerate the whole project. The manifest records, per workspace:
+
+- design sections (split at markdown headings) keyed by content hash
+- for every generated file: the design sections it came from + its content hash
+
+On a rerun the new design is diffed against the recorded section hashes and
+only files mapped to changed sections (or missing on disk) are
+regenerated; files that only belonged to removed sections are deleted;
+everything else is kept. Prompt size, cost and latency then scale with the
+size of the change instead of the size of the project.
+
+Files whose content hash differs from the recorded one were edited after
+the generation (by the user or the fixer). They are never deleted, and
+when they have to be regenerated the prompt asks to update the current
+file and preserve those edits.
+
+Plan modes:
+- "full":        no manifest, or too much of the design changed
+- "incremental": regenerate a subset of files
+- "unchanged":   design identical and all files present → no LLM call
+
+Section mapping is by reference: a file belongs to every section that
+mentions its path or file name. Files no section mentions are mapped to
+"*" and regenerated on any design change (conservative).
+
+Storage: $WORKSPACE/.ki_autoagent_ws/cache/codesmith_manifest.json
+Disable with KI_CODESMITH_INCREMENTAL=0
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+MANIFEST_FILE = "codesmith_manifest.json"
+
+# Above this share of changed sections, a full regeneration is cheaper
+MAX_CHANGED_RATIO = 0.5
+
+ALL_SECTIONS = "*"
+PREAMBLE_SECTION = "_preamble"
+
+_HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+
+
+def is_incremental_enabled() -> bool:
+    return os.environ.get("KI_CODESMITH_INCREMENTAL", "1").lower() not in ("0", "false", "no", "off")
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def split_design_sections(design: str) -> dict[str, str]:
+    """
+    Split a markdown design into sections at headings.
+
+    Section ids are heading paths ("Architecture > Backend > API"); text
+    before the first heading is PREAMBLE_SECTION. Duplicate ids get "#2", "#3".
+
+    Returns:
+        {section_id: section_text} in document order
+    """
+    sections: dict[str, list[str]] = {}
+    stack: list[tuple[int, str]] = []
+    current = PREAMBLE_SECTION
+    in_code_block = False
+
+    for line in design.splitlines():
+        if line.lstrip().startswith("```"):
+            in_code_block = not in_code_block
+
+        match = None if in_code_block else _HEADING_PATTERN.match(line)
+        if match:
+            level = len(match.group(1))
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            stack.append((level, match.group(2)))
+
+            section_id = " > ".join(title for _, title in stack)
+            current, suffix = section_id, 2
+            while current in sections:
+                current = f"{section_id}#{suffix}"
+                suffix += 1
+            sections[current] = []
+
+        sections.setdefault(current, []).append(line)
+
+    return {
+        section_id: "\n".join(lines).strip()
+        for section_id, lines in sections.items()
+        if "\n".join(lines).strip()
+    }
+
+
+def map_file_to_sections(file_path: str, sections: dict[str, str]) -> list[str]:
+    """Sections that mention the file's path or name (ALL_SECTIONS if none)."""
+    normalized = file_path.replace("\\", "/").removeprefix("./")
+    name = os.path.basename(normalized)
+    name_pattern = re.compile(rf"(?<![\w.\-/]){re.escape(name)}(?![\w\-])")
+
+    mapped = [
+        section_id for section_id, text in sections.items()
+        if normalized in text or name_pattern.search(text)
+    ]
+    return mapped or [ALL_SECTIONS]
+
+
+def _hash_file(path: str) -> str | None:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class DesignManifest:
+    """Design section hashes + file → section mapping for one workspace."""
+
+    def __init__(self, workspace_path: str, data: dict[str, Any] | None = None):
+        self.workspace_path = workspace_path
+        self.path = os.path.join(workspace_path, ".ki_autoagent_ws", "cache", MANIFEST_FILE)
+        data = data or {}
+        self.sections: dict[str, str] = data.get("sections", {})
+        self.files: dict[str, dict[str, Any]] = data.get("files", {})
+
+    @classmethod
+    def load(cls, workspace_path: str) -> DesignManifest:
+        """Load the workspace manifest (empty if missing or unreadable)."""
+        manifest = cls(workspace_path)
+        try:
+            with open(manifest.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                manifest.sections = data.get("sections", {})
+                manifest.files = data.get("files", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable design manifest: {e}")
+        return manifest
+
+    def save(self) -> None:
+        """Atomic write (tmp file + rename)."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": MANIFEST_VERSION,
+                "updated_at": time.time(),
+                "sections": self.sections,
+                "files": self.files
+            }, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def diff_sections(self, sections: dict[str, str]) -> tuple[list[str], list[str]]:
+        """(changed or added section ids, removed section ids)."""
+        changed = [
+            section_id for section_id, text in sections.items()
+            if self.sections.get(section_id) != hash_text(text)
+        ]
+        removed = [section_id for section_id in self.sections if section_id not in sections]
+        return changed, removed
+
+    def plan(self, sections: dict[str, str]) -> dict[str, Any]:
+        """
+        Decide what to regenerate for the new design.
+
+        Returns:
+            {
+                "mode": "full" | "incremental" | "unchanged",
+                "reason": str,
+                "changed_sections": [...], "removed_sections": [...],
+                "regenerate": [paths], "keep": [paths], "delete": [paths],
+                "modified": [paths edited since the last generation]
+            }
+        """
+        plan: dict[str, Any] = {
+            "mode": "full",
+            "reason": "",
+            "changed_sections": [],
+            "removed_sections": [],
+            "regenerate": [],
+            "keep": [],
+            "delete": [],
+            "modified": []
+        }
+
+        if not self.sections or not self.files:
+            plan["reason"] = "no previous generation"
+            return plan
+
+        changed, removed = self.diff_sections(sections)
+        plan["changed_sections"] = changed
+        plan["removed_sections"] = removed
+
+        total = len(set(sections) | set(self.sections))
+        if total and (len(changed) + len(removed)) / total > MAX_CHANGED_RATIO:
+            plan["reason"] = f"{len(changed) + len(removed)}/{total} design sections changed"
+            return plan
+
+        dirty = set(changed) | set(removed)
+        for path, info in self.files.items():
+            mapped = set(info.get("sections", [ALL_SECTIONS]))
+            content_hash = _hash_file(os.path.join(self.workspace_path, path))
+            modified = content_hash is not None and info.get("content_hash") not in (None, content_hash)
+            if modified:
+                plan["modified"].append(path)
+
+            if ALL_SECTIONS not in mapped and mapped <= set(removed):
+                # Only described by removed sections - edited files stay
+                plan["keep" if modified else "delete"].append(path)
+            elif content_hash is None or mapped & dirty or (dirty and ALL_SECTIONS in mapped):
+                plan["regenerate"].append(path)
+            else:
+                plan["keep"].append(path)
+
+        if not dirty and not plan["regenerate"]:
+            plan["mode"] = "unchanged"
+            plan["reason"] = "design unchanged"
+        else:
+            plan["mode"] = "incremental"
+            plan["reason"] = (
+                f"{len(dirty)} design sections changed → "
+                f"{len(plan['regenerate'])} files to regenerate, {len(plan['keep'])} kept, "
+                f"{len(plan['delete'])} deleted"
+            )
+        if plan["modified"]:
+            plan["reason"] += f", {len(plan['modified'])} edited since the last generation"
+        return plan
+
+    def delete_files(self, plan: dict[str, Any]) -> list[str]:
+        """Delete the files of removed design sections (plan["delete"])."""
+        workspace = os.path.realpath(self.workspace_path)
+        deleted = []
+        for path in plan.get("delete", []):
+            full_path = os.path.realpath(os.path.join(workspace, path))
+            if os.path.commonpath([workspace, full_path]) != workspace:
+                continue
+            try:
+                os.remove(full_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"⚠️ Could not delete {path}: {e}")
+                continue
+            deleted.append(path)
+        return deleted
+
+    def kept_file_infos(self, plan: dict[str, Any]) -> list[dict[str, Any]]:
+        """generated_files entries for files kept by an incremental plan."""
+        return [
+            {
+                "path": path,
+                "size": self.files[path].get("size", 0),
+                "timestamp": self.files[path].get("timestamp", ""),
+                # Edits since the last generation were not validated
+                "validated": self.files[path].get("validated", False) and path not in plan.get("modified", []),
+                "kept": True
+            }
+            for path in plan["keep"]
+        ]
+
+    def update(self, sections: dict[str, str], generated_files: list[dict[str, Any]]) -> None:
+        """Record the new design and the mapping of all current files."""
+        files: dict[str, dict[str, Any]] = {}
+        for file_info in generated_files:
+            path = file_info.get("path")
+            if not path:
+                continue
+
+            previous = self.files.get(path)
+            if file_info.get("kept") and previous:
+                mapped = [s for s in previous.get("sections", []) if s in sections or s == ALL_SECTIONS]
+            else:
+                mapped = map_file_to_sections(path, sections)
+
+            files[path] = {
+                "sections": mapped or [ALL_SECTIONS],
+                "content_hash": _hash_file(os.path.join(self.workspace_path, path)),
+                "size": file_info.get("size", 0),
+                "timestamp": file_info.get("timestamp", ""),
+                "validated": file_info.get("validated", False)
+            }
+
+        self.sections = {section_id: hash_text(text) for section_id, text in sections.items()}
+        self.files = files
+
+
+def build_incremental_prompt(plan: dict[str, Any], sections: dict[str, str]) -> str:
+    """User prompt for an incremental run: only the changed part of the design."""
+    changed = "\n\n".join(sections[s] for s in plan["changed_sections"] if s in sections)
+    removed = "\n".join(f"- {s}" for s in plan["removed_sections"]) or "None"
+    modified = set(plan.get("modified", []))
+    regenerate = "\n".join(
+        f"- {p}" + (" (edited since the last generation: read the current file, update it"
+                    " and preserve those edits)" if p in modified else "")
+        for p in plan["regenerate"]
+    ) or "None"
+    keep = "\n".join(f"- {p}" for p in plan["keep"]) or "None"
+    delete = "\n".join(f"- {p}" for p in plan.get("delete", [])) or "None"
+    outline = "\n".join(f"- {s}" for s in sections)
+
+    return f"""The design of an existing project changed. Update the project incrementally.
+
+## Changed Design Sections
+{changed or "None (only removals)"}
+
+## Removed Design Sections
+{removed}
+
+## Files to Regenerate (output each one completely)
+{regenerate}
+
+## Unchanged Files (already in the workspace - do NOT output them)
+{keep}
+
+## Deleted Files (their design sections were removed - do NOT recreate them)
+{delete}
+
+## Full Design Outline (for orientation)
+{outline}
+
+Regenerate the listed files and add new files only if a changed section requires them."""
+
+
+__all__ = [
+    "ALL_SECTIONS",
+    "DesignManifest",
+    "build_incremental_prompt",
+    "hash_text",
+    "is_incremental_enabled",
+    "map_file_to_sections",
+    "split_design_sections",
+]
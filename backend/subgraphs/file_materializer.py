@@ -0,0 +1,184 @@
+"""
+Early File Materialization from Streamed Claude CLI Events
+
+Codesmith used to look at files only after the CLI exited. With streamed
+events (ClaudeCLISimple.astream), every Edit/Write tool_use followed by its
+tool_result means the file is on disk - so per-file work starts right away
+while the CLI keeps generating:
+
+1. Tree-sitter syntax validation
+2. Asimov rule check (validate_asimov_rules, strict=False)
+
+finish() returns the file infos; codesmith adds them to generated_files,
+which is the changed-file set reviewfix reviews. Paths outside the
+workspace are never read.
+
+Usage:
+    materializer = EarlyFileMaterializer(workspace_path)
+    llm = ClaudeCLISimple(..., event_listener=materializer.on_event)
+    await llm.ainvoke(messages)
+    files = await materializer.finish()
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any
+
+from security.asimov_rules import format_violations_report, validate_asimov_rules
+from tools.tree_sitter_tools import TreeSitterAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# Tools that create or modify files (Write discovered 2025-10-11)
+FILE_TOOLS = {"Edit", "Write", "MultiEdit"}
+
+
+class EarlyFileMaterializer:
+    """Runs per-file validation as soon as the CLI's file tools complete."""
+
+    def __init__(self, workspace_path: str):
+        self.workspace_path = workspace_path
+        self.tree_sitter = TreeSitterAnalyzer()
+
+        # tool_use_id → (relative path, tool name), waiting for tool_result
+        self._pending: dict[str, tuple[str, str]] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._versions: dict[str, int] = {}
+
+        self.results: dict[str, dict[str, Any]] = {}
+        self.started_at = time.time()
+
+    def _relative_path(self, file_path: str) -> str | None:
+        """Path relative to the workspace; None if it points outside of it."""
+        workspace = os.path.realpath(self.workspace_path)
+        full_path = os.path.realpath(os.path.join(workspace, file_path))
+        if os.path.commonpath([workspace, full_path]) != workspace:
+            return None
+        return os.path.relpath(full_path, workspace)
+
+    def on_event(self, event: dict[str, Any]) -> None:
+        """Event listener for ClaudeCLISimple (called for every streamed event)."""
+        content = event.get("message", {}).get("content", [])
+        if not isinstance(content, list):
+            return
+
+        for block in content:
+            if not isinstance(block, dict):
+                continue
+
+            if event.get("type") == "assistant" and block.get("type") == "tool_use":
+                if block.get("name") in FILE_TOOLS:
+                    tool_input = block.get("input", {})
+                    file_path = tool_input.get("file_path") or tool_input.get("path")
+                    if not file_path:
+                        continue
+                    rel_path = self._relative_path(file_path)
+                    if rel_path is None:
+                        logger.warning(f"⚠️  {block['name']} tool wrote {file_path} outside the workspace - ignored")
+                        continue
+                    self._pending[block.get("id", file_path)] = (rel_path, block["name"])
+
+            elif event.get("type") == "user" and block.get("type") == "tool_result":
+                pending = self._pending.pop(block.get("tool_use_id"), None)
+                if pending is None:
+                    continue
+                if block.get("is_error"):
+                    logger.warning(f"⚠️  {pending[1]} tool failed for {pending[0]} - not materialized")
+                    continue
+                self._schedule(*pending)
+
+    def _schedule(self, rel_path: str, tool_name: str) -> None:
+        """Start (or restart, for repeated edits) the per-file processing."""
+        version = self._versions.get(rel_path, 0) + 1
+        self._versions[rel_path] = version
+        self._tasks[f"{rel_path}#{version}"] = asyncio.create_task(
+            self._process(rel_path, tool_name, version)
+        )
+        logger.info(f"⚡ Early materialization: {rel_path} ({tool_name})")
+
+    async def _process(self, rel_path: str, tool_name: str, version: int) -> None:
+        full_path = os.path.join(self.workspace_path, rel_path)
+        result = await asyncio.to_thread(self._validate_file, full_path, rel_path, tool_name)
+
+        # A later edit of the same file supersedes this result
+        if result is None or self._versions.get(rel_path) != version:
+            return
+
+        self.results[rel_path] = result
+
+    def _validate_file(self, full_path: str, rel_path: str, tool_name: str) -> dict[str, Any] | None:
+        """Syntax + Asimov validation of a file written by the CLI (runs in a thread)."""
+        try:
+            with open(full_path, encoding="utf-8") as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f"⚠️  {tool_name} tool mentioned {rel_path} but file not readable: {e}")
+            return None
+
+        language = self.tree_sitter.detect_language(rel_path)
+        syntax_valid = True
+        asimov_errors = 0
+        asimov_warnings = 0
+
+        if language:
+            # Thread-local parser; re-writes of a file are parsed incrementally
+            syntax_valid = self.tree_sitter.validate_syntax(content, language, full_path)
+            if not syntax_valid:
+                logger.error(f"❌ Syntax validation failed for {rel_path}")
+
+            asimov_result = validate_asimov_rules(code=content, file_path=rel_path, strict=False)
+            asimov_errors = asimov_result["summary"]["errors"]
+            asimov_warnings = asimov_result["summary"]["warnings"]
+            if not asimov_result["valid"]:
+                logger.warning(f"\n{format_violations_report(asimov_result, rel_path)}")
+
+        logger.info(
+            f"📄 Materialized {rel_path} from {tool_name} tool "
+            f"({len(content)} bytes, +{time.time() - self.started_at:.1f}s)"
+        )
+
+        return {
+            "path": rel_path,
+            "size": len(content),
+            "timestamp": datetime.now().isoformat(),
+            "validated": language is not None and syntax_valid and asimov_errors == 0,
+            "syntax_valid": syntax_valid,
+            "asimov_errors": asimov_errors,
+            "asimov_warnings": asimov_warnings,
+            "tool": tool_name
+        }
+
+    async def finish(self) -> list[dict[str, Any]]:
+        """
+        Wait for in-flight processing and return file infos.
+
+        Tool uses whose tool_result never arrived are processed now if the
+        file exists on disk.
+        """
+        for rel_path, tool_name in self._pending.values():
+            if os.path.isfile(os.path.join(self.workspace_path, rel_path)):
+                self._schedule(rel_path, tool_name)
+        self._pending.clear()
+
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+
+        return list(self.results.values())
+
+    def cancel(self) -> None:
+        """Cancel in-flight processing (e.g. after a failed generation)."""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+
+__all__ = ["EarlyFileMaterializer"]
@@ -0,0 +1,349 @@
+"""
+Multi-Query Research Fan-Out
+
+Research used to send the user query to Perplexity once. For broad tasks
+the architect then routed back to research (low confidence) for another
+full serial round. The research node now:
+
+1. Splits the task into focused sub-queries (stack, security, deployment,
+   data, testing, performance) - keyword-based, no extra LLM call
+2. Runs them concurrently
+3. Deduplicates overlapping findings:
+   - content hashes of normalized paragraphs/bullets
+   - near-duplicates by word overlap (Jaccard)
+   - findings already in Memory (semantic similarity) - e.g. from a
+     previous research round
+4. Synthesizes everything in ONE LLM call
+5. Stores the new findings in Memory one by one (agent "research_findings",
+   kept apart from the research summaries other agents read)
+
+Known findings are compared finding-to-finding: a single bullet never gets
+close to a stored multi-section research summary. Memory reports
+1 / (1 + d) with d the squared L2 distance of the (unit length) embeddings,
+so d = 2 - 2·cos; the threshold is applied to that cosine. An identical
+finding has cosine 1.0, a reworded statement typically > 0.9, a different
+statement on the same topic < 0.8.
+
+Configuration:
+- KI_RESEARCH_FANOUT              max sub-queries incl. the original (default 4, 1 = off)
+- KI_RESEARCH_MEMORY_SIMILARITY   cosine similarity above which a finding counts as known (default 0.9)
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FANOUT = 4
+DEFAULT_MEMORY_SIMILARITY = 0.9
+
+# Word overlap above which two findings are the same statement
+NEAR_DUPLICATE_JACCARD = 0.8
+
+# Findings shorter than this are kept as-is (headings, short lines)
+MIN_UNIT_CHARS = 40
+
+# Memory agent tag of single findings (research summaries use "research")
+FINDINGS_AGENT = "research_findings"
+
+# Max Memory lookups/stores per research run (each costs an embedding call)
+MEMORY_CHECK_LIMIT = 24
+
+# aspect → (focus appended to the query, trigger keywords)
+ASPECTS: dict[str, tuple[str, frozenset[str]]] = {
+    "stack": (
+        "recommended tech stack, frameworks and libraries",
+        frozenset({"app", "application", "api", "web", "frontend", "backend", "framework", "library",
+                   "stack", "build", "create", "implement", "service", "website", "erstelle", "baue"}),
+    ),
+    "security": (
+        "security best practices and common vulnerabilities",
+        frozenset({"auth", "authentication", "login", "password", "security", "secure", "token", "jwt",
+                   "oauth", "user", "users", "payment", "payments", "sicherheit", "permissions"}),
+    ),
+    "deployment": (
+        "deployment, hosting and configuration",
+        frozenset({"deploy", "deployment", "docker", "kubernetes", "k8s", "cloud", "production",
+                   "hosting", "ci", "cd", "server", "aws", "azure", "gcp"}),
+    ),
+    "data": (
+        "data modeling and storage options",
+        frozenset({"database", "db", "sql", "postgres", "postgresql", "mysql", "mongodb", "redis",
+                   "storage", "cache", "schema", "datenbank"}),
+    ),
+    "testing": (
+        "testing strategy and tools",
+        frozenset({"test", "tests", "testing", "qa", "coverage", "e2e"}),
+    ),
+    "performance": (
+        "performance and scalability considerations",
+        frozenset({"performance", "scale", "scalable", "scalability", "fast", "latency", "realtime",
+                   "real-time", "concurrent", "throughput"}),
+    ),
+}
+
+# Broad tasks without explicit aspects still get these
+DEFAULT_ASPECTS = ("stack", "security", "deployment")
+
+# Queries with at least this many words count as broad tasks
+BROAD_QUERY_WORDS = 8
+
+_CITATION_RE = re.compile(r"\[\d+\]")
+_BULLET_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+_NON_WORD_RE = re.compile(r"[^\w]+")
+
+
+def get_fanout_limit() -> int:
+    try:
+        return max(1, int(os.environ.get("KI_RESEARCH_FANOUT", DEFAULT_FANOUT)))
+    except ValueError:
+        return DEFAULT_FANOUT
+
+
+def get_memory_similarity() -> float:
+    try:
+        return float(os.environ.get("KI_RESEARCH_MEMORY_SIMILARITY", DEFAULT_MEMORY_SIMILARITY))
+    except ValueError:
+        return DEFAULT_MEMORY_SIMILARITY
+
+
+def plan_sub_queries(query: str, max_queries: int | None = None) -> list[dict[str, str]]:
+    """
+    Split a task into focused sub-queries.
+
+    The original query always comes first. Aspects are added when the
+    query mentions them; broad tasks get DEFAULT_ASPECTS.
+
+    Returns:
+        [{"aspect": "overview" | aspect, "query": str}, ...]
+    """
+    limit = get_fanout_limit() if max_queries is None else max_queries
+    sub_queries = [{"aspect": "overview", "query": query}]
+    if limit <= 1:
+        return sub_queries
+
+    words = set(re.findall(r"[\w-]+", query.lower()))
+    aspects = [name for name, (_, keywords) in ASPECTS.items() if words & keywords]
+
+    if aspects or len(query.split()) >= BROAD_QUERY_WORDS:
+        aspects += [name for name in DEFAULT_ASPECTS if name not in aspects]
+
+    for name in aspects[:limit - 1]:
+        focus = ASPECTS[name][0]
+        sub_queries.append({"aspect": name, "query": f"{query} - {focus}"})
+
+    return sub_queries
+
+
+def split_units(text: str) -> list[str]:
+    """Split search results into findings: paragraphs, each bullet separately."""
+    units = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        current: list[str] = []
+        for line in paragraph.splitlines():
+            if _BULLET_RE.match(line) and current:
+                units.append("\n".join(current))
+                current = []
+            if line.strip():
+                current.append(line)
+        if current:
+            units.append("\n".join(current))
+    return units
+
+
+def normalize_unit(unit: str) -> str:
+    """Normalized text of a finding (for hashing / word overlap)."""
+    text = _BULLET_RE.sub("", _CITATION_RE.sub("", unit.lower()))
+    return " ".join(_NON_WORD_RE.sub(" ", text).split())
+
+
+def _jaccard(a: set[str], b: set[str]) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def dedupe_findings(results: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], dict[str, int]]:
+    """
+    Merge sub-query results, dropping repeated findings.
+
+    Args:
+        results: [{"aspect": str, "content": str}, ...] in sub-query order
+
+    Returns:
+        ([{"aspect", "text", "hash"}, ...], {"total", "duplicates", "near_duplicates"})
+    """
+    seen_hashes: set[str] = set()
+    kept_words: list[set[str]] = []
+    units: list[dict[str, Any]] = []
+    stats = {"total": 0, "duplicates": 0, "near_duplicates": 0}
+
+    for result in results:
+        for unit in split_units(result.get("content", "")):
+            stats["total"] += 1
+            normalized = normalize_unit(unit)
+            digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+
+            if digest in seen_hashes:
+                stats["duplicates"] += 1
+                continue
+
+            words = set(normalized.split())
+            if len(unit) >= MIN_UNIT_CHARS and any(
+                _jaccard(words, other) >= NEAR_DUPLICATE_JACCARD for other in kept_words
+            ):
+                stats["near_duplicates"] += 1
+                continue
+
+            seen_hashes.add(digest)
+            if len(unit) >= MIN_UNIT_CHARS:
+                kept_words.append(words)
+            units.append({"aspect": result["aspect"], "text": unit, "hash": digest})
+
+    return units, stats
+
+
+def memory_similarity_to_cosine(similarity: float) -> float:
+    """Cosine similarity from Memory's 1 / (1 + squared L2) score (unit length embeddings)."""
+    if similarity <= 0.0:
+        return -1.0
+    return 1.0 - (1.0 / similarity - 1.0) / 2.0
+
+
+async def drop_known_findings(
+    units: list[dict[str, Any]],
+    memory: Any | None,
+    threshold: float | None = None
+) -> tuple[list[dict[str, Any]], int]:
+    """
+    Drop findings that Memory already holds from earlier research.
+
+    Each finding is compared with the stored findings (remember_findings())
+    by cosine similarity. Only the longest MEMORY_CHECK_LIMIT findings are
+    checked (one embedding call each, run concurrently). Memory errors keep
+    the finding. If every finding is known, all are kept - the synthesis
+    still needs input.
+
+    Returns:
+        (remaining units, number of known findings dropped)
+    """
+    if not memory or not units:
+        return units, 0
+
+    threshold = get_memory_similarity() if threshold is None else threshold
+    candidates = sorted(
+        (unit for unit in units if len(unit["text"]) >= MIN_UNIT_CHARS),
+        key=lambda unit: len(unit["text"]),
+        reverse=True
+    )[:MEMORY_CHECK_LIMIT]
+
+    async def is_known(unit: dict[str, Any]) -> bool:
+        try:
+            matches = await memory.search(
+                query=unit["text"], filters={"agent": FINDINGS_AGENT}, k=1
+            )
+        except Exception as e:
+            logger.debug(f"Memory similarity check failed: {e}")
+            return False
+        return bool(matches) and memory_similarity_to_cosine(matches[0].get("similarity", 0.0)) >= threshold
+
+    verdicts = await asyncio.gather(*(is_known(unit) for unit in candidates))
+    known = {unit["hash"] for unit, verdict in zip(candidates, verdicts) if verdict}
+    if len(known) == len(units):
+        return units, 0
+
+    return [unit for unit in units if unit["hash"] not in known], len(known)
+
+
+async def remember_findings(units: list[dict[str, Any]], memory: Any | None, query: str) -> int:
+    """
+    Store findings individually (agent FINDINGS_AGENT) for drop_known_findings().
+
+    Only the longest MEMORY_CHECK_LIMIT findings are stored. Returns the
+    number of stored findings; Memory errors are logged and skipped.
+    """
+    if not memory:
+        return 0
+
+    candidates = sorted(
+        (unit for unit in units if len(unit["text"]) >= MIN_UNIT_CHARS),
+        key=lambda unit: len(unit["text"]),
+        reverse=True
+    )[:MEMORY_CHECK_LIMIT]
+
+    outcomes = await asyncio.gather(
+        *(
+            memory.store(
+                content=unit["text"],
+                metadata={"agent": FINDINGS_AGENT, "type": "finding", "aspect": unit["aspect"], "query": query}
+            )
+            for unit in candidates
+        ),
+        return_exceptions=True
+    )
+    failed = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+    if failed:
+        logger.debug(f"Storing {len(failed)} findings in Memory failed: {failed[0]}")
+    return len(candidates) - len(failed)
+
+
+def format_findings(units: list[dict[str, Any]]) -> str:
+    """Deduplicated findings grouped by aspect (for the synthesis prompt)."""
+    sections: dict[str, list[str]] = {}
+    for unit in units:
+        sections.setdefault(unit["aspect"], []).append(unit["text"])
+
+    return "\n\n".join(
+        f"### {aspect.title()}\n\n" + "\n\n".join(texts)
+        for aspect, texts in sections.items()
+    )
+
+
+async def run_sub_queries(search_tool: Any, sub_queries: list[dict[str, str]]) -> list[dict[str, Any]]:
+    """
+    Run all sub-queries concurrently.
+
+    Returns:
+        [{"aspect", "query", "content", "citations", "success", "cached"}, ...]
+    """
+    outcomes = await asyncio.gather(
+        *(search_tool.ainvoke({"query": sub["query"]}) for sub in sub_queries),
+        return_exceptions=True
+    )
+
+    results = []
+    for sub, outcome in zip(sub_queries, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.warning(f"⚠️ Research sub-query failed ({sub['aspect']}): {outcome}")
+            outcome = {"content": f"Search failed: {outcome}", "success": False}
+        results.append({
+            "aspect": sub["aspect"],
+            "query": sub["query"],
+            "content": outcome.get("content", ""),
+            "citations": outcome.get("citations", []),
+            "success": outcome.get("success", False),
+            "cached": outcome.get("cached", False)
+        })
+    return results
+
+
+__all__ = [
+    "ASPECTS",
+    "dedupe_findings",
+    "drop_known_findings",
+    "format_findings",
+    "get_fanout_limit",
+    "memory_similarity_to_cosine",
+    "normalize_unit",
+    "plan_sub_queries",
+    "remember_findings",
+    "run_sub_queries",
+    "split_units",
+]
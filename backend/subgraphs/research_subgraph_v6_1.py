@@ -9,6 +9,7 @@ Changes from v6.0:
 - Direct LLM.ainvoke() calls (like Architect pattern)
 - Manual tool calling for Perplexity (simplified)
 - Works with ClaudeCLISimple adapter
+- Multi-query fan-out with deduplicated synthesis (research_fanout.py)
 
 Author: KI AutoAgent Team
 Python: 3.13+
@@ -26,6 +27,14 @@ from langgraph.graph import END, StateGraph
 # Use ClaudeCLISimple instead of langchain-anthropic (broken)
 from adapters.claude_cli_simple import ClaudeCLISimple as ChatAnthropic
 from state_v6 import ResearchState
+from subgraphs.research_fanout import (
+    dedupe_findings,
+    drop_known_findings,
+    format_findings,
+    plan_sub_queries,
+    remember_findings,
+    run_sub_queries,
+)
 from tools.perplexity_tool import perplexity_search
 
 logger = logging.getLogger(__name__)
@@ -58,8 +67,9 @@ def create_research_subgraph(
         Execute research with custom implementation.
 
         Flow:
-        1. Use Perplexity to search for information
-        2. Use Claude to analyze and summarize findings
+        1. Use Perplexity to search focused sub-queries concurrently
+           and deduplicate the findings
+        2. Use Claude to analyze and summarize findings (one call)
         3. Store in Memory
         4. Return results
         """
@@ -67,21 +77,39 @@ def create_research_subgraph(
         logger.info(f"🔍 Research node v6.1 executing: {state['query']}")
 
         try:
-            # Step 1: Search with Perplexity
-            print(f"  Step 1: Calling Perplexity...")
-            logger.info("🌐 Searching with Perplexity...")
-            search_result = await perplexity_search.ainvoke({"query": state['query']})
-            print(f"  Step 1: Perplexity returned {type(search_result)}")
+            # Step 1: Search with Perplexity (focused sub-queries, concurrently)
+            sub_queries = plan_sub_queries(state['query'])
+            print(f"  Step 1: Calling Perplexity with {len(sub_queries)} sub-queries...")
+            logger.info(f"🌐 Searching with Perplexity: {[sub['aspect'] for sub in sub_queries]}")
+            search_results = await run_sub_queries(perplexity_search, sub_queries)
 
             # LOG COMPLETE PERPLEXITY OUTPUT
             import json
             with open("/tmp/perplexity_output.json", "w") as f:
-                json.dump(search_result, f, indent=2)
+                json.dump(search_results, f, indent=2)
             print(f"  📝 Perplexity complete output: /tmp/perplexity_output.json")
 
-            search_findings = search_result.get("content", "No results found")
-            print(f"  Step 1: Got {len(search_findings)} chars")
-            logger.info(f"✅ Perplexity results: {len(search_findings)} chars")
+            successful = [result for result in search_results if result["success"]]
+            if not successful:
+                # Error texts must not reach the synthesis as findings
+                raise RuntimeError(
+                    f"All {len(search_results)} research sub-queries failed: {search_results[0]['content']}"
+                )
+
+            # Step 1.5: Deduplicate overlapping findings (hashes, word overlap, Memory)
+            units, dedup_stats = dedupe_findings(successful)
+            units, known = await drop_known_findings(units, memory)
+            dedup_stats["known"] = known
+            search_findings = format_findings(units) or "No results found"
+            sources = list(dict.fromkeys(
+                citation for result in successful for citation in result["citations"]
+            ))
+
+            print(f"  Step 1: Got {len(search_findings)} chars ({dedup_stats})")
+            logger.info(
+                f"✅ Perplexity results: {len(search_findings)} chars from {len(successful)} sub-queries, "
+                f"{dedup_stats['duplicates'] + dedup_stats['near_duplicates']} duplicate / {known} known findings dropped"
+            )
 
             # Step 2: Analyze with Claude
             print(f"  Step 2: Creating Claude LLM...")
@@ -118,10 +146,10 @@ Output format:
 
 **Query:** {state['query']}
 
-**Search Results:**
+**Search Results** (deduplicated, grouped by research aspect):
 {search_findings}
 
-Provide a structured summary of the key findings."""
+Provide ONE structured summary of the key findings that covers all aspects."""
 
             # LOG PROMPTS FOR DEBUGGING
             with open("/tmp/claude_system_prompt.txt", "w") as f:
@@ -162,6 +190,11 @@ Provide a structured summary of the key findings."""
             findings = {
                 "analysis": analysis,
                 "raw_results": search_findings,
+                "sub_queries": [
+                    {"aspect": result["aspect"], "query": result["query"], "success": result["success"], "cached": result["cached"]}
+                    for result in search_results
+                ],
+                "dedup": dedup_stats,
                 "timestamp": datetime.now().isoformat()
             }
 
@@ -179,7 +212,9 @@ Provide a structured summary of the key findings."""
                         "timestamp": findings["timestamp"]
                     }
                 )
-                print(f"  Step 3: Memory stored")
+                # Single findings → known findings of the next research round
+                stored = await remember_findings(units, memory, state['query'])
+                print(f"  Step 3: Memory stored ({stored} findings)")
                 logger.debug("✅ Findings stored in Memory")
             else:
                 print(f"  Step 3: No memory, skipping")
@@ -189,6 +224,7 @@ Provide a structured summary of the key findings."""
             return {
                 **state,
                 "findings": findings,
+                "sources": sources,
                 "report": report,
                 "completed": True,
                 "errors": []
@@ -0,0 +1,95 @@
+"""
+Review Planner - Token-Budgeted Review Chunks
+
+The reviewer used to join all file contents into one prompt, which either
+exceeds the model context or turns into one very slow call for large
+projects. The planner groups the files to review into chunks that fit a
+token budget, keeping files of the same directory together (they usually
+import each other). Chunks are then reviewed concurrently by ReviewFix
+(capped by get_review_concurrency()) and the per-file verdicts merged.
+
+Configuration (environment):
+    KI_REVIEW_CHUNK_TOKENS=<n>     token budget per chunk (default 12000)
+    KI_REVIEW_CONCURRENCY=<n>      parallel reviewer calls (default 4)
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import PurePosixPath
+
+DEFAULT_CHUNK_TOKENS = 12000
+DEFAULT_CONCURRENCY = 4
+
+# Rough chars-per-token ratio for source code
+CHARS_PER_TOKEN = 4
+
+# Prompt overhead per file (FILE: header + code fence)
+FILE_OVERHEAD_TOKENS = 10
+
+
+def get_chunk_token_budget() -> int:
+    return int(os.environ.get("KI_REVIEW_CHUNK_TOKENS", DEFAULT_CHUNK_TOKENS))
+
+
+def get_review_concurrency() -> int:
+    return max(1, int(os.environ.get("KI_REVIEW_CONCURRENCY", DEFAULT_CONCURRENCY)))
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + FILE_OVERHEAD_TOKENS
+
+
+def plan_review_chunks(files: dict[str, str], max_tokens: int | None = None) -> list[list[str]]:
+    """
+    Group files into review chunks within a token budget.
+
+    Files are ordered by directory, so a directory stays in one chunk when
+    it fits; a new chunk starts when the budget would be exceeded. A file
+    larger than the budget gets a chunk of its own.
+
+    Args:
+        files: {path: content}
+        max_tokens: Budget per chunk (default: get_chunk_token_budget())
+
+    Returns:
+        [[path, ...], ...]
+    """
+    budget = max_tokens or get_chunk_token_budget()
+    ordered = sorted(files, key=lambda path: (str(PurePosixPath(path).parent), path))
+
+    chunks: list[list[str]] = []
+    current: list[str] = []
+    current_tokens = 0
+    current_dir: str | None = None
+
+    for path in ordered:
+        tokens = estimate_tokens(files[path])
+        directory = str(PurePosixPath(path).parent)
+
+        # Start a new chunk when over budget, or at a directory boundary
+        # once the chunk is mostly full (keeps directories together)
+        full = current_tokens + tokens > budget
+        boundary = directory != current_dir and current_tokens > budget // 2
+        if current and (full or boundary):
+            chunks.append(current)
+            current, current_tokens = [], 0
+
+        current.append(path)
+        current_tokens += tokens
+        current_dir = directory
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+__all__ = [
+    "estimate_tokens",
+    "get_chunk_token_budget",
+    "get_review_concurrency",
+    "plan_review_chunks",
+]
@@ -0,0 +1,247 @@
+"""
+Per-File Review Verdicts for Incremental ReviewFix
+
+The reviewer used to re-read every generated file on every iteration and
+send all of them to GPT-4o-mini - even when the fixer touched one file.
+Reviews are now per file:
+
+- The reviewer answers with one QUALITY_SCORE + findings block per file
+- Verdicts are cached by (model, path, content hash, context hash); the
+  context hash covers the prompt context the verdict depended on - the
+  file's static findings (plus project-wide ones) and the content of the
+  files it references by module/file name (its cross-file context)
+- Iteration 2+: only files whose content changed are sent; unchanged files
+  contribute their cached verdict (and a compact summary of their findings
+  goes into the prompt for cross-file context)
+- Overall quality = size-weighted mean of the per-file scores
+
+Storage: $WORKSPACE/.ki_autoagent_ws/cache/review_verdicts.json
+(verdicts also survive between workflow runs in the same workspace)
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+VERDICTS_FILE = "review_verdicts.json"
+MAX_ENTRIES = 2000
+
+# Score for files the reviewer did not answer for (not cached → re-reviewed)
+DEFAULT_SCORE = 0.5
+
+_SCORE_PATTERN = re.compile(r"QUALITY_SCORE:\s*([0-9]*\.?[0-9]+)")
+
+
+def hash_content(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def review_context_hash(
+    path: str,
+    content: str,
+    file_hashes: dict[str, str],
+    static_findings: list[dict[str, Any]]
+) -> str:
+    """
+    Hash of the review context of one file.
+
+    Covers the static findings for the file (and project-wide ones) and the
+    content hashes of the files it references by name (e.g. `from models import`
+    or `./models` → models.py), so a verdict is re-reviewed when its dependencies
+    change but not when an unrelated file does.
+    """
+    findings = sorted(
+        f"{f.get('source')}|{f.get('severity')}|{f.get('line')}|{f.get('message')}"
+        for f in static_findings
+        if f.get("file") in (path, "", None)
+    )
+    referenced = sorted(
+        f"{other}|{content_hash}"
+        for other, content_hash in file_hashes.items()
+        if other != path and _references(content, other)
+    )
+    return hashlib.sha256("\n".join(findings + ["--"] + referenced).encode("utf-8")).hexdigest()[:16]
+
+
+def _references(content: str, path: str) -> bool:
+    # Stems shorter than 3 characters match too much prose to be meaningful
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return len(stem) >= 3 and re.search(rf"\b{re.escape(stem)}\b", content) is not None
+
+
+def _clamp(score: float) -> float:
+    return max(0.0, min(1.0, score))
+
+
+class ReviewVerdictCache:
+    """Per-file review verdicts keyed by (model, path, content hash, context hash)."""
+
+    def __init__(self, workspace_path: str | None = None, model: str = "gpt-4o-mini"):
+        self.model = model
+        self.path = (
+            os.path.join(workspace_path, ".ki_autoagent_ws", "cache", VERDICTS_FILE)
+            if workspace_path else None
+        )
+        self._entries: dict[str, dict[str, Any]] = {}
+        self.stats = {"hits": 0, "misses": 0}
+        self._load()
+
+    def _key(self, path: str, content_hash: str, context_hash: str) -> str:
+        return f"{self.model}:{path}:{content_hash}:{context_hash}"
+
+    def _load(self) -> None:
+        if not self.path:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable review verdict cache: {e}")
+
+    def save(self) -> None:
+        """Atomic write (tmp file + rename); oldest entries beyond MAX_ENTRIES are dropped."""
+        if not self.path:
+            return
+        if len(self._entries) > MAX_ENTRIES:
+            newest = sorted(self._entries.items(), key=lambda item: item[1].get("reviewed_at", 0))
+            self._entries = dict(newest[-MAX_ENTRIES:])
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not save review verdicts: {e}")
+
+    def get(self, path: str, content_hash: str, context_hash: str = "") -> dict[str, Any] | None:
+        verdict = self._entries.get(self._key(path, content_hash, context_hash))
+        self.stats["hits" if verdict else "misses"] += 1
+        return verdict
+
+    def put(self, verdict: dict[str, Any], context_hash: str = "") -> None:
+        self._entries[self._key(verdict["path"], verdict["content_hash"], context_hash)] = verdict
+
+
+def parse_review_output(
+    output: str,
+    file_hashes: dict[str, str]
+) -> dict[str, dict[str, Any]]:
+    """
+    Parse per-file review blocks:
+
+        FILE: <path>
+        QUALITY_SCORE: <0.0 to 1.0>
+        FEEDBACK:
+        - ...
+        SUMMARY: ...
+
+    Files without their own block get the global QUALITY_SCORE (if any)
+    and are marked "partial" (not cached).
+
+    Returns:
+        {path: {"path", "content_hash", "score", "issues", "summary", "partial", "reviewed_at"}}
+    """
+    blocks: dict[str, list[str]] = {}
+    preamble: list[str] = []
+    current: list[str] = preamble
+
+    for line in output.splitlines():
+        stripped = line.strip().strip("*#` ")
+        if stripped.startswith("FILE:"):
+            path = stripped.replace("FILE:", "", 1).strip().strip("`*")
+            current = blocks.setdefault(path, [])
+        else:
+            current.append(line)
+
+    global_match = _SCORE_PATTERN.search("\n".join(preamble))
+    global_score = _clamp(float(global_match.group(1))) if global_match else None
+
+    verdicts: dict[str, dict[str, Any]] = {}
+    for path, content_hash in file_hashes.items():
+        lines = blocks.get(path)
+        if lines is None:
+            verdicts[path] = {
+                "path": path,
+                "content_hash": content_hash,
+                "score": DEFAULT_SCORE if global_score is None else global_score,
+                "issues": [],
+                "summary": "No per-file verdict from reviewer",
+                "partial": True,
+                "reviewed_at": time.time()
+            }
+            continue
+
+        text = "\n".join(lines)
+        score_match = _SCORE_PATTERN.search(text)
+        summary = next(
+            (l.split("SUMMARY:", 1)[1].strip() for l in lines if "SUMMARY:" in l), ""
+        )
+        verdicts[path] = {
+            "path": path,
+            "content_hash": content_hash,
+            "score": _clamp(float(score_match.group(1))) if score_match else (global_score if global_score is not None else DEFAULT_SCORE),
+            "issues": [l.strip()[2:].strip() for l in lines if l.strip().startswith(("- ", "* "))],
+            "summary": summary,
+            "partial": score_match is None,
+            "reviewed_at": time.time()
+        }
+
+    return verdicts
+
+
+def aggregate_score(verdicts: dict[str, dict[str, Any]], sizes: dict[str, int]) -> float:
+    """Size-weighted mean of per-file scores (every file weighs at least 1)."""
+    if not verdicts:
+        return 0.0
+    total_weight = sum(max(1, sizes.get(path, 1)) for path in verdicts)
+    return sum(
+        verdict["score"] * max(1, sizes.get(path, 1))
+        for path, verdict in verdicts.items()
+    ) / total_weight
+
+
+def summarize_verdicts(verdicts: list[dict[str, Any]], max_issues: int = 3) -> str:
+    """Compact findings of unchanged files (for the reviewer prompt)."""
+    lines = []
+    for verdict in verdicts:
+        issues = "; ".join(issue[:120] for issue in verdict["issues"][:max_issues]) or "no issues"
+        lines.append(f"- {verdict['path']} (score {verdict['score']:.2f}): {issues}")
+    return "\n".join(lines)
+
+
+def format_feedback(verdicts: dict[str, dict[str, Any]], quality_score: float) -> str:
+    """Combined review text for the fixer and Memory."""
+    parts = [f"QUALITY_SCORE: {quality_score:.2f}", ""]
+    for verdict in sorted(verdicts.values(), key=lambda v: v["score"]):
+        parts.append(f"FILE: {verdict['path']} (score {verdict['score']:.2f})")
+        parts.append("FEEDBACK:")
+        parts.extend(f"- {issue}" for issue in verdict["issues"] or ["No issues"])
+        if verdict["summary"]:
+            parts.append(f"SUMMARY: {verdict['summary']}")
+        parts.append("")
+    return "\n".join(parts).rstrip()
+
+
+__all__ = [
+    "ReviewVerdictCache",
+    "aggregate_score",
+    "format_feedback",
+    "hash_content",
+    "parse_review_output",
+    "review_context_hash",
+    "summarize_verdicts",
+]
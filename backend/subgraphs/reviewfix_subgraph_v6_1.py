@@ -16,6 +16,7 @@ Python: 3.13+
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 from datetime import datetime
@@ -25,10 +26,29 @@ from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 # Use ClaudeCLISimple instead of langchain-anthropic (broken)
 from adapters.claude_cli_simple import ClaudeCLISimple as ChatAnthropic
+from adapters.llm_response_cache import cached_ainvoke
 from langgraph.graph import END, StateGraph
 
 from state_v6 import ReviewFixState
 from tools.file_tools import read_file, write_file
+from subgraphs.review_verdicts import (
+    ReviewVerdictCache,
+    aggregate_score,
+    format_feedback,
+    hash_content,
+    parse_review_output,
+    review_context_hash,
+    summarize_verdicts,
+)
+from subgraphs.review_planner import get_review_concurrency, plan_review_chunks
+from subgraphs.build_validation import run_build_validation
+from subgraphs.convergence_policy import decide, findings_signature, load_convergence_policy
+from subgraphs.static_review import (
+    format_findings,
+    run_static_analysis,
+    select_llm_review_files,
+    static_verdict,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +74,26 @@ def create_reviewfix_subgraph(
     """
     logger.debug("Creating ReviewFix subgraph v6.1 (custom Fixer node)...")
 
+    # Per-file review verdicts by content hash (only changed files are re-reviewed)
+    verdict_cache = ReviewVerdictCache(workspace_path)
+
+    # Loop termination settings ($WORKSPACE/.ki_autoagent_ws/config/reviewfix.json)
+    convergence_policy = load_convergence_policy(workspace_path)
+
+    def converge(state: ReviewFixState, quality_score: float, signature: str | None = None) -> dict[str, Any]:
+        """Record the score trajectory and decide whether another fix round is worth it."""
+        score_history = state.get("score_history", []) + [quality_score]
+        finding_signatures = state.get("finding_signatures", []) + ([signature] if signature else [])
+        should_continue, stop_reason = decide(
+            score_history, finding_signatures, state.get('iteration', 0) + 1, convergence_policy
+        )
+        return {
+            "score_history": score_history,
+            "finding_signatures": finding_signatures,
+            "should_continue": should_continue,
+            "stop_reason": stop_reason
+        }
+
     # Reviewer node (unchanged - uses GPT-4o-mini)
     async def reviewer_node(state: ReviewFixState) -> ReviewFixState:
         """
@@ -73,6 +113,7 @@ def create_reviewfix_subgraph(
                     **state,
                     "quality_score": 0.0,
                     "feedback": "No files to review",
+                    **converge(state, 0.0),
                     "iteration": state.get('iteration', 0) + 1
                 }
 
@@ -96,268 +137,155 @@ def create_reviewfix_subgraph(
                         logger.error(f"Failed to read {file_path}: {e}")
                         file_contents[file_path] = f"[Error reading file: {e}]"
 
-            # Review with GPT-4o-mini
-            llm = ChatOpenAI(
-                model="gpt-4o-mini",
-                temperature=0.3,
-                max_tokens=2048
+            # ================================================================
+            # STATIC PRE-REVIEW GATE - build checks (tsc/mypy/eslint),
+            # tree-sitter, Python lint and Asimov rules before any LLM call
+            # ================================================================
+            logger.info("🔬 Running build validation checks...")
+            build_validation_passed, build_errors = await run_build_validation(
+                generated_files, workspace_path
+            )
+            static_analysis = await run_static_analysis(file_contents, workspace_path, build_errors)
+            static_findings = static_analysis["findings"]
+            logger.info(
+                f"🔎 Static analysis: {static_analysis['summary']['errors']} errors, "
+                f"{static_analysis['summary']['warnings']} warnings "
+                f"({static_analysis['summary']['duration_ms']:.0f}ms)"
             )
 
-            system_prompt = """You are a senior code reviewer.
+            # Split into files with a cached verdict (unchanged since their
+            # last review) and files that need review
+            file_hashes = {path: hash_content(content) for path, content in file_contents.items()}
+            context_hashes = {
+                path: review_context_hash(path, content, file_hashes, static_findings)
+                for path, content in file_contents.items()
+            }
+            verdicts: dict[str, dict[str, Any]] = {}
+            changed_files: dict[str, str] = {}
+
+            for path, content in file_contents.items():
+                cached = verdict_cache.get(path, file_hashes[path], context_hashes[path])
+                if cached is not None:
+                    verdicts[path] = cached
+                else:
+                    changed_files[path] = content
+
+            # Clean code below the size threshold → LLM reviews a sample (or nothing)
+            review_paths, gate_reason = select_llm_review_files(changed_files, static_findings)
+            for path in changed_files:
+                if path not in review_paths:
+                    verdicts[path] = static_verdict(path, file_hashes[path])
+            changed_files = {path: changed_files[path] for path in review_paths}
+            logger.info(f"🚦 Pre-review gate: {gate_reason}")
+
+            logger.info(
+                f"📋 Reviewing {len(changed_files)} changed files "
+                f"({len(verdicts)} unchanged or cleared by the gate)"
+            )
+
+            if changed_files:
+                # Review with GPT-4o-mini
+                llm = ChatOpenAI(
+                    model="gpt-4o-mini",
+                    temperature=0.3,
+                    max_tokens=2048
+                )
+
+                system_prompt = """You are a senior code reviewer.
 
 Your task:
 1. Review code for quality, correctness, and best practices
 2. Check for errors, bugs, and security issues
 3. Assess code style and documentation
 4. Provide actionable feedback
-5. Assign a quality score (0.0 to 1.0)
+5. Assign a quality score (0.0 to 1.0) to EACH file
 
-Output format:
+Output format (one block per reviewed file):
+FILE: <path>
 QUALITY_SCORE: <0.0 to 1.0>
-
 FEEDBACK:
 - Issue 1: ...
-- Issue 2: ...
 - Suggestion 1: ...
+SUMMARY: Assessment of this file"""
 
-SUMMARY: Overall assessment"""
-
-            files_text = "\n\n".join([
-                f"FILE: {path}\n```\n{content}\n```"
-                for path, content in file_contents.items()
-            ])
-
-            user_prompt = f"""Review the following code:
-
-{files_text}
-
-Provide quality score and detailed feedback."""
+                unchanged_text = ""
+                if verdicts:
+                    unchanged_text = f"""
 
-            response = await llm.ainvoke([
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=user_prompt)
-            ])
+## Unchanged Files (already reviewed - do NOT review again)
+{summarize_verdicts(list(verdicts.values()))}"""
 
-            review_output = response.content if hasattr(response, 'content') else str(response)
-
-            # Parse quality score
-            quality_score = 0.5  # Default
-
-            for line in review_output.split('\n'):
-                if line.startswith('QUALITY_SCORE:'):
-                    try:
-                        score_str = line.replace('QUALITY_SCORE:', '').strip()
-                        quality_score = float(score_str)
-                        quality_score = max(0.0, min(1.0, quality_score))  # Clamp
-                    except ValueError:
-                        logger.warning(f"Failed to parse quality score: {line}")
-
-            logger.info(f"✅ Review complete - Quality: {quality_score:.2f}")
-
-            # ================================================================
-            # BUILD VALIDATION - Run actual build checks (TypeScript/Python)
-            # ================================================================
-            logger.info("🔬 Running build validation checks...")
+                if static_findings:
+                    unchanged_text += f"""
 
-            # Detect project type from generated files
-            has_typescript = any(
-                f.get('path', '').endswith(('.ts', '.tsx'))
-                for f in generated_files
-            )
-            has_python = any(
-                f.get('path', '').endswith('.py')
-                for f in generated_files
-            )
-            has_javascript = any(
-                f.get('path', '').endswith(('.js', '.jsx'))
-                and not f.get('path', '').endswith(('.ts', '.tsx'))
-                for f in generated_files
-            )
+## Static Analysis Findings (verify and include in your feedback)
+{format_findings(static_findings)}"""
 
-            build_validation_passed = True
-            build_errors = []
+                # Token-budgeted chunks (grouped by directory), reviewed concurrently
+                chunks = plan_review_chunks(changed_files)
+                semaphore = asyncio.Semaphore(get_review_concurrency())
+                logger.info(f"🧩 Review plan: {len(chunks)} chunks for {len(changed_files)} files")
 
-            #================================================================
-            # IMPORTANT: Changed from elif to if for polyglot project support!
-            # This allows running MULTIPLE validation checks for projects
-            # with mixed languages (e.g., TypeScript + Python backend).
-            # For true parallel execution: TODO - use asyncio.gather()
-            #================================================================
+                async def review_chunk(chunk: list[str]) -> dict[str, dict[str, Any]]:
+                    files_text = "\n\n".join([
+                        f"FILE: {path}\n```\n{changed_files[path]}\n```"
+                        for path in chunk
+                    ])
 
-            # TypeScript compilation check
-            if has_typescript:
-                logger.info("📘 Project Type: TypeScript")
-                logger.info("   Quality Threshold: 0.90 (highest)")
+                    user_prompt = f"""Review the following code:
 
-                tsconfig_path = os.path.join(workspace_path, 'tsconfig.json')
-                package_json_path = os.path.join(workspace_path, 'package.json')
+{files_text}{unchanged_text}
 
-                if os.path.exists(tsconfig_path) and os.path.exists(package_json_path):
-                    logger.info("🔬 Running TypeScript compilation check (tsc --noEmit)...")
+Provide a quality score and detailed feedback for each file."""
 
-                    try:
-                        import subprocess
-                        result = subprocess.run(
-                            ['npx', 'tsc', '--noEmit'],
-                            cwd=workspace_path,
-                            capture_output=True,
-                            text=True,
-                            timeout=60
+                    async with semaphore:
+                        # Unchanged chunk → identical prompt → cached review (opt-in)
+                        response = await cached_ainvoke(
+                            llm,
+                            [
+                                SystemMessage(content=system_prompt),
+                                HumanMessage(content=user_prompt)
+                            ],
+                            agent_name="reviewer",
+                            workspace_path=workspace_path
                         )
 
-                        if result.returncode == 0:
-                            logger.info("✅ TypeScript compilation passed!")
-                        else:
-                            logger.error("❌ TypeScript compilation failed!")
-                            logger.error(f"   Errors:\n{result.stdout}\n{result.stderr}")
-                            build_validation_passed = False
-                            build_errors.append({
-                                "type": "typescript_compilation",
-                                "errors": result.stdout + result.stderr
-                            })
+                    raw_review = response.content if hasattr(response, 'content') else str(response)
+                    return parse_review_output(raw_review, {path: file_hashes[path] for path in chunk})
 
-                    except subprocess.TimeoutExpired:
-                        logger.error("❌ TypeScript compilation timeout (60s)")
-                        build_validation_passed = False
-                        build_errors.append({
-                            "type": "typescript_compilation",
-                            "errors": "Compilation timeout after 60 seconds"
-                        })
-                    except Exception as e:
-                        logger.error(f"❌ TypeScript compilation check failed: {e}")
-                        build_validation_passed = False
-                        build_errors.append({
-                            "type": "typescript_compilation",
-                            "errors": str(e)
-                        })
-                else:
-                    logger.warning("⚠️  No tsconfig.json or package.json found - skipping TS compilation check")
-
-            # Python type checking with mypy
-            if has_python:
-                logger.info("🐍 Project Type: Python")
-                logger.info("   Quality Threshold: 0.85")
-
-                # Check if mypy is available and there are .py files
-                python_files = [
-                    f.get('path') for f in generated_files
-                    if f.get('path', '').endswith('.py')
-                ]
+                chunk_results = await asyncio.gather(
+                    *(review_chunk(chunk) for chunk in chunks),
+                    return_exceptions=True
+                )
 
-                if python_files:
-                    logger.info(f"🔬 Running Python mypy type check ({len(python_files)} files)...")
+                failed = [r for r in chunk_results if isinstance(r, BaseException)]
+                if len(failed) == len(chunks):
+                    raise failed[0]
 
-                    try:
-                        import subprocess
-
-                        # Run mypy on all Python files
-                        result = subprocess.run(
-                            ['python3', '-m', 'mypy'] + [
-                                os.path.join(workspace_path, f) for f in python_files
-                            ] + ['--ignore-missing-imports', '--no-strict-optional'],
-                            capture_output=True,
-                            text=True,
-                            timeout=60
+                for chunk, chunk_result in zip(chunks, chunk_results):
+                    if isinstance(chunk_result, BaseException):
+                        # Files of a failed chunk get a neutral, uncached verdict
+                        logger.error(f"❌ Review of chunk {chunk} failed: {chunk_result}")
+                        chunk_result = parse_review_output(
+                            "", {path: file_hashes[path] for path in chunk}
                         )
+                    for verdict in chunk_result.values():
+                        if not verdict["partial"]:
+                            verdict_cache.put(verdict, context_hashes[verdict["path"]])
+                    verdicts.update(chunk_result)
+                verdict_cache.save()
+
+            # Overall quality from the per-file scores
+            quality_score = aggregate_score(
+                verdicts, {path: len(content) for path, content in file_contents.items()}
+            )
+            review_output = format_feedback(verdicts, quality_score)
 
-                        if result.returncode == 0:
-                            logger.info("✅ Python mypy type check passed!")
-                        else:
-                            logger.error("❌ Python mypy type check failed!")
-                            logger.error(f"   Errors:\n{result.stdout}\n{result.stderr}")
-                            build_validation_passed = False
-                            build_errors.append({
-                                "type": "python_mypy",
-                                "errors": result.stdout + result.stderr
-                            })
-
-                    except subprocess.TimeoutExpired:
-                        logger.error("❌ Python mypy timeout (60s)")
-                        build_validation_passed = False
-                        build_errors.append({
-                            "type": "python_mypy",
-                            "errors": "Mypy type check timeout after 60 seconds"
-                        })
-                    except FileNotFoundError:
-                        logger.warning("⚠️  mypy not installed - skipping Python type check")
-                        logger.warning("   Install with: pip install mypy")
-                    except Exception as e:
-                        logger.error(f"❌ Python mypy check failed: {e}")
-                        build_validation_passed = False
-                        build_errors.append({
-                            "type": "python_mypy",
-                            "errors": str(e)
-                        })
-                else:
-                    logger.warning("⚠️  No Python files found - skipping mypy check")
-
-            # JavaScript linting with ESLint
-            if has_javascript:
-                logger.info("📙 Project Type: JavaScript")
-                logger.info("   Quality Threshold: 0.75")
-
-                # Check if ESLint is available
-                eslint_config_path = os.path.join(workspace_path, '.eslintrc.json')
-                package_json_path = os.path.join(workspace_path, 'package.json')
-
-                javascript_files = [
-                    f.get('path') for f in generated_files
-                    if f.get('path', '').endswith(('.js', '.jsx'))
-                ]
-
-                if javascript_files:
-                    logger.info(f"🔬 Running JavaScript ESLint check ({len(javascript_files)} files)...")
-
-                    try:
-                        import subprocess
+            file_findings = [f for f in static_findings if f["file"]]
+            if file_findings:
+                review_output += f"\n\n## STATIC ANALYSIS FINDINGS\n\n{format_findings(file_findings)}"
 
-                        # Run ESLint on all JavaScript files
-                        result = subprocess.run(
-                            ['npx', 'eslint'] + [
-                                os.path.join(workspace_path, f) for f in javascript_files
-                            ],
-                            cwd=workspace_path,
-                            capture_output=True,
-                            text=True,
-                            timeout=60
-                        )
-
-                        # ESLint returns 0 for no errors, 1 for errors, 2 for fatal errors
-                        if result.returncode == 0:
-                            logger.info("✅ JavaScript ESLint check passed!")
-                        elif result.returncode == 1:
-                            logger.error("❌ JavaScript ESLint check failed!")
-                            logger.error(f"   Errors:\n{result.stdout}\n{result.stderr}")
-                            build_validation_passed = False
-                            build_errors.append({
-                                "type": "javascript_eslint",
-                                "errors": result.stdout + result.stderr
-                            })
-                        else:
-                            logger.error(f"❌ JavaScript ESLint fatal error (code {result.returncode})")
-                            logger.error(f"   Output:\n{result.stdout}\n{result.stderr}")
-                            # Don't fail build on configuration issues
-                            logger.warning("   Continuing without ESLint check")
-
-                    except subprocess.TimeoutExpired:
-                        logger.error("❌ JavaScript ESLint timeout (60s)")
-                        build_validation_passed = False
-                        build_errors.append({
-                            "type": "javascript_eslint",
-                            "errors": "ESLint check timeout after 60 seconds"
-                        })
-                    except FileNotFoundError:
-                        logger.warning("⚠️  ESLint not found - skipping JavaScript linting")
-                        logger.warning("   Install with: npm install --save-dev eslint")
-                    except Exception as e:
-                        logger.error(f"❌ JavaScript ESLint check failed: {e}")
-                        build_validation_passed = False
-                        build_errors.append({
-                            "type": "javascript_eslint",
-                            "errors": str(e)
-                        })
-                else:
-                    logger.warning("⚠️  No JavaScript files found - skipping ESLint check")
+            logger.info(f"✅ Review complete - Quality: {quality_score:.2f}")
 
             # Adjust quality score based on build validation
             if not build_validation_passed:
@@ -393,6 +321,15 @@ Provide quality score and detailed feedback."""
                 **state,
                 "quality_score": quality_score,
                 "feedback": review_output,
+                "review_feedback": {
+                    "feedback": review_output,
+                    "files": verdicts,
+                    "reviewed_files": sorted(changed_files),
+                    "build_errors": build_errors,
+                    "static_findings": static_findings,
+                    "gate": gate_reason
+                },
+                **converge(state, quality_score, findings_signature(verdicts, static_findings)),
                 "iteration": state.get('iteration', 0) + 1
             }
 
@@ -403,6 +340,7 @@ Provide quality score and detailed feedback."""
                 **state,
                 "quality_score": 0.0,
                 "feedback": f"Review failed: {str(e)}",
+                **converge(state, 0.0),
                 "iteration": state.get('iteration', 0) + 1,
                 "errors": state.get('errors', []) + [{"error": str(e), "node": "reviewer"}]
             }
@@ -417,7 +355,7 @@ Provide quality score and detailed feedback."""
         logger.info(f"🔧 Fixer applying fixes (iteration {state['iteration']})...")
 
         try:
-            feedback = state.get('feedback', '')
+            feedback = state.get('feedback') or state.get('review_feedback', {}).get('feedback', '')
             files_to_fix = state.get('files_to_review', [])
 
             if not feedback or not files_to_fix:
@@ -596,25 +534,20 @@ Generate complete fixed versions of all files."""
         """
         Decide whether to continue fixing or stop.
 
-        Stop conditions:
-        1. Quality score >= 0.75 (good enough)
-        2. Iteration >= 3 (max iterations reached)
+        The reviewer applies the convergence policy (quality threshold,
+        max iterations, stalled score, repeated findings, predicted gain
+        vs. cost) and records the decision in should_continue/stop_reason.
 
         Returns:
             "continue" to keep fixing, "end" to stop
         """
-        quality = state.get("quality_score", 0.0)
-        iteration = state.get("iteration", 0)
-
-        if quality >= 0.75:
-            logger.info(f"✅ Quality target reached: {quality:.2f}")
-            return "end"
+        reason = state.get("stop_reason", "")
 
-        if iteration >= 3:
-            logger.info(f"⚠️  Max iterations reached: {iteration}")
+        if not state.get("should_continue", False):
+            logger.info(f"🛑 ReviewFix stops - {reason}")
             return "end"
 
-        logger.info(f"🔄 Continue fixing (quality: {quality:.2f}, iteration: {iteration})")
+        logger.info(f"🔄 Continue fixing ({reason})")
         return "continue"
 
     # Build subgraph
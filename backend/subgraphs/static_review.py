@@ -0,0 +1,267 @@
+"""
+Static Pre-Review Gate for ReviewFix
+
+Fast local analysis in front of the LLM reviewer. Combines into one
+structured findings list:
+
+1. Tree-sitter syntax errors (ERROR / MISSING nodes)
+2. Python lint: ruff (F rules, pyflakes-equivalent) if installed,
+   else pyflakes if importable, else skipped
+3. Asimov rules (validate_asimov_rules)
+4. Build/type-check results (tsc, mypy, eslint - see build_validation)
+
+Gate: when there are no findings and every file is below a size
+threshold, the LLM review is skipped ("skip") or run on a reduced sample
+of the largest files ("sample", default). Files not sent to the LLM get a
+static verdict. With findings, everything is reviewed and the findings are
+included in the reviewer prompt.
+
+Configuration (environment):
+    KI_REVIEW_GATE=sample|skip|off      default sample
+    KI_REVIEW_GATE_MAX_FILE_BYTES=<n>   default 20000
+    KI_REVIEW_GATE_SAMPLE=<n>           files reviewed in sample mode (default 2)
+
+Finding format:
+    {"file": str | None, "line": int | None, "source": str,
+     "severity": "error" | "warning", "message": str}
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import subprocess
+import time
+from typing import Any
+
+from security.asimov_rules import validate_asimov_rules
+from tools.tree_sitter_tools import TreeSitterAnalyzer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GATE_MODE = "sample"
+DEFAULT_MAX_FILE_BYTES = 20000
+DEFAULT_SAMPLE_SIZE = 2
+
+# Score of files that passed the gate without LLM review
+STATIC_CLEAN_SCORE = 0.9
+
+# Optional: pyflakes as fallback when ruff is not installed
+try:
+    from pyflakes.api import check as _pyflakes_check
+    from pyflakes.reporter import Reporter as _PyflakesReporter
+    PYFLAKES_AVAILABLE = True
+except ImportError:
+    PYFLAKES_AVAILABLE = False
+
+_analyzer = TreeSitterAnalyzer()
+
+
+def get_gate_config() -> dict[str, Any]:
+    return {
+        "mode": os.environ.get("KI_REVIEW_GATE", DEFAULT_GATE_MODE).lower(),
+        "max_file_bytes": int(os.environ.get("KI_REVIEW_GATE_MAX_FILE_BYTES", DEFAULT_MAX_FILE_BYTES)),
+        "sample_size": int(os.environ.get("KI_REVIEW_GATE_SAMPLE", DEFAULT_SAMPLE_SIZE))
+    }
+
+
+def _finding(file: str | None, line: int | None, source: str, severity: str, message: str) -> dict[str, Any]:
+    return {"file": file, "line": line, "source": source, "severity": severity, "message": message}
+
+
+def check_syntax(path: str, content: str) -> list[dict[str, Any]]:
+    """Tree-sitter syntax errors (no findings for unsupported languages)."""
+    language = _analyzer.detect_language(path)
+    if not language:
+        return []
+    return [
+        _finding(path, error["line"], "tree-sitter", "error",
+                 "Missing token" if error["type"] == "missing_node" else "Syntax error")
+        for error in _analyzer.find_syntax_errors(content, language, path)
+    ]
+
+
+def check_asimov(path: str, content: str) -> list[dict[str, Any]]:
+    """Asimov rule violations (code files only)."""
+    if not _analyzer.detect_language(path):
+        return []
+    result = validate_asimov_rules(code=content, file_path=path, strict=False)
+    return [
+        _finding(path, v.get("line"), "asimov", v["severity"], f"[{v['rule']}] {v['description']}")
+        for v in result["violations"]
+    ]
+
+
+def lint_python(files: dict[str, str], workspace_path: str) -> list[dict[str, Any]]:
+    """pyflakes-class findings (undefined names, unused imports, ...) for Python files."""
+    python_files = {path: content for path, content in files.items() if path.endswith(".py")}
+    if not python_files:
+        return []
+
+    ruff = shutil.which("ruff")
+    if ruff:
+        try:
+            result = subprocess.run(
+                [ruff, "check", "--select", "F", "--output-format", "json", "--no-cache", "--exit-zero",
+                 *python_files],
+                cwd=workspace_path,
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+            return [
+                _finding(
+                    os.path.relpath(item["filename"], workspace_path),
+                    item.get("location", {}).get("row"),
+                    "ruff", "warning", f"{item['code']} {item['message']}"
+                )
+                for item in json.loads(result.stdout or "[]")
+            ]
+        except (subprocess.TimeoutExpired, OSError, ValueError, KeyError) as e:
+            logger.warning(f"⚠️  ruff failed ({e}) - falling back to pyflakes")
+
+    if not PYFLAKES_AVAILABLE:
+        logger.debug("No Python linter available (ruff/pyflakes) - skipping lint")
+        return []
+
+    findings = []
+
+    class _Collector(_PyflakesReporter):
+        def __init__(self, path: str):
+            self.path = path
+
+        def unexpectedError(self, filename, msg):
+            findings.append(_finding(self.path, None, "pyflakes", "error", str(msg)))
+
+        def syntaxError(self, filename, msg, lineno, offset, text):
+            pass  # Reported by tree-sitter
+
+        def flake(self, message):
+            findings.append(_finding(
+                self.path, message.lineno, "pyflakes", "warning",
+                message.message % message.message_args
+            ))
+
+    for path, content in python_files.items():
+        _pyflakes_check(content, path, _Collector(path))
+    return findings
+
+
+def build_errors_to_findings(build_errors: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Project-level build/type-check errors (from run_build_validation)."""
+    return [
+        _finding(None, None, error["type"], "error", error["errors"][:2000])
+        for error in build_errors
+    ]
+
+
+async def run_static_analysis(
+    files: dict[str, str],
+    workspace_path: str,
+    build_errors: list[dict[str, Any]] | None = None
+) -> dict[str, Any]:
+    """
+    Run all local checks (per-file checks concurrently in threads).
+
+    Returns:
+        {"findings": [...], "summary": {"errors", "warnings", "by_source", "duration_ms"}}
+    """
+    start = time.perf_counter()
+
+    def analyze(path: str, content: str) -> list[dict[str, Any]]:
+        return check_syntax(path, content) + check_asimov(path, content)
+
+    per_file = await asyncio.gather(
+        *(asyncio.to_thread(analyze, path, content) for path, content in files.items()),
+        asyncio.to_thread(lint_python, files, workspace_path)
+    )
+
+    findings = [finding for result in per_file for finding in result]
+    findings += build_errors_to_findings(build_errors or [])
+
+    by_source: dict[str, int] = {}
+    for finding in findings:
+        by_source[finding["source"]] = by_source.get(finding["source"], 0) + 1
+
+    return {
+        "findings": findings,
+        "summary": {
+            "errors": sum(1 for f in findings if f["severity"] == "error"),
+            "warnings": sum(1 for f in findings if f["severity"] == "warning"),
+            "by_source": by_source,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 1)
+        }
+    }
+
+
+def select_llm_review_files(
+    files: dict[str, str],
+    findings: list[dict[str, Any]],
+    config: dict[str, Any] | None = None
+) -> tuple[list[str], str]:
+    """
+    Gate decision: which files still need LLM review.
+
+    Returns:
+        (paths to review, reason)
+    """
+    config = config or get_gate_config()
+    paths = list(files)
+
+    if config["mode"] == "off":
+        return paths, "gate disabled"
+    if findings:
+        return paths, f"{len(findings)} static findings"
+
+    oversized = [p for p in paths if len(files[p].encode("utf-8")) > config["max_file_bytes"]]
+    if oversized:
+        return paths, f"{len(oversized)} files above {config['max_file_bytes']} bytes"
+
+    if config["mode"] == "skip":
+        return [], "clean - LLM review skipped"
+
+    sample = sorted(paths, key=lambda p: len(files[p]), reverse=True)[:config["sample_size"]]
+    return sample, f"clean - reviewing sample of {len(sample)}/{len(paths)} files"
+
+
+def static_verdict(path: str, content_hash: str) -> dict[str, Any]:
+    """Verdict for a file that passed the gate without LLM review."""
+    return {
+        "path": path,
+        "content_hash": content_hash,
+        "score": STATIC_CLEAN_SCORE,
+        "issues": [],
+        "summary": "No static findings (LLM review skipped by pre-review gate)",
+        "partial": False,
+        "source": "static",
+        "reviewed_at": time.time()
+    }
+
+
+def format_findings(findings: list[dict[str, Any]], limit: int = 50) -> str:
+    """Findings as a bullet list (for the reviewer prompt and fixer feedback)."""
+    lines = []
+    for finding in findings[:limit]:
+        location = finding["file"] or "project"
+        if finding["line"]:
+            location += f":{finding['line']}"
+        lines.append(f"- [{finding['source']}/{finding['severity']}] {location}: {finding['message']}")
+    if len(findings) > limit:
+        lines.append(f"- ... {len(findings) - limit} more")
+    return "\n".join(lines)
+
+
+__all__ = [
+    "STATIC_CLEAN_SCORE",
+    "format_findings",
+    "get_gate_config",
+    "run_static_analysis",
+    "select_llm_review_files",
+    "static_verdict",
+]
@@ -0,0 +1,343 @@
+"""
+Codesmith Validation Pipeline - Parallel Per-File Syntax + Asimov Checks
+
+Codesmith used to validate each parsed file inline on the event loop:
+validate_syntax → validate_asimov_rules → write_file, one file after the
+other. This pipeline splits that into three stages:
+
+1. Validate: tree-sitter syntax + Asimov rules for ALL files concurrently
+   on a worker pool (threads for small batches, processes for large ones -
+   both checks are CPU-bound and hold the GIL)
+2. Write: every file that passed is written in one batch off the event loop
+3. Report: one aggregated report instead of per-file log noise
+
+A multi-file generation therefore validates in roughly the time of the
+slowest file.
+
+Write decision (unchanged from the inline version):
+- Syntax error → skipped
+- Asimov errors → skipped (warnings are logged, file is written)
+- No parser for the language (e.g. .md, .txt) → written without validation
+
+Configuration (environment):
+    KI_VALIDATION_WORKERS=<n>           pool size (default: CPU count, max 8)
+    KI_VALIDATION_PROCESS_MIN_FILES=<n> use the process pool from n files (default 8, 0 = never)
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any
+
+from security.asimov_rules import format_violations_report, validate_asimov_rules
+from tools.tree_sitter_tools import TreeSitterAnalyzer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROCESS_MIN_FILES = 8
+
+# Created lazily in each worker process
+_analyzer: TreeSitterAnalyzer | None = None
+
+
+def _get_analyzer() -> TreeSitterAnalyzer:
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = TreeSitterAnalyzer()
+    return _analyzer
+
+
+def parse_file_blocks(output: str) -> list[tuple[str, str]]:
+    """
+    Parse Codesmith's `FILE: <path>` + fenced code block output.
+
+    Returns:
+        [(path, content), ...] in output order (files without code are dropped)
+    """
+    files: list[tuple[str, str]] = []
+    current_file: str | None = None
+    current_code: list[str] = []
+    in_code_block = False
+
+    for line in output.split('\n'):
+        if line.startswith('FILE:'):
+            if current_file and current_code:
+                files.append((current_file, '\n'.join(current_code).strip()))
+            current_file = line.replace('FILE:', '').strip()
+            current_code = []
+            in_code_block = False
+        elif line.startswith('```'):
+            in_code_block = not in_code_block
+        elif in_code_block and current_file:
+            current_code.append(line)
+
+    if current_file and current_code:
+        files.append((current_file, '\n'.join(current_code).strip()))
+
+    return files
+
+
+def validate_file(file_path: str, content: str) -> dict[str, Any]:
+    """
+    Syntax + Asimov validation of one generated file (runs in a pool worker).
+
+    Returns:
+        {
+            "path", "language", "syntax_valid", "asimov_valid",
+            "asimov_errors", "asimov_warnings", "asimov_report",
+            "write": bool, "reason": str, "duration_ms": float
+        }
+    """
+    start = time.perf_counter()
+    analyzer = _get_analyzer()
+    language = analyzer.detect_language(file_path)
+
+    result: dict[str, Any] = {
+        "path": file_path,
+        "language": language,
+        "syntax_valid": None,
+        "asimov_valid": None,
+        "asimov_errors": 0,
+        "asimov_warnings": 0,
+        "asimov_report": "",
+        "write": True,
+        "reason": "no parser - written without validation"
+    }
+
+    if language:
+        result["syntax_valid"] = analyzer.validate_syntax(content, language, file_path)
+
+        if not result["syntax_valid"]:
+            result["write"] = False
+            result["reason"] = "syntax errors"
+        else:
+            asimov_result = validate_asimov_rules(code=content, file_path=file_path, strict=False)
+            result["asimov_valid"] = asimov_result["valid"]
+            result["asimov_errors"] = asimov_result["summary"]["errors"]
+            result["asimov_warnings"] = asimov_result["summary"]["warnings"]
+            if not asimov_result["valid"]:
+                result["asimov_report"] = format_violations_report(asimov_result, file_path)
+
+            if result["asimov_errors"] > 0:
+                result["write"] = False
+                result["reason"] = f"{result['asimov_errors']} Asimov errors"
+            elif result["asimov_warnings"] > 0:
+                result["reason"] = "valid (Asimov warnings)"
+            else:
+                result["reason"] = "valid"
+
+    result["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+# ============================================================================
+# WORKER POOLS
+# ============================================================================
+
+_thread_pool: ThreadPoolExecutor | None = None
+_process_pool: ProcessPoolExecutor | None = None
+
+
+def _pool_size() -> int:
+    return int(os.environ.get("KI_VALIDATION_WORKERS", min(8, os.cpu_count() or 1)))
+
+
+def _process_min_files() -> int:
+    return int(os.environ.get("KI_VALIDATION_PROCESS_MIN_FILES", DEFAULT_PROCESS_MIN_FILES))
+
+
+def _get_executor(file_count: int) -> Executor:
+    """Threads for small batches, a (warm, reused) process pool for large ones."""
+    global _thread_pool, _process_pool
+
+    min_files = _process_min_files()
+    if min_files > 0 and file_count >= min_files:
+        if _process_pool is None:
+            # spawn: the server process has threads (fork would copy their locks)
+            _process_pool = ProcessPoolExecutor(
+                max_workers=_pool_size(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(max_workers=_pool_size(), thread_name_prefix="codesmith-validate")
+    return _thread_pool
+
+
+def shutdown_validation_pools() -> None:
+    """Shut down the worker pools (server lifespan)."""
+    global _thread_pool, _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+    if _thread_pool is not None:
+        _thread_pool.shutdown(wait=False, cancel_futures=True)
+        _thread_pool = None
+
+
+async def validate_files(files: list[tuple[str, str]]) -> list[dict[str, Any]]:
+    """Validate all files concurrently; results are in input order."""
+    global _process_pool
+    if not files:
+        return []
+
+    loop = asyncio.get_running_loop()
+    executor = _get_executor(len(files))
+
+    try:
+        return list(await asyncio.gather(*(
+            loop.run_in_executor(executor, validate_file, path, content)
+            for path, content in files
+        )))
+    except BrokenProcessPool:
+        logger.warning("⚠️ Validation process pool broken - retrying on threads")
+        _process_pool = None
+        executor = _get_executor(0)
+        return list(await asyncio.gather(*(
+            loop.run_in_executor(executor, validate_file, path, content)
+            for path, content in files
+        )))
+
+
+# ============================================================================
+# BATCHED WRITES
+# ============================================================================
+
+def _write_batch(files: list[tuple[str, str]], workspace_path: str) -> dict[str, str | None]:
+    """
+    Write files (same safety rules as tools.file_tools.write_file).
+
+    Returns:
+        {path: None on success, else error message}
+    """
+    abs_workspace = os.path.abspath(workspace_path)
+    errors: dict[str, str | None] = {}
+
+    for file_path, content in files:
+        abs_path = os.path.abspath(os.path.join(abs_workspace, file_path))
+        if os.path.commonpath([abs_path, abs_workspace]) != abs_workspace:
+            errors[file_path] = "File path outside workspace (security violation)"
+            continue
+        try:
+            os.makedirs(os.path.dirname(abs_path), exist_ok=True)
+            with open(abs_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            errors[file_path] = None
+        except OSError as e:
+            errors[file_path] = str(e)
+
+    return errors
+
+
+async def write_files(files: list[tuple[str, str]], workspace_path: str) -> dict[str, str | None]:
+    """Write all files in one batch off the event loop."""
+    if not files:
+        return {}
+    return await asyncio.to_thread(_write_batch, files, workspace_path)
+
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def build_validation_report(results: list[dict[str, Any]], duration_ms: float) -> dict[str, Any]:
+    """Aggregate per-file results into one summary + markdown report."""
+    summary = {
+        "total": len(results),
+        "written": sum(1 for r in results if r.get("written")),
+        "skipped_syntax": sum(1 for r in results if r["syntax_valid"] is False),
+        "skipped_asimov": sum(1 for r in results if r["syntax_valid"] and r["asimov_errors"] > 0),
+        "write_errors": sum(1 for r in results if r.get("write_error")),
+        "unvalidated": sum(1 for r in results if r["language"] is None),
+        "asimov_warnings": sum(r["asimov_warnings"] for r in results),
+        "duration_ms": round(duration_ms, 1),
+        "slowest_file_ms": max((r["duration_ms"] for r in results), default=0.0)
+    }
+
+    lines = [
+        "## Codesmith Validation Report",
+        "",
+        f"**Files:** {summary['total']} | **Written:** {summary['written']} | "
+        f"**Skipped:** {summary['skipped_syntax'] + summary['skipped_asimov']} | "
+        f"**Duration:** {summary['duration_ms']:.0f}ms (slowest file {summary['slowest_file_ms']:.0f}ms)",
+        ""
+    ]
+    for r in results:
+        icon = "✅" if r.get("written") else "❌"
+        status = r.get("write_error") or r["reason"]
+        lines.append(f"- {icon} `{r['path']}` ({r['language'] or 'no parser'}): {status}")
+
+    reports = [r["asimov_report"] for r in results if r["asimov_report"]]
+    if reports:
+        lines += ["", "### Asimov Violations", "", *reports]
+
+    return {"summary": summary, "files": results, "markdown": "\n".join(lines)}
+
+
+async def run_validation_pipeline(code_output: str, workspace_path: str) -> dict[str, Any]:
+    """
+    Parse, validate (in parallel) and write Codesmith's generated files.
+
+    Returns:
+        {
+            "generated_files": [{"path", "size", "timestamp", "validated"}, ...],
+            "report": build_validation_report(...)
+        }
+    """
+    start = time.perf_counter()
+    files = parse_file_blocks(code_output)
+    logger.info(f"🔍 Validating {len(files)} files in parallel...")
+
+    results = await validate_files(files)
+
+    contents = dict(files)
+    to_write = [(r["path"], contents[r["path"]]) for r in results if r["write"]]
+    write_errors = await write_files(to_write, workspace_path)
+
+    generated_files = []
+    for r in results:
+        if not r["write"]:
+            logger.warning(f"⚠️ Skipping {r['path']}: {r['reason']}")
+            continue
+        error = write_errors.get(r["path"])
+        if error:
+            r["write_error"] = error
+            logger.error(f"❌ Failed to write {r['path']}: {error}")
+            continue
+        r["written"] = True
+        generated_files.append({
+            "path": r["path"],
+            "size": len(contents[r["path"]]),
+            "timestamp": datetime.now().isoformat(),
+            "validated": r["language"] is not None
+        })
+
+    report = build_validation_report(results, (time.perf_counter() - start) * 1000)
+    if report["summary"]["skipped_asimov"] or report["summary"]["asimov_warnings"]:
+        logger.warning(f"\n{report['markdown']}")
+    else:
+        logger.info(f"\n{report['markdown']}")
+
+    return {"generated_files": generated_files, "report": report}
+
+
+__all__ = [
+    "build_validation_report",
+    "parse_file_blocks",
+    "run_validation_pipeline",
+    "shutdown_validation_pools",
+    "validate_file",
+    "validate_files",
+    "write_files",
+]
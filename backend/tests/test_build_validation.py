@@ -0,0 +1,180 @@
+"""
+Test Async Incremental Build Validation
+
+Tests that tsc/mypy/eslint checks run concurrently, reuse results for
+unchanged inputs, use the dmypy daemon and lint only changed files -
+using fake `npx` and `python3` executables on PATH.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import stat
+import sys
+import textwrap
+import time
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from subgraphs import build_validation
+from subgraphs.build_validation import BuildValidator
+
+
+FAKE_TOOL = """
+import json, os, sys, time
+log = os.environ["FAKE_TOOL_LOG"]
+with open(log, "a") as f:
+    f.write(json.dumps([os.path.basename(sys.argv[0])] + sys.argv[1:]) + "\\n")
+time.sleep(float(os.environ.get("FAKE_TOOL_DELAY", "0")))
+args = sys.argv[1:]
+if os.environ.get("FAKE_NO_MYPY") and "mypy" in " ".join(args):
+    sys.stderr.write("No module named mypy")
+    sys.exit(1)
+if "mypy.dmypy" in args and os.environ.get("FAKE_DMYPY_EXIT"):
+    sys.stdout.write(os.environ.get("FAKE_DMYPY_OUTPUT", ""))
+    sys.exit(int(os.environ["FAKE_DMYPY_EXIT"]))
+if "eslint" in args:
+    files = [a for a in args if a.endswith(".js")]
+    print(json.dumps([
+        {"filePath": f, "messages": [{"severity": 2, "line": 1, "message": "bad", "ruleId": "no-undef"}]
+         if "bad" in open(f).read() else []}
+        for f in files
+    ]))
+    sys.exit(1 if any("bad" in open(f).read() for f in files) else 0)
+sys.exit(0)
+"""
+
+
+@pytest.fixture
+def tools(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    for name in ("npx", "python3"):
+        script = bin_dir / name
+        script.write_text(f"#!{sys.executable}\n" + textwrap.dedent(FAKE_TOOL))
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+
+    log = tmp_path / "calls.log"
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_TOOL_LOG", str(log))
+
+    def calls() -> list[list[str]]:
+        return [json.loads(line) for line in log.read_text().splitlines()] if log.exists() else []
+
+    return calls
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    ws = tmp_path / "ws"
+    ws.mkdir()
+    (ws / "tsconfig.json").write_text("{}")
+    (ws / "package.json").write_text("{}")
+    (ws / "app.ts").write_text("export const a = 1;\n")
+    (ws / "main.py").write_text("x: int = 1\n")
+    (ws / "good.js").write_text("const g = 1;\n")
+    (ws / "other.js").write_text("const o = 1;\n")
+    return ws
+
+
+FILES = [{"path": p} for p in ("app.ts", "main.py", "good.js", "other.js")]
+
+
+@pytest.mark.asyncio
+async def test_checks_run_concurrently(workspace, tools, monkeypatch):
+    monkeypatch.setenv("FAKE_TOOL_DELAY", "0.5")
+    validator = BuildValidator(str(workspace))
+
+    start = time.monotonic()
+    passed, errors = await validator.run(FILES)
+
+    assert passed, errors
+    assert len(tools()) == 3
+    assert time.monotonic() - start < 1.3  # 3 × 0.5s sequentially
+
+
+@pytest.mark.asyncio
+async def test_incremental_state_between_iterations(workspace, tools):
+    validator = BuildValidator(str(workspace))
+    await validator.run(FILES)
+
+    tsc_call = next(c for c in tools() if "tsc" in c)
+    assert "--incremental" in tsc_call
+    assert any("mypy.dmypy" in c for c in tools())
+
+    # Nothing changed → nothing re-run
+    await validator.run(FILES)
+    assert len(tools()) == 3
+    assert validator.stats["reused"] == 3
+
+    # One JS file changed → only that file is linted, tsc/mypy reused
+    (workspace / "other.js").write_text("bad();\n")
+    passed, errors = await validator.run(FILES)
+
+    last = tools()[-1]
+    assert len(tools()) == 4
+    assert "eslint" in last and last[-1].endswith("other.js")
+    assert not passed
+    assert errors[0]["type"] == "javascript_eslint" and "other.js:1" in errors[0]["errors"]
+
+    await validator.shutdown()
+    assert tools()[-1][-1] == "stop"
+
+
+@pytest.mark.asyncio
+async def test_missing_mypy_is_skipped(workspace, tools, monkeypatch):
+    monkeypatch.setenv("FAKE_NO_MYPY", "1")
+    validator = BuildValidator(str(workspace))
+
+    passed, errors = await validator.run([{"path": "main.py"}])
+
+    assert passed and errors == []
+
+
+@pytest.mark.asyncio
+async def test_dmypy_blocking_errors_are_a_result(workspace, tools, monkeypatch):
+    monkeypatch.setenv("FAKE_DMYPY_EXIT", "2")
+    monkeypatch.setenv("FAKE_DMYPY_OUTPUT", "main.py:1: error: invalid syntax  [syntax]\n")
+    validator = BuildValidator(str(workspace))
+
+    passed, errors = await validator.run([{"path": "main.py"}])
+
+    assert not passed and "invalid syntax" in errors[0]["errors"]
+    assert validator.use_dmypy
+    assert len(tools()) == 1  # No fallback to plain mypy
+
+
+@pytest.mark.asyncio
+async def test_dmypy_crash_falls_back_to_mypy(workspace, tools, monkeypatch):
+    monkeypatch.setenv("FAKE_DMYPY_EXIT", "2")
+    monkeypatch.setenv("FAKE_DMYPY_OUTPUT", "Daemon crashed!\n")
+    validator = BuildValidator(str(workspace))
+
+    passed, errors = await validator.run([{"path": "main.py"}])
+
+    assert passed, errors
+    assert not validator.use_dmypy
+    assert "mypy.dmypy" not in tools()[-1] and "mypy" in tools()[-1]
+
+
+@pytest.mark.asyncio
+async def test_validators_are_released_and_reaped(workspace, tools, monkeypatch):
+    monkeypatch.setattr(build_validation, "_validators", {})
+
+    await build_validation.run_build_validation([{"path": "main.py"}], str(workspace))
+    await build_validation.release_build_validator(str(workspace))
+    assert tools()[-1][-1] == "stop"
+    assert build_validation._validators == {}
+
+    await build_validation.run_build_validation([{"path": "main.py"}], str(workspace))
+    assert await build_validation.stop_idle_build_validators(max_idle_seconds=3600) == 0
+    assert await build_validation.stop_idle_build_validators(max_idle_seconds=0) == 1
+    assert tools()[-1][-1] == "stop"
+    assert build_validation._validators == {}
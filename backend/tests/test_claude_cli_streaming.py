@@ -0,0 +1,270 @@
+"""
+Test Claude CLI Streaming
+
+Tests ClaudeCLISimple.astream() against a fake `claude` executable that
+emits stream-json events with delays, so no real CLI is needed.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import stat
+import sys
+import textwrap
+import time
+
+import pytest
+import pytest_asyncio
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from adapters import claude_cli_pool
+from adapters.claude_cli_pool import ClaudeCLIPool
+from adapters.claude_cli_simple import ClaudeCLISimple
+
+
+FAKE_CLI = textwrap.dedent("""\
+    #!{python}
+    import json, sys, time
+
+    def answer(text):
+        events = [
+            {{"type": "system", "subtype": "init"}},
+            {{"type": "assistant", "message": {{"content": [{{"type": "text", "text": "{big}"}}]}}}},
+            {{"type": "result", "subtype": "success", "is_error": False, "result": "{result}"}},
+        ]
+        for event in events:
+            print(json.dumps(event), flush=True)
+            time.sleep({delay})
+
+    streaming = "--input-format" in sys.argv
+    if {exit_code} or (streaming and not {supports_streaming}):
+        sys.stderr.write("{stderr}")
+        sys.exit({exit_code} or 2)
+
+    if streaming:
+        # Streaming input mode: one turn per JSONL user message on stdin
+        for line in sys.stdin:
+            json.loads(line)["message"]["content"][0]["text"]
+            answer("")
+    else:
+        answer(sys.argv[-1])
+""")
+
+
+def make_fake_cli(
+    tmp_path,
+    *,
+    result="4",
+    delay=0.2,
+    exit_code=0,
+    stderr="",
+    big_size=10,
+    supports_streaming=True
+) -> str:
+    """Write an executable fake CLI and return its path."""
+    script = tmp_path / "claude"
+    script.write_text(FAKE_CLI.format(
+        python=sys.executable,
+        result=result,
+        delay=delay,
+        exit_code=exit_code,
+        stderr=stderr,
+        big="x" * big_size,
+        supports_streaming=supports_streaming
+    ))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return str(script)
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def fresh_pool(monkeypatch):
+    """Isolate the global CLI pool per test."""
+    pool = ClaudeCLIPool()
+    monkeypatch.setattr(claude_cli_pool, "_pool", pool)
+    yield pool
+    await pool.shutdown()
+
+
+MESSAGES = [SystemMessage(content="Be brief."), HumanMessage(content="What is 2+2?")]
+
+
+@pytest.mark.asyncio
+async def test_astream_yields_events_before_process_exits(tmp_path):
+    """First event arrives long before the CLI finishes."""
+    llm = ClaudeCLISimple(cli_path=make_fake_cli(tmp_path, delay=0.3), workspace_path=str(tmp_path))
+
+    start = time.monotonic()
+    arrivals = []
+    async for event in llm.astream(MESSAGES):
+        arrivals.append((event["type"], time.monotonic() - start))
+    total = time.monotonic() - start
+
+    assert [t for t, _ in arrivals] == ["system", "assistant", "result"]
+    assert arrivals[0][1] < total - 0.5
+    assert llm.last_events[-1]["result"] == "4"
+
+
+@pytest.mark.asyncio
+async def test_events_forwarded_to_hitl_callback(tmp_path):
+    """Every event is forwarded as claude_cli_event between start and complete."""
+    received = []
+
+    async def callback(info: dict) -> None:
+        received.append(info)
+
+    llm = ClaudeCLISimple(
+        cli_path=make_fake_cli(tmp_path, delay=0),
+        workspace_path=str(tmp_path),
+        hitl_callback=callback
+    )
+    response = await llm.ainvoke(MESSAGES)
+
+    assert response.content == "4"
+    types = [info["type"] for info in received]
+    assert types == ["claude_cli_start"] + ["claude_cli_event"] * 3 + ["claude_cli_complete"]
+    assert [info["event_type"] for info in received[1:4]] == ["system", "assistant", "result"]
+
+
+@pytest.mark.asyncio
+async def test_raw_output_capture_is_opt_in(tmp_path):
+    """Raw output is only kept when capture_raw_output is enabled."""
+    cli = make_fake_cli(tmp_path, delay=0)
+
+    llm = ClaudeCLISimple(cli_path=cli, workspace_path=str(tmp_path), capture_raw_output=False)
+    await llm.ainvoke(MESSAGES)
+    assert llm.last_raw_output is None
+
+    llm = ClaudeCLISimple(cli_path=cli, workspace_path=str(tmp_path), capture_raw_output=True)
+    await llm.ainvoke(MESSAGES)
+    assert len(llm.last_raw_output.splitlines()) == 3
+    assert json.loads(llm.last_raw_output.splitlines()[-1])["result"] == "4"
+
+
+@pytest.mark.asyncio
+async def test_long_lines_are_parsed(tmp_path):
+    """Lines above asyncio's default 64 KB limit are still parsed."""
+    llm = ClaudeCLISimple(
+        cli_path=make_fake_cli(tmp_path, delay=0, big_size=200_000),
+        workspace_path=str(tmp_path)
+    )
+    await llm.ainvoke(MESSAGES)
+
+    text = llm.last_events[1]["message"]["content"][0]["text"]
+    assert len(text) == 200_000
+
+
+@pytest.mark.asyncio
+async def test_nonzero_exit_raises(tmp_path):
+    """A failing CLI raises RuntimeError with stderr content."""
+    llm = ClaudeCLISimple(
+        cli_path=make_fake_cli(tmp_path, delay=0, exit_code=1, stderr="boom"),
+        workspace_path=str(tmp_path)
+    )
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await llm.ainvoke(MESSAGES)
+    assert llm.last_error is not None
+
+
+@pytest.mark.asyncio
+async def test_pool_serves_second_call_from_warm_worker(tmp_path, fresh_pool):
+    """First call spawns cold, the next one gets the pre-spawned warm worker."""
+    llm = ClaudeCLISimple(cli_path=make_fake_cli(tmp_path, delay=0), workspace_path=str(tmp_path))
+
+    assert (await llm.ainvoke(MESSAGES)).content == "4"
+    assert (await llm.ainvoke(MESSAGES)).content == "4"
+
+    stats = fresh_pool.get_stats()
+    assert stats["cold_spawns"] == 1
+    assert stats["warm_hits"] == 1
+    assert stats["workers_recycled"] == 2  # max_requests_per_worker=1
+    assert stats["idle_workers"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_worker_up_to_max_requests(tmp_path, monkeypatch):
+    """Workers serve several turns when max_requests_per_worker allows it."""
+    pool = ClaudeCLIPool(warm_workers_per_key=0, max_requests_per_worker=2)
+    monkeypatch.setattr(claude_cli_pool, "_pool", pool)
+    llm = ClaudeCLISimple(cli_path=make_fake_cli(tmp_path, delay=0), workspace_path=str(tmp_path))
+
+    for _ in range(3):
+        assert (await llm.ainvoke(MESSAGES)).content == "4"
+
+    stats = pool.get_stats()
+    assert stats["workers_spawned"] == 2
+    assert stats["warm_hits"] == 1
+    await pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pool_falls_back_to_oneshot(tmp_path, fresh_pool):
+    """CLI without streaming input: transparent fallback, key marked unsupported."""
+    llm = ClaudeCLISimple(
+        cli_path=make_fake_cli(tmp_path, delay=0, supports_streaming=False),
+        workspace_path=str(tmp_path)
+    )
+
+    assert (await llm.ainvoke(MESSAGES)).content == "4"
+    assert (await llm.ainvoke(MESSAGES)).content == "4"
+
+    stats = fresh_pool.get_stats()
+    assert stats["fallbacks"] == 1
+    assert stats["unsupported_keys"] == 1
+    assert stats["cold_start_ms"] is not None
+
+
+@pytest.mark.asyncio
+async def test_pool_reaps_idle_workers(tmp_path, monkeypatch):
+    """Spares idle longer than max_idle_seconds are closed by reap_idle()."""
+    pool = ClaudeCLIPool(max_idle_seconds=60)
+    monkeypatch.setattr(claude_cli_pool, "_pool", pool)
+    llm = ClaudeCLISimple(cli_path=make_fake_cli(tmp_path, delay=0), workspace_path=str(tmp_path))
+
+    assert (await llm.ainvoke(MESSAGES)).content == "4"
+    for _ in range(50):
+        if pool.get_stats()["idle_workers"]:
+            break
+        await asyncio.sleep(0.05)
+    assert pool.get_stats()["idle_workers"] == 1
+
+    assert await pool.reap_idle() == 0
+    for workers in pool._idle.values():
+        for worker in workers:
+            worker.last_used -= 120
+    assert await pool.reap_idle() == 1
+
+    stats = pool.get_stats()
+    assert stats["idle_workers"] == 0
+    assert stats["workers_reaped"] == 1
+    await pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pool_caps_idle_workers_across_keys(tmp_path, monkeypatch):
+    """Warm spares of many workspaces never exceed max_idle_workers."""
+    pool = ClaudeCLIPool(max_idle_workers=2)
+    monkeypatch.setattr(claude_cli_pool, "_pool", pool)
+    cli_path = make_fake_cli(tmp_path, delay=0)
+
+    for i in range(4):
+        workspace = tmp_path / f"ws{i}"
+        workspace.mkdir()
+        llm = ClaudeCLISimple(cli_path=cli_path, workspace_path=str(workspace))
+        assert (await llm.ainvoke(MESSAGES)).content == "4"
+        await asyncio.gather(*pool._background)
+
+    stats = pool.get_stats()
+    assert stats["idle_workers"] == 2
+    assert stats["workers_reaped"] == 2
+    # The most recent workspaces keep their spares
+    assert {key[0] for key in pool._idle} == {str(tmp_path / "ws2"), str(tmp_path / "ws3")}
+    await pool.shutdown()
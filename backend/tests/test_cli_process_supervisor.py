@@ -0,0 +1,222 @@
+"""
+Test Claude CLI Process Supervisor
+
+Tests wall-clock timeouts, SIGTERM → SIGKILL escalation, retries of
+transient failures and the live process registry, using fake `claude`
+executables.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import stat
+import sys
+import textwrap
+import time
+
+import pytest
+import pytest_asyncio
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_core.messages import HumanMessage
+from adapters import claude_cli_pool, claude_cli_simple, cli_process_supervisor
+from adapters.claude_cli_pool import ClaudeCLIPool
+from adapters.claude_cli_simple import ClaudeCLISimple
+from adapters.cli_process_supervisor import (
+    ClaudeCLITimeoutError,
+    ProcessSupervisor,
+    get_agent_timeout,
+    is_transient_error,
+)
+
+
+MESSAGES = [HumanMessage(content="What is 2+2?")]
+
+RESULT_LINE = '{"type": "result", "subtype": "success", "is_error": false, "result": "4"}'
+
+
+def make_script(tmp_path, body: str) -> str:
+    script = tmp_path / "claude"
+    script.write_text(f"#!{sys.executable}\n" + textwrap.dedent(body))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return str(script)
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def supervisor(monkeypatch):
+    """Isolated supervisor and pool, no backoff sleeps."""
+    sup = ProcessSupervisor(terminate_grace=0.5)
+    pool = ClaudeCLIPool(warm_workers_per_key=0)
+    monkeypatch.setattr(cli_process_supervisor, "_supervisor", sup)
+    monkeypatch.setattr(claude_cli_pool, "_pool", pool)
+    monkeypatch.setattr(claude_cli_simple, "retry_delay", lambda attempt: 0.0)
+    yield sup
+    await pool.shutdown()
+    await sup.shutdown()
+
+
+def test_transient_error_classification():
+    assert is_transient_error(ClaudeCLITimeoutError("timed out"))
+    assert is_transient_error(RuntimeError("Claude CLI failed: API Error: 529 Overloaded"))
+    assert is_transient_error(RuntimeError("Claude CLI failed: read ECONNRESET"))
+    assert not is_transient_error(RuntimeError("Claude CLI failed: invalid --model"))
+    assert not is_transient_error(RuntimeError("Processed 5000 tokens"))
+    assert not is_transient_error(RuntimeError("Claude CLI failed: empty response"))
+    assert not is_transient_error(RuntimeError("Claude CLI failed: wrote 502 lines, test 500 failed"))
+    assert is_transient_error(RuntimeError("Claude CLI failed: API Error: 503"))
+
+
+def test_agent_timeouts(monkeypatch):
+    monkeypatch.delenv("KI_CLAUDE_CLI_TIMEOUT", raising=False)
+    monkeypatch.delenv("KI_CLAUDE_CLI_TIMEOUT_CODESMITH", raising=False)
+    assert get_agent_timeout("codesmith") > get_agent_timeout("research")
+
+    monkeypatch.setenv("KI_CLAUDE_CLI_TIMEOUT_CODESMITH", "42")
+    assert get_agent_timeout("codesmith") == 42.0
+
+
+@pytest.mark.asyncio
+async def test_hung_oneshot_cli_is_terminated(tmp_path, supervisor):
+    """A CLI that never answers is killed at the deadline, even if it ignores SIGTERM."""
+    cli = make_script(tmp_path, """
+        import signal, time
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        print('{"type": "system", "subtype": "init"}', flush=True)
+        time.sleep(60)
+    """)
+    llm = ClaudeCLISimple(cli_path=cli, workspace_path=str(tmp_path), use_pool=False, timeout=1.0, max_retries=0)
+
+    start = time.monotonic()
+    with pytest.raises(ClaudeCLITimeoutError):
+        await llm.ainvoke(MESSAGES)
+
+    assert time.monotonic() - start < 5
+    assert supervisor.list_running() == []
+    assert supervisor.stats["timeouts"] == 1
+    assert supervisor.stats["killed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hung_pooled_worker_is_terminated(tmp_path, supervisor):
+    """A pooled worker that never finishes its turn is terminated, not reused."""
+    cli = make_script(tmp_path, """
+        import sys, time
+        for line in sys.stdin:
+            time.sleep(60)
+    """)
+    llm = ClaudeCLISimple(cli_path=cli, workspace_path=str(tmp_path), timeout=1.0, max_retries=0)
+
+    with pytest.raises(ClaudeCLITimeoutError):
+        await llm.ainvoke(MESSAGES)
+
+    assert supervisor.list_running() == []
+    assert claude_cli_pool.get_claude_cli_pool().get_stats()["idle_workers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_transient_failure_is_retried(tmp_path, supervisor):
+    counter = tmp_path / "attempts"
+    cli = make_script(tmp_path, f"""
+        import os, sys
+        path = {str(counter)!r}
+        attempts = int(open(path).read()) if os.path.exists(path) else 0
+        open(path, "w").write(str(attempts + 1))
+        if attempts == 0:
+            sys.stderr.write("API Error: 529 Overloaded")
+            sys.exit(1)
+        print({RESULT_LINE!r}, flush=True)
+    """)
+    llm = ClaudeCLISimple(cli_path=cli, workspace_path=str(tmp_path), use_pool=False, max_retries=2)
+
+    response = await llm.ainvoke(MESSAGES)
+
+    assert response.content == "4"
+    assert counter.read_text() == "2"
+    assert supervisor.stats["retries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failure_after_file_edits_is_not_retried(tmp_path, supervisor):
+    """A retry would repeat the Edit/Write tool calls of the failed attempt."""
+    counter = tmp_path / "attempts"
+    edit_event = json.dumps({
+        "type": "assistant",
+        "message": {"content": [{"type": "tool_use", "name": "Edit", "input": {"file_path": "a.py"}}]}
+    })
+    cli = make_script(tmp_path, f"""
+        import os, sys
+        path = {str(counter)!r}
+        attempts = int(open(path).read()) if os.path.exists(path) else 0
+        open(path, "w").write(str(attempts + 1))
+        print({edit_event!r}, flush=True)
+        sys.stderr.write("API Error: 529 Overloaded")
+        sys.exit(1)
+    """)
+    llm = ClaudeCLISimple(cli_path=cli, workspace_path=str(tmp_path), use_pool=False, max_retries=2)
+
+    with pytest.raises(RuntimeError, match="Overloaded"):
+        await llm.ainvoke(MESSAGES)
+
+    assert counter.read_text() == "1"
+    assert supervisor.stats["retries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_no_retry_beyond_retry_budget(tmp_path, supervisor):
+    cli = make_script(tmp_path, """
+        import sys
+        sys.stderr.write("API Error: 529 Overloaded")
+        sys.exit(1)
+    """)
+    llm = ClaudeCLISimple(
+        cli_path=cli, workspace_path=str(tmp_path), use_pool=False, max_retries=2, retry_budget=0.0
+    )
+
+    with pytest.raises(RuntimeError, match="Overloaded"):
+        await llm.ainvoke(MESSAGES)
+
+    assert supervisor.stats["retries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_registry_lists_running_processes(tmp_path, supervisor):
+    cli = make_script(tmp_path, f"""
+        import time
+        time.sleep(1)
+        print({RESULT_LINE!r}, flush=True)
+    """)
+    llm = ClaudeCLISimple(
+        agent_name="architect", cli_path=cli, workspace_path=str(tmp_path), use_pool=False
+    )
+
+    task = asyncio.create_task(llm.ainvoke(MESSAGES))
+    await asyncio.sleep(0.3)
+
+    running = supervisor.get_stats()["running"]
+    assert len(running) == 1
+    assert running[0]["agent"] == "architect"
+    assert running[0]["mode"] == "oneshot"
+
+    await task
+    assert supervisor.get_stats()["running"] == []
+
+
+@pytest.mark.asyncio
+async def test_shutdown_terminates_orphans(tmp_path, supervisor):
+    process = await supervisor.spawn(
+        [sys.executable, "-c", "import time; time.sleep(60)"],
+        agent="research",
+        mode="oneshot"
+    )
+
+    await supervisor.shutdown()
+
+    assert process.returncode is not None
+    assert supervisor.list_running() == []
@@ -0,0 +1,97 @@
+"""
+Test Adaptive ReviewFix Loop Termination
+
+Tests the convergence policy decisions, per-workspace configuration and
+that the ReviewFix loop records why it stopped.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_core.messages import AIMessage
+from subgraphs import reviewfix_subgraph_v6_1
+from subgraphs.convergence_policy import DEFAULT_POLICY, decide, load_convergence_policy
+
+
+def test_stop_reasons():
+    policy = dict(DEFAULT_POLICY)
+
+    assert decide([0.8], [], 1, policy) == (False, "quality_reached: 0.80 >= 0.75")
+    assert decide([0.4, 0.5, 0.6], [], 3, policy)[1].startswith("max_iterations")
+    assert decide([0.5, 0.51], [], 2, policy)[1].startswith("stalled")
+    assert decide([0.5, 0.45], [], 2, policy)[1].startswith("stalled")  # Regression
+    assert decide([0.4, 0.5], ["a", "a"], 2, policy)[1].startswith("repeated_findings")
+
+    should_continue, reason = decide([0.4, 0.5], ["a", "b"], 2, policy)
+    assert should_continue and reason.startswith("continue")
+
+    assert decide([0.5], [], 1, policy)[0] is True  # No trajectory yet
+
+
+def test_not_worth_cost():
+    policy = {**DEFAULT_POLICY, "max_iterations": 10, "iteration_cost": 0.05}
+    # Improvements 0.04 → predicted 0.04 * 0.6 = 0.024 < 0.05
+    should_continue, reason = decide([0.40, 0.44, 0.48], [], 3, policy)
+    assert not should_continue
+    assert reason.startswith("not_worth_cost")
+
+
+def test_workspace_policy_overrides(tmp_path):
+    config_dir = tmp_path / ".ki_autoagent_ws" / "config"
+    config_dir.mkdir(parents=True)
+    (config_dir / "reviewfix.json").write_text(json.dumps({"quality_threshold": 0.9, "max_iterations": "5", "bogus": 1}))
+
+    policy = load_convergence_policy(str(tmp_path))
+
+    assert policy["quality_threshold"] == 0.9
+    assert policy["max_iterations"] == 5
+    assert "bogus" not in policy
+    assert policy["min_improvement"] == DEFAULT_POLICY["min_improvement"]
+
+
+class StuckReviewer:
+    def __init__(self, **kwargs):
+        pass
+
+    async def ainvoke(self, messages):
+        return AIMessage(content="FILE: a.txt\nQUALITY_SCORE: 0.5\nFEEDBACK:\n- Issue 1: same problem")
+
+
+@pytest.mark.asyncio
+async def test_loop_stops_on_stalled_score(tmp_path, monkeypatch):
+    monkeypatch.setattr(reviewfix_subgraph_v6_1, "ChatOpenAI", StuckReviewer)
+    monkeypatch.setenv("KI_REVIEW_GATE", "off")
+    (tmp_path / "a.txt").write_text("alpha")
+
+    subgraph = reviewfix_subgraph_v6_1.create_reviewfix_subgraph(str(tmp_path))
+    result = await subgraph.ainvoke({
+        "workspace_path": str(tmp_path),
+        "generated_files": [{"path": "a.txt"}],
+        "files_to_review": ["a.txt"],
+        "design": {},
+        "quality_score": 0.0,
+        "review_feedback": {},
+        "fixes_applied": [],
+        "iteration": 0,
+        "should_continue": True,
+        "score_history": [],
+        "finding_signatures": [],
+        "stop_reason": "",
+        "errors": []
+    })
+
+    # One fix round, then the unchanged score stops the loop before max_iterations
+    assert result["iteration"] == 2
+    assert result["score_history"] == [0.5, 0.5]
+    assert result["stop_reason"].startswith("stalled")
@@ -0,0 +1,190 @@
+"""
+Test Design-Diff Driven Incremental Regeneration
+
+Tests design section splitting, file → section mapping and the
+full / incremental / unchanged regeneration plans.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from subgraphs.design_manifest import (
+    ALL_SECTIONS,
+    DesignManifest,
+    build_incremental_prompt,
+    map_file_to_sections,
+    split_design_sections,
+)
+
+
+DESIGN = """# Todo App
+
+## Backend
+API server in `src/server.py` with SQLite storage in src/db.py.
+
+## Frontend
+Single page in `src/App.tsx`.
+
+```python
+# not a heading
+```
+
+## Deployment
+Docker based.
+"""
+
+FILES = ["src/server.py", "src/db.py", "src/App.tsx", "README.md"]
+
+
+def write_generation(workspace, design: str) -> DesignManifest:
+    for path in FILES:
+        full_path = workspace / path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_text(f"// {path}\n")
+
+    manifest = DesignManifest.load(str(workspace))
+    manifest.update(split_design_sections(design), [{"path": p, "size": 10} for p in FILES])
+    manifest.save()
+    return DesignManifest.load(str(workspace))
+
+
+def test_split_design_sections():
+    sections = split_design_sections(DESIGN)
+
+    assert list(sections) == [
+        "Todo App", "Todo App > Backend", "Todo App > Frontend", "Todo App > Deployment"
+    ]
+    assert "# not a heading" in sections["Todo App > Frontend"]
+
+
+def test_map_file_to_sections():
+    sections = split_design_sections(DESIGN)
+
+    assert map_file_to_sections("src/db.py", sections) == ["Todo App > Backend"]
+    assert map_file_to_sections("./src/App.tsx", sections) == ["Todo App > Frontend"]
+    assert map_file_to_sections("README.md", sections) == [ALL_SECTIONS]
+
+
+def test_first_run_is_full(tmp_path):
+    plan = DesignManifest.load(str(tmp_path)).plan(split_design_sections(DESIGN))
+    assert plan["mode"] == "full"
+
+
+def test_unchanged_design_skips_generation(tmp_path):
+    manifest = write_generation(tmp_path, DESIGN)
+
+    plan = manifest.plan(split_design_sections(DESIGN))
+
+    assert plan["mode"] == "unchanged"
+    assert sorted(plan["keep"]) == sorted(FILES)
+
+
+def test_changed_section_regenerates_only_mapped_files(tmp_path):
+    manifest = write_generation(tmp_path, DESIGN)
+    new_design = DESIGN.replace("Single page", "Two pages")
+
+    sections = split_design_sections(new_design)
+    plan = manifest.plan(sections)
+
+    assert plan["mode"] == "incremental"
+    assert plan["changed_sections"] == ["Todo App > Frontend"]
+    # README.md is not referenced by any section → regenerated on any change
+    assert sorted(plan["regenerate"]) == ["README.md", "src/App.tsx"]
+    assert sorted(plan["keep"]) == ["src/db.py", "src/server.py"]
+
+    prompt = build_incremental_prompt(plan, sections)
+    assert "Two pages" in prompt
+    assert "SQLite" not in prompt  # Unchanged sections are not resent
+
+
+def test_missing_file_is_regenerated(tmp_path):
+    manifest = write_generation(tmp_path, DESIGN)
+    (tmp_path / "src" / "db.py").unlink()
+
+    plan = manifest.plan(split_design_sections(DESIGN))
+
+    assert plan["mode"] == "incremental"
+    assert plan["regenerate"] == ["src/db.py"]
+
+
+def test_large_change_falls_back_to_full(tmp_path):
+    manifest = write_generation(tmp_path, DESIGN)
+
+    plan = manifest.plan(split_design_sections("# Something else\n\nCompletely new.\n"))
+
+    assert plan["mode"] == "full"
+
+
+def test_kept_files_keep_their_mapping(tmp_path):
+    manifest = write_generation(tmp_path, DESIGN)
+    sections = split_design_sections(DESIGN.replace("Single page", "Two pages"))
+    plan = manifest.plan(sections)
+
+    regenerated = [{"path": p, "size": 5} for p in plan["regenerate"]]
+    manifest.update(sections, regenerated + manifest.kept_file_infos(plan))
+
+    assert manifest.files["src/db.py"]["sections"] == ["Todo App > Backend"]
+    assert manifest.plan(sections)["mode"] == "unchanged"
+
+
+def test_edited_file_is_detected_and_preserved(tmp_path):
+    manifest = write_generation(tmp_path, DESIGN)
+    (tmp_path / "src" / "db.py").write_text("# fixed by the user\n")
+
+    unchanged = manifest.plan(split_design_sections(DESIGN))
+    assert unchanged["mode"] == "unchanged"
+    assert unchanged["modified"] == ["src/db.py"]
+
+    sections = split_design_sections(DESIGN.replace("SQLite", "Postgres"))
+    plan = manifest.plan(sections)
+    assert "src/db.py" in plan["regenerate"]
+    assert "src/db.py (edited since the last generation" in build_incremental_prompt(plan, sections)
+
+
+def test_files_of_removed_sections_are_deleted(tmp_path):
+    design = DESIGN + "\n## Admin\nAdmin page in `src/Admin.tsx`.\n"
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "Admin.tsx").write_text("// admin\n")
+    manifest = write_generation(tmp_path, design)
+    manifest.update(
+        split_design_sections(design),
+        [{"path": p, "size": 10} for p in FILES + ["src/Admin.tsx"]]
+    )
+
+    sections = split_design_sections(DESIGN)
+    plan = manifest.plan(sections)
+
+    assert plan["mode"] == "incremental"
+    assert plan["delete"] == ["src/Admin.tsx"]
+    assert "src/Admin.tsx" not in plan["regenerate"]
+    assert manifest.delete_files(plan) == ["src/Admin.tsx"]
+    assert not (tmp_path / "src" / "Admin.tsx").exists()
+    assert (tmp_path / "src" / "App.tsx").exists()
+
+
+def test_edited_file_of_removed_section_is_kept(tmp_path):
+    design = DESIGN + "\n## Admin\nAdmin page in `src/Admin.tsx`.\n"
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "Admin.tsx").write_text("// admin\n")
+    manifest = write_generation(tmp_path, design)
+    manifest.update(
+        split_design_sections(design),
+        [{"path": p, "size": 10} for p in FILES + ["src/Admin.tsx"]]
+    )
+    (tmp_path / "src" / "Admin.tsx").write_text("// admin, edited\n")
+
+    plan = manifest.plan(split_design_sections(DESIGN))
+
+    assert plan["delete"] == []
+    assert "src/Admin.tsx" in plan["keep"]
+    assert manifest.delete_files(plan) == []
+    kept = {f["path"]: f for f in manifest.kept_file_infos(plan)}
+    assert kept["src/Admin.tsx"]["validated"] is False
@@ -0,0 +1,123 @@
+"""
+Test Early File Materialization
+
+Tests that files written by Claude CLI Edit/Write tools are validated while
+the CLI stream is still running.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_core.messages import HumanMessage
+from adapters.claude_cli_simple import ClaudeCLISimple
+from subgraphs.file_materializer import EarlyFileMaterializer
+
+
+def tool_use(tool_id: str, name: str, file_path: str) -> dict:
+    return {
+        "type": "assistant",
+        "message": {"content": [{"type": "tool_use", "id": tool_id, "name": name, "input": {"file_path": file_path}}]}
+    }
+
+
+def tool_result(tool_id: str, is_error: bool = False) -> dict:
+    return {
+        "type": "user",
+        "message": {"content": [{"type": "tool_result", "tool_use_id": tool_id, "is_error": is_error}]}
+    }
+
+
+@pytest.mark.asyncio
+async def test_files_validated_after_tool_result(tmp_path):
+    materializer = EarlyFileMaterializer(str(tmp_path))
+
+    (tmp_path / "good.py").write_text("def add(a: int, b: int) -> int:\n    return a + b\n")
+    (tmp_path / "broken.py").write_text("def broken(:\n")
+
+    materializer.on_event(tool_use("t1", "Write", str(tmp_path / "good.py")))
+    materializer.on_event(tool_use("t2", "Edit", "broken.py"))
+    assert materializer.results == {}  # Nothing before tool_result
+
+    materializer.on_event(tool_result("t1"))
+    materializer.on_event(tool_result("t2"))
+    files = {f["path"]: f for f in await materializer.finish()}
+
+    assert files["good.py"]["validated"] is True
+    assert files["good.py"]["tool"] == "Write"
+    assert files["broken.py"]["syntax_valid"] is False
+
+
+@pytest.mark.asyncio
+async def test_paths_outside_workspace_are_not_read(tmp_path):
+    workspace = tmp_path / "ws"
+    workspace.mkdir()
+    (tmp_path / "secret.py").write_text("TOKEN = 1\n")
+    (workspace / "app.py").write_text("x = 1\n")
+    materializer = EarlyFileMaterializer(str(workspace))
+
+    materializer.on_event(tool_use("t1", "Write", str(tmp_path / "secret.py")))
+    materializer.on_event(tool_use("t2", "Edit", "../secret.py"))
+    materializer.on_event(tool_use("t3", "Edit", str(workspace / "sub" / ".." / "app.py")))
+    for tool_id in ("t1", "t2", "t3"):
+        materializer.on_event(tool_result(tool_id))
+
+    assert [f["path"] for f in await materializer.finish()] == ["app.py"]
+
+
+@pytest.mark.asyncio
+async def test_failed_tool_results_are_ignored(tmp_path):
+    materializer = EarlyFileMaterializer(str(tmp_path))
+    (tmp_path / "a.py").write_text("x = 1\n")
+
+    materializer.on_event(tool_use("t1", "Write", "a.py"))
+    materializer.on_event(tool_result("t1", is_error=True))
+
+    assert await materializer.finish() == []
+
+
+@pytest.mark.asyncio
+async def test_materialization_overlaps_with_generation(tmp_path, monkeypatch):
+    """The file is validated before the CLI stream ends."""
+    (tmp_path / "app.py").write_text("print('hi')\n")
+    events = [
+        {"type": "system", "subtype": "init"},
+        tool_use("t1", "Write", str(tmp_path / "app.py")),
+        tool_result("t1"),
+        {"type": "assistant", "message": {"content": [{"type": "text", "text": "more work"}]}},
+        {"type": "result", "result": "done"},
+    ]
+
+    async def fake_lines(self, cmd, combined_prompt, deadline):
+        for event in events:
+            await asyncio.sleep(0.1)
+            yield json.dumps(event)
+
+    monkeypatch.setattr(ClaudeCLISimple, "_iter_output_lines", fake_lines)
+
+    materializer = EarlyFileMaterializer(str(tmp_path))
+    llm = ClaudeCLISimple(
+        agent_name="codesmith",
+        workspace_path=str(tmp_path),
+        response_cache=False,
+        event_listener=materializer.on_event
+    )
+
+    seen_before_result = False
+    async for event in llm.astream([HumanMessage(content="Generate")]):
+        if event["type"] == "result":
+            seen_before_result = "app.py" in materializer.results
+
+    assert seen_before_result
+    assert [f["path"] for f in await materializer.finish()] == ["app.py"]
@@ -0,0 +1,79 @@
+"""
+Test Shared HTTP Client Registry
+
+Tests that PerplexityService reuses one keep-alive connection across
+requests and that the registry closes its clients on shutdown.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+from aiohttp import web
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils import http_clients
+from utils.perplexity_service import PerplexityService
+
+
+@pytest.mark.asyncio
+async def test_perplexity_reuses_connection(monkeypatch):
+    monkeypatch.setenv("PERPLEXITY_API_KEY", "test")
+    monkeypatch.setattr(http_clients, "_http_client_registry", None)
+
+    connections = set()
+
+    async def completions(request):
+        connections.add(id(request.transport))
+        return web.json_response({"choices": [{"message": {"content": "ok"}}], "citations": []})
+
+    app = web.Application()
+    app.router.add_post("/chat/completions", completions)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    try:
+        service = PerplexityService()
+        service.base_url = f"http://127.0.0.1:{port}"
+
+        for _ in range(3):
+            result = await service.send_message("test")
+            assert result["content"] == "ok"
+        assert await service.test_connection()
+
+        assert len(connections) == 1
+        registry = http_clients.get_http_client_registry()
+        session = registry.aiohttp_session("perplexity")
+        assert registry.get_stats()["aiohttp_sessions"] == ["perplexity"]
+
+        await http_clients.shutdown_http_clients()
+        assert session.closed
+        assert registry.get_stats()["aiohttp_sessions"] == []
+    finally:
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_registry_closes_all_clients(monkeypatch):
+    monkeypatch.setattr(http_clients, "_http_client_registry", None)
+    registry = http_clients.get_http_client_registry()
+
+    async_client = registry.async_client("openai")
+    sync_client = registry.sync_client("mermaid.ink")
+    assert registry.async_client("openai") is async_client
+    assert registry.sync_client("mermaid.ink") is sync_client
+
+    await http_clients.shutdown_http_clients()
+
+    assert async_client.is_closed and sync_client.is_closed
+    assert registry.sync_client("mermaid.ink") is not sync_client
@@ -0,0 +1,100 @@
+"""
+Test Per-File Incremental Code Index
+
+Tests that rebuilding the code index only re-parses added or modified
+files, drops deleted ones and keeps the import graph and statistics
+identical to a full build.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.indexing.code_indexer import CodeIndexer
+
+
+def count_parses(indexer: CodeIndexer, monkeypatch) -> list[str]:
+    parsed: list[str] = []
+    original = indexer.tree_sitter.index_file
+
+    async def index_file(file_path):
+        parsed.append(os.path.basename(file_path))
+        return await original(file_path)
+
+    monkeypatch.setattr(indexer.tree_sitter, "index_file", index_file)
+    return parsed
+
+
+@pytest.mark.asyncio
+async def test_rebuild_only_parses_changes(tmp_path, monkeypatch):
+    (tmp_path / "app.py").write_text("import os\n\ndef main():\n    helper()\n")
+    (tmp_path / "helper.py").write_text("def helper():\n    return 1\n")
+    (tmp_path / "old.py").write_text("import sys\n")
+
+    indexer = CodeIndexer()
+    parsed = count_parses(indexer, monkeypatch)
+
+    first = await indexer.build_full_index(str(tmp_path))
+    assert sorted(parsed) == ["app.py", "helper.py", "old.py"]
+    assert first["statistics"]["total_files"] == 3
+
+    # Modify one, delete one, add one, touch one without changes
+    parsed.clear()
+    (tmp_path / "helper.py").write_text("import json\n\ndef helper():\n    return 2\n\nclass Helper:\n    pass\n")
+    (tmp_path / "old.py").unlink()
+    (tmp_path / "new.py").write_text("from app import main\n")
+    os.utime(tmp_path / "app.py", ns=(1, 1))
+
+    # A fresh indexer (new process) reuses the on-disk manifest
+    indexer = CodeIndexer()
+    parsed = count_parses(indexer, monkeypatch)
+    second = await indexer.build_full_index(str(tmp_path))
+
+    assert sorted(parsed) == ["helper.py", "new.py"]
+    assert second["index_update"] == {"reparsed": 2, "reused": 1, "deleted": 1, "changed": 2}
+    assert set(second["ast"]["files"]) == {"app.py", "helper.py", "new.py"}
+    assert second["import_graph"]["helper.py"] == ["json"]
+    assert second["statistics"]["total_classes"] == 1
+
+    # Identical to a full build from scratch
+    full = await CodeIndexer().build_full_index(str(tmp_path))
+    cache_dir = tmp_path / ".ki_autoagent_ws" / "cache" / "code_index"
+    for blob in (cache_dir / "files").glob("*.json"):
+        blob.unlink()
+    (cache_dir / "manifest.json").unlink()
+    scratch = await CodeIndexer().build_full_index(str(tmp_path))
+
+    for key in ("ast", "import_graph", "statistics"):
+        assert full[key] == scratch[key]
+    assert scratch["index_update"]["reparsed"] == 3
+
+    # Nothing changed → nothing parsed
+    parsed.clear()
+    third = await indexer.build_full_index(str(tmp_path))
+    assert parsed == [] and third["index_update"]["reparsed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_renamed_file_is_not_reparsed(tmp_path, monkeypatch):
+    (tmp_path / "a.py").write_text("def a():\n    pass\n")
+
+    indexer = CodeIndexer()
+    parsed = count_parses(indexer, monkeypatch)
+    await indexer.build_full_index(str(tmp_path))
+
+    parsed.clear()
+    (tmp_path / "a.py").rename(tmp_path / "b.py")
+    result = await indexer.build_full_index(str(tmp_path))
+
+    assert parsed == []
+    assert list(result["ast"]["files"]) == ["b.py"]
+    assert result["ast"]["files"]["b.py"]["functions"][0]["name"] == "a"
@@ -0,0 +1,143 @@
+"""
+Test Incremental ReviewFix
+
+Tests per-file review verdicts: parsing, size-weighted aggregation and
+that the reviewer only sends changed files on later iterations.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_core.messages import AIMessage
+from subgraphs import reviewfix_subgraph_v6_1
+from subgraphs.review_verdicts import (
+    ReviewVerdictCache,
+    aggregate_score,
+    parse_review_output,
+    review_context_hash,
+)
+
+
+REVIEW = """FILE: a.txt
+QUALITY_SCORE: 0.9
+FEEDBACK:
+- Issue 1: minor naming
+SUMMARY: good
+
+**FILE: b.txt**
+QUALITY_SCORE: 0.4
+FEEDBACK:
+- Issue 1: broken logic
+- Suggestion 1: add tests
+SUMMARY: needs work
+"""
+
+
+def test_parse_review_output():
+    verdicts = parse_review_output(REVIEW, {"a.txt": "h1", "b.txt": "h2", "c.txt": "h3"})
+
+    assert verdicts["a.txt"]["score"] == 0.9
+    assert verdicts["b.txt"]["issues"] == ["Issue 1: broken logic", "Suggestion 1: add tests"]
+    assert verdicts["b.txt"]["summary"] == "needs work"
+    assert verdicts["c.txt"]["partial"] is True  # No block → not cached
+
+
+def test_aggregate_score_is_size_weighted():
+    verdicts = parse_review_output(REVIEW, {"a.txt": "h1", "b.txt": "h2"})
+    assert aggregate_score(verdicts, {"a.txt": 300, "b.txt": 100}) == pytest.approx(0.775)
+
+
+def test_verdict_cache_persists(tmp_path):
+    cache = ReviewVerdictCache(str(tmp_path))
+    cache.put(parse_review_output(REVIEW, {"a.txt": "h1"})["a.txt"])
+    cache.save()
+
+    reloaded = ReviewVerdictCache(str(tmp_path))
+    assert reloaded.get("a.txt", "h1")["score"] == 0.9
+    assert reloaded.get("a.txt", "other-hash") is None
+
+
+class FakeReviewer:
+    prompts: list[str] = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    async def ainvoke(self, messages):
+        prompt = messages[-1].content
+        FakeReviewer.prompts.append(prompt)
+        blocks = [
+            f"FILE: {name}\nQUALITY_SCORE: 0.9\nFEEDBACK:\n- fine\nSUMMARY: ok"
+            for name in ("a.txt", "b.txt") if f"FILE: {name}\n" in prompt
+        ]
+        return AIMessage(content="\n\n".join(blocks))
+
+
+@pytest.mark.asyncio
+async def test_reviewer_only_sends_changed_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(reviewfix_subgraph_v6_1, "ChatOpenAI", FakeReviewer)
+    FakeReviewer.prompts = []
+    (tmp_path / "a.txt").write_text("alpha")
+    (tmp_path / "b.txt").write_text("beta")
+
+    subgraph = reviewfix_subgraph_v6_1.create_reviewfix_subgraph(str(tmp_path))
+    state = {
+        "workspace_path": str(tmp_path),
+        "generated_files": [{"path": "a.txt"}, {"path": "b.txt"}],
+        "files_to_review": ["a.txt", "b.txt"],
+        "design": {},
+        "quality_score": 0.0,
+        "review_feedback": {},
+        "fixes_applied": [],
+        "iteration": 0,
+        "should_continue": True,
+        "errors": []
+    }
+
+    first = await subgraph.ainvoke(state)
+    assert first["quality_score"] == pytest.approx(0.9)
+    assert "FILE: a.txt\n" in FakeReviewer.prompts[0] and "FILE: b.txt\n" in FakeReviewer.prompts[0]
+
+    (tmp_path / "b.txt").write_text("beta, fixed")
+    second = await subgraph.ainvoke(state)
+
+    assert len(FakeReviewer.prompts) == 2
+    assert "FILE: b.txt\n" in FakeReviewer.prompts[1]
+    assert "FILE: a.txt\n" not in FakeReviewer.prompts[1]
+    assert "- a.txt (score 0.90)" in FakeReviewer.prompts[1]  # Summary of unchanged file
+    assert second["review_feedback"]["reviewed_files"] == ["b.txt"]
+
+    # Nothing changed → no reviewer call at all
+    await subgraph.ainvoke(state)
+    assert len(FakeReviewer.prompts) == 2
+
+
+def test_zero_global_score_is_kept():
+    verdicts = parse_review_output("QUALITY_SCORE: 0.0\nFILE: a.txt\nFEEDBACK:\n- broken", {"a.txt": "h1"})
+    assert verdicts["a.txt"]["score"] == 0.0
+
+
+def test_context_hash_tracks_findings_and_referenced_files():
+    hashes = {"src/app.py": "h1", "src/models.py": "h2", "src/other.py": "h3"}
+    content = "from models import User\n"
+    base = review_context_hash("src/app.py", content, hashes, [])
+
+    assert base == review_context_hash("src/app.py", content, {**hashes, "src/other.py": "h4"}, [])
+    assert base != review_context_hash("src/app.py", content, {**hashes, "src/models.py": "h5"}, [])
+    finding = {"file": "src/app.py", "source": "mypy", "severity": "error", "line": 1, "message": "x"}
+    assert base != review_context_hash("src/app.py", content, hashes, [finding])
+
+    cache = ReviewVerdictCache()
+    cache.put(parse_review_output(REVIEW, {"a.txt": "h1"})["a.txt"], base)
+    assert cache.get("a.txt", "h1", base) is not None
+    assert cache.get("a.txt", "h1", "changed-context") is None
@@ -0,0 +1,212 @@
+"""
+Test LLM Response Cache
+
+Tests key derivation, LRU eviction, the temperature threshold, side-effect
+detection and per-agent hit rates of the content-addressed response cache.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from adapters import llm_response_cache
+from adapters.claude_cli_simple import ClaudeCLISimple
+from adapters.llm_response_cache import (
+    LLMResponseCache,
+    cached_ainvoke,
+    client_params,
+    get_llm_cache_stats,
+    has_side_effects,
+    hash_workspace_files,
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_stats(monkeypatch):
+    """Fresh per-agent statistics and cache instances per test."""
+    monkeypatch.setattr(llm_response_cache, "_agent_stats", {})
+    monkeypatch.setattr(llm_response_cache, "_caches", {})
+
+
+MESSAGES = [SystemMessage(content="You review code."), HumanMessage(content="Review: x = 1")]
+
+
+class CountingLLM:
+    """Chat model stub that counts real invocations."""
+
+    def __init__(self, model_name="gpt-4o-mini", temperature=0.3):
+        self.model_name = model_name
+        self.temperature = temperature
+        self.calls = 0
+
+    async def ainvoke(self, messages, **kwargs):
+        self.calls += 1
+        return AIMessage(content=f"QUALITY_SCORE: 0.9 (call {self.calls})")
+
+
+def test_key_changes_with_every_input(tmp_path):
+    cache = LLMResponseCache(tmp_path)
+    base = cache.make_key("m", 0.2, "sys", "user", {"a.py": "1"})
+
+    assert base == cache.make_key("m", 0.2, "sys", "user", {"a.py": "1"})
+    assert base != cache.make_key("m2", 0.2, "sys", "user", {"a.py": "1"})
+    assert base != cache.make_key("m", 0.0, "sys", "user", {"a.py": "1"})
+    assert base != cache.make_key("m", 0.2, "sys2", "user", {"a.py": "1"})
+    assert base != cache.make_key("m", 0.2, "sys", "user2", {"a.py": "1"})
+    assert base != cache.make_key("m", 0.2, "sys", "user", {"a.py": "2"})
+
+
+def test_workspace_hashes_follow_content(tmp_path):
+    (tmp_path / "a.py").write_text("x = 1")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "dep.js").write_text("ignored")
+
+    first = hash_workspace_files(str(tmp_path))
+    assert list(first) == ["a.py"]
+
+    (tmp_path / "a.py").write_text("x = 2")
+    assert hash_workspace_files(str(tmp_path))["a.py"] != first["a.py"]
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    cache = LLMResponseCache(tmp_path, max_bytes=1200)
+    payload = {"content": "x" * 400}
+
+    cache.put("old", payload, "reviewer")
+    cache.put("used", payload, "reviewer")
+    past = time.time() - 100
+    os.utime(tmp_path / "old.json", (past, past))
+    os.utime(tmp_path / "used.json", (past, past))
+    cache.get("used", "reviewer")  # Touch → most recently used
+
+    cache.put("new", payload, "reviewer")
+
+    assert not (tmp_path / "old.json").exists()
+    assert (tmp_path / "used.json").exists()
+    assert (tmp_path / "new.json").exists()
+    assert cache.evictions == 1
+
+
+def test_side_effect_detection():
+    read_only = [{"type": "assistant", "message": {"content": [{"type": "tool_use", "name": "Read"}]}}]
+    editing = [{"type": "assistant", "message": {"content": [{"type": "tool_use", "name": "Write"}]}}]
+
+    assert not has_side_effects(read_only)
+    assert has_side_effects(editing)
+
+
+@pytest.mark.asyncio
+async def test_cached_ainvoke_hits_and_reports_per_agent(tmp_path):
+    llm = CountingLLM()
+
+    for _ in range(3):
+        response = await cached_ainvoke(
+            llm, MESSAGES, agent_name="reviewer",
+            workspace_path=str(tmp_path), enabled=True
+        )
+
+    assert llm.calls == 1
+    assert response.content.endswith("(call 1)")
+
+    stats = get_llm_cache_stats()["agents"]["reviewer"]
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == pytest.approx(0.667, abs=0.001)
+
+
+@pytest.mark.asyncio
+async def test_cached_ainvoke_keys_on_client_parameters(tmp_path):
+    """Model and parameters come from the client - changing them is a miss."""
+    llm = CountingLLM()
+    other_model = CountingLLM(model_name="gpt-4o")
+
+    for client in (llm, llm, other_model):
+        await cached_ainvoke(
+            client, MESSAGES, agent_name="reviewer",
+            workspace_path=str(tmp_path), enabled=True
+        )
+    assert (llm.calls, other_model.calls) == (1, 1)
+
+    llm.max_tokens = 512
+    await cached_ainvoke(llm, MESSAGES, agent_name="reviewer", workspace_path=str(tmp_path), enabled=True)
+    assert llm.calls == 2
+
+    assert client_params(llm) == {"model": "gpt-4o-mini", "temperature": 0.3, "max_tokens": 512}
+
+
+@pytest.mark.asyncio
+async def test_cached_ainvoke_skips_non_deterministic_calls(tmp_path):
+    llm = CountingLLM(temperature=0.9)
+
+    for _ in range(2):
+        await cached_ainvoke(
+            llm, MESSAGES, agent_name="reviewer",
+            workspace_path=str(tmp_path), enabled=True
+        )
+
+    assert llm.calls == 2
+    assert get_llm_cache_stats()["agents"]["reviewer"]["skipped"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_ainvoke_disabled_by_default(tmp_path, monkeypatch):
+    monkeypatch.delenv("KI_LLM_CACHE", raising=False)
+    llm = CountingLLM(temperature=0.0)
+
+    for _ in range(2):
+        await cached_ainvoke(
+            llm, MESSAGES, agent_name="reviewer",
+            workspace_path=str(tmp_path)
+        )
+
+    assert llm.calls == 2
+    assert not (tmp_path / ".ki_autoagent_ws").exists()
+
+
+@pytest.mark.asyncio
+async def test_claude_cli_cache_invalidated_by_workspace_change(tmp_path, monkeypatch):
+    """CLI responses depend on workspace files; edits via tools are never cached."""
+    (tmp_path / "app.py").write_text("x = 1")
+    calls = []
+    events_to_return = [[{"type": "result", "result": "ok"}]]
+
+    async def fake_call_cli(self, messages):
+        calls.append(messages)
+        self.last_events = events_to_return[0]
+        return self.last_events[-1]
+
+    monkeypatch.setattr(ClaudeCLISimple, "_call_cli", fake_call_cli)
+    llm = ClaudeCLISimple(
+        agent_name="architect", temperature=0.2,
+        workspace_path=str(tmp_path), response_cache=True
+    )
+
+    await llm.ainvoke(MESSAGES)
+    await llm.ainvoke(MESSAGES)
+    assert len(calls) == 1  # Second call served from cache
+
+    (tmp_path / "app.py").write_text("x = 2")
+    await llm.ainvoke(MESSAGES)
+    assert len(calls) == 2  # Workspace changed → miss
+
+    # Responses with file edits are not stored
+    events_to_return[0] = [
+        {"type": "assistant", "message": {"content": [{"type": "tool_use", "name": "Edit"}]}},
+        {"type": "result", "result": "edited"}
+    ]
+    (tmp_path / "app.py").write_text("x = 3")
+    await llm.ainvoke(MESSAGES)
+    await llm.ainvoke(MESSAGES)
+    assert len(calls) == 4
+    assert get_llm_cache_stats()["agents"]["architect"]["skipped"] == 2
@@ -0,0 +1,83 @@
+"""
+Test Parallel Code Indexing
+
+Tests that sharding the parse work across the process pool gives the same
+index as the serial path, reports progress and falls back to serial
+indexing when the pool breaks.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.indexing import code_indexer
+from core.indexing.code_indexer import CodeIndexer, shutdown_index_pool
+
+
+def write_project(root) -> None:
+    for i in range(12):
+        (root / f"module_{i}.py").write_text(
+            f"import os\n\nclass Service{i}:\n    def run(self):\n        return helper_{i}()\n\n"
+            f"def helper_{i}():\n    return {i}\n"
+        )
+    (root / "index.html").write_text("<html><body><div id='app'></div></body></html>\n")
+
+
+@pytest.mark.asyncio
+async def test_parallel_matches_serial(tmp_path, monkeypatch):
+    monkeypatch.setenv("KI_INDEX_WORKERS", "2")
+    for name in ("serial", "parallel"):
+        (tmp_path / name).mkdir()
+        write_project(tmp_path / name)
+
+    messages: list[str] = []
+
+    async def progress(message: str) -> None:
+        messages.append(message)
+
+    try:
+        serial = await CodeIndexer().build_full_index(str(tmp_path / "serial"), parallel=False)
+        parallel = await CodeIndexer().build_full_index(
+            str(tmp_path / "parallel"), progress_callback=progress, parallel=True
+        )
+    finally:
+        shutdown_index_pool()
+
+    assert parallel["ast"] == serial["ast"]
+    assert parallel["import_graph"] == serial["import_graph"]
+    assert parallel["statistics"] == serial["statistics"]
+    assert parallel["index_update"]["reparsed"] == 13
+    assert "📂 Indexed 13/13 files" in messages
+
+
+@pytest.mark.asyncio
+async def test_broken_pool_falls_back_to_serial(tmp_path, monkeypatch):
+    monkeypatch.setenv("KI_INDEX_WORKERS", "2")
+    monkeypatch.setenv("KI_INDEX_PARALLEL_MIN_FILES", "1")
+    write_project(tmp_path)
+
+    class BrokenPool:
+        def submit(self, *args, **kwargs):
+            raise BrokenProcessPool("worker died")
+
+        def shutdown(self, *args, **kwargs):
+            pass
+
+    monkeypatch.setattr(code_indexer, "_index_pool", BrokenPool())
+
+    result = await CodeIndexer().build_full_index(str(tmp_path))
+
+    assert result["statistics"]["total_files"] == 13
+    assert result["index_update"]["reparsed"] == 13
+    assert result["ast"]["files"]["module_0.py"]["classes"][0]["name"] == "Service0"
+    assert code_indexer._index_pool is None
@@ -0,0 +1,98 @@
+"""
+Test Tree-sitter Parse Cache
+
+Tests the ParseCache of tree_sitter_tools: hits on identical content,
+incremental re-parsing of edited files (same tree as a fresh parse), LRU
+eviction and that cached metadata isn't shared with callers.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from tools import tree_sitter_tools
+from tools.tree_sitter_tools import ParseCache, TreeSitterAnalyzer, _edit_range, get_parser
+
+CODE = '''import os
+
+
+class Service:
+    def run(self):
+        return os.getcwd()
+
+
+def main():
+    Service().run()
+'''
+
+
+def test_identical_content_is_a_cache_hit(monkeypatch):
+    cache = ParseCache(max_entries=8)
+    monkeypatch.setattr(tree_sitter_tools, "_parse_cache", cache)
+    analyzer = TreeSitterAnalyzer()
+
+    assert analyzer.validate_syntax(CODE, "python")
+    assert analyzer.validate_syntax(CODE, "python", "other.py")
+    assert analyzer.find_syntax_errors(CODE, "python") == []
+    assert [f["name"] for f in analyzer.parse_code(CODE, "python")["functions"]] == ["run", "main"]
+
+    stats = cache.get_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 3
+
+
+def test_edits_are_parsed_incrementally(tmp_path):
+    cache = ParseCache(max_entries=8)
+    path = str(tmp_path / "service.py")
+    cache.parse(CODE.encode(), "python", path)
+
+    versions = [
+        CODE.replace("return os.getcwd()", "return (os.getcwd()"),   # Broken
+        CODE.replace("def main():", "def main(argv):\n    print(argv)\n"),
+        "# header\n" + CODE + "\nVALUE = 'ä'\n",
+    ]
+    for version in versions:
+        parsed = cache.parse(version.encode(), "python", path)
+        fresh = get_parser("python").parse(version.encode())
+        assert str(parsed.tree.root_node) == str(fresh.root_node)
+
+    assert cache.get_stats()["incremental"] == len(versions)
+
+
+def test_edit_range():
+    assert _edit_range(b"abcdef", b"abXYdef") == (2, 3, 4)
+    assert _edit_range(b"aaaa", b"aaaaaa") == (4, 4, 6)
+    assert _edit_range(b"same", b"same") == (4, 4, 4)
+
+
+def test_lru_eviction_and_metadata_copies(monkeypatch, tmp_path):
+    cache = ParseCache(max_entries=2)
+    for i in range(3):
+        cache.parse(f"x = {i}\n".encode(), "python", f"file_{i}.py")
+    stats = cache.get_stats()
+    assert stats["entries"] == 2
+    assert stats["files"] == 2
+
+    # The oldest parse was evicted
+    cache.parse(b"x = 0\n", "python")
+    assert cache.get_stats()["hits"] == 0
+
+    monkeypatch.setattr(tree_sitter_tools, "_parse_cache", cache)
+    file_path = tmp_path / "service.py"
+    file_path.write_text(CODE)
+    analyzer = TreeSitterAnalyzer()
+
+    first = analyzer.parse_file(str(file_path))
+    first["functions"].clear()
+    first["classes"][0]["name"] = "Changed"
+
+    second = analyzer.parse_file(str(file_path))
+    assert [f["name"] for f in second["functions"]] == ["run", "main"]
+    assert second["classes"][0]["name"] == "Service"
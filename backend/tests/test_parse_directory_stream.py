@@ -0,0 +1,102 @@
+"""
+Test Streaming Directory Parsing
+
+Tests TreeSitterAnalyzer.iter_directory / parse_directory_page: path order,
+compact summaries without tree objects, cursor pagination and agreement
+with parse_directory.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from tools.tree_sitter_tools import TreeSitterAnalyzer, iter_source_files
+
+
+def _make_tree(root):
+    files = {
+        "b.py": "def b():\n    pass\n",
+        "a/z.py": "class Z:\n    pass\n",
+        "a/b/c.py": "import os\n\ndef c(:\n",
+        "a.py": "x = 1\n",
+        "web/app.ts": "export function app(): number { return 1 }\n",
+        "node_modules/lib.js": "function lib() {}\n",
+        ".hidden/h.py": "def h(): pass\n",
+        "README.md": "# readme\n",
+    }
+    for path, content in files.items():
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content)
+
+
+EXPECTED_ORDER = ["a/b/c.py", "a/z.py", "a.py", "b.py", "web/app.ts"]
+
+
+def test_source_files_in_path_order(tmp_path):
+    _make_tree(tmp_path)
+
+    assert [path for path, _ in iter_source_files(str(tmp_path))] == EXPECTED_ORDER
+    assert [path for path, _ in iter_source_files(str(tmp_path), start_after="a/z.py")] == [
+        "a.py", "b.py", "web/app.ts"
+    ]
+
+
+def test_symlinked_directories_are_not_followed(tmp_path):
+    _make_tree(tmp_path)
+    (tmp_path / "loop").symlink_to(tmp_path, target_is_directory=True)
+    (tmp_path / "a" / "up").symlink_to(tmp_path / "a", target_is_directory=True)
+
+    assert [path for path, _ in iter_source_files(str(tmp_path))] == EXPECTED_ORDER
+    assert len(TreeSitterAnalyzer().parse_directory(str(tmp_path))["files"]) == len(EXPECTED_ORDER)
+
+
+def test_summaries_are_compact_and_match_parse_directory(tmp_path):
+    _make_tree(tmp_path)
+    analyzer = TreeSitterAnalyzer()
+
+    summaries = list(analyzer.iter_directory(str(tmp_path), workers=2))
+    assert [s["path"] for s in summaries] == EXPECTED_ORDER
+    json.dumps(summaries)  # No tree objects
+
+    by_path = {s["path"]: s for s in summaries}
+    assert by_path["a/b/c.py"]["syntax_valid"] is False
+    assert by_path["a/b/c.py"]["errors"]
+    assert by_path["a/b/c.py"]["imports"] == ["import os"]
+    assert by_path["web/app.ts"]["language"] == "typescript"
+
+    full = analyzer.parse_directory(str(tmp_path))
+    for summary in summaries:
+        parsed = full["files"][summary["file_path"]]
+        assert [f["name"] for f in summary["functions"]] == [f["name"] for f in parsed["functions"]]
+        assert [c["name"] for c in summary["classes"]] == [c["name"] for c in parsed["classes"]]
+        assert summary["syntax_valid"] == parsed["syntax_valid"]
+
+
+def test_pagination_with_cursor(tmp_path):
+    _make_tree(tmp_path)
+    analyzer = TreeSitterAnalyzer()
+
+    pages = []
+    cursor = None
+    while True:
+        page = analyzer.parse_directory_page(str(tmp_path), cursor=cursor, limit=2)
+        pages.append([f["path"] for f in page["files"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == [["a/b/c.py", "a/z.py"], ["a.py", "b.py"], ["web/app.ts"]]
+
+    first = analyzer.parse_directory_page(str(tmp_path), limit=2)
+    assert first["summary"]["parsed_files"] == 2
+    assert first["summary"]["syntax_errors"] == 1
+    assert first["summary"]["total_classes"] == 1
@@ -0,0 +1,79 @@
+"""
+Test Perplexity Result Cache
+
+Tests query normalization, TTL expiry, size cap and that reworded queries
+are served from the cache unless a live lookup is forced.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils import perplexity_cache
+from utils.perplexity_cache import PerplexityCache, normalize_query
+from utils.perplexity_service import PerplexityService
+
+
+def test_normalize_query():
+    assert normalize_query("What are the  React best practices?") == "react best practices"
+    assert normalize_query("react BEST practices") == "react best practices"
+    assert normalize_query("Wie ist die Performance von Node.js?") == "performance node.js"
+    assert normalize_query("C++ vs C#") == "c++ vs c#"
+
+
+def test_ttl_and_size_cap(tmp_path):
+    cache = PerplexityCache(tmp_path, ttl_seconds=60, max_entries=2)
+    keys = [cache.make_key(f"query {i}", "sonar") for i in range(3)]
+
+    for i, key in enumerate(keys):
+        cache.put(key, f"query {i}", {"answer": str(i)})
+        os.utime(cache._path(key), (time.time() + i, time.time() + i))
+
+    assert cache.get(keys[0]) is None  # Evicted (least recently used)
+    assert cache.get(keys[2])["answer"] == "2"
+
+    cache._path(keys[2]).write_text('{"created": 0, "value": {"answer": "old"}}')
+    assert cache.get(keys[2]) is None
+    assert cache.stats["expired"] == 1 and cache.stats["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_search_web_uses_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("PERPLEXITY_API_KEY", "test")
+    monkeypatch.setenv("KI_PERPLEXITY_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(perplexity_cache, "_perplexity_cache", None)
+
+    calls = []
+
+    async def fake_send_message(self, prompt, **kwargs):
+        calls.append(prompt)
+        return {"content": f"answer {len(calls)}", "citations": ["https://example.com"], "timestamp": "now"}
+
+    monkeypatch.setattr(PerplexityService, "send_message", fake_send_message)
+    service = PerplexityService()
+
+    first = await service.search_web("React best practices", recency="month")
+    second = await service.search_web("what are the react  best practices?", recency="month")
+    other_filter = await service.search_web("React best practices", recency="week")
+    forced = await service.search_web("React best practices", recency="month", force_refresh=True)
+    after_refresh = await service.search_web("React best practices", recency="month")
+
+    assert first["cached"] is False and first["answer"] == "answer 1"
+    assert second["cached"] is True and second["answer"] == "answer 1"
+    assert other_filter["cached"] is False
+    assert forced["cached"] is False and forced["answer"] == "answer 3"
+    assert after_refresh["answer"] == "answer 3"
+    assert len(calls) == 3
+
+    stats = perplexity_cache.get_perplexity_cache_stats()
+    assert stats["hits"] == 2 and stats["refreshes"] == 1
@@ -0,0 +1,203 @@
+"""
+Test Multi-Query Research Fan-Out
+
+Tests sub-query planning, deduplication of overlapping findings and that
+the research subgraph searches concurrently but synthesizes once.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_core.messages import AIMessage
+from subgraphs import research_subgraph_v6_1
+from subgraphs.research_fanout import (
+    dedupe_findings,
+    drop_known_findings,
+    memory_similarity_to_cosine,
+    plan_sub_queries,
+    remember_findings,
+)
+
+
+def test_plan_sub_queries():
+    assert [s["aspect"] for s in plan_sub_queries("What is Python asyncio?", 4)] == ["overview"]
+
+    aspects = [s["aspect"] for s in plan_sub_queries("Build a web app with login and a Postgres database", 4)]
+    assert aspects == ["overview", "stack", "security", "data"]
+
+    assert len(plan_sub_queries("Build a web app with login and a Postgres database", 1)) == 1
+
+
+def test_dedupe_findings():
+    shared = "- FastAPI is a modern, fast web framework for building APIs with Python [1]"
+    results = [
+        {"aspect": "overview", "content": f"{shared}\n- Use Pydantic models for request validation"},
+        {"aspect": "stack", "content": f"- fastapi is a modern fast web framework for building APIs with Python [3]\n\n"
+                                       "- FastAPI is a modern, fast web framework for building REST APIs with Python"},
+        {"aspect": "security", "content": "- Hash passwords with argon2 or bcrypt"},
+    ]
+
+    units, stats = dedupe_findings(results)
+
+    assert [u["aspect"] for u in units] == ["overview", "overview", "security"]
+    assert stats == {"total": 5, "duplicates": 1, "near_duplicates": 1}
+
+
+def memory_score(cosine: float) -> float:
+    """MemorySystem score for unit length embeddings: 1 / (1 + squared L2)."""
+    return 1.0 / (1.0 + (2.0 - 2.0 * cosine))
+
+
+class KnownMemory:
+    async def search(self, query, filters=None, k=5):
+        similarity = memory_score(0.95 if "argon2" in query else 0.5)
+        return [{"content": "", "similarity": similarity}]
+
+
+class WordMemory:
+    """MemorySystem stand-in: bag-of-words unit vectors scored like FAISS IndexFlatL2."""
+
+    def __init__(self):
+        self.items: list[tuple[str, dict]] = []
+
+    @staticmethod
+    def _vector(text):
+        words = text.lower().split()
+        return {word: words.count(word) / len(words) ** 0.5 for word in set(words)}
+
+    async def store(self, content, metadata):
+        self.items.append((content, metadata))
+
+    async def search(self, query, filters=None, k=5):
+        query_vector = self._vector(query)
+        results = []
+        for content, metadata in self.items:
+            if any(metadata.get(key) != value for key, value in (filters or {}).items()):
+                continue
+            vector = self._vector(content)
+            norm = (sum(v * v for v in vector.values()) * sum(v * v for v in query_vector.values())) ** 0.5
+            cosine = sum(v * vector.get(w, 0.0) for w, v in query_vector.items()) / norm
+            results.append({"content": content, "similarity": memory_score(cosine)})
+        return sorted(results, key=lambda r: r["similarity"], reverse=True)[:k]
+
+
+@pytest.mark.asyncio
+async def test_drop_known_findings():
+    units = [
+        {"aspect": "security", "text": "- Hash passwords with argon2 or bcrypt before storing them", "hash": "a"},
+        {"aspect": "stack", "text": "- Use Pydantic models for request and response validation", "hash": "b"},
+    ]
+
+    remaining, known = await drop_known_findings(units, KnownMemory(), threshold=0.85)
+
+    assert [u["hash"] for u in remaining] == ["b"] and known == 1
+
+
+def test_memory_similarity_to_cosine():
+    assert memory_similarity_to_cosine(1.0) == pytest.approx(1.0)
+    assert memory_similarity_to_cosine(memory_score(0.93)) == pytest.approx(0.93)
+    assert memory_similarity_to_cosine(memory_score(0.0)) == pytest.approx(0.0)
+
+
+@pytest.mark.asyncio
+async def test_remembered_findings_are_known_next_round():
+    memory = WordMemory()
+    await memory.store("A long research summary about FastAPI, Postgres and login", {"agent": "research"})
+    first_round = [
+        {"aspect": "security", "text": "- Hash passwords with argon2 or bcrypt before storing them", "hash": "a"},
+    ]
+    assert await remember_findings(first_round, memory, "web app") == 1
+
+    second_round = [
+        {"aspect": "security", "text": "- Hash passwords with argon2 or bcrypt before storing them", "hash": "a"},
+        {"aspect": "data", "text": "- Run database migrations with Alembic on every deployment", "hash": "c"},
+    ]
+    remaining, known = await drop_known_findings(second_round, memory)
+
+    assert [u["hash"] for u in remaining] == ["c"] and known == 1
+
+
+class SlowSearch:
+    queries: list[str] = []
+
+    async def ainvoke(self, tool_input):
+        SlowSearch.queries.append(tool_input["query"])
+        await asyncio.sleep(0.3)
+        return {"content": "- Use HTTPS everywhere and keep dependencies up to date\n\n"
+                           f"- Finding for {tool_input['query']}",
+                "citations": ["https://example.com"], "success": True}
+
+
+class RecordingLLM:
+    prompts: list[str] = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    async def ainvoke(self, messages):
+        RecordingLLM.prompts.append(messages[-1].content)
+        return AIMessage(content="Synthesis")
+
+
+@pytest.mark.asyncio
+async def test_subgraph_fans_out_and_synthesizes_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(research_subgraph_v6_1, "perplexity_search", SlowSearch())
+    monkeypatch.setattr(research_subgraph_v6_1, "ChatAnthropic", RecordingLLM)
+    monkeypatch.setenv("KI_RESEARCH_FANOUT", "4")
+    SlowSearch.queries, RecordingLLM.prompts = [], []
+
+    subgraph = research_subgraph_v6_1.create_research_subgraph(str(tmp_path))
+    start = time.monotonic()
+    result = await subgraph.ainvoke({
+        "query": "Build a web app with login and a Postgres database",
+        "workspace_path": str(tmp_path),
+        "findings": {},
+        "sources": [],
+        "report": "",
+        "errors": []
+    })
+
+    assert len(SlowSearch.queries) == 4
+    assert time.monotonic() - start < 1.0  # 4 × 0.3s sequentially
+    assert len(RecordingLLM.prompts) == 1
+    assert RecordingLLM.prompts[0].count("Use HTTPS everywhere") == 1
+    assert result["findings"]["dedup"]["duplicates"] == 3
+    assert result["sources"] == ["https://example.com"]
+
+
+class FailingSearch:
+    async def ainvoke(self, tool_input):
+        raise ConnectionError("Perplexity unreachable")
+
+
+@pytest.mark.asyncio
+async def test_all_sub_queries_failing_is_an_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(research_subgraph_v6_1, "perplexity_search", FailingSearch())
+    monkeypatch.setattr(research_subgraph_v6_1, "ChatAnthropic", RecordingLLM)
+    RecordingLLM.prompts = []
+
+    subgraph = research_subgraph_v6_1.create_research_subgraph(str(tmp_path))
+    result = await subgraph.ainvoke({
+        "query": "Build a web app with login",
+        "workspace_path": str(tmp_path),
+        "findings": {},
+        "sources": [],
+        "report": "",
+        "errors": []
+    })
+
+    assert RecordingLLM.prompts == []  # Error texts are not synthesized as findings
+    assert result["findings"] is None
+    assert "Perplexity unreachable" in result["errors"][0]["error"]
@@ -0,0 +1,107 @@
+"""
+Test Chunked Parallel Review
+
+Tests the token-budgeted review planner and that ReviewFix reviews the
+chunks concurrently (under the concurrency cap) and merges their verdicts.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_core.messages import AIMessage
+from subgraphs import reviewfix_subgraph_v6_1
+from subgraphs.review_planner import estimate_tokens, plan_review_chunks
+
+
+def test_chunks_respect_budget_and_group_directories():
+    files = {
+        "src/api/routes.txt": "r" * 400,
+        "src/api/models.txt": "m" * 400,
+        "src/ui/app.txt": "a" * 400,
+        "src/ui/view.txt": "v" * 400,
+    }
+    budget = estimate_tokens("x" * 400) * 2
+
+    chunks = plan_review_chunks(files, max_tokens=budget)
+
+    assert chunks == [
+        ["src/api/models.txt", "src/api/routes.txt"],
+        ["src/ui/app.txt", "src/ui/view.txt"],
+    ]
+
+
+def test_oversized_file_gets_own_chunk():
+    chunks = plan_review_chunks({"big.txt": "b" * 10000, "small.txt": "s"}, max_tokens=100)
+    assert chunks == [["big.txt"], ["small.txt"]]
+
+
+class ConcurrentReviewer:
+    active = 0
+    max_active = 0
+    calls = 0
+
+    def __init__(self, **kwargs):
+        pass
+
+    async def ainvoke(self, messages):
+        cls = ConcurrentReviewer
+        cls.calls += 1
+        cls.active += 1
+        cls.max_active = max(cls.max_active, cls.active)
+        try:
+            await asyncio.sleep(0.05)
+            prompt = messages[-1].content
+            if "FILE: fail.txt\n" in prompt:
+                raise RuntimeError("context length exceeded")
+            names = [line[6:] for line in prompt.splitlines() if line.startswith("FILE: ")]
+            return AIMessage(content="\n".join(
+                f"FILE: {name}\nQUALITY_SCORE: 0.8\nFEEDBACK:\n- ok" for name in names
+            ))
+        finally:
+            cls.active -= 1
+
+
+@pytest.mark.asyncio
+async def test_chunks_reviewed_concurrently_and_merged(tmp_path, monkeypatch):
+    monkeypatch.setattr(reviewfix_subgraph_v6_1, "ChatOpenAI", ConcurrentReviewer)
+    monkeypatch.setenv("KI_REVIEW_CHUNK_TOKENS", "50")
+    monkeypatch.setenv("KI_REVIEW_CONCURRENCY", "2")
+    monkeypatch.setenv("KI_REVIEW_GATE", "off")
+
+    names = [f"f{i}.txt" for i in range(5)] + ["fail.txt"]
+    for name in names:
+        (tmp_path / name).write_text(name * 40)
+
+    subgraph = reviewfix_subgraph_v6_1.create_reviewfix_subgraph(str(tmp_path))
+    result = await subgraph.ainvoke({
+        "workspace_path": str(tmp_path),
+        "generated_files": [{"path": name} for name in names],
+        "files_to_review": names,
+        "design": {},
+        "quality_score": 0.0,
+        "review_feedback": {},
+        "fixes_applied": [],
+        "iteration": 2,  # Max iterations → no fixer
+        "should_continue": True,
+        "errors": []
+    })
+
+    assert ConcurrentReviewer.calls == 6  # One chunk per file at this budget
+    assert ConcurrentReviewer.max_active == 2
+
+    verdicts = result["review_feedback"]["files"]
+    assert set(verdicts) == set(names)
+    assert verdicts["f0.txt"]["score"] == 0.8
+    assert verdicts["fail.txt"]["partial"] is True  # Failed chunk → neutral verdict
+    assert 0.5 < result["quality_score"] < 0.8
@@ -0,0 +1,105 @@
+"""
+Test Parallel mmap Scan Engine
+
+Tests that the scan engine reports exactly the lines (and context) of the
+line-by-line scan, streams results in file order with early termination,
+and that the scan benchmark runs.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.code_search_scan import run_benchmark
+from services.code_search import LightweightCodeSearch
+from services import scan_engine
+from services.scan_engine import ScanPattern, scan_file, scan_files
+
+FILES = {
+    "plain.py": "import os\n\ndef load(path):\n    return open(path)\n\n\ndef save():\n    pass",
+    "crlf.py": "def load():\r\n    return 1\r\n",
+    "unicode.py": "# Grüße\ndef lade_daten():\n    return 'café'\n",
+    "trailing.py": "x = 1\n\n",
+    "empty.py": "",
+}
+
+PATTERNS = [
+    r"def\s+\w+", r"^$", r"return", r"load$", r"caf.'", r"\n", r"\s+pass", r"^\s*def",
+    r"(?<!\s)def", r"(?<=\n)def",
+]
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+@pytest.mark.parametrize("flags", [0, re.IGNORECASE])
+def test_same_lines_as_line_scan(tmp_path, pattern, flags):
+    search = LightweightCodeSearch(str(tmp_path), use_index=False)
+    regex = re.compile(pattern, flags)
+
+    for name, content in FILES.items():
+        path = tmp_path / name
+        path.write_bytes(content.encode("utf-8"))
+
+        expected = [
+            (r.line_number, r.line_content, r.context_before, r.context_after)
+            for r in search._search_file(path, regex, 2, 100)
+        ]
+        actual = [
+            (m.line_number, m.line_content, m.context_before, m.context_after)
+            for m in scan_file(path, ScanPattern(regex), context_lines=2, max_results=100)
+        ]
+        assert actual == expected, (name, pattern)
+
+
+def test_prefilter_works_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(scan_engine, "_CHUNK_BYTES", 7)
+    search = LightweightCodeSearch(str(tmp_path), use_index=False)
+    path = tmp_path / "module.py"
+    path.write_text("import os\n\ndef load_config(path):\n    return open(path)\n")
+
+    for pattern in (r"load_config", r"open\(path\)", r"^\s*return"):
+        regex = re.compile(pattern)
+        expected = [(r.line_number, r.context_before) for r in search._search_file(path, regex, 2, 100)]
+        actual = [(m.line_number, m.context_before) for m in scan_file(path, ScanPattern(regex))]
+        assert actual and actual == expected, pattern
+
+    assert scan_file(path, ScanPattern(re.compile("missing_name"))) == []
+
+    # A carriage return in a later chunk still selects the line scan
+    path.write_bytes(b"import os\n\ndef load():\r\n    return 1\r\n")
+    assert [m.line_content for m in scan_file(path, ScanPattern(re.compile("load")))] == ["def load():"]
+
+
+def test_streams_in_file_order_and_stops_early(tmp_path):
+    paths = []
+    for i in range(20):
+        path = tmp_path / f"module_{i:02}.py"
+        path.write_text("value = 1\nvalue = 2\n")
+        paths.append(path)
+
+    matches = scan_files(paths, re.compile("value"), max_results=5, workers=4)
+    first = next(matches)
+    assert (first.file_path, first.line_number) == (paths[0], 1)
+
+    rest = list(matches)
+    assert [(m.file_path.name, m.line_number) for m in rest] == [
+        ("module_00.py", 2), ("module_01.py", 1), ("module_01.py", 2), ("module_02.py", 1)
+    ]
+
+
+def test_benchmark_runs():
+    results = run_benchmark(files=20, lines=60, repeats=1)
+
+    assert results["config"]["files"] == 20
+    for engines in results["patterns"].values():
+        assert set(engines) == {"line_scan", "scan_engine", "trigram_index"}
+        assert all(engine["same_matches"] for engine in engines.values())
@@ -0,0 +1,149 @@
+"""
+Test Persistent Symbol Index
+
+Tests that the symbol index follows the code index incrementally and that
+definition/usage searches are answered from it.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.indexing.code_indexer import CodeIndexer
+from core.indexing.symbol_index import SymbolIndex
+from services.code_search import LightweightCodeSearch
+
+
+@pytest.mark.asyncio
+async def test_symbol_index_follows_code_index(tmp_path):
+    (tmp_path / "models.py").write_text("MAX_USERS = 10\n\nclass User:\n    pass\n")
+    (tmp_path / "app.py").write_text(
+        "from models import User\n\nclass Admin(User):\n    pass\n\ndef main():\n    return User()\n"
+    )
+
+    indexer = CodeIndexer()
+    await indexer.build_full_index(str(tmp_path))
+    symbols = SymbolIndex(tmp_path / ".ki_autoagent_ws" / "cache" / "symbols.db")
+
+    assert [(d["kind"], d["path"], d["line"]) for d in symbols.find_definitions("User")] == [
+        ("class", "models.py", 3)
+    ]
+    assert symbols.find_definitions("MAX_USERS", "variable")[0]["line"] == 1
+    assert {(r["kind"], r["line"]) for r in symbols.find_references("User")} == {
+        ("import", 1), ("base", 3), ("call", 7)
+    }
+    assert symbols.find_importers("models")[0]["path"] == "app.py"
+
+    (tmp_path / "app.py").write_text("def main():\n    return 1\n")
+    (tmp_path / "models.py").unlink()
+    await indexer.build_full_index(str(tmp_path))
+
+    assert symbols.find_definitions("User") == []
+    assert symbols.find_references("User") == []
+    assert symbols.statistics()["files"] == 1
+
+
+@pytest.mark.asyncio
+async def test_code_search_uses_symbol_index(tmp_path):
+    (tmp_path / "service.py").write_text(
+        "def load_config():\n    return {}\n\n\ndef start():\n    config = load_config()\n"
+        "    # load_config is cached\n    return config\n"
+    )
+    search = LightweightCodeSearch(str(tmp_path))
+
+    # No index yet: file scan (every occurrence of the name)
+    assert [r.line_number for r in search.search_usage("load_config")] == [1, 6, 7]
+
+    stats = await search.build_symbol_index()
+    assert stats["files"] == 1
+
+    definitions = search.search_definition("load_config", "function")
+    assert [(r.file_path, r.line_number) for r in definitions] == [("service.py", 1)]
+    assert definitions[0].context_after[0] == "    return {}"
+
+    usages = search.search_usage("load_config")
+    assert [(r.line_number, r.line_content.strip()) for r in usages] == [(6, "config = load_config()")]
+    assert search.search_usage("load_config", file_pattern="**/*.js") == []
+
+
+@pytest.mark.asyncio
+async def test_code_search_refreshes_stale_symbol_index(tmp_path, monkeypatch):
+    monkeypatch.setenv("KI_CODE_SEARCH_REFRESH_SECONDS", "0")
+    (tmp_path / "a.py").write_text("def old():\n    return 1\n")
+    search = LightweightCodeSearch(str(tmp_path))
+    await search.build_symbol_index()
+
+    (tmp_path / "b.py").write_text("def fresh():\n    return old()\n")
+    (tmp_path / "a.py").unlink()
+
+    assert [(r.file_path, r.line_number) for r in search.search_definition("fresh")] == [("b.py", 1)]
+    assert search.search_definition("old") == []
+    assert [(r.file_path, r.line_number) for r in search.search_usage("old")] == [("b.py", 2)]
+
+
+@pytest.mark.asyncio
+async def test_symbol_index_covers_async_defs_and_name_usages(tmp_path):
+    (tmp_path / "handlers.py").write_text(
+        "async def on_event(event):\n"
+        "    return event\n"
+        "\n"
+        "\n"
+        "def register(bus, settings: Settings):\n"
+        "    bus.subscribe(on_event)\n"
+        "    handler = on_event\n"
+        "    return settings.on_event\n"
+    )
+    search = LightweightCodeSearch(str(tmp_path))
+    await search.build_symbol_index()
+
+    definitions = search.search_definition("on_event", "function")
+    assert [r.line_number for r in definitions] == [1]
+    assert [r.line_number for r in search.search_usage("on_event")] == [6, 7, 8]
+    assert [r.line_number for r in search.search_usage("Settings")] == [5]
+
+
+@pytest.mark.asyncio
+async def test_symbol_index_refresh_is_rate_limited(tmp_path, monkeypatch):
+    monkeypatch.setenv("KI_CODE_SEARCH_REFRESH_SECONDS", "3600")
+    (tmp_path / "a.py").write_text("def old():\n    return 1\n")
+    search = LightweightCodeSearch(str(tmp_path))
+    await search.build_symbol_index()
+
+    (tmp_path / "b.py").write_text("def fresh():\n    return 1\n")
+    assert search.search_definition("fresh") == []  # Within the staleness window
+
+    search.invalidate_indexes()
+    assert [r.file_path for r in search.search_definition("fresh")] == ["b.py"]
+
+
+@pytest.mark.asyncio
+async def test_non_python_patterns_are_scanned(tmp_path):
+    (tmp_path / "service.py").write_text("def load_config():\n    return {}\n")
+    (tmp_path / "app.js").write_text("function loadConfig() {}\nloadConfig();\n")
+    (tmp_path / "cfg.yaml").write_text("loader: loadConfig\n")
+    search = LightweightCodeSearch(str(tmp_path))
+    await search.build_symbol_index()
+
+    assert [r.line_number for r in search.search_usage("loadConfig", "**/*.js")] == [1, 2]
+    assert [r.file_path for r in search.search_usage("loadConfig", "**/*.yaml")] == ["cfg.yaml"]
+    assert [r.file_path for r in search.search_definition("loadConfig", file_pattern="**/*.js")] == []
+
+
+@pytest.mark.asyncio
+async def test_name_references_stay_out_of_the_code_index(tmp_path):
+    (tmp_path / "app.py").write_text("def main(handler):\n    return handler\n")
+
+    code_index = await CodeIndexer().build_full_index(str(tmp_path))
+
+    assert "names" not in code_index["ast"]["files"]["app.py"]
+    symbols = SymbolIndex(tmp_path / ".ki_autoagent_ws" / "cache" / "symbols.db")
+    assert [r["line"] for r in symbols.find_references("handler")] == [2]
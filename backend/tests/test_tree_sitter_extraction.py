@@ -0,0 +1,95 @@
+"""
+Test Tree-sitter Query Extraction
+
+Tests the single-pass query extraction of TreeSitterAnalyzer: functions,
+classes, imports and syntax errors, byte spans, the tree-walk fallback and
+files nested deeper than the Python recursion limit.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from tools import tree_sitter_tools
+from tools.tree_sitter_tools import TreeSitterAnalyzer
+
+PYTHON_CODE = '''import os
+from typing import Any
+
+
+class Service:
+    def run(self):
+        def helper():
+            return 1
+        return helper()
+
+
+def main():
+    pass
+'''
+
+
+def test_extracts_in_one_pass(tmp_path):
+    path = tmp_path / "service.py"
+    path.write_text(PYTHON_CODE)
+
+    result = TreeSitterAnalyzer().parse_file(str(path))
+
+    assert [f["name"] for f in result["functions"]] == ["run", "helper", "main"]
+    assert [(c["name"], c["start_line"], c["end_line"]) for c in result["classes"]] == [("Service", 5, 9)]
+    assert result["imports"] == ["import os", "from typing import Any"]
+    assert result["syntax_valid"] and result["error_nodes"] == []
+
+    main = result["functions"][-1]
+    assert PYTHON_CODE.encode()[main["start_byte"]:main["end_byte"]].decode() == "def main():\n    pass"
+
+
+def test_tree_walk_fallback_matches_query(tmp_path, monkeypatch):
+    path = tmp_path / "app.ts"
+    path.write_text(
+        "import { a } from './a';\n"
+        "class Widget { render() { return (1 }\n"
+        "const add = (x: number) => x + 1;\n"
+    )
+    analyzer = TreeSitterAnalyzer()
+    with_query = analyzer.parse_file(str(path))
+    errors = analyzer.find_syntax_errors("class A { m() { return (1 }", "typescript")
+
+    monkeypatch.setattr(tree_sitter_tools, "_QUERIES", {})
+    with_walk = analyzer.parse_file(str(path))
+
+    for key in ("functions", "classes", "imports", "error_nodes"):
+        assert with_walk[key] == with_query[key]
+    assert analyzer.find_syntax_errors("class A { m() { return (1 }", "typescript") == errors
+    assert {e["type"] for e in errors} == {"syntax_error", "missing_node"}
+
+
+def test_deeply_nested_file(tmp_path):
+    path = tmp_path / "deep.py"
+    path.write_text("x = " + "[" * 1500 + "1" + "]" * 1500 + "\n\n\ndef f():\n    pass\n")
+
+    result = TreeSitterAnalyzer().parse_file(str(path))
+
+    assert [f["name"] for f in result["functions"]] == ["f"]
+    assert result["syntax_valid"]
+
+
+def test_parse_code_matches_parse_file(tmp_path):
+    path = tmp_path / "service.py"
+    path.write_text(PYTHON_CODE)
+    analyzer = TreeSitterAnalyzer()
+
+    from_file = analyzer.parse_file(str(path))
+    from_code = analyzer.parse_code(PYTHON_CODE, "python")
+
+    for key in ("functions", "classes", "imports", "syntax_valid", "error_nodes"):
+        assert from_code[key] == from_file[key]
+    assert "tree" not in from_code
+    assert analyzer.parse_code("x = 1", "cobol") is None
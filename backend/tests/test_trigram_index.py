@@ -0,0 +1,102 @@
+"""
+Test Trigram Index for Code Search
+
+Tests trigram extraction from regexes and that indexed searches return the
+same matches as a full scan while the index follows file changes.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.code_search import LightweightCodeSearch
+from services.trigram_index import regex_trigrams
+
+
+def test_regex_trigrams():
+    assert regex_trigrams(r"\bload_config\b") == [
+        {"loa", "oad", "ad_", "d_c", "_co", "con", "onf", "nfi", "fig"}
+    ]
+    assert regex_trigrams(r"def\s+Foo\(") == [{"def", "foo", "oo("}]
+    assert regex_trigrams(r"(^\s*class\s+Foo|^\s*def\s+Bar\s*\()") == [
+        {"cla", "las", "ass", "foo"}, {"def", "bar"}
+    ]
+    assert regex_trigrams(r"foo(bar)+") == [{"foo", "bar"}]
+
+    # Nothing every match must contain → full scan
+    assert regex_trigrams(r"\w+\(") is None
+    assert regex_trigrams(r"foo|x") is None
+    assert regex_trigrams(r"(bar)?ab") is None
+    assert regex_trigrams(r"[unclosed") is None
+
+
+def result_keys(results):
+    return [(r.file_path, r.line_number) for r in results]
+
+
+def test_indexed_search_matches_full_scan(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "config.py").write_text("def load_config():\n    return LOAD_CONFIG\n")
+    (tmp_path / "main.py").write_text("from pkg.config import load_config\n\nload_config()\n")
+    (tmp_path / "other.py").write_text("print('unrelated')\n")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "dep.py").write_text("load_config = 1\n")
+
+    indexed = LightweightCodeSearch(str(tmp_path), use_index=True)
+    scan = LightweightCodeSearch(str(tmp_path), use_index=False)
+
+    for pattern in (r"load_config", r"def\s+load_config", r"(unrelated|LOAD_CONFIG)", r"\w+\("):
+        expected = sorted(result_keys(scan.search(pattern)))
+        assert sorted(result_keys(indexed.search(pattern))) == expected
+        assert sorted(result_keys(indexed.search(pattern, case_sensitive=True))) == sorted(
+            result_keys(scan.search(pattern, case_sensitive=True))
+        )
+
+    assert indexed._indexed_candidates("load_config", "**/*.py") == [
+        tmp_path / "main.py", tmp_path / "pkg" / "config.py"
+    ]
+
+    # Index follows edits and deletions (after the refresh interval or an invalidation)
+    (tmp_path / "other.py").write_text("load_config()\n")
+    (tmp_path / "main.py").unlink()
+    indexed.invalidate_indexes()
+    assert result_keys(indexed.search("load_config", case_sensitive=True)) == [
+        ("other.py", 1), ("pkg/config.py", 1)
+    ]
+    assert (tmp_path / ".ki_autoagent_ws" / "cache" / "trigrams.db").exists()
+
+
+def test_refresh_is_rate_limited(tmp_path, monkeypatch):
+    monkeypatch.setenv("KI_CODE_SEARCH_REFRESH_SECONDS", "3600")
+    (tmp_path / "a.py").write_text("needle_value = 1\n")
+    indexed = LightweightCodeSearch(str(tmp_path), use_index=True)
+    assert result_keys(indexed.search("needle_value")) == [("a.py", 1)]
+
+    (tmp_path / "b.py").write_text("needle_value = 2\n")
+    assert result_keys(indexed.search("needle_value")) == [("a.py", 1)]  # Within the staleness window
+
+    indexed.invalidate_indexes()
+    assert sorted(result_keys(indexed.search("needle_value"))) == [("a.py", 1), ("b.py", 1)]
+
+
+def test_file_patterns_match_like_glob(tmp_path):
+    (tmp_path / "sub" / "deep").mkdir(parents=True)
+    for path in ("top.py", "sub/inner.py", "sub/deep/leaf.py", "sub/notes.txt"):
+        (tmp_path / path).write_text("needle_value = 1\n")
+
+    indexed = LightweightCodeSearch(str(tmp_path), use_index=True)
+    scan = LightweightCodeSearch(str(tmp_path), use_index=False)
+
+    for file_pattern in ("*.py", "sub/*.py", "**/*.py", "sub/**/*.py", "**/deep/*.py", "**/*"):
+        expected = sorted(r.file_path for r in scan.search("needle_value", file_pattern))
+        assert sorted(r.file_path for r in indexed.search("needle_value", file_pattern)) == expected, file_pattern
+
+    assert [r.file_path for r in indexed.search("needle_value", "*.py")] == ["top.py"]
+    assert [r.file_path for r in indexed.search("needle_value", "sub/*.py")] == ["sub/inner.py"]
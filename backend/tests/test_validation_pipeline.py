@@ -0,0 +1,126 @@
+"""
+Test Codesmith Validation Pipeline
+
+Tests the FILE: block parser, per-file write decisions, parallel
+validation on the thread and process pools, batched writes and the
+aggregated report.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from subgraphs import validation_pipeline
+from subgraphs.validation_pipeline import (
+    parse_file_blocks,
+    run_validation_pipeline,
+    shutdown_validation_pools,
+    validate_file,
+    validate_files,
+)
+
+
+CODE_OUTPUT = """FILE: src/app.py
+```python
+def add(a: int, b: int) -> int:
+    return a + b
+```
+
+FILE: src/broken.py
+```python
+def broken(:
+```
+
+FILE: README.md
+```markdown
+# Demo
+```
+"""
+
+
+@pytest.fixture(autouse=True)
+def fresh_pools():
+    yield
+    shutdown_validation_pools()
+
+
+def test_parse_file_blocks():
+    files = parse_file_blocks(CODE_OUTPUT + "\nFILE: empty.py\n")
+
+    assert [path for path, _ in files] == ["src/app.py", "src/broken.py", "README.md"]
+    assert files[0][1].startswith("def add")
+
+
+def test_write_decisions():
+    assert validate_file("a.py", "x = 1\n")["write"] is True
+
+    broken = validate_file("b.py", "def broken(:\n")
+    assert broken["syntax_valid"] is False
+    assert broken["write"] is False
+
+    notes = validate_file("notes.txt", "anything")
+    assert notes["language"] is None
+    assert notes["write"] is True
+
+
+@pytest.mark.asyncio
+async def test_results_keep_input_order(monkeypatch):
+    monkeypatch.setenv("KI_VALIDATION_PROCESS_MIN_FILES", "0")
+    files = [(f"m{i}.py", f"x{i} = {i}\n") for i in range(12)]
+
+    results = await validate_files(files)
+
+    assert [r["path"] for r in results] == [path for path, _ in files]
+    assert all(r["write"] for r in results)
+
+
+@pytest.mark.asyncio
+async def test_large_batches_use_process_pool(monkeypatch):
+    monkeypatch.setenv("KI_VALIDATION_PROCESS_MIN_FILES", "2")
+    monkeypatch.setenv("KI_VALIDATION_WORKERS", "2")
+
+    results = await validate_files([("a.py", "a = 1\n"), ("b.py", "def b(:\n")])
+
+    assert validation_pipeline._process_pool is not None
+    assert [r["write"] for r in results] == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_writes_valid_files_and_reports(tmp_path, monkeypatch):
+    monkeypatch.setenv("KI_VALIDATION_PROCESS_MIN_FILES", "0")
+
+    result = await run_validation_pipeline(CODE_OUTPUT, str(tmp_path))
+
+    paths = [f["path"] for f in result["generated_files"]]
+    assert paths == ["src/app.py", "README.md"]
+    assert (tmp_path / "src" / "app.py").exists()
+    assert not (tmp_path / "src" / "broken.py").exists()
+    assert result["generated_files"][1]["validated"] is False
+
+    summary = result["report"]["summary"]
+    assert summary["total"] == 3
+    assert summary["written"] == 2
+    assert summary["skipped_syntax"] == 1
+    assert "`src/broken.py`" in result["report"]["markdown"]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_rejects_paths_outside_workspace(tmp_path, monkeypatch):
+    monkeypatch.setenv("KI_VALIDATION_PROCESS_MIN_FILES", "0")
+    workspace = tmp_path / "ws"
+    workspace.mkdir()
+
+    result = await run_validation_pipeline("FILE: ../escape.py\n```python\nx = 1\n```\n", str(workspace))
+
+    assert result["generated_files"] == []
+    assert result["report"]["summary"]["write_errors"] == 1
+    assert not (tmp_path / "escape.py").exists()
@@ -0,0 +1,70 @@
+"""
+Tests for the Workflow Overhead Benchmark
+
+Runs the benchmark suite with the smallest configuration and checks
+that the JSON report contains every metric we track for regressions.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.workflow_overhead import (
+    StubChatModel,
+    measure_state_conversions,
+    run_benchmark,
+)
+
+
+@pytest.mark.asyncio
+async def test_benchmark_report_structure():
+    """Benchmark produces per-node, checkpoint and throughput metrics."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        results = await run_benchmark(
+            sessions=1,
+            iterations=1,
+            memory_items=2,
+            conversion_repeats=10
+        )
+
+    # Must be machine-readable
+    json.dumps(results)
+
+    assert results["benchmark"] == "workflow_overhead"
+    for node in ("supervisor", "research", "architect", "codesmith", "reviewfix"):
+        assert results["nodes"][node]["count"] == 1
+
+    assert results["checkpoints"]["writes"] > 0
+    assert results["checkpoints"]["mean_bytes_per_superstep"] > 0
+    assert results["throughput"]["successful_sessions"] == 1
+    assert results["throughput"]["sessions_per_second"] > 0
+    assert results["memory_io"]["store"]["count"] == 2
+
+
+def test_state_conversions_cover_all_transformations():
+    """Every Supervisor <-> Subgraph transformation is measured."""
+    results = measure_state_conversions(file_count=5, repeats=5)
+
+    assert len(results["microseconds_per_call"]) == 8
+    assert all(v >= 0 for v in results["microseconds_per_call"].values())
+
+
+@pytest.mark.asyncio
+async def test_stub_chat_model_answers_per_agent():
+    """Stub LLM returns parseable, agent-specific output."""
+    codesmith = StubChatModel(agent_name="codesmith")
+    reviewer = StubChatModel(model="gpt-4o-mini")
+
+    assert (await codesmith.ainvoke([])).content.startswith("FILE:")
+    assert "QUALITY_SCORE:" in (await reviewer.ainvoke([])).content
@@ -40,12 +40,16 @@ from utils.perplexity_service import PerplexityService
 
 
 @tool
-async def perplexity_search(query: str) -> dict[str, Any]:
+async def perplexity_search(query: str, force_refresh: bool = False) -> dict[str, Any]:
     """
     Search the web using Perplexity Sonar API.
 
+    Results of recent identical (normalized) queries are served from the
+    Perplexity cache (utils/perplexity_cache.py).
+
     Args:
         query: Search query (e.g., "React best practices 2025")
+        force_refresh: Skip the cache and force a live lookup
 
     Returns:
         dict with:
@@ -56,6 +60,7 @@ async def perplexity_search(query: str) -> dict[str, Any]:
             - success: bool
             - model: str (Perplexity model used)
             - timestamp: str (ISO format timestamp)
+            - cached: bool (served from the Perplexity cache)
 
     Example:
         result = await perplexity_search("Python async patterns")
@@ -91,7 +96,8 @@ async def perplexity_search(query: str) -> dict[str, Any]:
         result = await service.search_web(
             query=query,
             recency="month",  # Focus on recent information
-            max_results=5
+            max_results=5,
+            force_refresh=force_refresh
         )
 
         # Extract data from result
@@ -106,7 +112,11 @@ async def perplexity_search(query: str) -> dict[str, Any]:
             else:
                 formatted_citations.append(str(citation))
 
-        logger.info(f"✅ Perplexity search successful: {len(content)} chars, {len(formatted_citations)} citations")
+        cached = result.get("cached", False)
+        logger.info(
+            f"✅ Perplexity search successful{' (cached)' if cached else ''}: "
+            f"{len(content)} chars, {len(formatted_citations)} citations"
+        )
 
         # Return structured result
         return {
@@ -116,7 +126,8 @@ async def perplexity_search(query: str) -> dict[str, Any]:
             "sources": formatted_citations,  # Backwards compatibility
             "success": True,
             "model": result.get("model", "sonar"),
-            "timestamp": result.get("timestamp", "")
+            "timestamp": result.get("timestamp", ""),
+            "cached": cached
         }
 
     except Exception as e:
@@ -4,18 +4,42 @@ Tree-sitter Code Analysis Tools for v6.0
 Multi-language code parsing and analysis using Tree-sitter.
 Supports: Python, JavaScript, TypeScript
 
+The same generated file is parsed several times per workflow (codesmith
+validation, reviewer, MCP server). Parses go through a ParseCache:
+- identical content (language + content hash) reuses the tree and the
+  extracted metadata (LRU)
+- a new version of a known file is parsed incrementally: the old tree is
+  edited (tree.edit) and passed to the parser, which only re-parses the
+  changed region
+
+parse_directory keeps every tree in memory. iter_directory /
+parse_directory_page stream compact per-file summaries (no tree objects)
+in path order, parse on a thread pool with a bounded read-ahead window and
+resume from a cursor - memory stays flat regardless of the tree size.
+
+Configuration:
+- KI_PARSE_CACHE_SIZE   cached parses / tracked files (default 256, 0 = off)
+- KI_PARSE_WORKERS      directory parse threads (default min(8, CPUs))
+
 Author: KI AutoAgent Team
 Version: 6.0.0
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
-from tree_sitter import Language, Parser, Node
+from tree_sitter import Language, Node, Parser, Query, QueryCursor, Tree
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +88,319 @@ def _setup_parsers() -> dict[str, Parser]:
 # Global parsers (initialized once)
 _PARSERS = _setup_parsers()
 
+# Parser objects are not thread-safe: worker threads get their own copies
+_THREAD_LOCAL = threading.local()
+
+
+def get_parser(language: str) -> Parser | None:
+    """Get a parser for the calling thread (created on first use)."""
+    if threading.current_thread() is threading.main_thread():
+        return _PARSERS.get(language)
+
+    parsers = getattr(_THREAD_LOCAL, "parsers", None)
+    if parsers is None:
+        parsers = _THREAD_LOCAL.parsers = {}
+
+    if language not in parsers:
+        base = _PARSERS.get(language)
+        if base is None:
+            return None
+        parsers[language] = Parser(base.language)
+
+    return parsers[language]
+
+
+# ============================================================================
+# EXTRACTION QUERIES
+# ============================================================================
+
+# Node types parse_file extracts, per language
+FUNCTION_TYPES: dict[str, list[str]] = {
+    "python": ["function_definition"],
+    "javascript": ["function_declaration", "function_expression", "arrow_function"],
+    "typescript": ["function_declaration", "function_expression", "arrow_function", "method_definition"]
+}
+
+CLASS_TYPES: dict[str, list[str]] = {
+    "python": ["class_definition"],
+    "javascript": ["class_declaration"],
+    "typescript": ["class_declaration"]
+}
+
+IMPORT_TYPES: dict[str, list[str]] = {
+    "python": ["import_statement", "import_from_statement"],
+    "javascript": ["import_statement"],
+    "typescript": ["import_statement"]
+}
+
+
+def _query_source(language: str) -> str:
+    """One query capturing everything parse_file needs (a single tree pass)."""
+    def alternatives(node_types: list[str]) -> str:
+        return "[" + " ".join(f"({t})" for t in node_types) + "]"
+
+    return "\n".join([
+        f"{alternatives(FUNCTION_TYPES[language])} @function",
+        f"{alternatives(CLASS_TYPES[language])} @class",
+        f"{alternatives(IMPORT_TYPES[language])} @import",
+        "(ERROR) @error",
+        "(MISSING) @missing",
+    ])
+
+
+def _compile_queries() -> dict[str, Query]:
+    """Precompile the extraction query of every loaded language."""
+    queries = {}
+    for language, parser in _PARSERS.items():
+        try:
+            queries[language] = Query(parser.language, _query_source(language))
+        except Exception as e:
+            # E.g. a grammar version without one of the node types
+            logger.warning(f"Extraction query for {language} unavailable, using tree walk: {e}")
+    return queries
+
+
+_QUERIES = _compile_queries()
+
+
+def _iter_nodes(root: Node, errors_only: bool = False):
+    """
+    Pre-order traversal with a TreeCursor (no recursion limit).
+
+    errors_only: only enter subtrees that contain errors
+    """
+    cursor = root.walk()
+    while True:
+        node = cursor.node
+        yield node
+        if (not errors_only or node.has_error) and cursor.goto_first_child():
+            continue
+        while not cursor.goto_next_sibling():
+            if not cursor.goto_parent():
+                return
+
+
+# ============================================================================
+# PARSE CACHE
+# ============================================================================
+
+DEFAULT_PARSE_CACHE_SIZE = 256
+
+
+@dataclass
+class ParsedSource:
+    """A parse result (trees are shared between callers - never edit them)."""
+
+    language: str
+    code: bytes
+    tree: Tree
+    extracted: dict[str, list] | None = None  # Filled on first use
+
+
+def _point(code: bytes, offset: int) -> tuple[int, int]:
+    """(row, byte column) of a byte offset."""
+    row = code.count(b"\n", 0, offset)
+    return row, offset - (code.rfind(b"\n", 0, offset) + 1)
+
+
+def _edit_range(old: bytes, new: bytes) -> tuple[int, int, int]:
+    """
+    (start_byte, old_end_byte, new_end_byte) of the region that differs.
+
+    Common prefix/suffix by binary search over slice comparisons (memcmp)
+    instead of a Python loop over every byte.
+    """
+    limit = min(len(old), len(new))
+
+    low, high = 0, limit
+    while low < high:
+        mid = (low + high + 1) // 2
+        if old[:mid] == new[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    prefix = low
+
+    low, high = 0, limit - prefix
+    while low < high:
+        mid = (low + high + 1) // 2
+        if old[len(old) - mid:] == new[len(new) - mid:]:
+            low = mid
+        else:
+            high = mid - 1
+    suffix = low
+
+    return prefix, len(old) - suffix, len(new) - suffix
+
+
+class ParseCache:
+    """LRU of parses by (language, content hash) + last parse per file path."""
+
+    def __init__(self, max_entries: int = DEFAULT_PARSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], ParsedSource] = OrderedDict()
+        self._latest: OrderedDict[str, ParsedSource] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "incremental": 0}
+
+    def parse(self, code: bytes, language: str, file_path: str | None = None) -> ParsedSource | None:
+        """
+        Parse code (cached).
+
+        Args:
+            code: Source bytes
+            language: Parser language
+            file_path: Identifies versions of the same file (enables
+                incremental re-parsing of edits)
+
+        Returns:
+            ParsedSource, None if there's no parser for the language
+        """
+        key = (language, hashlib.sha256(code).hexdigest())
+        path = os.path.abspath(file_path) if file_path else None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                self._remember(path, entry)
+                return entry
+            previous = self._latest.get(path) if path else None
+
+        parser = get_parser(language)
+        if parser is None:
+            return None
+
+        if previous is not None and previous.language == language:
+            start, old_end, new_end = _edit_range(previous.code, code)
+            old_tree = previous.tree.copy()
+            old_tree.edit(
+                start_byte=start,
+                old_end_byte=old_end,
+                new_end_byte=new_end,
+                start_point=_point(code, start),
+                old_end_point=_point(previous.code, old_end),
+                new_end_point=_point(code, new_end),
+            )
+            tree = parser.parse(code, old_tree)
+        else:
+            tree = parser.parse(code)
+
+        entry = ParsedSource(language=language, code=code, tree=tree)
+        with self._lock:
+            self.stats["misses"] += 1
+            if previous is not None and previous.language == language:
+                self.stats["incremental"] += 1
+            if self.max_entries > 0:
+                self._entries[key] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                self._remember(path, entry)
+        return entry
+
+    def _remember(self, path: str | None, entry: ParsedSource) -> None:
+        if path is None or self.max_entries <= 0:
+            return
+        self._latest[path] = entry
+        self._latest.move_to_end(path)
+        while len(self._latest) > self.max_entries:
+            self._latest.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._latest.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "entries": len(self._entries), "files": len(self._latest)}
+
+
+_parse_cache: ParseCache | None = None
+
+
+def get_parse_cache() -> ParseCache:
+    """Get the global parse cache."""
+    global _parse_cache
+    if _parse_cache is None:
+        try:
+            size = int(os.environ.get("KI_PARSE_CACHE_SIZE", DEFAULT_PARSE_CACHE_SIZE))
+        except ValueError:
+            size = DEFAULT_PARSE_CACHE_SIZE
+        _parse_cache = ParseCache(max_entries=size)
+    return _parse_cache
+
+
+def get_parse_cache_stats() -> dict[str, Any]:
+    return get_parse_cache().get_stats()
+
+
+# ============================================================================
+# DIRECTORY WALK
+# ============================================================================
+
+DEFAULT_EXTENSIONS = [".py", ".js", ".jsx", ".ts", ".tsx"]
+
+
+def get_parse_workers() -> int:
+    try:
+        return max(1, int(os.environ.get("KI_PARSE_WORKERS", min(8, os.cpu_count() or 1))))
+    except ValueError:
+        return min(8, os.cpu_count() or 1)
+
+
+def iter_source_files(
+    dir_path: str, extensions: list[str] | None = None, start_after: str | None = None
+) -> Iterator[tuple[str, str]]:
+    """
+    Source files of a directory in path order (hidden dirs, node_modules and
+    directory symlinks skipped).
+
+    Entries are visited sorted by name, so files come in lexicographic order
+    of their relative path components - a relative path is a stable cursor.
+    Directories entirely before start_after are not entered.
+
+    Yields:
+        (relative_path, file_path) - relative_path uses "/"
+    """
+    extensions = tuple(extensions or DEFAULT_EXTENSIONS)
+    cursor = tuple(start_after.split("/")) if start_after else ()
+    stack = [(iter(_sorted_entries(dir_path)), ())]
+
+    while stack:
+        entries, parts = stack[-1]
+        entry = next(entries, None)
+        if entry is None:
+            stack.pop()
+            continue
+
+        entry_parts = parts + (entry.name,)
+        try:
+            # Symlinked directories are not followed - a link back up the
+            # tree would otherwise repeat it until the path gets too long
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            continue
+
+        if is_dir:
+            if entry.name.startswith(".") or entry.name == "node_modules":
+                continue
+            # Subtrees that end before the cursor are not entered
+            if cursor and entry_parts < cursor[:len(entry_parts)]:
+                continue
+            stack.append((iter(_sorted_entries(entry.path)), entry_parts))
+        elif entry.name.endswith(extensions) and entry_parts > cursor:
+            yield "/".join(entry_parts), entry.path
+
+
+def _sorted_entries(directory: str) -> list[os.DirEntry]:
+    try:
+        with os.scandir(directory) as it:
+            return sorted(it, key=lambda entry: entry.name)
+    except OSError:
+        return []
+
 
 # ============================================================================
 # TREE-SITTER ANALYZER
@@ -110,10 +447,11 @@ class TreeSitterAnalyzer:
             {
                 "language": str,
                 "tree": Tree,
-                "functions": list[dict],
-                "classes": list[dict],
+                "functions": list[dict],  # name, start/end line, byte span
+                "classes": list[dict],    # name, start/end line, byte span
                 "imports": list[str],
-                "syntax_valid": bool
+                "syntax_valid": bool,
+                "error_nodes": list[dict]
             }
         """
         # Detect language
@@ -122,8 +460,7 @@ class TreeSitterAnalyzer:
             logger.warning(f"Unknown language for: {file_path}")
             return None
 
-        parser = self.parsers.get(language)
-        if not parser:
+        if language not in self.parsers:
             logger.warning(f"No parser for language: {language}")
             return None
 
@@ -137,20 +474,22 @@ class TreeSitterAnalyzer:
 
         # Parse
         try:
-            tree = parser.parse(code)
+            parsed = get_parse_cache().parse(code, language, file_path)
+            tree = parsed.tree
             root = tree.root_node
 
-            # Extract metadata
+            # Extract metadata (one pass over the tree, cached with the parse)
+            extracted = self._extracted(parsed)
             result = {
                 "language": language,
                 "file_path": file_path,
                 "tree": tree,
                 "root_node": root,
-                "functions": self._extract_functions(root, code, language),
-                "classes": self._extract_classes(root, code, language),
-                "imports": self._extract_imports(root, code, language),
+                "functions": extracted["functions"],
+                "classes": extracted["classes"],
+                "imports": extracted["imports"],
                 "syntax_valid": not root.has_error,
-                "error_nodes": self._find_error_nodes(root) if root.has_error else []
+                "error_nodes": extracted["error_nodes"] if root.has_error else []
             }
 
             return result
@@ -159,6 +498,30 @@ class TreeSitterAnalyzer:
             logger.error(f"Failed to parse {file_path}: {e}")
             return None
 
+    def parse_code(self, code: str, language: str) -> dict[str, Any] | None:
+        """
+        Parse a code string and return its metadata (no tree objects).
+
+        Returns:
+            {"language", "functions", "classes", "imports", "syntax_valid",
+             "error_nodes"} - None if there's no parser for the language
+        """
+        parsed = get_parse_cache().parse(code.encode(), language)
+        if parsed is None:
+            logger.warning(f"No parser for language: {language}")
+            return None
+
+        root = parsed.tree.root_node
+        extracted = self._extracted(parsed)
+        return {
+            "language": language,
+            "functions": extracted["functions"],
+            "classes": extracted["classes"],
+            "imports": extracted["imports"],
+            "syntax_valid": not root.has_error,
+            "error_nodes": extracted["error_nodes"] if root.has_error else []
+        }
+
     def parse_directory(self, dir_path: str, extensions: list[str] | None = None) -> dict[str, Any]:
         """
         Parse entire directory recursively.
@@ -180,9 +543,6 @@ class TreeSitterAnalyzer:
                 }
             }
         """
-        if extensions is None:
-            extensions = [".py", ".js", ".jsx", ".ts", ".tsx"]
-
         results = {
             "total_files": 0,
             "parsed_files": 0,
@@ -195,136 +555,278 @@ class TreeSitterAnalyzer:
             }
         }
 
-        # Find all matching files
-        for root, dirs, files in os.walk(dir_path):
-            # Skip hidden and node_modules
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d != 'node_modules']
+        for _, file_path in iter_source_files(dir_path, extensions):
+            results["total_files"] += 1
 
-            for file in files:
-                if any(file.endswith(ext) for ext in extensions):
-                    file_path = os.path.join(root, file)
-                    results["total_files"] += 1
+            # Parse
+            parse_result = self.parse_file(file_path)
 
-                    # Parse
-                    parse_result = self.parse_file(file_path)
+            if parse_result:
+                results["parsed_files"] += 1
+                results["files"][file_path] = parse_result
 
-                    if parse_result:
-                        results["parsed_files"] += 1
-                        results["files"][file_path] = parse_result
-
-                        # Update summary
-                        results["summary"]["total_functions"] += len(parse_result["functions"])
-                        results["summary"]["total_classes"] += len(parse_result["classes"])
-                        if not parse_result["syntax_valid"]:
-                            results["summary"]["syntax_errors"] += 1
-                    else:
-                        results["failed_files"] += 1
+                # Update summary
+                results["summary"]["total_functions"] += len(parse_result["functions"])
+                results["summary"]["total_classes"] += len(parse_result["classes"])
+                if not parse_result["syntax_valid"]:
+                    results["summary"]["syntax_errors"] += 1
+            else:
+                results["failed_files"] += 1
 
         logger.info(f"Parsed directory {dir_path}: {results['parsed_files']}/{results['total_files']} files")
         return results
 
-    def validate_syntax(self, code: str, language: str) -> bool:
+    def summarize_file(self, file_path: str) -> dict[str, Any] | None:
+        """
+        Compact, JSON-serializable summary of a file (no tree objects).
+
+        Parses outside the ParseCache: the tree is dropped right away.
+
+        Returns:
+            {
+                "file_path": str,
+                "language": str,
+                "lines": int,
+                "syntax_valid": bool,
+                "functions": [{"name", "start_line", "end_line"}],
+                "classes": [{"name", "start_line", "end_line"}],
+                "imports": [str],
+                "errors": [{"line", "column", "type"}]
+            }
+            None if the file can't be read or has no parser
+        """
+        language = self.detect_language(file_path)
+        parser = get_parser(language) if language else None
+        if parser is None:
+            return None
+
+        try:
+            with open(file_path, "rb") as f:
+                code = f.read()
+            root = parser.parse(code).root_node
+            extracted = self._extract(root, code, language)
+        except Exception as e:
+            logger.error(f"Failed to parse {file_path}: {e}")
+            return None
+
+        def spans(items: list[dict]) -> list[dict]:
+            return [
+                {"name": item["name"], "start_line": item["start_line"], "end_line": item["end_line"]}
+                for item in items
+            ]
+
+        return {
+            "file_path": file_path,
+            "language": language,
+            "lines": code.count(b"\n") + (1 if code and not code.endswith(b"\n") else 0),
+            "syntax_valid": not root.has_error,
+            "functions": spans(extracted["functions"]),
+            "classes": spans(extracted["classes"]),
+            "imports": extracted["imports"],
+            "errors": extracted["error_nodes"] + extracted["missing_nodes"] if root.has_error else [],
+        }
+
+    def iter_directory(
+        self,
+        dir_path: str,
+        extensions: list[str] | None = None,
+        cursor: str | None = None,
+        workers: int | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Stream file summaries of a directory in path order.
+
+        Files are parsed on a thread pool, at most 2 x workers ahead of the
+        consumer; summaries are yielded as soon as they're next in order.
+        Unparseable files are yielded with "error" set.
+
+        Args:
+            dir_path: Directory to scan
+            extensions: File extensions to include
+            cursor: Relative path of the last file already seen (resume after it)
+            workers: Parse threads (default KI_PARSE_WORKERS)
+
+        Yields:
+            summarize_file() result + {"path": relative path (the cursor)}
+        """
+        workers = workers or get_parse_workers()
+        files = iter_source_files(dir_path, extensions, start_after=cursor)
+        window: deque[tuple[str, str, Future]] = deque()
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tree-sitter")
+
+        def submit_next() -> None:
+            item = next(files, None)
+            if item is not None:
+                relative_path, file_path = item
+                window.append((relative_path, file_path, pool.submit(self.summarize_file, file_path)))
+
+        try:
+            for _ in range(workers * 2):
+                submit_next()
+
+            while window:
+                relative_path, file_path, future = window.popleft()
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to parse {file_path}: {e}")
+                    summary = None
+                submit_next()
+
+                yield {"path": relative_path, **(summary or {"file_path": file_path, "error": "parse failed"})}
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def parse_directory_page(
+        self,
+        dir_path: str,
+        extensions: list[str] | None = None,
+        cursor: str | None = None,
+        limit: int = 200,
+        workers: int | None = None,
+    ) -> dict[str, Any]:
+        """
+        One page of directory summaries (see iter_directory).
+
+        Returns:
+            {
+                "files": [summary, ...],          # at most limit
+                "next_cursor": str | None,        # pass as cursor for the next page
+                "summary": {"parsed_files", "failed_files", "total_functions",
+                            "total_classes", "syntax_errors"}   # of this page
+            }
+        """
+        limit = max(1, limit)
+        files = list(islice(self.iter_directory(dir_path, extensions, cursor, workers), limit))
+
+        next_cursor = None
+        if len(files) == limit:
+            has_more = next(iter_source_files(dir_path, extensions, start_after=files[-1]["path"]), None)
+            next_cursor = files[-1]["path"] if has_more else None
+
+        parsed = [f for f in files if "error" not in f]
+        return {
+            "files": files,
+            "next_cursor": next_cursor,
+            "summary": {
+                "parsed_files": len(parsed),
+                "failed_files": len(files) - len(parsed),
+                "total_functions": sum(len(f["functions"]) for f in parsed),
+                "total_classes": sum(len(f["classes"]) for f in parsed),
+                "syntax_errors": sum(1 for f in parsed if not f["syntax_valid"]),
+            },
+        }
+
+    def validate_syntax(self, code: str, language: str, file_path: str | None = None) -> bool:
         """
         Validate code syntax.
 
         Args:
             code: Code string to validate
             language: Programming language
+            file_path: Optional path of the code (incremental re-parsing)
 
         Returns:
             True if syntax is valid, False otherwise
         """
-        parser = self.parsers.get(language)
-        if not parser:
-            logger.warning(f"No parser for language: {language}")
-            return False
-
         try:
-            tree = parser.parse(code.encode())
-            return not tree.root_node.has_error
+            parsed = get_parse_cache().parse(code.encode(), language, file_path)
+            if parsed is None:
+                logger.warning(f"No parser for language: {language}")
+                return False
+            return not parsed.tree.root_node.has_error
         except Exception as e:
             logger.error(f"Syntax validation failed: {e}")
             return False
 
-    def _extract_functions(self, node: Node, code: bytes, language: str) -> list[dict]:
-        """Extract all function definitions"""
-        functions = []
+    def find_syntax_errors(self, code: str, language: str, file_path: str | None = None) -> list[dict]:
+        """
+        Locate syntax errors (ERROR and MISSING nodes) in code.
 
-        # Language-specific node types
-        func_types = {
-            "python": ["function_definition"],
-            "javascript": ["function_declaration", "function_expression", "arrow_function"],
-            "typescript": ["function_declaration", "function_expression", "arrow_function", "method_definition"]
+        Returns:
+            [{"line": int, "column": int, "type": "syntax_error" | "missing_node"}, ...]
+        """
+        parsed = get_parse_cache().parse(code.encode(), language, file_path)
+        if parsed is None or not parsed.tree.root_node.has_error:
+            return []
+
+        extracted = self._extracted(parsed)
+        errors = [dict(e) for e in extracted["error_nodes"] + extracted["missing_nodes"]]
+        return errors or [{"line": 1, "column": 0, "type": "syntax_error"}]
+
+    def _extracted(self, parsed: ParsedSource) -> dict[str, list]:
+        """Metadata of a cached parse (copies - callers may modify them)."""
+        if parsed.extracted is None:
+            parsed.extracted = self._extract(parsed.tree.root_node, parsed.code, parsed.language)
+        return {
+            key: [dict(item) if isinstance(item, dict) else item for item in items]
+            for key, items in parsed.extracted.items()
         }
 
-        target_types = func_types.get(language, [])
-
-        def visit(n: Node):
-            if n.type in target_types:
-                func_info = {
+    def _extract(self, root: Node, code: bytes, language: str) -> dict[str, list]:
+        """
+        Extract functions, classes, imports and error/missing nodes in one
+        pass: the precompiled language query, or an iterative tree walk if
+        the query couldn't be compiled.
+        """
+        query = _QUERIES.get(language)
+        if query is not None:
+            captures = QueryCursor(query).captures(root)
+            # Pre-order (captures of one name come in document order already)
+            nodes = {
+                name: sorted(found, key=lambda n: (n.start_byte, -n.end_byte))
+                for name, found in captures.items()
+            }
+        else:
+            categories = {
+                **{t: "function" for t in FUNCTION_TYPES.get(language, [])},
+                **{t: "class" for t in CLASS_TYPES.get(language, [])},
+                **{t: "import" for t in IMPORT_TYPES.get(language, [])},
+                "ERROR": "error",
+            }
+            nodes: dict[str, list[Node]] = {}
+            for n in _iter_nodes(root):
+                if n.is_missing:
+                    nodes.setdefault("missing", []).append(n)
+                elif n.type in categories:
+                    nodes.setdefault(categories[n.type], []).append(n)
+
+        return {
+            "functions": [
+                {
                     "name": self._get_function_name(n, code),
                     "start_line": n.start_point[0] + 1,
                     "end_line": n.end_point[0] + 1,
-                    "node_type": n.type
+                    "node_type": n.type,
+                    "start_byte": n.start_byte,
+                    "end_byte": n.end_byte
                 }
-                functions.append(func_info)
-
-            for child in n.children:
-                visit(child)
-
-        visit(node)
-        return functions
-
-    def _extract_classes(self, node: Node, code: bytes, language: str) -> list[dict]:
-        """Extract all class definitions"""
-        classes = []
-
-        class_types = {
-            "python": ["class_definition"],
-            "javascript": ["class_declaration"],
-            "typescript": ["class_declaration"]
-        }
-
-        target_types = class_types.get(language, [])
-
-        def visit(n: Node):
-            if n.type in target_types:
-                class_info = {
+                for n in nodes.get("function", [])
+            ],
+            "classes": [
+                {
                     "name": self._get_class_name(n, code),
                     "start_line": n.start_point[0] + 1,
-                    "end_line": n.end_point[0] + 1
+                    "end_line": n.end_point[0] + 1,
+                    "start_byte": n.start_byte,
+                    "end_byte": n.end_byte
                 }
-                classes.append(class_info)
-
-            for child in n.children:
-                visit(child)
-
-        visit(node)
-        return classes
-
-    def _extract_imports(self, node: Node, code: bytes, language: str) -> list[str]:
-        """Extract all imports"""
-        imports = []
-
-        import_types = {
-            "python": ["import_statement", "import_from_statement"],
-            "javascript": ["import_statement"],
-            "typescript": ["import_statement"]
+                for n in nodes.get("class", [])
+            ],
+            "imports": [
+                code[n.start_byte:n.end_byte].decode("utf-8").strip()
+                for n in nodes.get("import", [])
+            ],
+            "error_nodes": [
+                {"line": n.start_point[0] + 1, "column": n.start_point[1], "type": "syntax_error"}
+                for n in nodes.get("error", [])
+            ],
+            "missing_nodes": [
+                {"line": n.start_point[0] + 1, "column": n.start_point[1], "type": "missing_node"}
+                for n in nodes.get("missing", [])
+            ],
         }
 
-        target_types = import_types.get(language, [])
-
-        def visit(n: Node):
-            if n.type in target_types:
-                import_text = code[n.start_byte:n.end_byte].decode('utf-8')
-                imports.append(import_text.strip())
-
-            for child in n.children:
-                visit(child)
-
-        visit(node)
-        return imports
-
     def _get_function_name(self, node: Node, code: bytes) -> str:
         """Extract function name from node"""
         for child in node.children:
@@ -339,25 +841,6 @@ class TreeSitterAnalyzer:
                 return code[child.start_byte:child.end_byte].decode('utf-8')
         return "<anonymous>"
 
-    def _find_error_nodes(self, node: Node) -> list[dict]:
-        """Find all error nodes in AST"""
-        errors = []
-
-        def visit(n: Node):
-            if n.has_error:
-                if n.type == "ERROR":
-                    errors.append({
-                        "line": n.start_point[0] + 1,
-                        "column": n.start_point[1],
-                        "type": "syntax_error"
-                    })
-
-            for child in n.children:
-                visit(child)
-
-        visit(node)
-        return errors
-
 
 # ============================================================================
 # TOOL FUNCTIONS (for LangChain agents)
@@ -0,0 +1,199 @@
+"""
+Shared HTTP Client Registry
+
+PerplexityService opened a new aiohttp.ClientSession per request and the
+diagram renderer used urllib - every call paid for DNS lookup, TCP and TLS
+handshake again. This registry hands out long-lived, pooled clients:
+
+- aiohttp.ClientSession  (Perplexity): keep-alive, per-host connection
+  limit, DNS cache
+- httpx.AsyncClient      (OpenAI SDK):  keep-alive pool
+- httpx.Client           (sync callers: mermaid.ink rendering)
+
+Async clients are bound to the event loop they were created in, so they
+are kept per (name, loop). Everything is closed by shutdown_http_clients()
+in the server lifespan hook.
+
+Configuration:
+- KI_HTTP_MAX_CONNECTIONS   total connections per client (default 100)
+- KI_HTTP_MAX_PER_HOST      connections per host (default 10)
+- KI_HTTP_KEEPALIVE         idle keep-alive seconds (default 30)
+- KI_HTTP_DNS_TTL           DNS cache seconds (default 300)
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Any
+
+import aiohttp
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        logger.warning(f"⚠️ Invalid {name}, using {default}")
+        return default
+
+
+def _current_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class HTTPClientRegistry:
+    """Lifecycle-managed pooled HTTP clients, shared by all services."""
+
+    def __init__(self):
+        self.max_connections = _env_int("KI_HTTP_MAX_CONNECTIONS", 100)
+        self.max_per_host = _env_int("KI_HTTP_MAX_PER_HOST", 10)
+        self.keepalive = _env_int("KI_HTTP_KEEPALIVE", 30)
+        self.dns_ttl = _env_int("KI_HTTP_DNS_TTL", 300)
+
+        self._sessions: dict[tuple[str, int], tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = {}
+        self._async_clients: dict[tuple[str, int], tuple[asyncio.AbstractEventLoop | None, httpx.AsyncClient]] = {}
+        self._sync_clients: dict[str, httpx.Client] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_per_host,
+            keepalive_expiry=self.keepalive
+        )
+
+    def aiohttp_session(self, name: str) -> aiohttp.ClientSession:
+        """Pooled aiohttp session for the running event loop."""
+        loop = asyncio.get_running_loop()
+        key = (name, id(loop))
+
+        entry = self._sessions.get(key)
+        if entry and entry[0] is loop and not entry[1].closed:
+            return entry[1]
+
+        # Sessions of finished loops can't be used (or closed) anymore
+        for stale in [k for k, (session_loop, _) in self._sessions.items() if session_loop.is_closed()]:
+            del self._sessions[stale]
+
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_per_host,
+            keepalive_timeout=self.keepalive,
+            ttl_dns_cache=self.dns_ttl,
+            use_dns_cache=True
+        )
+        session = aiohttp.ClientSession(connector=connector)
+        self._sessions[key] = (loop, session)
+        self.created += 1
+        logger.debug(f"🌐 New pooled aiohttp session: {name}")
+        return session
+
+    def async_client(self, name: str, factory: type[httpx.AsyncClient] = httpx.AsyncClient, **kwargs: Any) -> httpx.AsyncClient:
+        """
+        Pooled httpx.AsyncClient.
+
+        Created outside an event loop (e.g. in a service constructor), the
+        client binds to the loop that first uses it.
+        """
+        loop = _current_loop()
+        key = (name, id(loop) if loop else 0)
+
+        with self._lock:
+            entry = self._async_clients.get(key)
+            if entry and not entry[1].is_closed:
+                return entry[1]
+
+            kwargs.setdefault("limits", self._limits())
+            client = factory(**kwargs)
+            self._async_clients[key] = (loop, client)
+            self.created += 1
+
+        logger.debug(f"🌐 New pooled httpx async client: {name}")
+        return client
+
+    def sync_client(self, name: str, **kwargs: Any) -> httpx.Client:
+        """Pooled, thread-safe httpx.Client for synchronous callers."""
+        with self._lock:
+            client = self._sync_clients.get(name)
+            if client and not client.is_closed:
+                return client
+
+            kwargs.setdefault("limits", self._limits())
+            client = httpx.Client(**kwargs)
+            self._sync_clients[name] = client
+            self.created += 1
+
+        logger.debug(f"🌐 New pooled httpx client: {name}")
+        return client
+
+    async def aclose(self) -> None:
+        """Close all clients (clients bound to other, stopped loops are dropped)."""
+        loop = asyncio.get_running_loop()
+
+        sessions, self._sessions = self._sessions, {}
+        with self._lock:
+            async_clients, self._async_clients = self._async_clients, {}
+            sync_clients, self._sync_clients = self._sync_clients, {}
+
+        for session_loop, session in sessions.values():
+            if session_loop is loop and not session.closed:
+                await session.close()
+
+        for client_loop, client in async_clients.values():
+            if client_loop in (None, loop) and not client.is_closed:
+                try:
+                    await client.aclose()
+                except Exception as e:  # Used from a loop that is gone
+                    logger.debug(f"HTTP client close failed: {e}")
+
+        for client in sync_clients.values():
+            client.close()
+
+        logger.info(f"🌐 Closed {len(sessions) + len(async_clients) + len(sync_clients)} HTTP clients")
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "aiohttp_sessions": sorted(name for name, _ in self._sessions),
+            "async_clients": sorted(name for name, _ in self._async_clients),
+            "sync_clients": sorted(self._sync_clients),
+            "created": self.created,
+            "max_per_host": self.max_per_host
+        }
+
+
+# Global registry instance
+_http_client_registry: HTTPClientRegistry | None = None
+
+
+def get_http_client_registry() -> HTTPClientRegistry:
+    """Get the global HTTP client registry."""
+    global _http_client_registry
+    if _http_client_registry is None:
+        _http_client_registry = HTTPClientRegistry()
+    return _http_client_registry
+
+
+async def shutdown_http_clients() -> None:
+    """Close all pooled HTTP clients (server lifespan shutdown)."""
+    if _http_client_registry is not None:
+        await _http_client_registry.aclose()
+
+
+__all__ = [
+    "HTTPClientRegistry",
+    "get_http_client_registry",
+    "shutdown_http_clients",
+]
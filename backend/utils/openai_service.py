@@ -12,7 +12,9 @@ from dataclasses import dataclass
 from typing import Any
 
 from dotenv import load_dotenv
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from utils.http_clients import get_http_client_registry
 
 # Load environment variables
 load_dotenv()
@@ -52,7 +54,9 @@ class OpenAIService:
             logger.warning("OpenAI API key not found in environment variables")
             self.client = None
         else:
-            self.client = AsyncOpenAI(api_key=self.config.api_key)
+            # Shared keep-alive connection pool for all OpenAI services
+            http_client = get_http_client_registry().async_client("openai", factory=DefaultAsyncHttpxClient)
+            self.client = AsyncOpenAI(api_key=self.config.api_key, http_client=http_client)
             logger.info(f"✅ OpenAI Service initialized with model: {self.config.model}")
 
     async def complete(
@@ -0,0 +1,215 @@
+"""
+Disk-Backed Perplexity Result Cache
+
+research_node calls perplexity_search on every run - also for the same or
+a trivially reworded query - and each call takes 25-40s. This cache stores
+search results on disk, keyed by a SHA-256 over:
+
+- the normalized query (lowercase, unicode-normalized, punctuation and
+  whitespace collapsed, English/German stopwords removed)
+- model, recency filter, domain filter, max_results
+
+Rules:
+- Enabled by default, KI_PERPLEXITY_CACHE=0 disables it
+- Entries expire after KI_PERPLEXITY_CACHE_TTL seconds (default 24h)
+- Size cap: KI_PERPLEXITY_CACHE_MAX_ENTRIES (default 500), LRU eviction
+- Only successful results are stored
+- force_refresh=True skips the lookup and refreshes the entry
+- Hit/miss/expired statistics via get_perplexity_cache_stats()
+
+Location: ~/.ki_autoagent/cache/perplexity/ (KI_PERPLEXITY_CACHE_DIR)
+Web results don't depend on the workspace, so the cache is shared.
+
+Author: KI AutoAgent Team
+Python: 3.13+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 500
+
+# Words that don't change what a web search returns
+STOPWORDS = frozenset({
+    # English
+    "a", "an", "and", "are", "about", "as", "at", "be", "by", "can", "do", "does",
+    "for", "from", "how", "i", "in", "is", "it", "me", "of", "on", "or", "please",
+    "should", "the", "to", "what", "which", "with", "you",
+    # German
+    "am", "bitte", "das", "der", "die", "ein", "eine", "einen", "für", "ich",
+    "im", "ist", "mit", "und", "von", "wie", "was", "welche", "zu", "zum", "zur",
+})
+
+# Keep characters that carry meaning in tech terms (c++, c#, node.js)
+_TOKEN_RE = re.compile(r"[\w+#.]+")
+
+
+def is_perplexity_cache_enabled() -> bool:
+    """Global switch (KI_PERPLEXITY_CACHE, default on)."""
+    return os.environ.get("KI_PERPLEXITY_CACHE", "1").lower() not in ("0", "false", "no", "off")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a search query for the cache key.
+
+    "What are the  React best practices?" and "react best practices"
+    map to the same key.
+    """
+    text = unicodedata.normalize("NFKC", query).casefold()
+    tokens = [token.strip(".") for token in _TOKEN_RE.findall(text)]
+    words = [token for token in tokens if token and token not in STOPWORDS]
+    # A query made only of stopwords still needs a distinct key
+    return " ".join(words) if words else " ".join(token for token in tokens if token)
+
+
+class PerplexityCache:
+    """Disk-backed search result cache with TTL and entry-count LRU eviction."""
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "stores": 0, "refreshes": 0, "evictions": 0}
+
+    def make_key(self, query: str, model: str, **params: Any) -> str:
+        """SHA-256 over the normalized query, model and search parameters."""
+        payload = {"query": normalize_query(query), "model": model, "params": params}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Get a cached result that is not older than the TTL."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.stats["misses"] += 1
+            return None
+
+        age = time.time() - entry.get("created", 0)
+        if age > self.ttl_seconds:
+            self.stats["expired"] += 1
+            self.stats["misses"] += 1
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return None
+
+        # LRU: mtime = last access
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        self.stats["hits"] += 1
+        logger.info(f"💾 Perplexity cache HIT ({age:.0f}s old): {entry.get('query', '')[:60]}")
+        return {**entry["value"], "cached": True, "cached_at": entry["created"]}
+
+    def put(self, key: str, query: str, value: dict[str, Any], refresh: bool = False) -> None:
+        """Store a result (atomic write), then evict if over max_entries."""
+        data = json.dumps({
+            "created": time.time(),
+            "query": query,
+            "normalized": normalize_query(query),
+            "value": value
+        })
+
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"⚠️ Perplexity cache write failed: {e}")
+            return
+
+        self.stats["refreshes" if refresh else "stores"] += 1
+        self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until max_entries is met."""
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return
+
+        for _, path in sorted(entries)[:excess]:
+            try:
+                path.unlink()
+                self.stats["evictions"] += 1
+            except OSError:
+                continue
+        logger.info(f"🧹 Perplexity cache evicted {excess} entries")
+
+    def get_stats(self) -> dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+            "cache_dir": str(self.cache_dir),
+            "ttl_seconds": self.ttl_seconds,
+            "max_entries": self.max_entries
+        }
+
+
+# Global cache instance
+_perplexity_cache: PerplexityCache | None = None
+
+
+def get_perplexity_cache() -> PerplexityCache:
+    """Get the global Perplexity cache (created on first use)."""
+    global _perplexity_cache
+    if _perplexity_cache is None:
+        cache_dir = os.environ.get("KI_PERPLEXITY_CACHE_DIR") or Path.home() / ".ki_autoagent" / "cache" / "perplexity"
+        _perplexity_cache = PerplexityCache(
+            cache_dir,
+            ttl_seconds=float(os.environ.get("KI_PERPLEXITY_CACHE_TTL", DEFAULT_TTL_SECONDS)),
+            max_entries=int(os.environ.get("KI_PERPLEXITY_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        )
+    return _perplexity_cache
+
+
+def get_perplexity_cache_stats() -> dict[str, Any]:
+    """Hit/miss statistics (for /api/v6/stats)."""
+    if _perplexity_cache is None:
+        return {"enabled": is_perplexity_cache_enabled()}
+    return {"enabled": is_perplexity_cache_enabled(), **_perplexity_cache.get_stats()}
+
+
+__all__ = [
+    "PerplexityCache",
+    "get_perplexity_cache",
+    "get_perplexity_cache_stats",
+    "is_perplexity_cache_enabled",
+    "normalize_query",
+]
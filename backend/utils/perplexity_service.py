@@ -5,6 +5,7 @@ PerplexityService - Service for Perplexity API integration
 Handles web search and research queries using Perplexity's AI models
 """
 
+import asyncio
 import json
 import logging
 import os
@@ -14,6 +15,9 @@ from typing import Any
 
 import aiohttp
 
+from utils.http_clients import get_http_client_registry
+from utils.perplexity_cache import get_perplexity_cache, is_perplexity_cache_enabled
+
 logger = logging.getLogger(__name__)
 
 
@@ -94,38 +98,39 @@ class PerplexityService:
 
         try:
             timeout = aiohttp.ClientTimeout(total=30.0)  # 30 second timeout
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=self.headers,
-                    json=payload,
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-
-                        # Extract the response
-                        content = (
-                            result.get("choices", [{}])[0]
-                            .get("message", {})
-                            .get("content", "")
-                        )
-                        citations = result.get("citations", [])
-
-                        return {
-                            "content": content,
-                            "citations": citations,
-                            "model": self.model,
-                            "usage": result.get("usage", {}),
-                            "timestamp": datetime.now().isoformat(),
-                        }
-                    else:
-                        error_text = await response.text()
-                        logger.error(
-                            f"Perplexity API error: {response.status} - {error_text}"
-                        )
-                        raise Exception(
-                            f"Perplexity API error: {response.status} - {error_text}"
-                        )
+            session = get_http_client_registry().aiohttp_session("perplexity")
+            async with session.post(
+                f"{self.base_url}/chat/completions",
+                headers=self.headers,
+                json=payload,
+                timeout=timeout,
+            ) as response:
+                if response.status == 200:
+                    result = await response.json()
+
+                    # Extract the response
+                    content = (
+                        result.get("choices", [{}])[0]
+                        .get("message", {})
+                        .get("content", "")
+                    )
+                    citations = result.get("citations", [])
+
+                    return {
+                        "content": content,
+                        "citations": citations,
+                        "model": self.model,
+                        "usage": result.get("usage", {}),
+                        "timestamp": datetime.now().isoformat(),
+                    }
+                else:
+                    error_text = await response.text()
+                    logger.error(
+                        f"Perplexity API error: {response.status} - {error_text}"
+                    )
+                    raise Exception(
+                        f"Perplexity API error: {response.status} - {error_text}"
+                    )
 
         except Exception as e:
             logger.error(f"Error calling Perplexity API: {e}")
@@ -165,36 +170,37 @@ class PerplexityService:
 
         try:
             timeout = aiohttp.ClientTimeout(total=30.0)  # 30 second timeout
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=self.headers,
-                    json=payload,
-                ) as response:
-                    if response.status == 200:
-                        async for line in response.content:
-                            if line:
-                                line = line.decode("utf-8").strip()
-                                if line.startswith("data: "):
-                                    data = line[6:]  # Remove "data: " prefix
-                                    if data != "[DONE]":
-                                        try:
-                                            chunk = json.loads(data)
-                                            content = (
-                                                chunk.get("choices", [{}])[0]
-                                                .get("delta", {})
-                                                .get("content", "")
-                                            )
-                                            if content:
-                                                yield content
-                                        except json.JSONDecodeError:
-                                            continue
-                    else:
-                        error_text = await response.text()
-                        logger.error(
-                            f"Perplexity API streaming error: {response.status} - {error_text}"
-                        )
-                        raise Exception(f"Perplexity API error: {response.status}")
+            session = get_http_client_registry().aiohttp_session("perplexity")
+            async with session.post(
+                f"{self.base_url}/chat/completions",
+                headers=self.headers,
+                json=payload,
+                timeout=timeout,
+            ) as response:
+                if response.status == 200:
+                    async for line in response.content:
+                        if line:
+                            line = line.decode("utf-8").strip()
+                            if line.startswith("data: "):
+                                data = line[6:]  # Remove "data: " prefix
+                                if data != "[DONE]":
+                                    try:
+                                        chunk = json.loads(data)
+                                        content = (
+                                            chunk.get("choices", [{}])[0]
+                                            .get("delta", {})
+                                            .get("content", "")
+                                        )
+                                        if content:
+                                            yield content
+                                    except json.JSONDecodeError:
+                                        continue
+                else:
+                    error_text = await response.text()
+                    logger.error(
+                        f"Perplexity API streaming error: {response.status} - {error_text}"
+                    )
+                    raise Exception(f"Perplexity API error: {response.status}")
 
         except Exception as e:
             logger.error(f"Error streaming from Perplexity API: {e}")
@@ -206,19 +212,40 @@ class PerplexityService:
         domains: list | None = None,
         recency: str | None = None,
         max_results: int = 5,
+        force_refresh: bool = False,
     ) -> dict[str, Any]:
         """
         Perform a focused web search
 
+        Results are served from the Perplexity cache when the same
+        (normalized) query was searched recently.
+
         Args:
             query: Search query
             domains: Optional list of domains to search
             recency: Time filter ('hour', 'day', 'week', 'month', 'year')
             max_results: Maximum number of results to return
+            force_refresh: Skip the cache and do a live lookup
 
         Returns:
             Structured search results with citations
+            (cached: True for results served from the cache)
         """
+        cache = get_perplexity_cache() if is_perplexity_cache_enabled() else None
+        cache_key = None
+        if cache:
+            cache_key = cache.make_key(
+                query,
+                self.model,
+                domains=sorted(domains or []),
+                recency=recency,
+                max_results=max_results,
+            )
+            if not force_refresh:
+                cached = await asyncio.to_thread(cache.get, cache_key)
+                if cached is not None:
+                    return cached
+
         prompt = f"""Search the web for: {query}
 
 Please provide:
@@ -236,7 +263,7 @@ Focus on returning the {max_results} most relevant and recent results."""
             return_citations=True,
         )
 
-        return {
+        search_result = {
             "query": query,
             "answer": result["content"],
             "citations": result.get("citations", []),
@@ -245,6 +272,11 @@ Focus on returning the {max_results} most relevant and recent results."""
             "filters": {"domains": domains, "recency": recency},
         }
 
+        if cache and search_result["answer"]:
+            await asyncio.to_thread(cache.put, cache_key, query, search_result, force_refresh)
+
+        return {**search_result, "cached": False}
+
     async def research_technology(
         self, technology: str, aspects: list = None
     ) -> dict[str, Any]:
@@ -323,7 +355,7 @@ Cite authoritative sources like official documentation, major tech blogs, and re
             "recency": "last_month",
         }
 
-    def test_connection(self) -> bool:
+    async def test_connection(self) -> bool:
         """
         Test if Perplexity API connection works
 
@@ -331,9 +363,8 @@ Cite authoritative sources like official documentation, major tech blogs, and re
             True if connection successful, False otherwise
         """
         try:
-            import requests
-
-            response = requests.post(
+            session = get_http_client_registry().aiohttp_session("perplexity")
+            async with session.post(
                 f"{self.base_url}/chat/completions",
                 headers=self.headers,
                 json={
@@ -341,13 +372,13 @@ Cite authoritative sources like official documentation, major tech blogs, and re
                     "messages": [{"role": "user", "content": "test"}],
                     "max_tokens": 1,
                 },
-                timeout=5,
-            )
-            if response.status_code != 200:
-                logger.error(
-                    f"Connection test failed with status {response.status_code}: {response.text}"
-                )
-            return response.status_code == 200
+                timeout=aiohttp.ClientTimeout(total=5.0),
+            ) as response:
+                if response.status != 200:
+                    logger.error(
+                        f"Connection test failed with status {response.status}: {await response.text()}"
+                    )
+                return response.status == 200
         except Exception as e:
             logger.error(f"Connection test failed with exception: {e}")
             return False
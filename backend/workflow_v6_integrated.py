@@ -75,6 +75,7 @@ from state_v6 import (
     supervisor_to_reviewfix,
 )
 from memory.memory_system_v6 import MemorySystem
+from subgraphs.build_validation import release_build_validator
 
 # ============================================================================
 # V6 SYSTEM IMPORTS
@@ -977,6 +978,24 @@ class WorkflowV6Integrated:
     # EXECUTION (with v6 Intelligence)
     # ========================================================================
 
+    def _build_initial_state(self, user_query: str) -> SupervisorState:
+        """
+        Build the initial SupervisorState for a workflow run.
+
+        Shared by run() and the overhead benchmarks so both start
+        from an identical state.
+        """
+        return {
+            "user_query": user_query,
+            "workspace_path": self.workspace_path,
+            "research_results": None,
+            "architecture_design": None,
+            "generated_files": [],
+            "review_feedback": None,
+            "final_result": None,
+            "errors": []
+        }
+
     async def run(
         self,
         user_query: str,
@@ -1027,16 +1046,7 @@ class WorkflowV6Integrated:
 
         logger.info("⚙️  Starting workflow execution...")
 
-        initial_state: SupervisorState = {
-            "user_query": user_query,
-            "workspace_path": self.workspace_path,
-            "research_results": None,
-            "architecture_design": None,
-            "generated_files": [],
-            "review_feedback": None,
-            "final_result": None,
-            "errors": []
-        }
+        initial_state = self._build_initial_state(user_query)
 
         try:
             result = await self.workflow.ainvoke(
@@ -1063,6 +1073,10 @@ class WorkflowV6Integrated:
                 "error": str(e)
             }
 
+        finally:
+            # Stop the workspace's mypy daemon (no more ReviewFix iterations)
+            await release_build_validator(self.workspace_path)
+
         # ====================================================================
         # PHASE 3: POST-EXECUTION LEARNING
         # ====================================================================
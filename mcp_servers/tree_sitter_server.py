@@ -13,7 +13,7 @@ Tools:
 1. validate_syntax - Validate code syntax
 2. parse_code - Parse code and extract AST metadata
 3. analyze_file - Analyze a single file
-4. analyze_directory - Analyze entire directory
+4. analyze_directory - Analyze entire directory (paginated: cursor/limit)
 
 Run:
     python mcp_servers/tree_sitter_server.py
@@ -45,6 +45,7 @@ spec = importlib.util.spec_from_file_location(
     backend_path / "tools" / "tree_sitter_tools.py"
 )
 tree_sitter_module = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = tree_sitter_module  # Needed by @dataclass during exec
 spec.loader.exec_module(tree_sitter_module)
 TreeSitterAnalyzer = tree_sitter_module.TreeSitterAnalyzer
 
@@ -86,9 +87,8 @@ async def validate_syntax(code: str, language: str) -> dict:
                 "message": f"✅ Code is syntactically valid ({language})"
             }
         else:
-            # Parse to get error details
-            tree = analyzer.parsers[language].parse(code.encode())
-            errors = analyzer._find_error_nodes(tree.root_node)
+            # Error locations (ERROR and MISSING nodes)
+            errors = analyzer.find_syntax_errors(code, language)
 
             return {
                 "valid": False,
@@ -125,31 +125,26 @@ async def parse_code(code: str, language: str) -> dict:
         }
     """
     try:
-        parser = analyzer.parsers.get(language)
-        if not parser:
+        if language not in analyzer.parsers:
             return {
                 "error": f"Unsupported language: {language}",
                 "supported_languages": list(analyzer.parsers.keys())
             }
 
-        # Parse
-        code_bytes = code.encode()
-        tree = parser.parse(code_bytes)
-        root = tree.root_node
-
-        # Extract metadata
+        # Parse + extract metadata (one query pass)
+        parsed = analyzer.parse_code(code, language)
         result = {
             "language": language,
-            "syntax_valid": not root.has_error,
-            "functions": analyzer._extract_functions(root, code_bytes, language),
-            "classes": analyzer._extract_classes(root, code_bytes, language),
-            "imports": analyzer._extract_imports(root, code_bytes, language),
+            "syntax_valid": parsed["syntax_valid"],
+            "functions": parsed["functions"],
+            "classes": parsed["classes"],
+            "imports": parsed["imports"],
             "timestamp": datetime.now().isoformat()
         }
 
         # Add errors if present
-        if root.has_error:
-            result["errors"] = analyzer._find_error_nodes(root)
+        if not parsed["syntax_valid"]:
+            result["errors"] = parsed["error_nodes"]
 
         return result
 
@@ -203,39 +198,36 @@ async def analyze_file(file_path: str) -> dict:
         }
 
 
-async def analyze_directory(dir_path: str, extensions: list[str] | None = None) -> dict:
+async def analyze_directory(
+    dir_path: str,
+    extensions: list[str] | None = None,
+    cursor: str | None = None,
+    limit: int = 200
+) -> dict:
     """
-    Analyze entire directory recursively.
+    Analyze a directory recursively, one page of files at a time.
 
     Args:
         dir_path: Directory path
-        extensions: File extensions to include (default: [".py", ".js", ".ts"])
+        extensions: File extensions to include (default: [".py", ".js", ".jsx", ".ts", ".tsx"])
+        cursor: next_cursor of the previous page (None = first page)
+        limit: Files per page
 
     Returns:
-        Complete directory analysis with summary
+        Compact file summaries of this page, page summary and next_cursor
     """
     try:
-        result = analyzer.parse_directory(dir_path, extensions)
-
-        # Convert to JSON-serializable format (remove tree objects)
-        json_files = {}
-        for file_path, file_result in result["files"].items():
-            json_files[file_path] = {
-                "language": file_result["language"],
-                "syntax_valid": file_result["syntax_valid"],
-                "functions": file_result["functions"],
-                "classes": file_result["classes"],
-                "imports": file_result["imports"],
-                "errors": file_result["error_nodes"] if not file_result["syntax_valid"] else []
-            }
+        # Parsed on worker threads; only this page's summaries are held
+        page = await asyncio.to_thread(
+            analyzer.parse_directory_page, dir_path, extensions, cursor, limit
+        )
 
         return {
             "directory": dir_path,
-            "total_files": result["total_files"],
-            "parsed_files": result["parsed_files"],
-            "failed_files": result["failed_files"],
-            "summary": result["summary"],
-            "files": json_files,
+            "cursor": cursor,
+            "next_cursor": page["next_cursor"],
+            "summary": page["summary"],
+            "files": page["files"],
             "timestamp": datetime.now().isoformat()
         }
 
@@ -342,7 +334,7 @@ async def handle_request(request: dict) -> dict:
                     },
                     {
                         "name": "analyze_directory",
-                        "description": "Analyze entire directory recursively. Returns summary of all code files with functions, classes, and syntax errors.",
+                        "description": "Analyze entire directory recursively. Returns compact summaries of the code files (functions, classes, imports, syntax errors), one page at a time - pass next_cursor as cursor to get the next page.",
                         "inputSchema": {
                             "type": "object",
                             "properties": {
@@ -356,6 +348,14 @@ async def handle_request(request: dict) -> dict:
                                     "items": {
                                         "type": "string"
                                     }
+                                },
+                                "cursor": {
+                                    "type": "string",
+                                    "description": "next_cursor of the previous page (omit for the first page)"
+                                },
+                                "limit": {
+                                    "type": "integer",
+                                    "description": "Files per page (default: 200)"
                                 }
                             },
                             "required": ["dir_path"]
@@ -392,7 +392,9 @@ async def handle_request(request: dict) -> dict:
             elif tool_name == "analyze_directory":
                 result = await analyze_directory(
                     dir_path=tool_args.get("dir_path", ""),
-                    extensions=tool_args.get("extensions")
+                    extensions=tool_args.get("extensions"),
+                    cursor=tool_args.get("cursor"),
+                    limit=tool_args.get("limit", 200)
                 )
 
             else: